@@ -0,0 +1,147 @@
+"""
+Queueing latency benchmark for the LLM Queue poller.
+
+Compares the default sleep based poller with the event driven poller by sending N concurrent requests
+through `LLMQueue.execute_request()` to a request controller that returns immediately, so the measured
+latency is the overhead added by the queue itself.
+
+Usage (from components/llm-queue):
+    python benchmarks/poller_latency_benchmark.py
+    python benchmarks/poller_latency_benchmark.py --concurrency 1 100 --work-ms 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from llm_queue import LLMQueue
+from llm_queue.base import BaseRequestController
+from llm_queue.base.config_data_classes import LLMConfig
+from llm_queue.base.data_classes import ModelPreferences
+
+REQ_TYPE = "benchmark"
+
+
+class NoOpRequestController(BaseRequestController):
+    def __init__(self, work_seconds: float):
+        self.work_seconds = work_seconds
+
+    async def process_request(self, req, chosen_llm_ids, telemetry_data):
+        if self.work_seconds > 0:
+            await asyncio.sleep(self.work_seconds)
+        return req
+
+
+def build_llm_config(num_callers: int) -> LLMConfig:
+    # Rate limits are set high enough for the load balancer and user limits to never throttle
+    return LLMConfig(
+        azure_open_ai=[
+            {
+                "api_key": "***",
+                "api_version": "2023-03-15-preview",
+                "api_type": "azure",
+                "azure_endpoint": "https://***.openai.azure.com/",
+                "azure_oai_models": [
+                    {
+                        "unique_model_id": "benchmark-gpt",
+                        "model_name_in_azure": "gpt-4o",
+                        "deployment_name_in_azure": "gpt-4o",
+                        "model_type": "completion",
+                        "req_per_min": 60_000_000,
+                        "tokens_per_min": 10**12,
+                        "error_backoff_in_seconds": 60,
+                    }
+                ],
+            }
+        ],
+        user_limits={
+            "max_num_requests_in_time_window": num_callers * 10,
+            "time_window_length_in_seconds": 60,
+        },
+        scheduler_limits={"ttl_in_seconds": 3600, "max_queue_size": num_callers * 10},
+        custom_models=[],
+    )
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    index = min(
+        len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1)))
+    )
+    return sorted_values[index]
+
+
+async def run_once(num_callers: int, event_driven: bool, work_seconds: float) -> dict:
+    llm_queue = LLMQueue(
+        build_llm_config(num_callers),
+        {REQ_TYPE: NoOpRequestController(work_seconds)},
+        event_driven_polling=event_driven,
+    )
+    await llm_queue.initiate()
+    model_pref = ModelPreferences(require_llm_model=True)
+
+    async def call(i: int) -> float:
+        start = time.perf_counter()
+        _, status_code = await llm_queue.execute_request(
+            req_type=REQ_TYPE,
+            request_data={"i": i},
+            user_id="benchmark-user",
+            model_pref=model_pref,
+        )
+        assert status_code == 200
+        return time.perf_counter() - start - work_seconds
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    latencies = sorted(await asyncio.gather(*(call(i) for i in range(num_callers))))
+    wall_time = time.perf_counter() - wall_start
+    busy_cpu_time = time.process_time() - cpu_start
+
+    # CPU burnt by the background loops while the queue sits idle
+    idle_cpu_start = time.process_time()
+    await asyncio.sleep(2)
+    idle_cpu_time = time.process_time() - idle_cpu_start
+
+    await llm_queue.graceful_shutdown()
+    return {
+        "mode": "event" if event_driven else "sleep",
+        "callers": num_callers,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "wall_s": wall_time,
+        "cpu_s": busy_cpu_time,
+        "idle_cpu_ms_per_s": idle_cpu_time / 2 * 1000,
+    }
+
+
+async def main(concurrency: list[int], work_ms: float):
+    header = f"{'mode':<6} {'callers':>8} {'p50 ms':>10} {'p99 ms':>10} {'mean ms':>10} {'wall s':>8} {'cpu s':>8} {'idle cpu ms/s':>14}"
+    print(header)
+    print("-" * len(header))
+    for num_callers in concurrency:
+        for event_driven in (False, True):
+            r = await run_once(num_callers, event_driven, work_ms / 1000)
+            print(
+                f"{r['mode']:<6} {r['callers']:>8} {r['p50_ms']:>10.2f} {r['p99_ms']:>10.2f} "
+                f"{r['mean_ms']:>10.2f} {r['wall_s']:>8.2f} {r['cpu_s']:>8.2f} {r['idle_cpu_ms_per_s']:>14.3f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 100, 1000],
+        help="Numbers of concurrent callers to benchmark",
+    )
+    parser.add_argument(
+        "--work-ms",
+        type=float,
+        default=0,
+        help="Simulated processing time of each request in milliseconds",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.work_ms))
@@ -0,0 +1,157 @@
+"""
+Queue wait simulation for the LLM Queue schedulers under mixed load.
+
+Simulates interactive lesson chat requests (many users, Poisson arrivals, priority 0) competing with bursts of bulk
+question paper requests (few users, priority 1) for a deployment that can dispatch a fixed number of requests per
+second, and reports the p50/p99 queue wait per request class for `BasicFIFOScheduler` and `PriorityFairScheduler`.
+Time is simulated, so the benchmark runs in a few seconds regardless of the simulated duration.
+
+Usage (from components/llm-queue):
+    python benchmarks/scheduler_wait_benchmark.py
+    python benchmarks/scheduler_wait_benchmark.py --duration 600 --capacity 7.5 --chat-rate 4 --burst-size 300
+"""
+
+import argparse
+import asyncio
+import random
+
+from llm_queue.base.data_classes import ScheduledRequest, TelemetryData
+from llm_queue.schedulers import BasicFIFOScheduler, PriorityFairScheduler
+
+CHAT = "lesson_chat"
+BULK = "question_paper"
+PRIORITIES = {CHAT: 0, BULK: 1}
+
+
+def generate_arrivals(args) -> list[tuple[float, str, str]]:
+    """
+    Returns (arrival_time, req_type, user_id) tuples sorted by arrival time.
+    """
+    rng = random.Random(args.seed)
+    arrivals = []
+    t = 0.0
+    while True:
+        t += rng.expovariate(args.chat_rate)
+        if t >= args.duration:
+            break
+        arrivals.append((t, CHAT, f"teacher-{rng.randrange(args.chat_users)}"))
+
+    burst_time = 0.0
+    while burst_time < args.duration:
+        user_id = f"bulk-{rng.randrange(args.bulk_users)}"
+        for i in range(args.burst_size):
+            arrivals.append((burst_time + i * 0.001, BULK, user_id))
+        burst_time += args.burst_interval
+    arrivals.sort(key=lambda arrival: arrival[0])
+    return arrivals
+
+
+def create_request(i: int, req_type: str, user_id: str, use_priority: bool):
+    req_id = f"{req_type}-{i}"
+    return ScheduledRequest(
+        req_type=req_type,
+        req_id=req_id,
+        payload={},
+        priority=PRIORITIES[req_type] if use_priority else 0,
+        telemetry_data=TelemetryData(
+            user_id=user_id, req_id=req_id, req_payload="", req_type=req_type
+        ),
+    )
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    index = min(
+        len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1)))
+    )
+    return sorted_values[index]
+
+
+async def simulate(scheduler, arrivals, args, use_priority: bool) -> dict:
+    arrival_times = {}
+    waits = {CHAT: [], BULK: []}
+    next_arrival = 0
+    dispatch_interval = 1 / args.capacity
+    t = 0.0
+    # Dispatch one request every `dispatch_interval` seconds, enqueueing everything that arrived in between
+    while t < args.duration + args.drain:
+        while next_arrival < len(arrivals) and arrivals[next_arrival][0] <= t:
+            arrival_time, req_type, user_id = arrivals[next_arrival]
+            request = create_request(next_arrival, req_type, user_id, use_priority)
+            arrival_times[request.req_id] = (arrival_time, req_type)
+            await scheduler.add_request(request)
+            next_arrival += 1
+        request = await scheduler.pop_top_new_request()
+        if request is not None:
+            arrival_time, req_type = arrival_times.pop(request.req_id)
+            waits[req_type].append(t - arrival_time)
+        t += dispatch_interval
+
+    result = {}
+    for req_type, req_waits in waits.items():
+        req_waits.sort()
+        result[req_type] = {
+            "served": len(req_waits),
+            "unserved": sum(1 for _, rt in arrival_times.values() if rt == req_type),
+            "p50": percentile(req_waits, 50),
+            "p99": percentile(req_waits, 99),
+        }
+    return result
+
+
+async def main(args):
+    arrivals = generate_arrivals(args)
+    limits = {"ttl_in_seconds": 300, "max_queue_size": len(arrivals) + 1}
+    schedulers = {
+        "BasicFIFOScheduler": (BasicFIFOScheduler(limits), False),
+        "PriorityFairScheduler": (PriorityFairScheduler(limits), True),
+    }
+    header = f"{'scheduler':<22} {'class':<15} {'served':>8} {'unserved':>9} {'p50 wait s':>11} {'p99 wait s':>11}"
+    print(header)
+    print("-" * len(header))
+    for name, (scheduler, use_priority) in schedulers.items():
+        result = await simulate(scheduler, arrivals, args, use_priority)
+        for req_type, r in result.items():
+            print(
+                f"{name:<22} {req_type:<15} {r['served']:>8} {r['unserved']:>9} {r['p50']:>11.2f} {r['p99']:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=600,
+        help="Simulated arrival window in seconds",
+    )
+    parser.add_argument(
+        "--drain",
+        type=float,
+        default=300,
+        help="Simulated seconds to keep dispatching after arrivals stop",
+    )
+    parser.add_argument(
+        "--capacity",
+        type=float,
+        default=7.5,
+        help="Dispatches per second (450 RPM by default)",
+    )
+    parser.add_argument(
+        "--chat-rate", type=float, default=3, help="Lesson chat arrivals per second"
+    )
+    parser.add_argument(
+        "--chat-users", type=int, default=200, help="Number of distinct chat users"
+    )
+    parser.add_argument(
+        "--bulk-users", type=int, default=3, help="Number of distinct bulk users"
+    )
+    parser.add_argument(
+        "--burst-size", type=int, default=300, help="Question paper requests per burst"
+    )
+    parser.add_argument(
+        "--burst-interval", type=float, default=120, help="Seconds between bursts"
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,202 @@
+"""
+Contention benchmark for the Redis user rate limit store adapter.
+
+Sends N concurrent `check_and_add_request()` calls for the same user and compares the previous WATCH/MULTI
+implementation, which retries whenever another call touched the user's key in between, with the current Lua script
+implementation. Reports throughput, latency percentiles, Redis round trips and optimistic locking retries per call.
+
+Runs against an in-process fakeredis server by default (requires `fakeredis` and `lupa`), pass `--redis-url` to
+benchmark a real Redis server, where the round trips dominate the latency.
+
+Usage (from components/llm-queue):
+    python benchmarks/user_rate_limiter_contention_benchmark.py
+    python benchmarks/user_rate_limiter_contention_benchmark.py --concurrency 10 100 --redis-url redis://localhost:6379
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from llm_queue.user_rate_limiter_adapters import RedisUserRateLimitStoreAdapter
+
+
+def get_watch_error():
+    # redis.asyncio (also used by fakeredis) supersedes aioredis, which is only used when redis is not installed
+    try:
+        from redis.exceptions import WatchError
+    except ImportError:
+        from aioredis import WatchError
+    return WatchError
+
+
+class CountingRedisClient:
+    """
+    Forwards every call to a Redis client and counts the round trips.
+    """
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.round_trips = 0
+
+    def __getattr__(self, name):
+        return getattr(self.redis_client, name)
+
+    def pipeline(self, *args, **kwargs):
+        return CountingPipeline(self, self.redis_client.pipeline(*args, **kwargs))
+
+    def register_script(self, script):
+        registered_script = self.redis_client.register_script(script)
+
+        async def run_script(*args, **kwargs):
+            self.round_trips += 1
+            return await registered_script(*args, **kwargs)
+
+        return run_script
+
+
+class CountingPipeline:
+    # In WATCH mode every pipeline command is sent immediately, after multi() only execute() is a round trip
+    def __init__(self, counting_client: CountingRedisClient, pipeline):
+        self.counting_client = counting_client
+        self.pipeline = pipeline
+        self.is_buffering = False
+
+    async def __aenter__(self):
+        await self.pipeline.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return await self.pipeline.__aexit__(*exc_info)
+
+    def multi(self):
+        self.is_buffering = True
+        return self.pipeline.multi()
+
+    def __getattr__(self, name):
+        attr = getattr(self.pipeline, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            if not self.is_buffering or name == "execute":
+                self.counting_client.round_trips += 1
+            if name in ("execute", "reset", "unwatch"):
+                self.is_buffering = False
+            return attr(*args, **kwargs)
+
+        return call
+
+
+class WatchMultiRedisUserRateLimitStoreAdapter(RedisUserRateLimitStoreAdapter):
+    """
+    The previous optimistic locking implementation, kept here as the baseline.
+    """
+
+    retries = 0
+
+    async def check_and_add_request(self, user_id, limit, now, window_len):
+        watch_error = get_watch_error()
+        window_start = now - window_len * 1000
+        async with self.redis.pipeline() as pipe:
+            while True:
+                try:
+                    await pipe.watch(user_id)
+                    await pipe.zremrangebyscore(user_id, 0, window_start)
+                    size = await pipe.zcard(user_id)
+                    if size >= limit:
+                        first_score = int(
+                            (await pipe.zrange(user_id, 0, 0, withscores=True))[0][1]
+                        )
+                        await pipe.unwatch()
+                        return False, window_len - (now - first_score) / 1000
+                    pipe.multi()
+                    pipe.zadd(user_id, {str(uuid.uuid4()): now})
+                    await pipe.execute()
+                    return True, None
+                except watch_error:
+                    self.retries += 1
+                    continue
+
+
+def create_redis_client(redis_url: str | None):
+    if redis_url:
+        import redis.asyncio
+
+        return redis.asyncio.from_url(redis_url)
+    import fakeredis
+
+    return fakeredis.aioredis.FakeRedis()
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    index = min(
+        len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1)))
+    )
+    return sorted_values[index]
+
+
+async def run_once(adapter_cls, num_callers: int, redis_url: str | None) -> dict:
+    redis_client = CountingRedisClient(create_redis_client(redis_url))
+    adapter = adapter_cls("localhost", "", redis_client=redis_client)
+    await adapter.connect()
+    user_id = f"benchmark-user-{uuid.uuid4()}"
+    now = int(time.time() * 1000)
+
+    async def call() -> float:
+        start = time.perf_counter()
+        # The limit is never reached, so every call has to add its request
+        await adapter.check_and_add_request(user_id, num_callers + 1, now, 60)
+        return time.perf_counter() - start
+
+    round_trips_before = redis_client.round_trips
+    wall_start = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(call() for _ in range(num_callers))))
+    wall_time = time.perf_counter() - wall_start
+    await redis_client.delete(user_id)
+    return {
+        "adapter": (
+            "watch/multi"
+            if adapter_cls is WatchMultiRedisUserRateLimitStoreAdapter
+            else "lua"
+        ),
+        "callers": num_callers,
+        "calls_per_s": num_callers / wall_time,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "round_trips": (redis_client.round_trips - round_trips_before) / num_callers,
+        "retries": getattr(adapter, "retries", 0) / num_callers,
+    }
+
+
+async def main(args):
+    header = f"{'adapter':<12} {'callers':>8} {'calls/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'trips/call':>11} {'retries/call':>13}"
+    print(header)
+    print("-" * len(header))
+    for num_callers in args.concurrency:
+        for adapter_cls in (
+            WatchMultiRedisUserRateLimitStoreAdapter,
+            RedisUserRateLimitStoreAdapter,
+        ):
+            r = await run_once(adapter_cls, num_callers, args.redis_url)
+            print(
+                f"{r['adapter']:<12} {r['callers']:>8} {r['calls_per_s']:>10.0f} {r['p50_ms']:>10.2f} "
+                f"{r['p99_ms']:>10.2f} {r['round_trips']:>11.2f} {r['retries']:>13.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100],
+        help="Numbers of concurrent calls for the same user",
+    )
+    parser.add_argument(
+        "--redis-url",
+        default=None,
+        help="Redis server to benchmark against, defaults to an in-process fakeredis server",
+    )
+    asyncio.run(main(parser.parse_args()))
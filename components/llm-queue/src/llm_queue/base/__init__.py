@@ -1,9 +1,11 @@
 from llm_queue.base.base_classes import (
     BaseScheduler,
+    BaseAsyncLLMEntityLoadBalancer,
     BaseLLMEntityLoadBalancer,
     BaseRequestController,
 )
 from llm_queue.base.adapter_base_classes import (
+    MetricsAdapter,
     TelemetryDataStoreAdapter,
     UserRateLimitsDatastoreAdapter,
 )
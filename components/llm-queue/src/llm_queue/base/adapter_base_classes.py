@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Callable, Tuple
 
 from llm_queue.base.data_classes import TelemetryData
 
@@ -13,6 +13,8 @@ class TelemetryDataStoreAdapter(ABC):
         connect(): Establishes a connection to the telemetry data storage system. Must be implemented by subclasses.
         disconnect(): Closes the connection to the telemetry data storage system. Must be implemented by subclasses.
         insert_telemetry_data(telemetry_data: TelemetryData): Inserts a telemetry data record into the datastore. Must be implemented by subclasses.
+        insert_telemetry_data_batch(telemetry_data_list: list[TelemetryData]): Inserts several telemetry data records. Defaults to one insert_telemetry_data() call per record,
+            subclasses should override it with a bulk write.
     """
 
     @abstractmethod
@@ -27,6 +29,12 @@ class TelemetryDataStoreAdapter(ABC):
     async def insert_telemetry_data(self, telemetry_data: TelemetryData):
         pass
 
+    async def insert_telemetry_data_batch(
+        self, telemetry_data_list: list[TelemetryData]
+    ):
+        for telemetry_data in telemetry_data_list:
+            await self.insert_telemetry_data(telemetry_data)
+
 
 class UserRateLimitsDatastoreAdapter(ABC):
     """
@@ -78,3 +86,32 @@ class UserRateLimitsDatastoreAdapter(ABC):
         This method must be overridden by subclasses to implement specific rate limit checking and updating logic.
         """
         pass
+
+
+class MetricsAdapter(ABC):
+    """
+    An abstract base class for adapters that export LLM Queue metrics to a monitoring system.
+
+    Methods:
+        observe(name, value, labels): Records one observation of a distribution, e.g. a stage duration in seconds.
+        increment(name, value, labels): Increments a counter.
+        register_gauge(name, callback, label_name): Registers a gauge whose value is read from `callback` when the metrics
+            are collected. The callback returns a number, or a dict of label value to number if `label_name` is set.
+    """
+
+    @abstractmethod
+    def observe(self, name: str, value: float, labels: dict[str, str] = None):
+        pass
+
+    @abstractmethod
+    def increment(self, name: str, value: float = 1, labels: dict[str, str] = None):
+        pass
+
+    @abstractmethod
+    def register_gauge(
+        self,
+        name: str,
+        callback: Callable[[], float | dict[str, float] | None],
+        label_name: str = None,
+    ):
+        pass
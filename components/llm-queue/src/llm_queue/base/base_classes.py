@@ -1,4 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Callable
 
 from llm_queue.base.data_classes import (
     ModelPreferences,
@@ -8,19 +10,117 @@ from llm_queue.base.data_classes import (
 )
 
 
-class BaseLLMEntityLoadBalancer(ABC):
+class BaseAsyncLLMEntityLoadBalancer(ABC):
     """
-    Abstract base class defining the interface for an LLM load balancer.
-    This class is responsible for managing available LLM entities and handling errors.
+    Abstract base class defining the async interface of an LLM load balancer, which is the one used by the
+    `ResourceAvailabilityChecker`. Load balancers whose state lives in an external store, e.g. Redis, implement it
+    directly, in-memory load balancers extend `BaseLLMEntityLoadBalancer` and implement its synchronous methods.
     """
 
+    # Listener called whenever the load balancer frees capacity ahead of its own schedule
+    capacity_release_listener: Callable[[], None] | None = None
+
+    @abstractmethod
+    async def ahas_available_llm(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> bool | None:
+        pass
+
     @abstractmethod
-    def has_available_llm(self, specific_llm_requried: str = None) -> bool | None:
+    async def aget_available_llm_id(
+        self,
+        num_llm_calls: float = 1.0,
+        specific_llm_requried: str = None,
+        num_tokens_per_call: float | None = None,
+    ) -> str | None:  # Return LLMConfig Id to use for current request
+        pass
+
+    @abstractmethod
+    async def aregister_error(self, llm_id: str):
+        pass
+
+    async def arelease_llm_id(
+        self,
+        llm_id: str,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ):
+        """
+        Gives back the capacity taken by `aget_available_llm_id` for a request that was not dispatched, e.g. because
+        another model it requires is not available.
+        """
+        pass
+
+    async def aget_seconds_until_available(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> float | None:
+        """
+        Returns the number of seconds after which an LLM is expected to become available, 0 if one is available
+        right now, or None if the load balancer cannot tell. Used by the event driven poller to sleep exactly
+        until capacity frees up instead of polling at a fixed interval.
+        """
+        return None
+
+    async def aregister_usage(
+        self,
+        llm_id: str,
+        num_llm_calls: float,
+        num_tokens_per_call: float | None,
+        actual_tokens: int,
+    ):
+        """
+        Reports the number of tokens a completed request actually used on an LLM, together with the values the
+        request was dispatched with. Load balancers that do not account for tokens can ignore it.
+        """
+        pass
+
+    async def aregister_success(self, llm_id: str, latency_in_seconds: float):
+        """
+        Reports that a request completed successfully on an LLM and how long it took to process. Load balancers that do
+        not account for latency or health can ignore it.
+        """
+        pass
+
+    def set_capacity_release_listener(self, listener: Callable[[], None]):
+        """
+        Registers a callback which is invoked when capacity is released earlier than reported by
+        `get_seconds_until_available`, e.g. when a request finishes or its usage is corrected.
+        """
+        self.capacity_release_listener = listener
+
+    def _notify_capacity_released(self):
+        if self.capacity_release_listener is not None:
+            self.capacity_release_listener()
+
+
+class BaseLLMEntityLoadBalancer(BaseAsyncLLMEntityLoadBalancer):
+    """
+    Abstract base class defining the interface for an in-memory LLM load balancer.
+    This class is responsible for managing available LLM entities and handling errors. Its async variants delegate to
+    the synchronous methods.
+    """
+
+    @abstractmethod
+    def has_available_llm(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> bool | None:
         pass
 
     @abstractmethod
     def get_available_llm_id(
-        self, num_llm_calls: float = 1.0, specific_llm_requried: str = None
+        self,
+        num_llm_calls: float = 1.0,
+        specific_llm_requried: str = None,
+        num_tokens_per_call: float | None = None,
     ) -> str:  # Return LLMConfig Id to use for current request
         pass
 
@@ -28,6 +128,110 @@ class BaseLLMEntityLoadBalancer(ABC):
     def register_error(self, llm_id: str):
         pass
 
+    def release_llm_id(
+        self,
+        llm_id: str,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ):
+        """
+        Gives back the capacity taken by `get_available_llm_id` for a request that was not dispatched.
+        """
+        pass
+
+    def get_seconds_until_available(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> float | None:
+        """
+        Returns the number of seconds after which an LLM is expected to become available, 0 if one is available
+        right now, or None if the load balancer cannot tell.
+        """
+        return None
+
+    def register_usage(
+        self,
+        llm_id: str,
+        num_llm_calls: float,
+        num_tokens_per_call: float | None,
+        actual_tokens: int,
+    ):
+        """
+        Reports the number of tokens a completed request actually used on an LLM. Load balancers that do not account
+        for tokens can ignore it.
+        """
+        pass
+
+    def register_success(self, llm_id: str, latency_in_seconds: float):
+        """
+        Reports that a request completed successfully on an LLM and how long it took to process. Load balancers that do
+        not account for latency or health can ignore it.
+        """
+        pass
+
+    async def ahas_available_llm(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> bool | None:
+        return self.has_available_llm(
+            specific_llm_requried,
+            num_llm_calls=num_llm_calls,
+            num_tokens_per_call=num_tokens_per_call,
+        )
+
+    async def aget_available_llm_id(
+        self,
+        num_llm_calls: float = 1.0,
+        specific_llm_requried: str = None,
+        num_tokens_per_call: float | None = None,
+    ) -> str | None:
+        return self.get_available_llm_id(
+            num_llm_calls,
+            specific_llm_requried,
+            num_tokens_per_call=num_tokens_per_call,
+        )
+
+    async def arelease_llm_id(
+        self,
+        llm_id: str,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ):
+        self.release_llm_id(
+            llm_id, num_llm_calls=num_llm_calls, num_tokens_per_call=num_tokens_per_call
+        )
+
+    async def aget_seconds_until_available(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> float | None:
+        return self.get_seconds_until_available(
+            specific_llm_requried,
+            num_llm_calls=num_llm_calls,
+            num_tokens_per_call=num_tokens_per_call,
+        )
+
+    async def aregister_usage(
+        self,
+        llm_id: str,
+        num_llm_calls: float,
+        num_tokens_per_call: float | None,
+        actual_tokens: int,
+    ):
+        self.register_usage(llm_id, num_llm_calls, num_tokens_per_call, actual_tokens)
+
+    async def aregister_error(self, llm_id: str):
+        self.register_error(llm_id)
+
+    async def aregister_success(self, llm_id: str, latency_in_seconds: float):
+        self.register_success(llm_id, latency_in_seconds)
+
 
 class BaseRequestController(ABC):
     """
@@ -56,13 +260,46 @@ class BaseResourceAvailabilityChecker(ABC):
     """
 
     @abstractmethod
-    def get_model_ids_if_available(
+    async def get_model_ids_if_available(
         self, model_pref: ModelPreferences
     ) -> list[str] | None:
         pass
 
     @abstractmethod
-    def register_error(self, llm_ids: list[str]):
+    async def register_error(
+        self, llm_ids: list[str], model_pref: ModelPreferences = None
+    ):
+        pass
+
+    async def get_seconds_until_available(
+        self, model_pref: ModelPreferences
+    ) -> float | None:
+        """
+        Returns the number of seconds after which the resources for `model_pref` are expected to be available,
+        or None if it cannot be determined.
+        """
+        return None
+
+    async def register_usage(
+        self,
+        llm_ids: list[str],
+        model_pref: ModelPreferences,
+        telemetry_data: TelemetryData,
+    ):
+        """
+        Reports the actual token usage of a completed request to the load balancers of the models it used.
+        """
+        pass
+
+    async def register_success(
+        self,
+        llm_ids: list[str],
+        model_pref: ModelPreferences,
+        latency_in_seconds: float,
+    ):
+        """
+        Reports the processing latency of a successful request to the load balancers of the models it used.
+        """
         pass
 
 
@@ -93,9 +330,75 @@ class BaseScheduler(ABC):
         pass
 
     @abstractmethod
-    def remove_request_by_id(self, req_id: str):
+    def remove_request_by_id(self, req_id: str) -> bool:
+        """
+        Removes a queued request. Returns True if the request was removed, False if it was not queued anymore.
+        """
         pass
 
     @abstractmethod
     def get_top_requests_model_prefs(self) -> TopQueuedRequest:
         pass
+
+    # Interval used by schedulers which cannot notify the poller about newly added requests
+    DEFAULT_POLL_INTERVAL_IN_SECONDS = 0.1
+
+    async def wait_for_request(self, timeout: float | None = None):
+        """
+        Waits until a new request is added or `notify_request_available()` is called, or until `timeout` seconds
+        have elapsed. The default implementation falls back to sleeping for a short polling interval.
+        """
+        interval = self.DEFAULT_POLL_INTERVAL_IN_SECONDS
+        await asyncio.sleep(interval if timeout is None else min(timeout, interval))
+
+    def notify_request_available(self):
+        """
+        Wakes up any coroutine blocked in `wait_for_request()`. No-op by default.
+        """
+        pass
+
+    def get_ttl_in_seconds(self, request: ScheduledRequest) -> float | None:
+        """
+        Returns how long a request may stay queued before it times out, or None to use the TTL of the scheduler limits
+        from the LLM config.
+        """
+        return None
+
+    def get_queue_depths(self) -> tuple[int, int] | None:
+        """
+        Returns the number of requests in the main queue and in the wait queue, or None if they cannot be read without
+        awaiting, e.g. for schedulers backed by an external store. Used for metrics only, so it does not take any lock.
+        """
+        return None
+
+    # Hooks for schedulers shared by several LLM Queue instances, where a request may be popped and processed by a
+    # different instance than the one that received it. In-process schedulers can rely on the defaults.
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    def is_remote_request(self, request: ScheduledRequest) -> bool:
+        """
+        Returns True if a popped request was added by another LLM Queue instance, whose caller awaits the response.
+        """
+        return False
+
+    async def send_response(
+        self, request: ScheduledRequest, response, status_code: int
+    ):
+        """
+        Delivers the response of a remote request back to the LLM Queue instance that added it.
+        """
+        raise NotImplementedError("This scheduler does not support remote requests")
+
+    def set_remote_response_handler(
+        self, handler: Callable[[str, object, int, TelemetryData], None]
+    ):
+        """
+        Registers the callback invoked with (req_id, response, status_code, telemetry_data) when the response of a
+        request added by this instance was produced by another instance.
+        """
+        pass
@@ -52,6 +52,8 @@ class UserLimits(UniversalBaseClass):
 class LLMQueueSchedulerLimits(UniversalBaseClass):
     ttl_in_seconds: int
     max_queue_size: int
+    # How long a request dequeued within its TTL may wait for its response after the TTL, defaults to ttl_in_seconds
+    response_timeout_in_seconds: Optional[int] = None
 
 
 @dataclass
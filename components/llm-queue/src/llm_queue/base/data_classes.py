@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime
+import time
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
@@ -42,11 +43,27 @@ class ModelPreferences(BaseModel):
     num_llm_calls_per_req: float = Field(
         default=1, description="Avg Number of LLM Calls made per request"
     )
+    est_tokens_per_emb_call: Optional[float] = Field(
+        default=None,
+        description="Estimated tokens per Embedding LLM Call, used by token aware load balancers",
+    )
+    est_tokens_per_llm_call: Optional[float] = Field(
+        default=None,
+        description="Estimated prompt + completion tokens per LLM Call, used by token aware load balancers",
+    )
 
     def has_specific_model_pref(self):
         return self.specific_embedding_model != None or self.specific_llm_model != None
 
 
+class RequestStage:
+    ENQUEUED = "enqueued"
+    DEQUEUED = "dequeued"
+    CONTROLLER_START = "controller_start"
+    CONTROLLER_END = "controller_end"
+    RESPONSE_SET = "response_set"
+
+
 class ScheduledRequest(BaseModel):
     req_type: str = Field(..., description="Type of the request controller to use")
     req_id: str = Field(..., description="Unique identifier for the request")
@@ -59,6 +76,18 @@ class ScheduledRequest(BaseModel):
     telemetry_data: TelemetryData = Field(
         ..., description="Telemetry data associated with the request"
     )
+    priority: int = Field(
+        default=0,
+        description="Priority class of the request, lower values are served first by priority aware schedulers",
+    )
+    stage_timestamps_ns: Dict[str, int] = Field(
+        default_factory=dict,
+        exclude=True,
+        description="Monotonic clock timestamps of the request stages reached in this process, keyed by RequestStage",
+    )
+
+    def mark_stage(self, stage: str):
+        self.stage_timestamps_ns[stage] = time.monotonic_ns()
 
     def __lt__(self, other: "ScheduledRequest") -> bool:
         """Less than comparison based on id."""
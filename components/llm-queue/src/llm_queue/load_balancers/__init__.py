@@ -1 +1,4 @@
 from llm_queue.load_balancers.even_spaced_req_lb_in_mem import EvenlySpacedRequestLB
+from llm_queue.load_balancers.token_bucket_lb_in_mem import TokenBucketRequestLB
+from llm_queue.load_balancers.even_spaced_req_lb_redis import RedisEvenlySpacedRequestLB
+from llm_queue.load_balancers.latency_aware_lb_in_mem import LatencyAwareRequestLB
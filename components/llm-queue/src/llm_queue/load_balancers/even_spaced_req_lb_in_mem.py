@@ -1,3 +1,4 @@
+import asyncio
 import time
 from llm_queue.base.base_classes import BaseLLMEntityLoadBalancer
 from llm_queue.base.config_data_classes import AzureAOIModels
@@ -14,6 +15,10 @@ class EvenlySpacedRequestLB(BaseLLMEntityLoadBalancer):
         last_selected_index (int): Index of the last selected LLM.
         llm_entity_last_error_time_map (dict): Tracks the last error time for each LLM.
         llm_entity_last_request_metadata_map (dict): Tracks the last request time and number of calls for each LLM.
+        llm_entity_previous_request_metadata_map (dict): The request metadata each LLM had before its last request, restored
+            when the last request is released.
+        llm_entity_release_timer_map (dict): Timer of each LLM notifying the capacity release listener when its spacing
+            or error backoff ends.
     """
 
     def __init__(self, llm_configs: list[AzureAOIModels]):
@@ -28,11 +33,16 @@ class EvenlySpacedRequestLB(BaseLLMEntityLoadBalancer):
         self.last_selected_index = -1
         self.llm_entity_last_error_time_map = {}
         self.llm_entity_last_request_metadata_map = {}
+        self.llm_entity_previous_request_metadata_map = {}
+        self.llm_entity_release_timer_map = {}
 
     def disconnect(self):
         """
         Clean up resources used by the load balancer.
         """
+        for timer in self.llm_entity_release_timer_map.values():
+            timer.cancel()
+        self.llm_entity_release_timer_map.clear()
         self.logging.info("CLOSING IN MEM LOAD BALANCER")
 
     def __update_last_error_time(self, llm_entity_id: str):
@@ -68,6 +78,9 @@ class EvenlySpacedRequestLB(BaseLLMEntityLoadBalancer):
             num_llm_calls (float): The number of LLM calls made in the request.
         """
         current_time = time.time()
+        self.llm_entity_previous_request_metadata_map[llm_entity_id] = (
+            self.llm_entity_last_request_metadata_map.get(llm_entity_id)
+        )
         self.llm_entity_last_request_metadata_map[llm_entity_id] = (
             current_time,
             num_llm_calls,
@@ -124,6 +137,59 @@ class EvenlySpacedRequestLB(BaseLLMEntityLoadBalancer):
         min_interval = self.__get_minimum_interval(llm_entity, num_llm_calls)
         return curr_time - last_request_time >= min_interval
 
+    def __get_seconds_until_request_allowed(self, llm_entity: AzureAOIModels) -> float:
+        """
+        Calculate how long a specific LLM has to wait before it can accept the next request.
+
+        Args:
+            llm_entity (AzureAOIModels): The LLM configuration object.
+
+        Returns:
+            float: Seconds until a request is allowed, 0 if a request is allowed right now.
+        """
+        curr_time = time.time()
+        wait_time = 0.0
+        last_error_time = self.__get_last_error_time(llm_entity.unique_model_id)
+        if last_error_time:
+            wait_time = llm_entity.error_backoff_in_seconds - (
+                curr_time - last_error_time
+            )
+
+        last_request_time, num_llm_calls = self.__get_last_request_metadata(
+            llm_entity.unique_model_id
+        )
+        min_interval = self.__get_minimum_interval(llm_entity, num_llm_calls)
+        wait_time = max(wait_time, min_interval - (curr_time - last_request_time))
+        return max(wait_time, 0.0)
+
+    def __schedule_capacity_release(self, llm_entity_id: str):
+        """
+        Notify the capacity release listener once the spacing and error backoff of a specific LLM end, so that a poller
+        waiting on the listener wakes up without polling.
+
+        Args:
+            llm_entity_id (str): The unique identifier of the LLM.
+        """
+        if self.capacity_release_listener is None:
+            return
+        llm_entity = next(
+            (c for c in self.llm_configs if c.unique_model_id == llm_entity_id), None
+        )
+        if llm_entity is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Synchronous callers without an event loop have no poller to wake up
+            return
+        timer = self.llm_entity_release_timer_map.pop(llm_entity_id, None)
+        if timer is not None:
+            timer.cancel()
+        self.llm_entity_release_timer_map[llm_entity_id] = loop.call_later(
+            self.__get_seconds_until_request_allowed(llm_entity),
+            self._notify_capacity_released,
+        )
+
     def __get_next_available_llm_index(self):
         """
         Get the index of the next available LLM based on load balancing logic.
@@ -163,12 +229,19 @@ class EvenlySpacedRequestLB(BaseLLMEntityLoadBalancer):
             )
         return None
 
-    def has_available_llm(self, specific_llm_requried: str = None) -> bool | None:
+    def has_available_llm(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> bool | None:
         """
         Check if an available LLM exists, optionally filtering by a specific LLM ID.
 
         Args:
             specific_llm_requried (str, optional): The unique identifier of the LLM. Defaults to None.
+            num_llm_calls (float, optional): Unused, requests are spaced by the previous request's number of calls.
+            num_tokens_per_call (float, optional): Unused, this load balancer only accounts for requests.
 
         Returns:
             bool | None: True if an available LLM exists, False otherwise.
@@ -180,7 +253,10 @@ class EvenlySpacedRequestLB(BaseLLMEntityLoadBalancer):
         return index is not None
 
     def get_available_llm_id(
-        self, num_llm_calls: float = 1.0, specific_llm_requried: str = None
+        self,
+        num_llm_calls: float = 1.0,
+        specific_llm_requried: str = None,
+        num_tokens_per_call: float | None = None,
     ) -> str | None:
         """
         Get the unique identifier of an available LLM.
@@ -188,6 +264,7 @@ class EvenlySpacedRequestLB(BaseLLMEntityLoadBalancer):
         Args:
             num_llm_calls (float, optional): The number of LLM calls for this request. Defaults to 1.0.
             specific_llm_requried (str, optional): The unique identifier of the LLM. Defaults to None.
+            num_tokens_per_call (float, optional): Unused, this load balancer only accounts for requests.
 
         Returns:
             str | None: The unique identifier of the selected LLM, or None if no LLM is available.
@@ -202,9 +279,69 @@ class EvenlySpacedRequestLB(BaseLLMEntityLoadBalancer):
             self.__update_last_request_metadata(
                 selected_llm_config.unique_model_id, num_llm_calls
             )
+            self.__schedule_capacity_release(selected_llm_config.unique_model_id)
             return selected_llm_config.unique_model_id
         return None
 
+    def release_llm_id(
+        self,
+        llm_id: str,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ):
+        """
+        Give back the spacing taken by `get_available_llm_id` for a request that was not dispatched, by restoring the
+        request metadata the LLM had before.
+
+        Args:
+            llm_id (str): The unique identifier of the LLM.
+            num_llm_calls (float, optional): Unused, the whole spacing is given back.
+            num_tokens_per_call (float, optional): Unused, this load balancer only accounts for requests.
+        """
+        if llm_id not in self.llm_entity_previous_request_metadata_map:
+            return
+        previous_metadata = self.llm_entity_previous_request_metadata_map.pop(llm_id)
+        if previous_metadata is None:
+            self.llm_entity_last_request_metadata_map.pop(llm_id, None)
+        else:
+            self.llm_entity_last_request_metadata_map[llm_id] = previous_metadata
+        self.__schedule_capacity_release(llm_id)
+        self._notify_capacity_released()
+
+    def get_seconds_until_available(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> float | None:
+        """
+        Get the number of seconds until an LLM, optionally a specific one, can accept a request.
+
+        Args:
+            specific_llm_requried (str, optional): The unique identifier of the LLM. Defaults to None.
+            num_llm_calls (float, optional): Unused, requests are spaced by the previous request's number of calls.
+            num_tokens_per_call (float, optional): Unused, this load balancer only accounts for requests.
+
+        Returns:
+            float | None: Seconds until an LLM is available, or None if there are no LLMs to wait for.
+        """
+        llm_entities = self.llm_configs
+        if specific_llm_requried is not None:
+            llm_entities = [
+                config
+                for config in self.llm_configs
+                if config.unique_model_id == specific_llm_requried
+            ]
+            if not llm_entities:
+                # Unknown LLM ID, let the poller surface the ResourceAvailabilityError right away
+                return 0.0
+        if not llm_entities:
+            return None
+        return min(
+            self.__get_seconds_until_request_allowed(llm_entity)
+            for llm_entity in llm_entities
+        )
+
     def register_error(self, llm_id: str):
         """
         Register an error for a specific LLM.
@@ -213,3 +350,4 @@ class EvenlySpacedRequestLB(BaseLLMEntityLoadBalancer):
             llm_id (str): The unique identifier of the LLM.
         """
         self.__update_last_error_time(llm_id)
+        self.__schedule_capacity_release(llm_id)
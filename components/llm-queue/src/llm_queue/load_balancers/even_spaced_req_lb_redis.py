@@ -0,0 +1,245 @@
+import hashlib
+import logging
+import math
+
+from llm_queue.base.base_classes import BaseAsyncLLMEntityLoadBalancer
+from llm_queue.base.config_data_classes import AzureAOIModels
+from llm_queue.base.custom_errors import ResourceAvailabilityError
+
+# KEYS: round robin index key, then the spacing key and the error key of every LLM, in config order
+# ARGV: mode ('check' or 'acquire'), then the spacing interval in milliseconds of every LLM, in config order
+# Returns the 0 based index of the first available LLM after the last selected one, or -1 if none is available.
+# In 'acquire' mode the spacing key of the selected LLM is set and the round robin index is moved to it.
+_ACQUIRE_SCRIPT = """
+local num_llms = #ARGV - 1
+local last_index = tonumber(redis.call('GET', KEYS[1]) or '-1')
+for i = 1, num_llms do
+    local index = (last_index + i) % num_llms
+    local spacing_key = KEYS[2 + 2 * index]
+    local error_key = KEYS[3 + 2 * index]
+    if redis.call('EXISTS', spacing_key, error_key) == 0 then
+        if ARGV[1] == 'acquire' then
+            redis.call('SET', spacing_key, '1', 'PX', ARGV[2 + index])
+            redis.call('SET', KEYS[1], index)
+        end
+        return index
+    end
+end
+return -1
+"""
+
+# KEYS: the spacing key and the error key of every LLM
+# Returns the smallest number of milliseconds after which one of the LLMs is available, 0 if one is available now.
+_WAIT_TIME_SCRIPT = """
+local min_wait = -1
+for i = 1, #KEYS, 2 do
+    local wait = math.max(redis.call('PTTL', KEYS[i]), redis.call('PTTL', KEYS[i + 1]), 0)
+    if min_wait < 0 or wait < min_wait then
+        min_wait = wait
+    end
+end
+return min_wait
+"""
+
+
+class RedisEvenlySpacedRequestLB(BaseAsyncLLMEntityLoadBalancer):
+    """
+    An evenly spaced request load balancer whose state lives in Redis, so that all LLM Queue instances sharing the Redis
+    server respect one global rate budget per LLM entity.
+
+    The spacing after a request is a key that expires after (60 / req_per_min) * num_llm_calls seconds, and an error
+    backoff is a key that expires after error_backoff_in_seconds. An LLM is available when neither of its keys exists.
+    Selecting and reserving an LLM runs as one Lua script, so two instances can never both take the same slot.
+
+    Redis is only reachable asynchronously, so the load balancer only implements the async load balancer interface,
+    which is the one used by the `ResourceAvailabilityChecker`. It has no synchronous methods.
+
+    Parameters:
+        llm_configs (list[AzureAOIModels]): List of LLM configurations.
+        redis_client: An asyncio Redis client, e.g. `aioredis.from_url(...)` or `fakeredis.aioredis.FakeRedis()`.
+        key_prefix (str): Prefix of the Redis keys, instances sharing a budget must use the same prefix.
+    """
+
+    def __init__(
+        self,
+        llm_configs: list[AzureAOIModels],
+        redis_client,
+        key_prefix: str = "llm_queue:lb",
+    ):
+        self.logging = logging.getLogger(__name__)
+        self.llm_configs = llm_configs
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+
+        # The round robin index is shared by the instances configured with the same set of LLMs
+        llm_ids = ",".join(config.unique_model_id for config in llm_configs)
+        self.round_robin_key = (
+            f"{key_prefix}:rr:{hashlib.sha1(llm_ids.encode()).hexdigest()[:12]}"
+        )
+
+        # register_script() runs the scripts with EVALSHA and falls back to EVAL when the script is not cached
+        self.acquire_script = self.redis.register_script(_ACQUIRE_SCRIPT)
+        self.wait_time_script = self.redis.register_script(_WAIT_TIME_SCRIPT)
+
+    def disconnect(self):
+        """
+        Clean up resources used by the load balancer. The Redis client is owned by the caller.
+        """
+        self.logging.info("CLOSING REDIS LOAD BALANCER")
+
+    def __get_spacing_key(self, llm_entity_id: str) -> str:
+        return f"{self.key_prefix}:{llm_entity_id}:spacing"
+
+    def __get_error_key(self, llm_entity_id: str) -> str:
+        return f"{self.key_prefix}:{llm_entity_id}:error"
+
+    def __get_minimum_interval_in_ms(
+        self, llm_entity: AzureAOIModels, num_llm_calls: float = 1.0
+    ) -> int:
+        """
+        Calculate the minimum interval between requests for a specific LLM, in whole milliseconds (at least 1).
+        """
+        return max(1, math.ceil((60 / llm_entity.req_per_min) * num_llm_calls * 1000))
+
+    def __get_llm_entities(self, specific_llm_requried: str = None):
+        """
+        Get the LLM configurations to choose from.
+
+        Raises:
+            ResourceAvailabilityError: If the specific LLM ID is not found in the load balancer.
+        """
+        if specific_llm_requried is None:
+            return self.llm_configs
+        llm_entities = [
+            config
+            for config in self.llm_configs
+            if config.unique_model_id == specific_llm_requried
+        ]
+        if not llm_entities:
+            raise ResourceAvailabilityError(
+                f"SPECIFIED LLM ID: {specific_llm_requried} is not present in the load balancer. Please check with the LLM Config provided."
+            )
+        return llm_entities
+
+    async def __run_acquire_script(
+        self, mode: str, specific_llm_requried: str = None, num_llm_calls: float = 1.0
+    ) -> str | None:
+        llm_entities = self.__get_llm_entities(specific_llm_requried)
+        if not llm_entities:
+            return None
+        # A specific LLM does not move the shared round robin index
+        round_robin_key = (
+            self.round_robin_key
+            if specific_llm_requried is None
+            else f"{self.round_robin_key}:{specific_llm_requried}"
+        )
+        keys = [round_robin_key]
+        args = [mode]
+        for llm_entity in llm_entities:
+            keys.append(self.__get_spacing_key(llm_entity.unique_model_id))
+            keys.append(self.__get_error_key(llm_entity.unique_model_id))
+            args.append(self.__get_minimum_interval_in_ms(llm_entity, num_llm_calls))
+        index = int(await self.acquire_script(keys=keys, args=args))
+        return llm_entities[index].unique_model_id if index >= 0 else None
+
+    async def ahas_available_llm(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> bool | None:
+        """
+        Check if an available LLM exists, optionally filtering by a specific LLM ID.
+
+        Args:
+            specific_llm_requried (str, optional): The unique identifier of the LLM. Defaults to None.
+            num_llm_calls (float, optional): Unused, the spacing is reserved when the LLM is selected.
+            num_tokens_per_call (float, optional): Unused, this load balancer only accounts for requests.
+
+        Returns:
+            bool | None: True if an available LLM exists, False otherwise.
+        """
+        llm_id = await self.__run_acquire_script(
+            "check", specific_llm_requried, num_llm_calls
+        )
+        return llm_id is not None
+
+    async def aget_available_llm_id(
+        self,
+        num_llm_calls: float = 1.0,
+        specific_llm_requried: str = None,
+        num_tokens_per_call: float | None = None,
+    ) -> str | None:
+        """
+        Atomically select an available LLM and reserve its next slot for all instances.
+
+        Args:
+            num_llm_calls (float, optional): The number of LLM calls for this request. Defaults to 1.0.
+            specific_llm_requried (str, optional): The unique identifier of the LLM. Defaults to None.
+            num_tokens_per_call (float, optional): Unused, this load balancer only accounts for requests.
+
+        Returns:
+            str | None: The unique identifier of the selected LLM, or None if no LLM is available.
+        """
+        return await self.__run_acquire_script(
+            "acquire", specific_llm_requried, num_llm_calls
+        )
+
+    async def arelease_llm_id(
+        self,
+        llm_id: str,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ):
+        """
+        Give back the slot reserved by `aget_available_llm_id` for a request that was not dispatched.
+
+        Args:
+            llm_id (str): The unique identifier of the LLM.
+            num_llm_calls (float, optional): Unused, the whole spacing is given back.
+            num_tokens_per_call (float, optional): Unused, this load balancer only accounts for requests.
+        """
+        await self.redis.delete(self.__get_spacing_key(llm_id))
+        self._notify_capacity_released()
+
+    async def aget_seconds_until_available(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> float | None:
+        """
+        Get the number of seconds until an LLM, optionally a specific one, can accept a request.
+
+        Returns:
+            float | None: Seconds until an LLM is available, or None if there are no LLMs to wait for.
+        """
+        try:
+            llm_entities = self.__get_llm_entities(specific_llm_requried)
+        except ResourceAvailabilityError:
+            # Unknown LLM ID, let the poller surface the ResourceAvailabilityError right away
+            return 0.0
+        if not llm_entities:
+            return None
+        keys = []
+        for llm_entity in llm_entities:
+            keys.append(self.__get_spacing_key(llm_entity.unique_model_id))
+            keys.append(self.__get_error_key(llm_entity.unique_model_id))
+        wait_time_in_ms = int(await self.wait_time_script(keys=keys))
+        return wait_time_in_ms / 1000
+
+    async def aregister_error(self, llm_id: str):
+        """
+        Register an error for a specific LLM, backing it off on all instances.
+
+        Args:
+            llm_id (str): The unique identifier of the LLM.
+        """
+        for llm_entity in self.llm_configs:
+            if llm_entity.unique_model_id == llm_id:
+                await self.redis.set(
+                    self.__get_error_key(llm_id),
+                    "1",
+                    ex=max(1, math.ceil(llm_entity.error_backoff_in_seconds)),
+                )
+                return
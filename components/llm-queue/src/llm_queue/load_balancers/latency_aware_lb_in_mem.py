@@ -0,0 +1,339 @@
+import random
+import time
+from llm_queue.base.base_classes import BaseLLMEntityLoadBalancer
+from llm_queue.base.config_data_classes import AzureAOIModels
+from llm_queue.base.custom_errors import ResourceAvailabilityError
+import logging
+
+
+class CircuitState:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class _DeploymentHealth:
+    """
+    Latency and error rate moving averages and the circuit breaker state of one LLM entity.
+    """
+
+    def __init__(self):
+        self.avg_latency_in_seconds = None
+        self.avg_error_rate = 0.0
+        self.consecutive_errors = 0
+        self.circuit_state = CircuitState.CLOSED
+        self.circuit_opened_at = 0.0
+        self.is_probe_in_flight = False
+        self.probe_sent_at = 0.0
+        self.last_request_time = 0.0
+        self.last_request_num_calls = 1.0
+        # Time and number of calls of the request before the last one, restored when the last request is released
+        self.previous_request = None
+
+
+class LatencyAwareRequestLB(BaseLLMEntityLoadBalancer):
+    """
+    A load balancer that sends requests to the fastest healthy LLM entity, while still spacing the requests of every LLM
+    entity evenly by its `req_per_min`.
+
+    The poller reports the processing latency of every successful request and every LLM error. From these, an
+    exponentially weighted moving average (EWMA) of the latency and of the error rate is kept per LLM entity. A request
+    goes to the better of two randomly sampled available LLM entities (power of two choices), scored by their average
+    latency inflated by their error rate. Sampling two instead of always taking the best keeps the load spread when
+    many requests arrive between latency updates. LLM entities without latency samples are tried first.
+
+    Instead of a fixed error backoff, every LLM entity has a circuit breaker:
+    - closed: requests are sent normally. The circuit opens after `failure_threshold` consecutive errors, or when the
+      average error rate reaches `error_rate_threshold`.
+    - open: no requests are sent for `error_backoff_in_seconds` of the LLM entity.
+    - half-open: a single probe request is sent. The circuit closes if it succeeds and opens again if it fails.
+
+    Attributes:
+        llm_configs (list[AzureAOIModels]): List of LLM configurations.
+        smoothing_factor (float): Weight of the latest observation in the moving averages.
+        failure_threshold (int): Consecutive errors that open the circuit.
+        error_rate_threshold (float): Average error rate that opens the circuit.
+        llm_entity_health_map (dict): Health of each LLM.
+    """
+
+    def __init__(
+        self,
+        llm_configs: list[AzureAOIModels],
+        smoothing_factor: float = 0.2,
+        failure_threshold: int = 3,
+        error_rate_threshold: float = 0.5,
+    ):
+        """
+        Initialize the load balancer with LLM configurations.
+
+        Args:
+            llm_configs (list[AzureAOIModels]): List of LLM configuration objects.
+            smoothing_factor (float, optional): Weight of the latest observation in the moving averages. Defaults to 0.2.
+            failure_threshold (int, optional): Consecutive errors that open the circuit. Defaults to 3.
+            error_rate_threshold (float, optional): Average error rate that opens the circuit. Defaults to 0.5.
+        """
+        self.logging = logging.getLogger(__name__)
+        self.llm_configs = llm_configs
+        self.smoothing_factor = smoothing_factor
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.llm_entity_health_map = {
+            llm_entity.unique_model_id: _DeploymentHealth()
+            for llm_entity in llm_configs
+        }
+        self.random = random.Random()
+
+    def disconnect(self):
+        """
+        Clean up resources used by the load balancer.
+        """
+        self.logging.info("CLOSING IN MEM LATENCY AWARE LOAD BALANCER")
+
+    def get_circuit_state(self, llm_id: str) -> str:
+        """
+        Get the circuit breaker state of a specific LLM, moving it from open to half-open once its backoff has passed.
+
+        Args:
+            llm_id (str): The unique identifier of the LLM.
+
+        Returns:
+            str: One of the `CircuitState` values.
+        """
+        health = self.llm_entity_health_map[llm_id]
+        if health.circuit_state == CircuitState.OPEN:
+            llm_entity = self.__get_llm_entity(llm_id)
+            if (
+                time.time() - health.circuit_opened_at
+                >= llm_entity.error_backoff_in_seconds
+            ):
+                health.circuit_state = CircuitState.HALF_OPEN
+                health.is_probe_in_flight = False
+        return health.circuit_state
+
+    def __get_llm_entity(self, llm_id: str) -> AzureAOIModels | None:
+        return next((c for c in self.llm_configs if c.unique_model_id == llm_id), None)
+
+    def __update_average(self, average: float | None, value: float) -> float:
+        if average is None:
+            return value
+        return (1 - self.smoothing_factor) * average + self.smoothing_factor * value
+
+    def __get_seconds_until_request_allowed(self, llm_entity: AzureAOIModels) -> float:
+        """
+        Calculate how long a specific LLM has to wait before it can accept the next request.
+
+        Returns:
+            float: Seconds until a request is allowed, 0 if a request is allowed right now.
+        """
+        health = self.llm_entity_health_map[llm_entity.unique_model_id]
+        curr_time = time.time()
+        circuit_state = self.get_circuit_state(llm_entity.unique_model_id)
+        if circuit_state == CircuitState.OPEN:
+            return llm_entity.error_backoff_in_seconds - (
+                curr_time - health.circuit_opened_at
+            )
+        if circuit_state == CircuitState.HALF_OPEN and health.is_probe_in_flight:
+            # Another probe is allowed if the outcome of the last one is never reported, e.g. it failed with a non LLM error
+            return max(
+                llm_entity.error_backoff_in_seconds
+                - (curr_time - health.probe_sent_at),
+                0.0,
+            )
+        min_interval = (60 / llm_entity.req_per_min) * health.last_request_num_calls
+        return max(min_interval - (curr_time - health.last_request_time), 0.0)
+
+    def __get_score(self, llm_entity: AzureAOIModels) -> float:
+        """
+        Expected latency of an LLM, inflated by its error rate. Lower is better.
+        """
+        health = self.llm_entity_health_map[llm_entity.unique_model_id]
+        if health.avg_latency_in_seconds is None:
+            return 0.0
+        return health.avg_latency_in_seconds / max(1.0 - health.avg_error_rate, 0.1)
+
+    def __get_candidate_llms(self, specific_llm_requried: str = None):
+        """
+        Get the LLMs which can serve a request.
+
+        Raises:
+            ResourceAvailabilityError: If the specific LLM ID is not found in the load balancer.
+        """
+        if specific_llm_requried is None:
+            return self.llm_configs
+        candidates = [
+            config
+            for config in self.llm_configs
+            if config.unique_model_id == specific_llm_requried
+        ]
+        if not candidates:
+            raise ResourceAvailabilityError(
+                f"SPECIFIED LLM ID: {specific_llm_requried} is not present in the load balancer. Please check with the LLM Config provided."
+            )
+        return candidates
+
+    def __choose_llm(self, specific_llm_requried: str = None) -> AzureAOIModels | None:
+        """
+        Choose the better of two randomly sampled available LLMs.
+
+        Returns:
+            AzureAOIModels | None: The chosen LLM, or None if no LLM can serve a request right now.
+        """
+        available_llm_entities = [
+            llm_entity
+            for llm_entity in self.__get_candidate_llms(specific_llm_requried)
+            if self.__get_seconds_until_request_allowed(llm_entity) == 0
+        ]
+        if len(available_llm_entities) > 2:
+            available_llm_entities = self.random.sample(available_llm_entities, 2)
+        if not available_llm_entities:
+            return None
+        return min(available_llm_entities, key=self.__get_score)
+
+    def has_available_llm(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> bool | None:
+        """
+        Check if an available LLM exists, optionally filtering by a specific LLM ID.
+
+        Args:
+            specific_llm_requried (str, optional): The unique identifier of the LLM. Defaults to None.
+            num_llm_calls (float, optional): Unused, requests are spaced by the previous request's number of calls.
+            num_tokens_per_call (float, optional): Unused, this load balancer only accounts for requests.
+
+        Returns:
+            bool | None: True if an available LLM exists, False otherwise.
+        """
+        return any(
+            self.__get_seconds_until_request_allowed(llm_entity) == 0
+            for llm_entity in self.__get_candidate_llms(specific_llm_requried)
+        )
+
+    def get_available_llm_id(
+        self,
+        num_llm_calls: float = 1.0,
+        specific_llm_requried: str = None,
+        num_tokens_per_call: float | None = None,
+    ) -> str | None:
+        """
+        Choose the LLM with the lower expected latency out of two available ones.
+
+        Args:
+            num_llm_calls (float, optional): The number of LLM calls for this request. Defaults to 1.0.
+            specific_llm_requried (str, optional): The unique identifier of the LLM. Defaults to None.
+            num_tokens_per_call (float, optional): Unused, this load balancer only accounts for requests.
+
+        Returns:
+            str | None: The unique identifier of the selected LLM, or None if no LLM is available.
+        """
+        llm_entity = self.__choose_llm(specific_llm_requried)
+        if llm_entity is None:
+            return None
+        health = self.llm_entity_health_map[llm_entity.unique_model_id]
+        health.previous_request = (
+            health.last_request_time,
+            health.last_request_num_calls,
+        )
+        health.last_request_time = time.time()
+        health.last_request_num_calls = num_llm_calls
+        if health.circuit_state == CircuitState.HALF_OPEN:
+            health.is_probe_in_flight = True
+            health.probe_sent_at = health.last_request_time
+        return llm_entity.unique_model_id
+
+    def release_llm_id(
+        self,
+        llm_id: str,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ):
+        """
+        Give back the spacing, and the probe of a half-open circuit, taken by `get_available_llm_id` for a request that
+        was not dispatched.
+
+        Args:
+            llm_id (str): The unique identifier of the LLM.
+            num_llm_calls (float, optional): Unused, the whole spacing is given back.
+            num_tokens_per_call (float, optional): Unused, this load balancer only accounts for requests.
+        """
+        health = self.llm_entity_health_map.get(llm_id)
+        if health is None or health.previous_request is None:
+            return
+        health.last_request_time, health.last_request_num_calls = (
+            health.previous_request
+        )
+        health.previous_request = None
+        if health.circuit_state == CircuitState.HALF_OPEN:
+            health.is_probe_in_flight = False
+        self._notify_capacity_released()
+
+    def get_seconds_until_available(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> float | None:
+        """
+        Get the number of seconds until an LLM, optionally a specific one, can accept a request.
+
+        Returns:
+            float | None: Seconds until an LLM is available, or None if there are no LLMs to wait for.
+        """
+        try:
+            llm_entities = self.__get_candidate_llms(specific_llm_requried)
+        except ResourceAvailabilityError:
+            # Unknown LLM ID, let the poller surface the ResourceAvailabilityError right away
+            return 0.0
+        if not llm_entities:
+            return None
+        return min(
+            self.__get_seconds_until_request_allowed(llm_entity)
+            for llm_entity in llm_entities
+        )
+
+    def register_success(self, llm_id: str, latency_in_seconds: float):
+        """
+        Register the processing latency of a successful request, closing the circuit of a half-open LLM.
+
+        Args:
+            llm_id (str): The unique identifier of the LLM.
+            latency_in_seconds (float): Time the request took to process.
+        """
+        health = self.llm_entity_health_map.get(llm_id)
+        if health is None:
+            return
+        health.avg_latency_in_seconds = self.__update_average(
+            health.avg_latency_in_seconds, latency_in_seconds
+        )
+        health.avg_error_rate = self.__update_average(health.avg_error_rate, 0.0)
+        health.consecutive_errors = 0
+        if health.circuit_state == CircuitState.HALF_OPEN:
+            self.logging.info(f"[LB] CIRCUIT CLOSED FOR {llm_id}")
+            health.circuit_state = CircuitState.CLOSED
+            health.is_probe_in_flight = False
+            self._notify_capacity_released()
+
+    def register_error(self, llm_id: str):
+        """
+        Register an error for a specific LLM, opening its circuit if it is unhealthy.
+
+        Args:
+            llm_id (str): The unique identifier of the LLM.
+        """
+        health = self.llm_entity_health_map.get(llm_id)
+        if health is None:
+            return
+        health.avg_error_rate = self.__update_average(health.avg_error_rate, 1.0)
+        health.consecutive_errors += 1
+        if (
+            health.circuit_state == CircuitState.HALF_OPEN
+            or health.consecutive_errors >= self.failure_threshold
+            or health.avg_error_rate >= self.error_rate_threshold
+        ):
+            if health.circuit_state != CircuitState.OPEN:
+                self.logging.info(f"[LB] CIRCUIT OPENED FOR {llm_id}")
+            health.circuit_state = CircuitState.OPEN
+            health.circuit_opened_at = time.time()
+            health.is_probe_in_flight = False
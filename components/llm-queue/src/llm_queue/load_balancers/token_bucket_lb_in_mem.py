@@ -0,0 +1,439 @@
+import time
+from collections import deque
+from llm_queue.base.base_classes import BaseLLMEntityLoadBalancer
+from llm_queue.base.config_data_classes import AzureAOIModels
+from llm_queue.base.custom_errors import ResourceAvailabilityError
+import logging
+
+
+class _Bucket:
+    """
+    A token bucket which refills continuously at `refill_rate_per_sec` up to `capacity`. The level may go negative
+    when actual usage turns out to be higher than what was debited at dispatch time.
+    """
+
+    def __init__(self, capacity: float, refill_rate_per_sec: float):
+        self.capacity = capacity
+        self.refill_rate_per_sec = refill_rate_per_sec
+        self.level = capacity
+        self.last_refill_time = time.time()
+
+    def refill(self, curr_time: float):
+        elapsed = max(curr_time - self.last_refill_time, 0.0)
+        self.level = min(self.capacity, self.level + elapsed * self.refill_rate_per_sec)
+        self.last_refill_time = curr_time
+
+    def clamp_cost(self, cost: float) -> float:
+        # A request bigger than the bucket is let through once the bucket is full, otherwise it would starve
+        return min(cost, self.capacity)
+
+    def seconds_until_available(self, cost: float) -> float:
+        missing = self.clamp_cost(cost) - self.level
+        if missing <= 0:
+            return 0.0
+        return missing / self.refill_rate_per_sec
+
+    def headroom(self) -> float:
+        return self.level / self.capacity
+
+
+class TokenBucketRequestLB(BaseLLMEntityLoadBalancer):
+    """
+    A load balancer that keeps a request bucket and a token bucket per LLM entity, refilled at `req_per_min` and
+    `tokens_per_min` respectively. A request is dispatched to an LLM only if both of its buckets can cover the request,
+    so both the RPM and the TPM limits of the deployment are respected.
+
+    Token usage is debited at dispatch time using an estimate, which is either passed by the caller through
+    `ModelPreferences` or taken from a moving average of the actual usage of the LLM. Once the request completes,
+    `register_usage()` corrects the debit with the actual number of tokens reported in the telemetry data. Debits taken
+    from the moving average are recorded at dispatch and settled in order, so a correction is always made against an
+    amount that was actually debited and not against the average, which has moved since.
+
+    Among the LLMs that can serve a request, the one with the most relative headroom left in its buckets is chosen, so
+    deployments close to their limits are preferred less.
+
+    Attributes:
+        llm_configs (list[AzureAOIModels]): List of LLM configurations.
+        burst_window_in_seconds (float): Bucket capacity expressed in seconds worth of the per minute limits.
+        usage_avg_smoothing_factor (float): Weight of the latest observation in the moving average of tokens per call.
+        llm_entity_req_bucket_map (dict): Request bucket of each LLM.
+        llm_entity_token_bucket_map (dict): Token bucket of each LLM.
+        llm_entity_avg_tokens_per_call_map (dict): Moving average of the actual tokens used per call for each LLM.
+        llm_entity_pending_token_debits_map (dict): Token debits taken from the moving average of each LLM which are
+            not settled yet, keyed by the number of LLM calls of the request.
+        llm_entity_last_error_time_map (dict): Tracks the last error time for each LLM.
+    """
+
+    def __init__(
+        self,
+        llm_configs: list[AzureAOIModels],
+        burst_window_in_seconds: float = 10,
+        usage_avg_smoothing_factor: float = 0.2,
+        initial_tokens_per_call: float | None = None,
+    ):
+        """
+        Initialize the load balancer with LLM configurations.
+
+        Args:
+            llm_configs (list[AzureAOIModels]): List of LLM configuration objects.
+            burst_window_in_seconds (float, optional): Number of seconds worth of the per minute limits each bucket can hold. Defaults to 10.
+            usage_avg_smoothing_factor (float, optional): Smoothing factor of the moving average of tokens per call. Defaults to 0.2.
+            initial_tokens_per_call (float, optional): Token estimate per call until the usage of an LLM is observed.
+                Defaults to a quarter of the token bucket capacity, and never less than an even share of the TPM budget.
+        """
+        self.logging = logging.getLogger(__name__)
+        self.llm_configs = llm_configs
+        self.burst_window_in_seconds = burst_window_in_seconds
+        self.usage_avg_smoothing_factor = usage_avg_smoothing_factor
+        self.llm_entity_req_bucket_map = {}
+        self.llm_entity_token_bucket_map = {}
+        self.llm_entity_avg_tokens_per_call_map = {}
+        self.llm_entity_pending_token_debits_map = {}
+        self.llm_entity_last_error_time_map = {}
+        # LLMs whose moving average has been seeded with an observed usage
+        self.llm_entities_with_observed_usage = set()
+        for llm_entity in self.llm_configs:
+            self.llm_entity_req_bucket_map[llm_entity.unique_model_id] = (
+                self.__create_bucket(llm_entity.req_per_min)
+            )
+            token_bucket = self.__create_bucket(llm_entity.tokens_per_min)
+            self.llm_entity_token_bucket_map[llm_entity.unique_model_id] = token_bucket
+            # An even share of the TPM budget lets a full RPM of long requests overshoot the TPM limit before the
+            # first usage is observed, so start from a larger estimate
+            self.llm_entity_avg_tokens_per_call_map[llm_entity.unique_model_id] = (
+                initial_tokens_per_call
+                if initial_tokens_per_call is not None
+                else max(
+                    token_bucket.capacity / 4,
+                    llm_entity.tokens_per_min / llm_entity.req_per_min,
+                )
+            )
+            self.llm_entity_pending_token_debits_map[llm_entity.unique_model_id] = {}
+
+    def disconnect(self):
+        """
+        Clean up resources used by the load balancer.
+        """
+        self.logging.info("CLOSING IN MEM TOKEN BUCKET LOAD BALANCER")
+
+    def __create_bucket(self, limit_per_min: int) -> _Bucket:
+        refill_rate_per_sec = limit_per_min / 60
+        capacity = max(refill_rate_per_sec * self.burst_window_in_seconds, 1)
+        return _Bucket(capacity, refill_rate_per_sec)
+
+    def __get_costs(
+        self,
+        llm_entity: AzureAOIModels,
+        num_llm_calls: float,
+        num_tokens_per_call: float | None,
+    ) -> tuple[float, float]:
+        """
+        Get the number of requests and tokens a request is expected to consume on a specific LLM.
+
+        Returns:
+            tuple: The request cost and the token cost.
+        """
+        if num_tokens_per_call is None:
+            num_tokens_per_call = self.llm_entity_avg_tokens_per_call_map[
+                llm_entity.unique_model_id
+            ]
+        return num_llm_calls, num_llm_calls * num_tokens_per_call
+
+    def __settle_token_debit(
+        self,
+        llm_entity: AzureAOIModels,
+        num_llm_calls: float,
+        num_tokens_per_call: float | None,
+    ) -> float | None:
+        """
+        Get the token debit taken by `get_available_llm_id` for a request which is released or completed.
+
+        Returns:
+            float | None: The debited tokens, or None if no debit was recorded for such a request.
+        """
+        if num_tokens_per_call is not None:
+            return num_llm_calls * num_tokens_per_call
+        # Requests estimated from the moving average are indistinguishable here, settle the oldest debit
+        pending_debits = self.llm_entity_pending_token_debits_map[
+            llm_entity.unique_model_id
+        ]
+        token_debits = pending_debits.get(num_llm_calls)
+        if not token_debits:
+            return None
+        token_cost = token_debits.popleft()
+        if not token_debits:
+            del pending_debits[num_llm_calls]
+        return token_cost
+
+    def __is_in_error_backoff(self, llm_entity: AzureAOIModels, curr_time: float):
+        last_error_time = self.llm_entity_last_error_time_map.get(
+            llm_entity.unique_model_id
+        )
+        return (
+            last_error_time is not None
+            and (curr_time - last_error_time) < llm_entity.error_backoff_in_seconds
+        )
+
+    def __get_seconds_until_request_allowed(
+        self,
+        llm_entity: AzureAOIModels,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> float:
+        """
+        Calculate how long a specific LLM has to wait before both of its buckets can cover a request.
+
+        Returns:
+            float: Seconds until the request is allowed, 0 if it is allowed right now.
+        """
+        curr_time = time.time()
+        req_bucket = self.llm_entity_req_bucket_map[llm_entity.unique_model_id]
+        token_bucket = self.llm_entity_token_bucket_map[llm_entity.unique_model_id]
+        req_bucket.refill(curr_time)
+        token_bucket.refill(curr_time)
+        req_cost, token_cost = self.__get_costs(
+            llm_entity, num_llm_calls, num_tokens_per_call
+        )
+
+        wait_time = max(
+            req_bucket.seconds_until_available(req_cost),
+            token_bucket.seconds_until_available(token_cost),
+        )
+        if self.__is_in_error_backoff(llm_entity, curr_time):
+            last_error_time = self.llm_entity_last_error_time_map[
+                llm_entity.unique_model_id
+            ]
+            wait_time = max(
+                wait_time,
+                llm_entity.error_backoff_in_seconds - (curr_time - last_error_time),
+            )
+        return wait_time
+
+    def __get_headroom(self, llm_entity: AzureAOIModels) -> float:
+        return min(
+            self.llm_entity_req_bucket_map[llm_entity.unique_model_id].headroom(),
+            self.llm_entity_token_bucket_map[llm_entity.unique_model_id].headroom(),
+        )
+
+    def __get_candidate_llms(self, specific_llm_requried: str = None):
+        """
+        Get the LLMs which can serve a request.
+
+        Raises:
+            ResourceAvailabilityError: If the specific LLM ID is not found in the load balancer.
+        """
+        if specific_llm_requried is None:
+            return self.llm_configs
+        candidates = [
+            config
+            for config in self.llm_configs
+            if config.unique_model_id == specific_llm_requried
+        ]
+        if not candidates:
+            raise ResourceAvailabilityError(
+                f"SPECIFIED LLM ID: {specific_llm_requried} is not present in the load balancer. Please check with the LLM Config provided."
+            )
+        return candidates
+
+    def __get_best_available_llm(
+        self,
+        num_llm_calls: float = 1.0,
+        specific_llm_requried: str = None,
+        num_tokens_per_call: float | None = None,
+    ) -> AzureAOIModels | None:
+        """
+        Get the available LLM with the most headroom left in its buckets.
+
+        Returns:
+            AzureAOIModels | None: The chosen LLM, or None if no LLM can serve the request right now.
+        """
+        best_llm_entity = None
+        best_headroom = None
+        for llm_entity in self.__get_candidate_llms(specific_llm_requried):
+            if (
+                self.__get_seconds_until_request_allowed(
+                    llm_entity, num_llm_calls, num_tokens_per_call
+                )
+                > 0
+            ):
+                continue
+            headroom = self.__get_headroom(llm_entity)
+            if best_headroom is None or headroom > best_headroom:
+                best_llm_entity = llm_entity
+                best_headroom = headroom
+        return best_llm_entity
+
+    def has_available_llm(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> bool | None:
+        """
+        Check if an LLM, optionally a specific one, can serve a request right now.
+
+        Args:
+            specific_llm_requried (str, optional): The unique identifier of the LLM. Defaults to None.
+            num_llm_calls (float, optional): The number of LLM calls for this request. Defaults to 1.0.
+            num_tokens_per_call (float, optional): Estimated tokens per LLM call. Defaults to the observed average.
+
+        Returns:
+            bool | None: True if an available LLM exists, False otherwise.
+        """
+        return (
+            self.__get_best_available_llm(
+                num_llm_calls, specific_llm_requried, num_tokens_per_call
+            )
+            is not None
+        )
+
+    def get_available_llm_id(
+        self,
+        num_llm_calls: float = 1.0,
+        specific_llm_requried: str = None,
+        num_tokens_per_call: float | None = None,
+    ) -> str | None:
+        """
+        Choose an LLM for a request and debit the request and its estimated tokens from the LLM's buckets.
+
+        Args:
+            num_llm_calls (float, optional): The number of LLM calls for this request. Defaults to 1.0.
+            specific_llm_requried (str, optional): The unique identifier of the LLM. Defaults to None.
+            num_tokens_per_call (float, optional): Estimated tokens per LLM call. Defaults to the observed average.
+
+        Returns:
+            str | None: The unique identifier of the selected LLM, or None if no LLM is available.
+        """
+        llm_entity = self.__get_best_available_llm(
+            num_llm_calls, specific_llm_requried, num_tokens_per_call
+        )
+        if llm_entity is None:
+            return None
+        req_cost, token_cost = self.__get_costs(
+            llm_entity, num_llm_calls, num_tokens_per_call
+        )
+        self.llm_entity_req_bucket_map[llm_entity.unique_model_id].level -= req_cost
+        self.llm_entity_token_bucket_map[llm_entity.unique_model_id].level -= token_cost
+        if num_tokens_per_call is None:
+            self.llm_entity_pending_token_debits_map[
+                llm_entity.unique_model_id
+            ].setdefault(num_llm_calls, deque()).append(token_cost)
+        return llm_entity.unique_model_id
+
+    def release_llm_id(
+        self,
+        llm_id: str,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ):
+        """
+        Credit back the request and token debit of `get_available_llm_id` for a request that was not dispatched.
+
+        Args:
+            llm_id (str): The unique identifier of the LLM.
+            num_llm_calls (float, optional): The number of LLM calls the request was debited with. Defaults to 1.0.
+            num_tokens_per_call (float, optional): The token estimate per call the request was debited with.
+        """
+        llm_entity = next(
+            (c for c in self.llm_configs if c.unique_model_id == llm_id), None
+        )
+        if llm_entity is None:
+            return
+        token_cost = self.__settle_token_debit(
+            llm_entity, num_llm_calls, num_tokens_per_call
+        )
+        curr_time = time.time()
+        for bucket, cost in (
+            (self.llm_entity_req_bucket_map[llm_id], num_llm_calls),
+            (self.llm_entity_token_bucket_map[llm_id], token_cost or 0),
+        ):
+            bucket.refill(curr_time)
+            bucket.level = min(bucket.capacity, bucket.level + cost)
+        self._notify_capacity_released()
+
+    def get_seconds_until_available(
+        self,
+        specific_llm_requried: str = None,
+        num_llm_calls: float = 1.0,
+        num_tokens_per_call: float | None = None,
+    ) -> float | None:
+        """
+        Get the number of seconds until an LLM, optionally a specific one, can serve a request.
+
+        Returns:
+            float | None: Seconds until an LLM is available, or None if there are no LLMs to wait for.
+        """
+        try:
+            llm_entities = self.__get_candidate_llms(specific_llm_requried)
+        except ResourceAvailabilityError:
+            # Unknown LLM ID, let the poller surface the ResourceAvailabilityError right away
+            return 0.0
+        if not llm_entities:
+            return None
+        return min(
+            self.__get_seconds_until_request_allowed(
+                llm_entity, num_llm_calls, num_tokens_per_call
+            )
+            for llm_entity in llm_entities
+        )
+
+    def register_usage(
+        self,
+        llm_id: str,
+        num_llm_calls: float,
+        num_tokens_per_call: float | None,
+        actual_tokens: int,
+    ):
+        """
+        Correct the token debit of a completed request with the number of tokens it actually used.
+
+        Args:
+            llm_id (str): The unique identifier of the LLM that served the request.
+            num_llm_calls (float): The number of LLM calls the request was dispatched with.
+            num_tokens_per_call (float | None): The token estimate per call the request was dispatched with.
+            actual_tokens (int): The number of tokens the request actually used.
+        """
+        llm_entity = next(
+            (c for c in self.llm_configs if c.unique_model_id == llm_id), None
+        )
+        if llm_entity is None:
+            return
+        # Settled even when the usage is unknown, the estimate then stays debited
+        estimated_tokens = self.__settle_token_debit(
+            llm_entity, num_llm_calls, num_tokens_per_call
+        )
+        if actual_tokens < 0:
+            return
+
+        if estimated_tokens is not None:
+            token_bucket = self.llm_entity_token_bucket_map[llm_id]
+            token_bucket.refill(time.time())
+            token_bucket.level = min(
+                token_bucket.capacity,
+                token_bucket.level + estimated_tokens - actual_tokens,
+            )
+
+        if num_llm_calls > 0:
+            tokens_per_call = actual_tokens / num_llm_calls
+            if llm_id not in self.llm_entities_with_observed_usage:
+                # The first observation replaces the cold start estimate
+                self.llm_entities_with_observed_usage.add(llm_id)
+                self.llm_entity_avg_tokens_per_call_map[llm_id] = tokens_per_call
+            else:
+                avg_tokens_per_call = self.llm_entity_avg_tokens_per_call_map[llm_id]
+                self.llm_entity_avg_tokens_per_call_map[llm_id] = (
+                    (1 - self.usage_avg_smoothing_factor) * avg_tokens_per_call
+                    + self.usage_avg_smoothing_factor * tokens_per_call
+                )
+
+        if estimated_tokens is not None and estimated_tokens > actual_tokens:
+            self._notify_capacity_released()
+
+    def register_error(self, llm_id: str):
+        """
+        Register an error for a specific LLM.
+
+        Args:
+            llm_id (str): The unique identifier of the LLM.
+        """
+        self.llm_entity_last_error_time_map[llm_id] = time.time()
@@ -1,15 +1,17 @@
 import asyncio
+import hashlib
 import traceback
 import json
 import uuid
 import logging
 
 from llm_queue.base.adapter_base_classes import (
+    MetricsAdapter,
     TelemetryDataStoreAdapter,
     UserRateLimitsDatastoreAdapter,
 )
 from llm_queue.base.base_classes import (
-    BaseLLMEntityLoadBalancer,
+    BaseAsyncLLMEntityLoadBalancer,
     BaseRequestController,
     BaseScheduler,
 )
@@ -22,6 +24,7 @@ from llm_queue.base.custom_errors import (
 )
 from llm_queue.base.data_classes import (
     ModelPreferences,
+    RequestStage,
     ScheduledRequest,
     TelemetryData,
 )
@@ -39,6 +42,7 @@ class LLMQueue:
     async def initiate(self):
         await self.telemetry.connect_database()
         await self.user_rate_limiter.connect()
+        await self.scheduler.connect()
         self.logging.debug("FINISHED INITIATING LLM QUEUE INSTANCE...")
 
     def register_request_executors(
@@ -55,8 +59,12 @@ class LLMQueue:
         user_rate_limits_store_adapter: UserRateLimitsDatastoreAdapter = None,
         telemetry_store_adapter: TelemetryDataStoreAdapter = None,
         scheduler: BaseScheduler = None,
-        llm_load_balancer: BaseLLMEntityLoadBalancer = None,
-        embedding_load_balancer: BaseLLMEntityLoadBalancer = None,
+        llm_load_balancer: BaseAsyncLLMEntityLoadBalancer = None,
+        embedding_load_balancer: BaseAsyncLLMEntityLoadBalancer = None,
+        event_driven_polling: bool = False,
+        coalesce_identical_requests: bool = False,
+        metrics_adapter: MetricsAdapter = None,
+        enable_tracing: bool = False,
     ):
         self.logging = logging.getLogger(__name__)
 
@@ -89,8 +97,21 @@ class LLMQueue:
                 self.embedding_llm_loadbalancer, self.llm_load_balancer
             ),
             self.llm_config,
+            event_driven=event_driven_polling,
+            metrics_adapter=metrics_adapter,
+            enable_tracing=enable_tracing,
         )
 
+        # WAKE UP THE POLLER WHENEVER A LOAD BALANCER FREES CAPACITY AHEAD OF SCHEDULE
+        if event_driven_polling:
+            for load_balancer in (
+                self.llm_load_balancer,
+                self.embedding_llm_loadbalancer,
+            ):
+                load_balancer.set_capacity_release_listener(
+                    self.scheduler.notify_request_available
+                )
+
         # REGISTER REQUEST CONTROLLERS WITH TASK TYPES
         for req_type, request_controller in request_executors.items():
             self.poller.register_req_type(req_type, req_controller=request_controller)
@@ -104,6 +125,15 @@ class LLMQueue:
         # CREATE TELEMETRY
         self.telemetry = Telemetry(telemetry_store_adapter)
 
+        # SHARE ONE QUEUED REQUEST BETWEEN CONCURRENT CALLERS WITH IDENTICAL REQUESTS
+        self.coalesce_identical_requests = coalesce_identical_requests
+        self.in_flight_requests: dict[str, tuple[asyncio.Task, TelemetryData]] = {}
+
+        # EXPOSE STAGE TIMINGS, COUNTERS AND GAUGES THROUGH THE METRICS ADAPTER
+        self.metrics_adapter = metrics_adapter
+        if self.metrics_adapter:
+            self.__register_gauges()
+
         # START BACKGROUND POLLING PROCESSES
         self.poll_process_task = asyncio.create_task(self.poller.poll_and_process())
         self.resp_get_set_task = asyncio.create_task(self.poller.get_and_set())
@@ -116,6 +146,9 @@ class LLMQueue:
             await self.poll_process_task
         if self.resp_get_set_task:
             await self.resp_get_set_task
+        await self.scheduler.disconnect()
+        await self.user_rate_limiter.disconnect()
+        await self.telemetry.disconnect_database()
 
     async def execute_request(
         self,
@@ -123,6 +156,7 @@ class LLMQueue:
         request_data: dict,
         user_id: str,
         model_pref: ModelPreferences,
+        priority: int = 0,
     ):
         try:
             llm_res_queue = ""
@@ -153,12 +187,20 @@ class LLMQueue:
                 payload=request_data,
                 telemetry_data=telemetry_data,
                 model_preferences=model_pref,
+                priority=priority,
             )
+            ttl_in_seconds = self.scheduler.get_ttl_in_seconds(scheduled_request)
 
-            await self.scheduler.add_request(scheduled_request)
-            await self.poller.wait_for_request_to_be_polled(request_id)
-            llm_res_queue, status_code = await self.poller.futures[request_id]
+            if self.coalesce_identical_requests:
+                llm_res_queue, status_code = await self.__execute_coalesced_request(
+                    scheduled_request, ttl_in_seconds
+                )
+            else:
+                llm_res_queue, status_code = await self.__queue_and_wait(
+                    scheduled_request, ttl_in_seconds
+                )
 
+            self.__count_request(req_type, str(status_code))
             if status_code == 200:
                 self.telemetry.sink_successfull(telemetry_data)
             else:
@@ -166,22 +208,122 @@ class LLMQueue:
 
             return llm_res_queue, status_code
         except QueueTimeoutError as err:
+            self.__count_request(req_type, "timeout")
             self.logging.error(err)
             self.logging.error(traceback.format_exc())
             self.__sink_telemetry_with_error(llm_res_queue, str(err), telemetry_data)
             raise err
         except SchedulerQueueFullError as err:
+            self.__count_request(req_type, "queue_full")
             self.logging.error(err)
             self.logging.error(traceback.format_exc())
             self.__sink_telemetry_with_error(llm_res_queue, str(err), telemetry_data)
             raise err
         except Exception as err:
+            self.__count_request(req_type, "error")
             self.logging.error(err)
             self.logging.error(traceback.format_exc())
             self.__sink_telemetry_with_error(llm_res_queue, str(err), telemetry_data)
             raise err
 
-    async def __sink_telemetry_with_error(
+    def __count_request(self, req_type: str, outcome: str):
+        if self.metrics_adapter:
+            self.metrics_adapter.increment(
+                "llm_queue_requests_total",
+                labels={"req_type": req_type, "outcome": outcome},
+            )
+
+    def __register_gauges(self):
+        self.metrics_adapter.register_gauge(
+            "llm_queue_main_queue_depth",
+            lambda: (self.scheduler.get_queue_depths() or (None, None))[0],
+        )
+        self.metrics_adapter.register_gauge(
+            "llm_queue_wait_queue_depth",
+            lambda: (self.scheduler.get_queue_depths() or (None, None))[1],
+        )
+        self.metrics_adapter.register_gauge(
+            "llm_queue_in_flight_requests",
+            lambda: dict(self.poller.in_flight_requests_per_deployment),
+            label_name="deployment",
+        )
+        self.metrics_adapter.register_gauge(
+            "llm_queue_pending_futures", lambda: len(self.poller.futures)
+        )
+
+    async def __queue_and_wait(
+        self, scheduled_request: ScheduledRequest, ttl_in_seconds: float | None
+    ):
+        request_id = scheduled_request.req_id
+        scheduled_request.mark_stage(RequestStage.ENQUEUED)
+        # The future exists before the request can be dequeued, so that its response is never missed
+        future = self.poller.create_future(request_id)
+        try:
+            await self.scheduler.add_request(scheduled_request)
+        except Exception:
+            self.poller.discard_future(request_id)
+            raise
+        response = await self.poller.wait_for_response(
+            request_id, future, ttl_in_seconds
+        )
+        scheduled_request.mark_stage(RequestStage.RESPONSE_SET)
+        self.poller.observe_stage_durations(scheduled_request)
+        return response
+
+    def __get_coalescing_key(self, scheduled_request: ScheduledRequest) -> str:
+        # The priority is part of the key, so that a request is never held back by an identical lower priority one
+        canonical_request = json.dumps(
+            {
+                "req_type": scheduled_request.req_type,
+                "priority": scheduled_request.priority,
+                "payload": scheduled_request.payload,
+                "model_preferences": scheduled_request.model_preferences.model_dump(
+                    mode="json"
+                ),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()
+
+    async def __execute_coalesced_request(
+        self, scheduled_request: ScheduledRequest, ttl_in_seconds: float | None
+    ):
+        """
+        Queues the request, unless an identical request is already in flight, in which case its response is shared.
+        The shared request runs in its own task, so a cancelled caller does not cancel it for the other callers.
+        """
+        key = self.__get_coalescing_key(scheduled_request)
+        in_flight = self.in_flight_requests.get(key)
+        if in_flight is None:
+            task = asyncio.create_task(
+                self.__queue_and_wait(scheduled_request, ttl_in_seconds)
+            )
+            self.in_flight_requests[key] = (task, scheduled_request.telemetry_data)
+            task.add_done_callback(lambda _: self.in_flight_requests.pop(key, None))
+            return await asyncio.shield(task)
+
+        task, leader_telemetry_data = in_flight
+        self.logging.debug(
+            f"COALESCED REQUEST {scheduled_request.req_id} WITH {leader_telemetry_data.req_id}"
+        )
+        try:
+            return await asyncio.shield(task)
+        finally:
+            # The caller keeps its own telemetry record with the timings of the shared request. Tokens stay
+            # unset, they were only spent once and are recorded by the shared request.
+            telemetry_data = scheduled_request.telemetry_data
+            telemetry_data.deployment_name = leader_telemetry_data.deployment_name
+            telemetry_data.request_queued_at = leader_telemetry_data.request_queued_at
+            telemetry_data.request_dequeued_at = (
+                leader_telemetry_data.request_dequeued_at
+            )
+            telemetry_data.response_queued_at = leader_telemetry_data.response_queued_at
+            telemetry_data.response_dequeued_at = (
+                leader_telemetry_data.response_dequeued_at
+            )
+
+    def __sink_telemetry_with_error(
         self, llm_res_queue: str, error_message: str, telemetry_data: TelemetryData
     ):
         if len(llm_res_queue) > 0:
@@ -0,0 +1,3 @@
+from llm_queue.metrics_adapters.in_mem_prometheus_metrics_adapter import (
+    InMemoryPrometheusMetricsAdapter,
+)
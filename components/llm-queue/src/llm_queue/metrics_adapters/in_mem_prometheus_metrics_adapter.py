@@ -0,0 +1,140 @@
+from bisect import bisect_left
+import logging
+import math
+from typing import Callable
+
+from llm_queue.base.adapter_base_classes import MetricsAdapter
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    formatted = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in labels
+    )
+    return "{" + formatted + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class InMemoryPrometheusMetricsAdapter(MetricsAdapter):
+    """
+    An implementation of MetricsAdapter that aggregates metrics in memory and renders them in the Prometheus text
+    exposition format, e.g. to be served from a `/metrics` endpoint of the app. Observations are aggregated into
+    cumulative histograms, so memory does not grow with the number of requests.
+
+    Parameters:
+        buckets (list[float], optional): Upper bounds of the histogram buckets, in the unit of the observed values.
+    """
+
+    DEFAULT_BUCKETS = [
+        0.001,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1,
+        2.5,
+        5,
+        10,
+        30,
+        60,
+        120,
+        300,
+    ]
+
+    def __init__(self, buckets: list[float] = None):
+        self.logging = logging.getLogger(__name__)
+        self.buckets = sorted(buckets or self.DEFAULT_BUCKETS)
+        # name -> labels -> [per bucket counts, sum, count]
+        self.histograms: dict[str, dict[tuple, list]] = {}
+        # name -> labels -> value
+        self.counters: dict[str, dict[tuple, float]] = {}
+        # name -> (callback, label name)
+        self.gauges: dict[str, tuple[Callable, str | None]] = {}
+
+    def observe(self, name: str, value: float, labels: dict[str, str] = None):
+        series = self.histograms.setdefault(name, {})
+        key = tuple(sorted((labels or {}).items()))
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            histogram[0][index] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+    def increment(self, name: str, value: float = 1, labels: dict[str, str] = None):
+        series = self.counters.setdefault(name, {})
+        key = tuple(sorted((labels or {}).items()))
+        series[key] = series.get(key, 0) + value
+
+    def register_gauge(
+        self,
+        name: str,
+        callback: Callable[[], float | dict[str, float] | None],
+        label_name: str = None,
+    ):
+        self.gauges[name] = (callback, label_name)
+
+    def export_prometheus_text(self) -> str:
+        """
+        Renders all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        lines = []
+        for name, series in self.counters.items():
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in series.items():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for name, series in self.histograms.items():
+            lines.append(f"# TYPE {name} histogram")
+            for labels, (bucket_counts, total, count) in series.items():
+                cumulative_count = 0
+                for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+                    cumulative_count += bucket_count
+                    bucket_labels = labels + (("le", _format_value(upper_bound)),)
+                    lines.append(
+                        f"{name}_bucket{_format_labels(bucket_labels)} {cumulative_count}"
+                    )
+                lines.append(
+                    f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}"
+                )
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)} {_format_value(total)}"
+                )
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        for name, (callback, label_name) in self.gauges.items():
+            try:
+                value = callback()
+            except Exception as err:
+                self.logging.error(f"[METRICS] FAILED TO READ GAUGE {name}: {err}")
+                continue
+            if value is None:
+                # Not supported by the component, e.g. the queue depth of a remote scheduler
+                continue
+            lines.append(f"# TYPE {name} gauge")
+            if label_name is None:
+                lines.append(f"{name} {_format_value(value)}")
+            else:
+                for label_value, label_sample in value.items():
+                    lines.append(
+                        f"{name}{_format_labels(((label_name, label_value),))} {_format_value(label_sample)}"
+                    )
+        return "\n".join(lines) + "\n"
@@ -4,8 +4,10 @@ from datetime import datetime
 import json
 import logging
 import os
+import time
 import traceback
 
+from llm_queue.base.adapter_base_classes import MetricsAdapter
 from llm_queue.base.base_classes import (
     BaseRequestController,
     BaseResourceAvailabilityChecker,
@@ -19,10 +21,16 @@ from llm_queue.base.custom_errors import (
 )
 from llm_queue.base.data_classes import (
     ModelPreferences,
+    RequestStage,
     ScheduledRequest,
     TopQueuedRequest,
 )
 
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
 
 class Poller:
     """
@@ -39,15 +47,39 @@ class Poller:
     - poll_and_process(): Continuously polls the scheduler for new or waiting requests, processing them based on resource availability and request type.
     - process_and_put(scheduled_request: ScheduledRequest, resource_ids: list[str]): Processes a given request using the appropriate request controller and places the response in a response queue.
     - get_and_set(): Retrieves responses from the response queue and sets the result of the corresponding future, signaling that the request has been processed.
-    - wait_for_request_to_be_polled(req_id): Waits for a request with the given ID to be polled and processed, with a timeout based on scheduler limits.
+    - create_future(req_id): Creates the response future of a request at enqueue time.
+    - wait_for_response(req_id, future, ttl_in_seconds): Awaits the response future of a request, removing it from the scheduler if it is not polled within the TTL, and raising a QueueTimeoutError if a dequeued request gets no response within `response_timeout_in_seconds` after the TTL.
+    - observe_stage_durations(scheduled_request): Reports the durations between the stages a request went through in this process to the metrics adapter.
+
+    Event driven mode:
+    By default the poller spins on short sleeps to check the scheduler and the response queue. When `event_driven` is True,
+    the poll loop instead blocks on the scheduler until a request is added or until the load balancers report that capacity
+    is available again, and responses are delivered by resolving the request future directly from `process_and_put()`.
+
+    Metrics and tracing:
+    If a `metrics_adapter` is given, the stage durations of every request are observed in
+    `llm_queue_stage_duration_seconds` and its outcome is counted in `llm_queue_requests_total`. If `enable_tracing` is
+    True, every `process_and_put()` runs in an OpenTelemetry span, which requires the `opentelemetry-api` package.
     """
 
+    # (stage name, start stage, end stage) of the durations observed by observe_stage_durations()
+    STAGE_DURATIONS = [
+        ("queue_wait", RequestStage.ENQUEUED, RequestStage.DEQUEUED),
+        ("dispatch", RequestStage.DEQUEUED, RequestStage.CONTROLLER_START),
+        ("processing", RequestStage.CONTROLLER_START, RequestStage.CONTROLLER_END),
+        ("response", RequestStage.CONTROLLER_END, RequestStage.RESPONSE_SET),
+        ("total", RequestStage.ENQUEUED, RequestStage.RESPONSE_SET),
+    ]
+
     def __init__(
         self,
         scheduler: BaseScheduler,
         scheduler_limits: LLMQueueSchedulerLimits,
         resource_availibility_checker: BaseResourceAvailabilityChecker,
         llm_config: LLMConfig,
+        event_driven: bool = False,
+        metrics_adapter: MetricsAdapter = None,
+        enable_tracing: bool = False,
     ):
         self.logging = logging.getLogger(__name__)
         self.scheduler = scheduler
@@ -61,6 +93,20 @@ class Poller:
         self._continue_polling = True
         self.shutdown_event_poll_and_process = asyncio.Event()
         self.shutdown_event_resp_queue_wait = asyncio.Event()
+        self.event_driven = event_driven
+        # Ids of requests that have been popped from the scheduler and are being processed
+        self.dequeued_req_ids = set()
+        self.scheduler.set_remote_response_handler(self.__set_remote_response)
+        self.metrics_adapter = metrics_adapter
+        # Number of requests being processed by each deployment, keyed by LLM id
+        self.in_flight_requests_per_deployment: dict[str, int] = {}
+        self.tracer = None
+        if enable_tracing:
+            if trace is None:
+                raise ImportError(
+                    "Tracing requires the opentelemetry-api package, install it or set enable_tracing=False"
+                )
+            self.tracer = trace.get_tracer(__name__)
 
     def register_req_type(self, req_type: str, req_controller: BaseRequestController):
         self.req_controllers[req_type] = req_controller
@@ -70,7 +116,7 @@ class Poller:
     ):
         try:
             resource_ids = (
-                self.resource_availibility_checker.get_model_ids_if_available(
+                await self.resource_availibility_checker.get_model_ids_if_available(
                     model_pref
                 )
             )
@@ -80,14 +126,23 @@ class Poller:
                 if is_waiting_req
                 else await self.scheduler.pop_top_new_request()
             )
+            if scheduled_request is None:
+                # Popped by another LLM Queue instance sharing the scheduler
+                return
             self.logging.debug(
                 f"[POLLER] ENCOUNTERED ResourceAvailabilityError FOR REQUEST: {scheduled_request.req_id}, INVALID CHOICE OF EMB/LLM MODEL"
             )
+            scheduled_request.mark_stage(RequestStage.DEQUEUED)
             scheduled_request.telemetry_data.request_dequeued_at = int(
                 datetime.now().timestamp()
             )
-            self.futures[scheduled_request.req_id] = asyncio.Future()
-            self.futures[scheduled_request.req_id].set_result((str(err), 400))
+            if self.scheduler.is_remote_request(scheduled_request):
+                await self.scheduler.send_response(scheduled_request, str(err), 400)
+                return
+            future = self.futures.pop(scheduled_request.req_id, None)
+            if future is not None and not future.done():
+                future.set_result((str(err), 400))
+            return
 
         if (
             resource_ids is None
@@ -98,7 +153,8 @@ class Poller:
             scheduled_request: ScheduledRequest = (
                 await self.scheduler.pop_top_new_request()
             )
-            await self.scheduler.add_request_to_wait_queue(scheduled_request)
+            if scheduled_request is not None:
+                await self.scheduler.add_request_to_wait_queue(scheduled_request)
 
         elif resource_ids is not None:
             # If required resources are available,
@@ -108,44 +164,81 @@ class Poller:
                 if is_waiting_req
                 else await self.scheduler.pop_top_new_request()
             )
+            if scheduled_request is None:
+                # Popped by another LLM Queue instance sharing the scheduler
+                return
             self.logging.debug(
                 f"[POLLER] NOW PROCESSING REQUEST: {scheduled_request.req_id}..."
             )
+            scheduled_request.mark_stage(RequestStage.DEQUEUED)
             scheduled_request.telemetry_data.request_dequeued_at = int(
                 datetime.now().timestamp()
             )
-            future = asyncio.Future()
-            self.futures[scheduled_request.req_id] = future
+            if not self.scheduler.is_remote_request(scheduled_request):
+                self.dequeued_req_ids.add(scheduled_request.req_id)
             _ = asyncio.create_task(
                 self.process_and_put(scheduled_request, resource_ids)
             )
 
+    async def __poll_once(self):
+        # CHECK IF SCHEDULER HAS A REQUEST
+        if await self.scheduler.has_request():
+            #  GET TOP NEW and ALL WAITING REQUESTS
+            top_queued_req_obj: TopQueuedRequest = (
+                await self.scheduler.get_top_requests_model_prefs()
+            )
+
+            if top_queued_req_obj.newly_queued_request is not None:
+                # PROCESS NEW REQUEST
+                model_pref = top_queued_req_obj.newly_queued_request
+                await self.__check_resource_availibility_and_process(
+                    model_pref, is_waiting_req=False
+                )
+
+            for model_pref in top_queued_req_obj.waiting_requests_list:
+                # PROCESS EACH WAITING REQUEST
+                await self.__check_resource_availibility_and_process(
+                    model_pref, is_waiting_req=True
+                )
+
+    async def __get_seconds_until_next_poll(self) -> float | None:
+        """
+        Returns how long the poll loop can block before the queued requests might be processable,
+        or None if there are no queued requests and the loop should wait for a new one.
+        """
+        top_queued_req_obj: TopQueuedRequest = (
+            await self.scheduler.get_top_requests_model_prefs()
+        )
+        model_prefs = list(top_queued_req_obj.waiting_requests_list)
+        if top_queued_req_obj.newly_queued_request is not None:
+            model_prefs.append(top_queued_req_obj.newly_queued_request)
+        if not model_prefs:
+            return None
+
+        wait_times = [
+            await self.resource_availibility_checker.get_seconds_until_available(
+                model_pref
+            )
+            for model_pref in model_prefs
+        ]
+        if None in wait_times:
+            return self.scheduler.DEFAULT_POLL_INTERVAL_IN_SECONDS
+        return min(wait_times)
+
     # Poll the scheduler and send requests to appropriate request controller
     async def poll_and_process(self):
         try:
             while self._continue_polling:
-                # CHECK IF SCHEDULER HAS A REQUEST
-                if await self.scheduler.has_request():
-                    #  GET TOP NEW and ALL WAITING REQUESTS
-                    top_queued_req_obj: TopQueuedRequest = (
-                        await self.scheduler.get_top_requests_model_prefs()
-                    )
+                await self.__poll_once()
 
-                    if top_queued_req_obj.newly_queued_request is not None:
-                        # PROCESS NEW REQUEST
-                        model_pref = top_queued_req_obj.newly_queued_request
-                        await self.__check_resource_availibility_and_process(
-                            model_pref, is_waiting_req=False
-                        )
-
-                    for model_pref in top_queued_req_obj.waiting_requests_list:
-                        # PROCESS EACH WAITING REQUEST
-                        await self.__check_resource_availibility_and_process(
-                            model_pref, is_waiting_req=True
-                        )
-
-                # Sleep for a small interval to avoid busy waiting
-                await asyncio.sleep(0.1)
+                if self.event_driven:
+                    # Block until a request is added or capacity frees up for a queued request
+                    timeout = await self.__get_seconds_until_next_poll()
+                    if timeout is None or timeout > 0:
+                        await self.scheduler.wait_for_request(timeout)
+                else:
+                    # Sleep for a small interval to avoid busy waiting
+                    await asyncio.sleep(0.1)
         finally:
             self.shutdown_event_poll_and_process.set()
 
@@ -153,13 +246,35 @@ class Poller:
     async def process_and_put(
         self, scheduled_request: ScheduledRequest, resource_ids: list[str]
     ):
+        if self.tracer is None:
+            await self.__process_and_put(scheduled_request, resource_ids)
+            return
+        with self.tracer.start_as_current_span(
+            "llm_queue.process_and_put",
+            attributes={
+                "llm_queue.req_id": scheduled_request.req_id,
+                "llm_queue.req_type": scheduled_request.req_type,
+                "llm_queue.deployments": ";".join(resource_ids),
+            },
+        ) as span:
+            status_code = await self.__process_and_put(scheduled_request, resource_ids)
+            span.set_attribute("llm_queue.status_code", status_code)
+            if status_code != 200:
+                span.set_status(trace.Status(trace.StatusCode.ERROR))
+
+    async def __process_and_put(
+        self, scheduled_request: ScheduledRequest, resource_ids: list[str]
+    ) -> int:
         response = "Invalid request type"
         status_code = 404
         if scheduled_request.req_type in self.req_controllers:
+            self.__update_in_flight_requests(resource_ids, 1)
             try:
                 scheduled_request.telemetry_data.deployment_name = ";".join(
                     resource_ids
                 )
+                scheduled_request.mark_stage(RequestStage.CONTROLLER_START)
+                processing_start_time = time.perf_counter()
                 response = await self.req_controllers[
                     scheduled_request.req_type
                 ].process_request(
@@ -170,18 +285,54 @@ class Poller:
                     ],
                     scheduled_request.telemetry_data,
                 )
+                processing_time = time.perf_counter() - processing_start_time
                 status_code = 200
             except LLMError as le:
                 self.logging.error(f"[POLLER] LLM ERROR in process_and_put(): {le}")
                 self.logging.error(traceback.format_exc())
                 response = f"LLM ERROR: {le}"
                 status_code = 500
-                self.resource_availibility_checker.register_error(resource_ids)
+                await self.resource_availibility_checker.register_error(
+                    resource_ids, scheduled_request.model_preferences
+                )
             except Exception as err:
                 self.logging.error(f"[POLLER] EXCEPTION IN process_and_put(): {err}")
                 self.logging.error(traceback.format_exc())
                 response = f"INTERNAL SERVER ERROR: {err}"
                 status_code = 500
+            finally:
+                scheduled_request.mark_stage(RequestStage.CONTROLLER_END)
+                self.__update_in_flight_requests(resource_ids, -1)
+            if status_code == 200:
+                # Feed the latency of the chosen deployments back to the load balancers
+                await self.resource_availibility_checker.register_success(
+                    resource_ids, scheduled_request.model_preferences, processing_time
+                )
+            # Correct the load balancers' usage estimates with the actual token counts
+            await self.resource_availibility_checker.register_usage(
+                resource_ids,
+                scheduled_request.model_preferences,
+                scheduled_request.telemetry_data,
+            )
+
+        if self.scheduler.is_remote_request(scheduled_request):
+            # The caller awaits the response in the LLM Queue instance that added the request
+            await self.scheduler.send_response(scheduled_request, response, status_code)
+            # The originating instance observes the stages it saw itself
+            self.observe_stage_durations(scheduled_request)
+            return status_code
+
+        if self.event_driven:
+            scheduled_request.telemetry_data.response_queued_at = int(
+                datetime.now().timestamp()
+            )
+            self.__set_response(
+                scheduled_request.req_id,
+                response,
+                status_code,
+                scheduled_request.telemetry_data,
+            )
+            return status_code
 
         # response["req_id"] = request_id // NOT NEEDED
         response_queue_item = (
@@ -197,33 +348,113 @@ class Poller:
         self.logging.debug(
             f"[POLLER] RESPONSE PUT IN RESPONSE QUEUE: {scheduled_request.req_id} {status_code}"
         )
+        return status_code
+
+    def __update_in_flight_requests(self, resource_ids: list[str], delta: int):
+        for resource_id in resource_ids:
+            num_in_flight = self.in_flight_requests_per_deployment.get(resource_id, 0)
+            self.in_flight_requests_per_deployment[resource_id] = num_in_flight + delta
+
+    def observe_stage_durations(self, scheduled_request: ScheduledRequest):
+        if self.metrics_adapter is None:
+            return
+        timestamps = scheduled_request.stage_timestamps_ns
+        for stage_name, start_stage, end_stage in self.STAGE_DURATIONS:
+            if start_stage in timestamps and end_stage in timestamps:
+                self.metrics_adapter.observe(
+                    "llm_queue_stage_duration_seconds",
+                    (timestamps[end_stage] - timestamps[start_stage]) / 1e9,
+                    {"stage": stage_name, "req_type": scheduled_request.req_type},
+                )
+
+    def __set_response(
+        self, request_id: str, response, status_code: int, telemetry_data
+    ):
+        self.dequeued_req_ids.discard(request_id)
+        # The future is gone if the caller has already given up waiting for the response
+        future = self.futures.pop(request_id, None)
+        if future is not None and not future.done():
+            future.set_result((response, status_code))
+        telemetry_data.response_dequeued_at = int(datetime.now().timestamp())
+
+    def __set_remote_response(
+        self, request_id: str, response, status_code: int, telemetry_data
+    ):
+        if request_id in self.futures:
+            self.__set_response(request_id, response, status_code, telemetry_data)
 
     # Get the response from the queue and set the result of the corresponding future
     async def get_and_set(self):
         try:
-            while self._continue_polling:
-                request_id, response, status_code, telemetry_data = (
-                    await self.response_queue.get()
-                )
-                future = self.futures[request_id]
-                future.set_result((response, status_code))
-                del self.futures[request_id]
-                telemetry_data.response_dequeued_at = int(datetime.now().timestamp())
+            # Responses are set directly by process_and_put() in event driven mode
+            while self._continue_polling and not self.event_driven:
+                response_queue_item = await self.response_queue.get()
+                if response_queue_item is None:
+                    # Sentinel put by stop_polling()
+                    break
+                request_id, response, status_code, telemetry_data = response_queue_item
+                self.__set_response(request_id, response, status_code, telemetry_data)
                 await asyncio.sleep(0.1)
         finally:
             self.shutdown_event_resp_queue_wait.set()
 
-    async def wait_for_request_to_be_polled(self, req_id):
-        time_elapsed = 0
-        wait_time = 0.1
-        while req_id not in self.futures:
-            await asyncio.sleep(wait_time)
-            time_elapsed += wait_time
-            if time_elapsed >= self.scheduler_limits.ttl_in_seconds:
-                await self.scheduler.remove_request_by_id(req_id)
-                raise QueueTimeoutError(
-                    f"Request has timed out in scheduler queue. TTL: {self.scheduler_limits.ttl_in_seconds}"
-                )
+    def create_future(self, req_id: str) -> asyncio.Future:
+        """
+        Creates the response future for a request before it is added to the scheduler. The future stays in
+        `futures` until the response is set or the caller stops waiting, so a response is never missed.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.futures[req_id] = future
+        return future
+
+    def discard_future(self, req_id: str):
+        """
+        Drops the response future of a request which could not be enqueued.
+        """
+        self.futures.pop(req_id, None)
+
+    async def wait_for_response(
+        self,
+        req_id: str,
+        future: asyncio.Future,
+        ttl_in_seconds: float | None = None,
+    ):
+        """
+        Awaits the response future of a request created with create_future(). A request still queued after the TTL
+        is removed from the scheduler. A request dequeued by then, by this or another LLM Queue instance, gets
+        `response_timeout_in_seconds` (the TTL if unset) more for its response, since a remote response can be lost.
+        """
+        ttl_in_seconds = ttl_in_seconds or self.scheduler_limits.ttl_in_seconds
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), ttl_in_seconds)
+        except TimeoutError:
+            if req_id not in self.dequeued_req_ids and not future.done():
+                removed = await self.scheduler.remove_request_by_id(req_id)
+                # The request may have been dequeued while it was being removed, by this or another LLM Queue instance
+                if removed is not False and not (
+                    req_id in self.dequeued_req_ids or future.done()
+                ):
+                    self.discard_future(req_id)
+                    raise QueueTimeoutError(
+                        f"Request has timed out in scheduler queue. TTL: {ttl_in_seconds}"
+                    )
+
+        response_timeout_in_seconds = (
+            self.scheduler_limits.response_timeout_in_seconds or ttl_in_seconds
+        )
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future), response_timeout_in_seconds
+            )
+        except TimeoutError:
+            self.discard_future(req_id)
+            self.dequeued_req_ids.discard(req_id)
+            raise QueueTimeoutError(
+                f"No response received for the dequeued request. Timeout: {response_timeout_in_seconds}"
+            )
 
     def stop_polling(self):
         self._continue_polling = False
+        # Wake up the poll loop and the response loop so that they can observe the stop signal
+        self.scheduler.notify_request_available()
+        self.response_queue.put_nowait(None)
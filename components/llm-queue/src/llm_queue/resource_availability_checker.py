@@ -1,8 +1,8 @@
 from llm_queue.base.base_classes import (
-    BaseLLMEntityLoadBalancer,
+    BaseAsyncLLMEntityLoadBalancer,
     BaseResourceAvailabilityChecker,
 )
-from llm_queue.base.data_classes import ModelPreferences
+from llm_queue.base.data_classes import ModelPreferences, TelemetryData
 
 
 # TODO: No need for separate load balancers for emb and LLM models. Can be just one.
@@ -11,30 +11,57 @@ class ResourceAvailabilityChecker(BaseResourceAvailabilityChecker):
     A class to check the availability of resources for embedding and LLM models based on preferences.
 
     Attributes:
-        embedding_llm_lb (BaseLLMEntityLoadBalancer): Load balancer for embedding models.
-        llm_lb (BaseLLMEntityLoadBalancer): Load balancer for LLM models.
+        embedding_llm_lb (BaseAsyncLLMEntityLoadBalancer): Load balancer for embedding models.
+        llm_lb (BaseAsyncLLMEntityLoadBalancer): Load balancer for LLM models.
     """
 
     def __init__(
         self,
-        embedding_llm_lb: BaseLLMEntityLoadBalancer,
-        llm_lb: BaseLLMEntityLoadBalancer,
+        embedding_llm_lb: BaseAsyncLLMEntityLoadBalancer,
+        llm_lb: BaseAsyncLLMEntityLoadBalancer,
     ):
         """
         Initialize the ResourceAvailabilityChecker with embedding and LLM load balancers.
 
         Args:
-            embedding_llm_lb (BaseLLMEntityLoadBalancer): Load balancer for embedding models.
-            llm_lb (BaseLLMEntityLoadBalancer): Load balancer for LLM models.
+            embedding_llm_lb (BaseAsyncLLMEntityLoadBalancer): Load balancer for embedding models.
+            llm_lb (BaseAsyncLLMEntityLoadBalancer): Load balancer for LLM models.
         """
         self.embedding_llm_lb = embedding_llm_lb
         self.llm_lb = llm_lb
 
-    def get_model_ids_if_available(
+    async def __get_available_emb_model_id(
+        self, model_pref: ModelPreferences
+    ) -> str | None:
+        return await self.embedding_llm_lb.aget_available_llm_id(
+            model_pref.num_emb_calls_per_req,
+            model_pref.specific_embedding_model,
+            num_tokens_per_call=model_pref.est_tokens_per_emb_call,
+        )
+
+    async def __get_available_llm_id(self, model_pref: ModelPreferences) -> str | None:
+        return await self.llm_lb.aget_available_llm_id(
+            model_pref.num_llm_calls_per_req,
+            model_pref.specific_llm_model,
+            num_tokens_per_call=model_pref.est_tokens_per_llm_call,
+        )
+
+    async def __release_emb_model_id(
+        self, emb_model_id: str | None, model_pref: ModelPreferences
+    ):
+        if emb_model_id is not None:
+            await self.embedding_llm_lb.arelease_llm_id(
+                emb_model_id,
+                num_llm_calls=model_pref.num_emb_calls_per_req,
+                num_tokens_per_call=model_pref.est_tokens_per_emb_call,
+            )
+
+    async def get_model_ids_if_available(
         self, model_pref: ModelPreferences
     ) -> list[str] | None:
         """
-        Check if models specified in the preferences are available and return their IDs if available.
+        Take a slot of every model required by the preferences and return their IDs, or take none if one of them is
+        not available.
 
         Args:
             model_pref (ModelPreferences): Preferences specifying required models and configurations.
@@ -46,62 +73,145 @@ class ResourceAvailabilityChecker(BaseResourceAvailabilityChecker):
         if not model_pref.require_embedding_model and not model_pref.require_llm_model:
             return None
 
-        # Initialize an empty list to hold model IDs.
-        llms = []
-
-        # Check if both embedding model and LLM model are required.
-        if model_pref.require_embedding_model and model_pref.require_llm_model:
-            # Check if both specific models are available.
-            if self.embedding_llm_lb.has_available_llm(
-                model_pref.specific_embedding_model
-            ) and self.llm_lb.has_available_llm(model_pref.specific_llm_model):
-                # Only if both are available, append their IDs to the list.
-                llms.append(
-                    self.embedding_llm_lb.get_available_llm_id(
-                        model_pref.num_emb_calls_per_req,
-                        model_pref.specific_embedding_model,
-                    )
-                )
-                llms.append(
-                    self.llm_lb.get_available_llm_id(
-                        model_pref.num_llm_calls_per_req, model_pref.specific_llm_model
-                    )
-                )
-            else:
-                # If either model is not available, return None.
+        # Take the slots right away instead of checking first, another coroutine or instance can take an available
+        # slot between the check and the selection.
+        emb_model_id = None
+        if model_pref.require_embedding_model:
+            emb_model_id = await self.__get_available_emb_model_id(model_pref)
+            if emb_model_id is None:
                 return None
-        elif model_pref.require_llm_model:
-            # If only the LLM model is required, check its availability.
-            if self.llm_lb.has_available_llm(model_pref.specific_llm_model):
-                llms.append(
-                    self.llm_lb.get_available_llm_id(
-                        model_pref.num_llm_calls_per_req, model_pref.specific_llm_model
-                    )
+
+        if not model_pref.require_llm_model:
+            return [emb_model_id]
+
+        try:
+            llm_id = await self.__get_available_llm_id(model_pref)
+        except Exception:
+            await self.__release_emb_model_id(emb_model_id, model_pref)
+            raise
+        if llm_id is None:
+            # The request is not dispatched without its LLM, give the embedding model slot back
+            await self.__release_emb_model_id(emb_model_id, model_pref)
+            return None
+
+        return [emb_model_id, llm_id] if emb_model_id is not None else [llm_id]
+
+    async def get_seconds_until_available(
+        self, model_pref: ModelPreferences
+    ) -> float | None:
+        """
+        Estimate how long it takes until all the models required by the preferences are available.
+
+        Args:
+            model_pref (ModelPreferences): Preferences specifying required models and configurations.
+
+        Returns:
+            float | None: Seconds until the required models are available, or None if it cannot be estimated.
+        """
+        wait_times = []
+        if model_pref.require_embedding_model:
+            wait_times.append(
+                await self.embedding_llm_lb.aget_seconds_until_available(
+                    model_pref.specific_embedding_model,
+                    num_llm_calls=model_pref.num_emb_calls_per_req,
+                    num_tokens_per_call=model_pref.est_tokens_per_emb_call,
                 )
-            else:
-                return None
-        elif model_pref.require_embedding_model:
-            if self.embedding_llm_lb.has_available_llm(
-                model_pref.specific_embedding_model
-            ):
-                llms.append(
-                    self.embedding_llm_lb.get_available_llm_id(
-                        model_pref.num_emb_calls_per_req,
-                        model_pref.specific_embedding_model,
-                    )
+            )
+        if model_pref.require_llm_model:
+            wait_times.append(
+                await self.llm_lb.aget_seconds_until_available(
+                    model_pref.specific_llm_model,
+                    num_llm_calls=model_pref.num_llm_calls_per_req,
+                    num_tokens_per_call=model_pref.est_tokens_per_llm_call,
                 )
-            else:
-                return None
+            )
+        if not wait_times or None in wait_times:
+            return None
+        return max(wait_times)
 
-        return llms if llms else None
+    async def register_usage(
+        self,
+        llm_ids: list[str],
+        model_pref: ModelPreferences,
+        telemetry_data: TelemetryData,
+    ):
+        """
+        Report the actual token usage of a completed request to the load balancers of the models it used.
 
-    def register_error(self, llm_ids: list[str]):
+        Args:
+            llm_ids (list[str]): The IDs of the models chosen for the request, in the order returned by `get_model_ids_if_available`.
+            model_pref (ModelPreferences): Preferences the request was dispatched with.
+            telemetry_data (TelemetryData): Telemetry data of the request holding the actual token counts.
+        """
+        llm_ids = list(llm_ids)
+        if model_pref.require_embedding_model and llm_ids:
+            await self.embedding_llm_lb.aregister_usage(
+                llm_ids.pop(0),
+                model_pref.num_emb_calls_per_req,
+                model_pref.est_tokens_per_emb_call,
+                telemetry_data.embedding_tokens,
+            )
+        if model_pref.require_llm_model and llm_ids:
+            actual_tokens = -1
+            if telemetry_data.prompt_tokens >= 0:
+                actual_tokens = telemetry_data.prompt_tokens + max(
+                    telemetry_data.completion_tokens, 0
+                )
+            await self.llm_lb.aregister_usage(
+                llm_ids.pop(0),
+                model_pref.num_llm_calls_per_req,
+                model_pref.est_tokens_per_llm_call,
+                actual_tokens,
+            )
+
+    def __get_load_balancers_of_ids(
+        self, llm_ids: list[str], model_pref: ModelPreferences
+    ) -> list[tuple[BaseAsyncLLMEntityLoadBalancer, str]]:
+        """
+        Pair the IDs returned by `get_model_ids_if_available` with the load balancers they were chosen by.
+        """
+        load_balancers = []
+        if model_pref.require_embedding_model:
+            load_balancers.append(self.embedding_llm_lb)
+        if model_pref.require_llm_model:
+            load_balancers.append(self.llm_lb)
+        return list(zip(load_balancers, llm_ids))
+
+    async def register_error(
+        self, llm_ids: list[str], model_pref: ModelPreferences = None
+    ):
         """
         Register an error for the specified model IDs.
 
         Args:
             llm_ids (list[str]): A list containing the IDs of the models where errors occurred.
+            model_pref (ModelPreferences, optional): Preferences the request was dispatched with, used to map the IDs to their load balancers.
+                Without it, errors are only registered for requests which used both an embedding model and an LLM.
+        """
+        if model_pref is not None:
+            for load_balancer, llm_id in self.__get_load_balancers_of_ids(
+                llm_ids, model_pref
+            ):
+                await load_balancer.aregister_error(llm_id)
+        elif len(llm_ids) == 2:
+            await self.embedding_llm_lb.aregister_error(llm_ids[0])
+            await self.llm_lb.aregister_error(llm_ids[1])
+
+    async def register_success(
+        self,
+        llm_ids: list[str],
+        model_pref: ModelPreferences,
+        latency_in_seconds: float,
+    ):
+        """
+        Report the processing latency of a successful request to the load balancers of the models it used.
+
+        Args:
+            llm_ids (list[str]): The IDs of the models chosen for the request, in the order returned by `get_model_ids_if_available`.
+            model_pref (ModelPreferences): Preferences the request was dispatched with.
+            latency_in_seconds (float): Time the request controller took to process the request.
         """
-        if len(llm_ids) == 2:
-            self.embedding_llm_lb.register_error(llm_ids[0])
-            self.llm_lb.register_error(llm_ids[1])
+        for load_balancer, llm_id in self.__get_load_balancers_of_ids(
+            llm_ids, model_pref
+        ):
+            await load_balancer.aregister_success(llm_id, latency_in_seconds)
@@ -1 +1,3 @@
 from llm_queue.schedulers.basic_fifo_scheduler import BasicFIFOScheduler
+from llm_queue.schedulers.priority_fair_scheduler import PriorityFairScheduler
+from llm_queue.schedulers.redis_fifo_scheduler import RedisFIFOScheduler
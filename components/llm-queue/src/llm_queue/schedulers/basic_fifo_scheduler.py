@@ -3,7 +3,7 @@ from collections import deque
 from datetime import datetime
 import heapq
 import logging
-from typing import Deque, List, Tuple
+from typing import Deque
 
 from llm_queue.base.base_classes import BaseScheduler
 from llm_queue.base.config_data_classes import LLMQueueSchedulerLimits
@@ -33,6 +33,8 @@ class BasicFIFOScheduler(BaseScheduler):
     - pop_top_waiting_request(): Asynchronously removes and returns the top (earliest) request from the wait queue.
     - has_request(): Checks if there are any requests in either the main or wait queues.
     - remove_request_by_id(req_id: str): Removes a request from either queue based on its request ID.
+    - wait_for_request(timeout: float | None): Asynchronously waits until a new request is added to the main queue or the timeout elapses.
+    - notify_request_available(): Wakes up the coroutine waiting in `wait_for_request()`.
     """
 
     def __init__(self, limits: LLMQueueSchedulerLimits):
@@ -41,6 +43,8 @@ class BasicFIFOScheduler(BaseScheduler):
         self.wait_queue: Deque[ScheduledRequest] = deque()
         self.lock = asyncio.Lock()
         self.limits = LLMQueueSchedulerLimits(**limits)
+        # Set whenever a new request is added, lets the poller sleep until there is work to do
+        self.request_added_event = asyncio.Event()
 
     async def add_request_to_wait_queue(self, request: ScheduledRequest):
         async with self.lock:
@@ -66,6 +70,7 @@ class BasicFIFOScheduler(BaseScheduler):
                 f"Request {request.req_id} added to main queue, curr_size: {len(self.queue)}"
             )
             request.telemetry_data.request_queued_at = int(datetime.now().timestamp())
+        self.notify_request_available()
 
     async def get_top_requests_model_prefs(self) -> TopQueuedRequest:
         async with self.lock:
@@ -98,24 +103,37 @@ class BasicFIFOScheduler(BaseScheduler):
         async with self.lock:
             return bool(self.queue) or bool(self.wait_queue)
 
-    async def remove_request_by_id(self, req_id: str):
+    def get_queue_depths(self) -> tuple[int, int]:
+        return len(self.queue), len(self.wait_queue)
+
+    async def remove_request_by_id(self, req_id: str) -> bool:
         async with self.lock:
             # Attempt to remove from the main queue first
             removed = self._remove_from_queue(self.queue, req_id)
             if not removed:
                 # If not found in the main queue, attempt to remove from the wait queue
                 removed = self._remove_from_queue(self.wait_queue, req_id)
+            return removed
+
+    async def wait_for_request(self, timeout: float | None = None):
+        try:
+            async with asyncio.timeout(timeout):
+                await self.request_added_event.wait()
+        except TimeoutError:
+            pass
+        self.request_added_event.clear()
+
+    def notify_request_available(self):
+        self.request_added_event.set()
 
-    def _remove_from_queue(
-        self, queue: List[Tuple[int, ScheduledRequest]], req_id: str
-    ) -> bool:
+    def _remove_from_queue(self, queue: Deque[ScheduledRequest], req_id: str) -> bool:
         """
         Helper method to remove a request by req_id from a given queue.
         Returns True if the request was found and removed, False otherwise.
         """
-        for i, (_, request) in enumerate(queue):
+        for i, request in enumerate(queue):
             if request.req_id == req_id:
                 # Remove the request by index
-                queue.pop(i)
+                del queue[i]
                 return True
         return False
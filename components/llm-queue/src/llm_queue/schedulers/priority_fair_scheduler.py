@@ -0,0 +1,260 @@
+import asyncio
+from datetime import datetime
+import heapq
+import itertools
+import logging
+
+from llm_queue.base.base_classes import BaseScheduler
+from llm_queue.base.config_data_classes import LLMQueueSchedulerLimits
+from llm_queue.base.custom_errors import SchedulerQueueFullError
+from llm_queue.base.data_classes import ScheduledRequest, TopQueuedRequest
+
+# Heap entry layout: [start_tag, sequence_number, request]. The request is set to None when the entry is removed.
+_START_TAG, _SEQ, _REQUEST = 0, 1, 2
+
+
+class PriorityFairScheduler(BaseScheduler):
+    """
+    Schedules requests by priority class first, and fairly across users and request types within a priority class.
+
+    Every priority class (`ScheduledRequest.priority`, lower values are served first) has its own heap and its own
+    `max_queue_size` and `ttl_in_seconds`. A request of a lower priority class is only dequeued when all higher priority
+    classes are empty.
+
+    Within a priority class, requests are ordered with start-time fair queueing over flows, where a flow is the pair of
+    (user_id, req_type). Every request gets a virtual start tag of max(class virtual time, finish tag of the previous
+    request of its flow), and the finish tag of the flow advances by 1 / weight of the request type. Requests are served
+    in order of their start tags, so a burst from one flow is interleaved with the requests of all other flows instead
+    of blocking them, and request types with a higher weight get a proportionally larger share.
+
+    Like `BasicFIFOScheduler`, requests whose specific LLM is not available are moved to a wait queue by the poller.
+
+    Removal by request id is O(1): the entry is marked as removed and skipped when it reaches the top of its heap.
+
+    Methods:
+    - __init__(limits, priority_class_limits, req_type_weights): Initializes the scheduler with default limits, per class limits and request type weights.
+    - add_request_to_wait_queue(request: ScheduledRequest): Asynchronously adds a request to the wait queue of its priority class, raising SchedulerQueueFullError if it is full.
+    - add_request(request: ScheduledRequest): Asynchronously adds a new request to the heap of its priority class, raising SchedulerQueueFullError if it is full.
+    - get_top_requests_model_prefs(): Asynchronously retrieves(without removing) the model prefs of the next request to serve and of all waiting requests in serving order.
+    - pop_top_new_request(): Asynchronously removes and returns the request peeked by get_top_requests_model_prefs(), or the next request to serve if none was peeked.
+    - pop_top_waiting_request(): Asynchronously removes and returns the next waiting request to serve.
+    - has_request(): Checks if there are any requests in either the main or wait queues.
+    - remove_request_by_id(req_id: str): Marks a queued request as removed.
+    - get_ttl_in_seconds(request: ScheduledRequest): Returns the TTL of the priority class of a request.
+    """
+
+    # Stale flow finish tags are purged once there are this many more flows than queued requests
+    FLOW_PURGE_SLACK = 1024
+
+    def __init__(
+        self,
+        limits: LLMQueueSchedulerLimits,
+        priority_class_limits: dict[int, LLMQueueSchedulerLimits] = None,
+        req_type_weights: dict[str, float] = None,
+    ):
+        """
+        Args:
+            limits (LLMQueueSchedulerLimits): Limits used by priority classes without their own limits.
+            priority_class_limits (dict[int, LLMQueueSchedulerLimits], optional): Limits per priority class.
+            req_type_weights (dict[str, float], optional): Share of each request type within a priority class. Defaults to 1 for every type.
+        """
+        self.logging = logging.getLogger(__name__)
+        self.limits = LLMQueueSchedulerLimits(**limits)
+        self.priority_class_limits = {
+            priority: LLMQueueSchedulerLimits(**class_limits)
+            for priority, class_limits in (priority_class_limits or {}).items()
+        }
+        self.req_type_weights = req_type_weights or {}
+
+        self.queues: dict[int, list] = {}
+        self.wait_queues: dict[int, list] = {}
+        self.queue_sizes: dict[int, int] = {}
+        self.wait_queue_sizes: dict[int, int] = {}
+        # Maps req_id to its live heap entry and the size counters of the queue holding it
+        self.entries: dict[str, tuple[list, dict[int, int]]] = {}
+        self.virtual_times: dict[int, float] = {}
+        self.flow_finish_tags: dict[tuple, float] = {}
+        self.sequence = itertools.count()
+        # Entry of the request peeked by get_top_requests_model_prefs(), popped by the next pop_top_new_request()
+        self.peeked_entry = None
+
+        self.lock = asyncio.Lock()
+        # Set whenever a new request is added, lets the poller sleep until there is work to do
+        self.request_added_event = asyncio.Event()
+
+    def __get_limits(self, priority: int) -> LLMQueueSchedulerLimits:
+        return self.priority_class_limits.get(priority, self.limits)
+
+    def __get_flow_key(self, request: ScheduledRequest) -> tuple:
+        return (request.priority, request.telemetry_data.user_id, request.req_type)
+
+    def __create_entry(self, request: ScheduledRequest) -> list:
+        """
+        Assigns the start tag of a new request and advances the finish tag of its flow.
+        """
+        flow_key = self.__get_flow_key(request)
+        virtual_time = self.virtual_times.get(request.priority, 0.0)
+        start_tag = max(virtual_time, self.flow_finish_tags.get(flow_key, 0.0))
+        weight = self.req_type_weights.get(request.req_type, 1.0)
+        self.flow_finish_tags[flow_key] = start_tag + 1.0 / weight
+        return [start_tag, next(self.sequence), request]
+
+    def __purge_idle_flows(self):
+        # A flow whose finish tag is behind the virtual time of its class is idle, it would restart from the virtual time anyway
+        if len(self.flow_finish_tags) <= len(self.entries) + self.FLOW_PURGE_SLACK:
+            return
+        self.flow_finish_tags = {
+            flow_key: finish_tag
+            for flow_key, finish_tag in self.flow_finish_tags.items()
+            if finish_tag > self.virtual_times.get(flow_key[0], 0.0)
+        }
+
+    def __peek(self, heap: list) -> list | None:
+        # Drop removed entries from the top of the heap
+        while heap and heap[0][_REQUEST] is None:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def __pop_entry(
+        self, entry: list, queues: dict[int, list], sizes: dict[int, int]
+    ) -> ScheduledRequest | None:
+        request = entry[_REQUEST]
+        if request is None:
+            # Removed since it was peeked
+            return None
+        priority = request.priority
+        heap = queues[priority]
+        if heap[0] is entry:
+            heapq.heappop(heap)
+        else:
+            # Not on top anymore, drop it lazily like a removed entry
+            entry[_REQUEST] = None
+        sizes[priority] -= 1
+        del self.entries[request.req_id]
+        self.virtual_times[priority] = max(
+            self.virtual_times.get(priority, 0.0), entry[_START_TAG]
+        )
+        self.__purge_idle_flows()
+        return request
+
+    def __pop_top(
+        self, queues: dict[int, list], sizes: dict[int, int]
+    ) -> ScheduledRequest | None:
+        for priority in sorted(queues):
+            entry = self.__peek(queues[priority])
+            if entry is not None:
+                return self.__pop_entry(entry, queues, sizes)
+        return None
+
+    def __check_queue_size(self, sizes: dict[int, int], priority: int, queue_name: str):
+        max_queue_size = self.__get_limits(priority).max_queue_size
+        if sizes.get(priority, 0) >= max_queue_size:
+            raise SchedulerQueueFullError(
+                f"{queue_name} of priority class {priority} is full. Max: {max_queue_size}"
+            )
+
+    def __push(
+        self,
+        queues: dict[int, list],
+        sizes: dict[int, int],
+        entry: list,
+        queue_name: str,
+    ):
+        request: ScheduledRequest = entry[_REQUEST]
+        heapq.heappush(queues.setdefault(request.priority, []), entry)
+        sizes[request.priority] = sizes.get(request.priority, 0) + 1
+        self.entries[request.req_id] = (entry, sizes)
+        self.logging.debug(
+            f"Request {request.req_id} added to {queue_name.lower()} of priority class {request.priority}, curr_size: {sizes[request.priority]}"
+        )
+
+    async def add_request_to_wait_queue(self, request: ScheduledRequest):
+        async with self.lock:
+            self.__check_queue_size(
+                self.wait_queue_sizes, request.priority, "Wait queue"
+            )
+            # Waiting requests keep their place in the fair order, so they do not lose their turn
+            entry = [
+                self.virtual_times.get(request.priority, 0.0),
+                next(self.sequence),
+                request,
+            ]
+            self.__push(self.wait_queues, self.wait_queue_sizes, entry, "Wait queue")
+
+    async def add_request(self, request: ScheduledRequest):
+        async with self.lock:
+            self.__check_queue_size(self.queue_sizes, request.priority, "Main queue")
+            self.__push(
+                self.queues,
+                self.queue_sizes,
+                self.__create_entry(request),
+                "Main queue",
+            )
+            request.telemetry_data.request_queued_at = int(datetime.now().timestamp())
+        self.notify_request_available()
+
+    async def get_top_requests_model_prefs(self) -> TopQueuedRequest:
+        async with self.lock:
+            res = TopQueuedRequest()
+            self.peeked_entry = None
+            for priority in sorted(self.queues):
+                entry = self.__peek(self.queues[priority])
+                if entry is not None:
+                    # Remember the peeked request, so that pop_top_new_request() does not pop a request added while
+                    # the poller was taking resources for this one
+                    self.peeked_entry = entry
+                    res.newly_queued_request = entry[_REQUEST].model_preferences
+                    break
+            waiting_entries = []
+            for priority in sorted(self.wait_queues):
+                waiting_entries.extend(
+                    sorted(
+                        e for e in self.wait_queues[priority] if e[_REQUEST] is not None
+                    )
+                )
+            res.waiting_requests_list = [
+                e[_REQUEST].model_preferences for e in waiting_entries
+            ]
+            return res
+
+    async def pop_top_new_request(self) -> ScheduledRequest | None:
+        async with self.lock:
+            entry, self.peeked_entry = self.peeked_entry, None
+            if entry is None:
+                return self.__pop_top(self.queues, self.queue_sizes)
+            return self.__pop_entry(entry, self.queues, self.queue_sizes)
+
+    async def pop_top_waiting_request(self) -> ScheduledRequest | None:
+        async with self.lock:
+            return self.__pop_top(self.wait_queues, self.wait_queue_sizes)
+
+    async def has_request(self):
+        async with self.lock:
+            return bool(self.entries)
+
+    async def remove_request_by_id(self, req_id: str) -> bool:
+        async with self.lock:
+            if req_id not in self.entries:
+                return False
+            entry, sizes = self.entries.pop(req_id)
+            # Lazy deletion, the entry is dropped once it reaches the top of its heap
+            sizes[entry[_REQUEST].priority] -= 1
+            entry[_REQUEST] = None
+            return True
+
+    def get_queue_depths(self) -> tuple[int, int]:
+        return sum(self.queue_sizes.values()), sum(self.wait_queue_sizes.values())
+
+    def get_ttl_in_seconds(self, request: ScheduledRequest) -> float | None:
+        return self.__get_limits(request.priority).ttl_in_seconds
+
+    async def wait_for_request(self, timeout: float | None = None):
+        try:
+            async with asyncio.timeout(timeout):
+                await self.request_added_event.wait()
+        except TimeoutError:
+            pass
+        self.request_added_event.clear()
+
+    def notify_request_available(self):
+        self.request_added_event.set()
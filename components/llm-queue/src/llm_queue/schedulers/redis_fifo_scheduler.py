@@ -0,0 +1,313 @@
+import asyncio
+from datetime import datetime
+import json
+import logging
+import uuid
+
+from llm_queue.base.base_classes import BaseScheduler
+from llm_queue.base.config_data_classes import LLMQueueSchedulerLimits
+from llm_queue.base.custom_errors import SchedulerQueueFullError
+from llm_queue.base.data_classes import (
+    ModelPreferences,
+    ScheduledRequest,
+    TopQueuedRequest,
+)
+
+# KEYS: sorted set, sequence counter, requests hash, model prefs hash
+# ARGV: max queue size, req_id, request envelope, model prefs, channel to publish the req_id on ('' to skip)
+_ADD_SCRIPT = """
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+local seq = redis.call('INCR', KEYS[2])
+redis.call('ZADD', KEYS[1], seq, ARGV[2])
+redis.call('HSET', KEYS[3], ARGV[2], ARGV[3])
+redis.call('HSET', KEYS[4], ARGV[2], ARGV[4])
+if ARGV[5] ~= '' then
+    redis.call('PUBLISH', ARGV[5], ARGV[2])
+end
+return 1
+"""
+
+# KEYS: sorted set, requests hash, model prefs hash
+# ARGV: req_id to pop, or '' to pop the top of the sorted set
+_POP_SCRIPT = """
+local req_id = ARGV[1]
+if req_id == '' then
+    local top = redis.call('ZRANGE', KEYS[1], 0, 0)
+    if #top == 0 then
+        return false
+    end
+    req_id = top[1]
+end
+if redis.call('ZREM', KEYS[1], req_id) == 0 then
+    return false
+end
+local envelope = redis.call('HGET', KEYS[2], req_id)
+redis.call('HDEL', KEYS[2], req_id)
+redis.call('HDEL', KEYS[3], req_id)
+return envelope
+"""
+
+# KEYS: main sorted set, wait sorted set, model prefs hash
+# Returns a flat list of req_id, model prefs pairs. The first pair is the top of the main queue, or empty strings.
+_PEEK_SCRIPT = """
+local res = {'', ''}
+local top = redis.call('ZRANGE', KEYS[1], 0, 0)
+if #top > 0 then
+    res[1] = top[1]
+    res[2] = redis.call('HGET', KEYS[3], top[1]) or ''
+end
+for _, req_id in ipairs(redis.call('ZRANGE', KEYS[2], 0, -1)) do
+    table.insert(res, req_id)
+    table.insert(res, redis.call('HGET', KEYS[3], req_id) or '')
+end
+return res
+"""
+
+# KEYS: main sorted set, wait sorted set, requests hash, model prefs hash
+# ARGV: req_id
+_REMOVE_SCRIPT = """
+local removed = redis.call('ZREM', KEYS[1], ARGV[1]) + redis.call('ZREM', KEYS[2], ARGV[1])
+if removed > 0 then
+    redis.call('HDEL', KEYS[3], ARGV[1])
+    redis.call('HDEL', KEYS[4], ARGV[1])
+end
+return removed
+"""
+
+
+def _decode(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class RedisFIFOScheduler(BaseScheduler):
+    """
+    A FIFO scheduler whose main and wait queues live in Redis sorted sets, so that several LLM Queue instances (e.g.
+    app service replicas) drain one global queue. Requests are ordered by a sequence number from a shared Redis counter.
+    Every queue operation runs as a single Lua script, so it is atomic across instances and costs one round trip.
+
+    A request can be popped and processed by a different instance than the one whose caller awaits it. The processing
+    instance publishes the response, together with the telemetry data, on the response channel of the originating
+    instance, which resolves the caller's future. New requests are announced on a shared channel, so event driven
+    pollers of all instances wake up without polling Redis.
+
+    Use it together with a load balancer that shares its state across instances, e.g. `RedisEvenlySpacedRequestLB`,
+    so that all instances respect one global rate budget.
+
+    Parameters:
+        limits (LLMQueueSchedulerLimits): Limits of the global queues.
+        redis_client: An asyncio Redis client, e.g. `aioredis.from_url(...)` or `fakeredis.aioredis.FakeRedis()`.
+        key_prefix (str): Prefix of the Redis keys and channels, instances sharing a queue must use the same prefix.
+    """
+
+    def __init__(
+        self,
+        limits: LLMQueueSchedulerLimits,
+        redis_client,
+        key_prefix: str = "llm_queue:scheduler",
+    ):
+        self.logging = logging.getLogger(__name__)
+        self.limits = LLMQueueSchedulerLimits(**limits)
+        self.redis = redis_client
+        self.instance_id = str(uuid.uuid4())
+
+        self.queue_key = f"{key_prefix}:queue"
+        self.wait_queue_key = f"{key_prefix}:wait_queue"
+        self.seq_key = f"{key_prefix}:seq"
+        self.requests_key = f"{key_prefix}:requests"
+        self.model_prefs_key = f"{key_prefix}:model_prefs"
+        self.request_added_channel = f"{key_prefix}:request_added"
+        self.response_channel_prefix = f"{key_prefix}:responses"
+
+        # register_script() runs the scripts with EVALSHA and falls back to EVAL when the script is not cached
+        self.add_script = self.redis.register_script(_ADD_SCRIPT)
+        self.pop_script = self.redis.register_script(_POP_SCRIPT)
+        self.peek_script = self.redis.register_script(_PEEK_SCRIPT)
+        self.remove_script = self.redis.register_script(_REMOVE_SCRIPT)
+
+        # Requests added by this instance, kept so that their callers' telemetry objects are updated in place
+        self.local_requests: dict[str, ScheduledRequest] = {}
+        # Origin instance id of popped requests that were added by other instances
+        self.remote_origins: dict[str, str] = {}
+        self.peeked_req_id = None
+        self.remote_response_handler = None
+        self.pubsub = None
+        self.listener_task = None
+        # Set whenever a new request is added by any instance, lets the poller sleep until there is work to do
+        self.request_added_event = asyncio.Event()
+
+    def __get_response_channel(self, instance_id: str) -> str:
+        return f"{self.response_channel_prefix}:{instance_id}"
+
+    async def connect(self):
+        self.pubsub = self.redis.pubsub()
+        await self.pubsub.subscribe(
+            self.request_added_channel, self.__get_response_channel(self.instance_id)
+        )
+        self.listener_task = asyncio.create_task(self.__listen())
+
+    async def disconnect(self):
+        if self.listener_task:
+            self.listener_task.cancel()
+            try:
+                await self.listener_task
+            except asyncio.CancelledError:
+                pass
+        if self.pubsub:
+            await self.pubsub.unsubscribe()
+            # redis-py deprecates close() in favour of aclose(), aioredis only provides close()
+            aclose = getattr(self.pubsub, "aclose", None) or self.pubsub.close
+            await aclose()
+
+    async def __listen(self):
+        async for message in self.pubsub.listen():
+            if message["type"] != "message":
+                continue
+            try:
+                if _decode(message["channel"]) == self.request_added_channel:
+                    self.notify_request_available()
+                else:
+                    self.__handle_remote_response(json.loads(_decode(message["data"])))
+            except Exception as err:
+                self.logging.error(f"[REDIS SCHEDULER] FAILED TO HANDLE MESSAGE: {err}")
+
+    def __handle_remote_response(self, message: dict):
+        request = self.local_requests.pop(message["req_id"], None)
+        if request is None:
+            # The caller has already timed out
+            return
+        for field, value in message["telemetry_data"].items():
+            setattr(request.telemetry_data, field, value)
+        if self.remote_response_handler:
+            self.remote_response_handler(
+                request.req_id,
+                message["response"],
+                message["status_code"],
+                request.telemetry_data,
+            )
+
+    async def __add(
+        self, queue_key: str, request: ScheduledRequest, queue_name: str, channel: str
+    ):
+        origin = self.remote_origins.pop(request.req_id, self.instance_id)
+        envelope = json.dumps(
+            {"origin": origin, "request": request.model_dump(mode="json")}
+        )
+        if origin == self.instance_id:
+            # Registered before the request is visible to other instances, which may respond right away
+            self.local_requests[request.req_id] = request
+        added = await self.add_script(
+            keys=[queue_key, self.seq_key, self.requests_key, self.model_prefs_key],
+            args=[
+                self.limits.max_queue_size,
+                request.req_id,
+                envelope,
+                request.model_preferences.model_dump_json(),
+                channel,
+            ],
+        )
+        if not int(added):
+            self.local_requests.pop(request.req_id, None)
+            raise SchedulerQueueFullError(
+                f"{queue_name} is full. Max: {self.limits.max_queue_size}"
+            )
+        self.logging.debug(f"Request {request.req_id} added to {queue_name.lower()}")
+
+    async def add_request_to_wait_queue(self, request: ScheduledRequest):
+        await self.__add(self.wait_queue_key, request, "Wait queue", "")
+
+    async def add_request(self, request: ScheduledRequest):
+        request.telemetry_data.request_queued_at = int(datetime.now().timestamp())
+        await self.__add(
+            self.queue_key, request, "Main queue", self.request_added_channel
+        )
+
+    async def __pop(self, queue_key: str, req_id: str = "") -> ScheduledRequest | None:
+        envelope = await self.pop_script(
+            keys=[queue_key, self.requests_key, self.model_prefs_key], args=[req_id]
+        )
+        if envelope is None:
+            return None
+        envelope = json.loads(_decode(envelope))
+        req_id = envelope["request"]["req_id"]
+        if envelope["origin"] == self.instance_id and req_id in self.local_requests:
+            return self.local_requests.pop(req_id)
+        self.remote_origins[req_id] = envelope["origin"]
+        return ScheduledRequest.model_validate(envelope["request"])
+
+    async def get_top_requests_model_prefs(self) -> TopQueuedRequest:
+        res = TopQueuedRequest()
+        peeked = [
+            _decode(value)
+            for value in await self.peek_script(
+                keys=[self.queue_key, self.wait_queue_key, self.model_prefs_key]
+            )
+        ]
+        # Remember the peeked request, so that pop_top_new_request() does not pop a request another instance added in between
+        self.peeked_req_id = peeked[0] or None
+        if peeked[0]:
+            res.newly_queued_request = ModelPreferences.model_validate_json(peeked[1])
+        res.waiting_requests_list = [
+            ModelPreferences.model_validate_json(model_prefs)
+            for model_prefs in peeked[3::2]
+            if model_prefs
+        ]
+        return res
+
+    async def pop_top_new_request(self) -> ScheduledRequest | None:
+        req_id, self.peeked_req_id = self.peeked_req_id, None
+        # Returns None if the peeked request has been popped by another instance in the meantime
+        return await self.__pop(self.queue_key, req_id or "")
+
+    async def pop_top_waiting_request(self) -> ScheduledRequest | None:
+        return await self.__pop(self.wait_queue_key)
+
+    async def has_request(self):
+        return await self.redis.exists(self.queue_key, self.wait_queue_key) > 0
+
+    async def remove_request_by_id(self, req_id: str) -> bool:
+        removed = await self.remove_script(
+            keys=[
+                self.queue_key,
+                self.wait_queue_key,
+                self.requests_key,
+                self.model_prefs_key,
+            ],
+            args=[req_id],
+        )
+        if int(removed):
+            self.local_requests.pop(req_id, None)
+        return bool(int(removed))
+
+    def is_remote_request(self, request: ScheduledRequest) -> bool:
+        return request.req_id in self.remote_origins
+
+    async def send_response(
+        self, request: ScheduledRequest, response, status_code: int
+    ):
+        origin = self.remote_origins.pop(request.req_id)
+        message = json.dumps(
+            {
+                "req_id": request.req_id,
+                "response": response,
+                "status_code": status_code,
+                "telemetry_data": request.telemetry_data.model_dump(mode="json"),
+            },
+            default=str,
+        )
+        await self.redis.publish(self.__get_response_channel(origin), message)
+
+    def set_remote_response_handler(self, handler):
+        self.remote_response_handler = handler
+
+    async def wait_for_request(self, timeout: float | None = None):
+        try:
+            async with asyncio.timeout(timeout):
+                await self.request_added_event.wait()
+        except TimeoutError:
+            pass
+        self.request_added_event.clear()
+
+    def notify_request_available(self):
+        self.request_added_event.set()
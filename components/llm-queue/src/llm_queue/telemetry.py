@@ -1,4 +1,5 @@
 import asyncio
+from collections import deque
 import logging
 
 from llm_queue.base.adapter_base_classes import TelemetryDataStoreAdapter
@@ -6,33 +7,112 @@ from llm_queue.base.data_classes import TelemetryData
 
 
 class Telemetry:
-    def __init__(self, data_store: TelemetryDataStoreAdapter = None):
+    """
+    Buffers telemetry rows in a bounded in-memory ring buffer and sinks them in batches from a single
+    background flusher, instead of one task and one datastore write per request.
+
+    A batch is flushed once `flush_batch_size` rows are buffered or `flush_interval_in_ms` has passed
+    since the last flush. When the datastore cannot keep up and the buffer is full, the oldest rows are
+    dropped so that request handling never blocks on telemetry. `get_stats()` exposes the buffer fill
+    and the drop and failure counters. Pending rows are flushed by `disconnect_database()`.
+
+    Parameters:
+        data_store (TelemetryDataStoreAdapter, optional): Datastore to sink telemetry into, telemetry is discarded if None.
+        max_buffer_size (int): Maximum number of buffered rows.
+        flush_batch_size (int): Number of rows that triggers a flush and maximum rows per datastore write.
+        flush_interval_in_ms (int): Maximum time a row waits in the buffer while the flusher is idle.
+    """
+
+    def __init__(
+        self,
+        data_store: TelemetryDataStoreAdapter = None,
+        max_buffer_size: int = 10000,
+        flush_batch_size: int = 500,
+        flush_interval_in_ms: int = 1000,
+    ):
         self.data_store = data_store
         self.logging = logging.getLogger(__name__)
+        self.flush_batch_size = flush_batch_size
+        self.flush_interval_in_ms = flush_interval_in_ms
+
+        self.buffer: deque[TelemetryData] = deque(maxlen=max_buffer_size)
+        self.flush_event = asyncio.Event()
+        # Set by disconnect_database() to stop the flusher once its in-flight batch is written
+        self.stop_event = asyncio.Event()
+        self.flusher_task = None
+        self.num_sunk = 0
+        self.num_dropped = 0
+        self.num_failed = 0
 
     async def disconnect_database(self):
         if self.data_store:
+            if self.flusher_task:
+                # Cancelling the flusher could drop a batch already taken from the buffer, let it finish instead
+                self.stop_event.set()
+                self.flush_event.set()
+                await self.flusher_task
+                self.flusher_task = None
+            # Sink whatever is still buffered before closing the connection
+            while self.buffer:
+                await self.__flush_batch()
             await self.data_store.disconnect()
 
     async def connect_database(self):
         if self.data_store:
             await self.data_store.connect()
+            self.stop_event.clear()
+            self.flusher_task = asyncio.create_task(self.__flush_periodically())
 
-    async def __sink_with_error(self, error, telemetry_data: TelemetryData):
-        if self.data_store:
-            telemetry_data.error_message = str(error)
-            await self.data_store.insert_telemetry_data(telemetry_data)
-            self.logging.debug("SINKED ERROR TELEMETRY")
+    def get_stats(self) -> dict:
+        """
+        Returns:
+            dict: The number of buffered rows, the buffer capacity, and the number of sunk, dropped and failed rows.
+        """
+        return {
+            "buffered": len(self.buffer),
+            "capacity": self.buffer.maxlen,
+            "sunk": self.num_sunk,
+            "dropped": self.num_dropped,
+            "failed": self.num_failed,
+        }
 
-    async def __sink_successfull(self, telemetry_data: TelemetryData):
-        if self.data_store:
-            await self.data_store.insert_telemetry_data(telemetry_data)
-            self.logging.debug("SINKED SUCCESS TELEMETRY")
+    async def __flush_periodically(self):
+        while not self.stop_event.is_set():
+            try:
+                async with asyncio.timeout(self.flush_interval_in_ms / 1000):
+                    await self.flush_event.wait()
+            except TimeoutError:
+                pass
+            self.flush_event.clear()
+            while self.buffer:
+                await self.__flush_batch()
+
+    async def __flush_batch(self):
+        batch = [
+            self.buffer.popleft()
+            for _ in range(min(self.flush_batch_size, len(self.buffer)))
+        ]
+        try:
+            await self.data_store.insert_telemetry_data_batch(batch)
+            self.num_sunk += len(batch)
+            self.logging.debug(f"SINKED {len(batch)} TELEMETRY ROWS")
+        except Exception as err:
+            self.num_failed += len(batch)
+            self.logging.error(f"FAILED TO SINK {len(batch)} TELEMETRY ROWS: {err}")
+
+    def __buffer(self, telemetry_data: TelemetryData):
+        if len(self.buffer) == self.buffer.maxlen:
+            # The ring buffer overwrites the oldest row
+            self.num_dropped += 1
+        self.buffer.append(telemetry_data)
+        if len(self.buffer) >= self.flush_batch_size:
+            self.flush_event.set()
 
     def sink_with_error(self, error, telemetry_data: TelemetryData):
         if self.data_store:
-            asyncio.create_task(self.__sink_with_error(error, telemetry_data))
+            telemetry_data.error_message = str(error)
+            self.__buffer(telemetry_data)
 
     def sink_successfull(self, telemetry_data: TelemetryData):
         if self.data_store:
-            asyncio.create_task(self.__sink_successfull(telemetry_data))
+            self.__buffer(telemetry_data)
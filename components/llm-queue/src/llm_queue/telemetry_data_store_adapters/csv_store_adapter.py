@@ -34,6 +34,14 @@ class CSVTelemetryDataStore(TelemetryDataStoreAdapter):
             self.executor, self._append_row, data_dict
         )
 
+    async def insert_telemetry_data_batch(
+        self, telemetry_data_list: list[TelemetryData]
+    ):
+        data_dicts = [telemetry_data.dict() for telemetry_data in telemetry_data_list]
+        await asyncio.get_event_loop().run_in_executor(
+            self.executor, self._append_rows, data_dicts
+        )
+
     def _write_headers(self):
         headers = TelemetryData.__fields__.keys()
         self._write_row(headers, "w+")
@@ -42,6 +50,15 @@ class CSVTelemetryDataStore(TelemetryDataStoreAdapter):
         row = [data_dict[field] for field in TelemetryData.__fields__]
         self._write_row(row)
 
+    def _append_rows(self, data_dicts):
+        # One open and one write for the whole batch
+        with open(self.file_path, "a", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerows(
+                [data_dict[field] for field in TelemetryData.__fields__]
+                for data_dict in data_dicts
+            )
+
     def _write_row(self, row, mode="a"):
         with open(self.file_path, mode, newline="") as file:
             writer = csv.writer(file)
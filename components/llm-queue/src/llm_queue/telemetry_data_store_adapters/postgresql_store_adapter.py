@@ -12,6 +12,24 @@ class PostgresqlTelemetryStoreAdapter(TelemetryDataStoreAdapter):
         db_name, user, password and host: PostgreSQL database credentials
     """
 
+    # Column order of the values returned by __get_sql_insert_query()
+    COLUMNS = [
+        "req_id",
+        "user_id",
+        "req_payload",
+        "req_type",
+        "deployment_name",
+        "request_received_at",
+        "request_queued_at",
+        "request_dequeued_at",
+        "response_queued_at",
+        "response_dequeued_at",
+        "prompt_tokens",
+        "completion_tokens",
+        "embedding_tokens",
+        "error_message",
+    ]
+
     def __init__(self, db_name: str, user: str, password: str, host: str):
         self.db_name = db_name
         self.user = user
@@ -54,6 +72,19 @@ class PostgresqlTelemetryStoreAdapter(TelemetryDataStoreAdapter):
         async with self.pool.acquire() as conn:
             await conn.execute(insert_query, *values)
 
+    async def insert_telemetry_data_batch(
+        self, telemetry_data_list: list[TelemetryData]
+    ):
+        # COPY sends the whole batch in one round trip
+        records = [
+            self.__get_sql_insert_query(self.table_name, telemetry_data)[1]
+            for telemetry_data in telemetry_data_list
+        ]
+        async with self.pool.acquire() as conn:
+            await conn.copy_records_to_table(
+                self.table_name, records=records, columns=self.COLUMNS
+            )
+
     def __get_sql_insert_query(self, table_name: str, telemetry_data: TelemetryData):
         query = f"""
             INSERT INTO {table_name}
@@ -1,4 +1,7 @@
 import asyncio
+from collections import deque
+import logging
+import time
 from typing import Tuple
 
 from llm_queue.base.adapter_base_classes import UserRateLimitsDatastoreAdapter
@@ -9,48 +12,86 @@ class InMemoryUserRateLimitStoreAdapter(UserRateLimitsDatastoreAdapter):
     An implementation of UserRateLimitsDatastoreAdapter that uses in-memory storage
     to manage user rate limits. This class provides functionality to check and add
     user requests against specified rate limits within a time window.
+
+    Every user has a ring buffer of at most `limit` request timestamps, and the time at which
+    the newest of them leaves the window. A background sweeper evicts the users without requests
+    in their window, so memory stays proportional to the number of active users.
+
+    A check never awaits, so it runs atomically on the event loop without any locks.
     """
 
-    def __init__(self):
+    def __init__(self, sweep_interval_in_seconds: float = 60):
         """
-        Initializes the in-memory storage and lock dictionaries for managing user rate limits.
+        Initializes the in-memory storage for managing user rate limits.
+
+        Parameters:
+            sweep_interval_in_seconds (float): How often idle users are evicted.
         """
-        self.storage = {}
-        self.locks = {}
+        self.logging = logging.getLogger(__name__)
+        self.sweep_interval_in_seconds = sweep_interval_in_seconds
+        # Maps user_id to the ring buffer of request timestamps in ms
+        self.storage: dict[str, deque] = {}
+        # Maps user_id to the time in ms at which all of its requests have left the window
+        self.expiry_times: dict[str, int] = {}
+        self.sweeper_task = None
 
     async def connect(self):
         """
-        Since the storage is in-memory, this method does nothing as there is nothing to connect to.
+        Starts the background sweeper that evicts idle users.
         """
-        pass
+        if self.sweeper_task is None:
+            self.sweeper_task = asyncio.create_task(self.__sweep_idle_users())
 
     async def disconnect(self):
         """
-        Clears the in-memory storage to simulate disconnection.
+        Stops the sweeper and clears the in-memory storage to simulate disconnection.
         """
+        if self.sweeper_task is not None:
+            self.sweeper_task.cancel()
+            try:
+                await self.sweeper_task
+            except asyncio.CancelledError:
+                pass
+            self.sweeper_task = None
         self.storage.clear()
-
-    async def _get_lock(self, user_id: str):
+        self.expiry_times.clear()
+
+    async def __sweep_idle_users(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval_in_seconds)
+            num_evicted = self._evict_idle_users(int(time.time() * 1000))
+            if num_evicted:
+                self.logging.debug(
+                    f"[USER RATE LIMITER] EVICTED {num_evicted} IDLE USERS"
+                )
+
+    def _evict_idle_users(self, now: int) -> int:
         """
-        Retrieves or creates an asyncio lock for the specified user ID to ensure thread-safe operations.
+        Removes the users whose requests have all left their time window.
 
         Parameters:
-            user_id (str): The unique identifier for the user.
+            now (int): The current time in ms.
 
         Returns:
-            asyncio.Lock: The lock associated with the specified user ID.
+            int: The number of evicted users.
         """
-        if user_id not in self.locks:
-            self.locks[user_id] = asyncio.Lock()
-        return self.locks[user_id]
+        idle_user_ids = [
+            user_id
+            for user_id, expiry_time in self.expiry_times.items()
+            if expiry_time <= now
+        ]
+        for user_id in idle_user_ids:
+            del self.storage[user_id]
+            del self.expiry_times[user_id]
+        return len(idle_user_ids)
 
     async def check_and_add_request(
         self, user_id: str, limit: int, now: int, window_len: int
     ) -> Tuple[bool, float]:
         """
         Checks if a new request by a user exceeds the set rate limit within a defined time window,
-        and adds the request to the in-memory storage if it does not exceed the limit. Manages requests
-        in a thread-safe manner using asyncio locks.
+        and adds the request to the in-memory storage if it does not exceed the limit. Runs in
+        amortized O(1), as every timestamp is added and dropped from the ring buffer once.
 
         Parameters:
             user_id (str): The unique identifier for the user.
@@ -63,30 +104,28 @@ class InMemoryUserRateLimitStoreAdapter(UserRateLimitsDatastoreAdapter):
                                  without exceeding the limit, and a float indicating the remaining time
                                  until the window resets, if the limit is exceeded.
         """
-        lock = await self._get_lock(user_id)
-        async with lock:
-            # Ensure the user's request list exists
-            if user_id not in self.storage:
-                self.storage[user_id] = []
-
-            requests = self.storage[user_id]
-
-            # Calculate the start of the window
-            window_start = now - (window_len * 1000)
-
-            # Remove requests outside of the current window
-            self.storage[user_id] = [req for req in requests if req > window_start]
-
-            # Check if adding a new request would exceed the limit
-            if len(self.storage[user_id]) >= limit:
-                # Calculate the remaining time until the oldest request exits the window
-                oldest_request = self.storage[user_id][0]
-                remaining_time = ((oldest_request - window_start) / 1000) + window_len
-                return False, remaining_time
-
-            # Add the new request
-            self.storage[user_id].append(now)
-            # Ensure the list is sorted; this may be redundant if timestamps are always increasing
-            self.storage[user_id].sort()
-
-            return True, None
+        # Calculate the start of the window
+        window_start = now - (window_len * 1000)
+        if limit <= 0:
+            return False, window_len
+
+        requests = self.storage.get(user_id)
+        if requests is None or requests.maxlen != limit:
+            # At most `limit` requests can be in the window, so the ring buffer never has to grow
+            requests = deque(requests or (), maxlen=limit)
+            self.storage[user_id] = requests
+
+        # Remove requests outside of the current window
+        while requests and requests[0] <= window_start:
+            requests.popleft()
+
+        # Check if adding a new request would exceed the limit
+        if len(requests) >= limit:
+            # Calculate the remaining time until the oldest request exits the window
+            remaining_time = (requests[0] - window_start) / 1000
+            return False, remaining_time
+
+        # Timestamps are appended in order, unless callers pass an older `now` than a previous call
+        requests.append(max(now, requests[-1]) if requests else now)
+        self.expiry_times[user_id] = requests[-1] + window_len * 1000
+        return True, None
@@ -3,6 +3,23 @@ from llm_queue.base.adapter_base_classes import UserRateLimitsDatastoreAdapter
 import aioredis
 import uuid
 
+# KEYS: sorted set of the user's request timestamps
+# ARGV: now in ms, window length in ms, limit, unique member for the new request
+# Returns {1, ''} if the request was added, or {0, score of the oldest request in the window} if the limit is exceeded.
+_CHECK_AND_ADD_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window_len = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window_len)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    local first = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {0, first[2]}
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+-- Every timestamp has left the window once the key expires, so idle users do not leave their sorted sets behind
+redis.call('PEXPIRE', KEYS[1], window_len)
+return {1, ''}
+"""
+
 
 class RedisUserRateLimitStoreAdapter(UserRateLimitsDatastoreAdapter):
     """
@@ -11,17 +28,19 @@ class RedisUserRateLimitStoreAdapter(UserRateLimitsDatastoreAdapter):
     user requests against specified rate limits within a time window.
     """
 
-    def __init__(self, redis_host: str, redis_password: str):
+    def __init__(self, redis_host: str, redis_password: str, redis_client=None):
         """
         Initializes the adapter with the Redis server credentials.
 
         Parameters:
             redis_host (str): The host address of the Redis server.
             redis_password (str): The password for accessing the Redis server.
+            redis_client (optional): An already created asyncio Redis client to use instead of connecting to redis_host.
         """
         self.redis_host = redis_host
         self.redis_password = redis_password
-        self.redis = None
+        self.redis = redis_client
+        self.check_and_add_script = None
 
     async def connect(self):
         """
@@ -29,14 +48,17 @@ class RedisUserRateLimitStoreAdapter(UserRateLimitsDatastoreAdapter):
 
         The connection parameters are determined based on whether the deployment is custom (e.g., Azure Container instance).
         """
-        is_custom_deployment = "azurecontainer" in self.redis_host
-        redis_port = 6379 if is_custom_deployment else 6380
-        url_scheme = "redis" if is_custom_deployment else "rediss"
-        self.redis = aioredis.from_url(
-            f"{url_scheme}://:{self.redis_password}@{self.redis_host}:{redis_port}",
-            encoding="utf-8",
-            decode_responses=True,
-        )
+        if self.redis is None:
+            is_custom_deployment = "azurecontainer" in self.redis_host
+            redis_port = 6379 if is_custom_deployment else 6380
+            url_scheme = "redis" if is_custom_deployment else "rediss"
+            self.redis = aioredis.from_url(
+                f"{url_scheme}://:{self.redis_password}@{self.redis_host}:{redis_port}",
+                encoding="utf-8",
+                decode_responses=True,
+            )
+        # register_script() runs the script with EVALSHA and falls back to EVAL when the script is not cached
+        self.check_and_add_script = self.redis.register_script(_CHECK_AND_ADD_SCRIPT)
 
     async def disconnect(self):
         """
@@ -49,8 +71,8 @@ class RedisUserRateLimitStoreAdapter(UserRateLimitsDatastoreAdapter):
     ) -> Tuple[bool, float]:
         """
         Checks if a new request by a user exceeds the set rate limit within a defined time window,
-        and adds the request to the Redis database if it does not exceed the limit. Manages requests
-        in a thread-safe manner using Redis transactions and optimistic locking.
+        and adds the request to the Redis database if it does not exceed the limit. The check and the add
+        run atomically as one Lua script, so each request costs a single round trip and never retries.
 
         Parameters:
             user_id (str): The unique identifier for the user.
@@ -63,30 +85,11 @@ class RedisUserRateLimitStoreAdapter(UserRateLimitsDatastoreAdapter):
                                  without exceeding the limit, and a float indicating the remaining time
                                  until the window resets, if the limit is exceeded.
         """
-        window_start = now - window_len * 1000
-        async with self.redis.pipeline() as pipe:
-            while True:
-                try:
-                    await pipe.watch(user_id)
-
-                    # Remove the requests older than the window_start
-                    await pipe.zremrangebyscore(user_id, 0, window_start)
-
-                    size = await pipe.zcard(user_id)
-
-                    if size >= limit:
-                        first_score = int(
-                            (await pipe.zrange(user_id, 0, 0, withscores=True))[0][1]
-                        )
-                        remaining_time = window_len - (now - first_score) / 1000
-                        await pipe.unwatch()
-                        return False, remaining_time
-                    else:
-                        pipe.multi()
-                        value = str(uuid.uuid4())
-                        zadd_data = {value: now}
-                        await pipe.zadd(user_id, zadd_data)
-                        await pipe.execute()
-                        return True, None
-                except aioredis.WatchError:
-                    continue
+        allowed, first_score = await self.check_and_add_script(
+            keys=[user_id],
+            args=[now, window_len * 1000, limit, str(uuid.uuid4())],
+        )
+        if int(allowed):
+            return True, None
+        remaining_time = window_len - (now - int(first_score)) / 1000
+        return False, remaining_time
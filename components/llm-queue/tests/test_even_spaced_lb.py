@@ -0,0 +1,50 @@
+import asyncio
+
+from llm_queue.base.config_data_classes import AzureAOIModels
+from llm_queue.load_balancers import EvenlySpacedRequestLB
+
+
+def create_model(unique_model_id: str, req_per_min=600, error_backoff_in_seconds=60):
+    return AzureAOIModels(
+        unique_model_id=unique_model_id,
+        model_type="completion",
+        req_per_min=req_per_min,
+        tokens_per_min=60000,
+        error_backoff_in_seconds=error_backoff_in_seconds,
+        model_name_in_azure="gpt-4o",
+        deployment_name_in_azure=unique_model_id,
+    )
+
+
+async def test_spacing_end_notifies_listener():
+    released = asyncio.Event()
+    # 600 RPM spaces requests 0.1s apart
+    lb = EvenlySpacedRequestLB([create_model("gpt-a")])
+    lb.set_capacity_release_listener(released.set)
+
+    assert lb.get_available_llm_id() == "gpt-a"
+    assert not lb.has_available_llm()
+    await asyncio.wait_for(released.wait(), 1)
+    assert lb.has_available_llm()
+
+
+async def test_error_backoff_end_notifies_listener():
+    released = asyncio.Event()
+    lb = EvenlySpacedRequestLB([create_model("gpt-a", error_backoff_in_seconds=0.1)])
+    lb.set_capacity_release_listener(released.set)
+
+    lb.register_error("gpt-a")
+    assert not lb.has_available_llm()
+    await asyncio.wait_for(released.wait(), 1)
+    assert lb.has_available_llm()
+
+
+def test_release_restores_spacing():
+    released = []
+    lb = EvenlySpacedRequestLB([create_model("gpt-a")])
+    lb.set_capacity_release_listener(lambda: released.append(True))
+
+    assert lb.get_available_llm_id() == "gpt-a"
+    lb.release_llm_id("gpt-a")
+    assert released
+    assert lb.get_available_llm_id() == "gpt-a"
@@ -0,0 +1,39 @@
+import asyncio
+
+from llm_queue.user_rate_limiter_adapters import InMemoryUserRateLimitStoreAdapter
+
+
+async def test_limit_is_enforced_within_window():
+    adapter = InMemoryUserRateLimitStoreAdapter()
+    assert await adapter.check_and_add_request("user", 2, 1_000, 10) == (True, None)
+    assert await adapter.check_and_add_request("user", 2, 2_000, 10) == (True, None)
+
+    allowed, remaining_time = await adapter.check_and_add_request("user", 2, 3_000, 10)
+    assert not allowed
+    # The oldest request, sent at 1s, leaves the 10s window at 11s
+    assert remaining_time == 8
+
+    assert await adapter.check_and_add_request("user", 2, 11_500, 10) == (True, None)
+    # The ring buffer never holds more than `limit` timestamps
+    assert len(adapter.storage["user"]) == 2
+
+
+async def test_idle_users_are_evicted():
+    adapter = InMemoryUserRateLimitStoreAdapter()
+    await adapter.check_and_add_request("idle-user", 2, 1_000, 10)
+    await adapter.check_and_add_request("active-user", 2, 9_000, 10)
+
+    assert adapter._evict_idle_users(11_000) == 1
+    assert list(adapter.storage) == ["active-user"]
+    assert list(adapter.expiry_times) == ["active-user"]
+
+
+async def test_sweeper_runs_in_background():
+    adapter = InMemoryUserRateLimitStoreAdapter(sweep_interval_in_seconds=0.01)
+    await adapter.connect()
+    # A request from long ago has already left its window
+    await adapter.check_and_add_request("user", 2, 1_000, 10)
+    await asyncio.sleep(0.05)
+    assert not adapter.storage
+    await adapter.disconnect()
+    assert adapter.sweeper_task is None
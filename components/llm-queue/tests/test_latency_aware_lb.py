@@ -0,0 +1,71 @@
+import time
+
+from llm_queue.base.config_data_classes import AzureAOIModels
+from llm_queue.load_balancers import LatencyAwareRequestLB
+from llm_queue.load_balancers.latency_aware_lb_in_mem import CircuitState
+
+
+def create_model(unique_model_id: str, req_per_min=60000, error_backoff_in_seconds=60):
+    return AzureAOIModels(
+        unique_model_id=unique_model_id,
+        model_type="completion",
+        req_per_min=req_per_min,
+        tokens_per_min=60000,
+        error_backoff_in_seconds=error_backoff_in_seconds,
+        model_name_in_azure="gpt-4o",
+        deployment_name_in_azure=unique_model_id,
+    )
+
+
+def test_prefers_faster_deployment():
+    lb = LatencyAwareRequestLB([create_model("gpt-slow"), create_model("gpt-fast")])
+    lb.register_success("gpt-slow", 4.0)
+    lb.register_success("gpt-fast", 1.0)
+    # With two deployments the power of two choices always compares both
+    assert lb.get_available_llm_id() == "gpt-fast"
+
+
+def test_spacing_spills_over_to_slower_deployment():
+    lb = LatencyAwareRequestLB(
+        [
+            create_model("gpt-slow", req_per_min=60),
+            create_model("gpt-fast", req_per_min=60),
+        ]
+    )
+    lb.register_success("gpt-slow", 4.0)
+    lb.register_success("gpt-fast", 1.0)
+    assert lb.get_available_llm_id() == "gpt-fast"
+    assert lb.get_available_llm_id() == "gpt-slow"
+    assert lb.get_available_llm_id() is None
+    assert 0 < lb.get_seconds_until_available() <= 1
+
+
+def test_circuit_opens_half_opens_and_closes():
+    lb = LatencyAwareRequestLB([create_model("gpt-a")], failure_threshold=2)
+    lb.register_error("gpt-a")
+    assert lb.get_circuit_state("gpt-a") == CircuitState.CLOSED
+    lb.register_error("gpt-a")
+    assert lb.get_circuit_state("gpt-a") == CircuitState.OPEN
+    assert not lb.has_available_llm()
+    assert lb.get_seconds_until_available() > 59
+
+    # Let the backoff pass
+    lb.llm_entity_health_map["gpt-a"].circuit_opened_at = time.time() - 60
+    assert lb.get_circuit_state("gpt-a") == CircuitState.HALF_OPEN
+    assert lb.get_available_llm_id() == "gpt-a"
+    # Only one probe is sent while half-open
+    assert not lb.has_available_llm()
+
+    lb.register_success("gpt-a", 1.0)
+    assert lb.get_circuit_state("gpt-a") == CircuitState.CLOSED
+    # Only the 1ms request spacing is left
+    assert lb.get_seconds_until_available() <= 0.001
+
+
+def test_failed_probe_reopens_circuit():
+    lb = LatencyAwareRequestLB([create_model("gpt-a")], failure_threshold=1)
+    lb.register_error("gpt-a")
+    lb.llm_entity_health_map["gpt-a"].circuit_opened_at = time.time() - 60
+    assert lb.get_available_llm_id() == "gpt-a"
+    lb.register_error("gpt-a")
+    assert lb.get_circuit_state("gpt-a") == CircuitState.OPEN
@@ -0,0 +1,80 @@
+import asyncio
+
+import yaml
+
+from llm_queue import LLMQueue
+from llm_queue.base import BaseRequestController
+from llm_queue.base.config_data_classes import LLMConfig
+from llm_queue.base.data_classes import ModelPreferences
+from llm_queue.metrics_adapters import InMemoryPrometheusMetricsAdapter
+
+LLM_CONFIG_PATH = "tests/configs/llm_config.yaml"
+TEST_REQUEST_TYPE = "test"
+
+
+def test_histogram_and_gauges_are_exported():
+    metrics_adapter = InMemoryPrometheusMetricsAdapter(buckets=[0.1, 1])
+    metrics_adapter.observe("latency_seconds", 0.05, {"stage": "total"})
+    metrics_adapter.observe("latency_seconds", 0.5, {"stage": "total"})
+    metrics_adapter.observe("latency_seconds", 5, {"stage": "total"})
+    metrics_adapter.increment("requests_total", labels={"outcome": "200"})
+    metrics_adapter.register_gauge("queue_depth", lambda: 3)
+    metrics_adapter.register_gauge(
+        "in_flight", lambda: {"gpt-a": 2}, label_name="deployment"
+    )
+    metrics_adapter.register_gauge("unsupported", lambda: None)
+
+    lines = metrics_adapter.export_prometheus_text().splitlines()
+    assert 'latency_seconds_bucket{stage="total",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{stage="total",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{stage="total",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{stage="total"} 3' in lines
+    assert 'requests_total{outcome="200"} 1.0' in lines
+    assert "queue_depth 3.0" in lines
+    assert 'in_flight{deployment="gpt-a"} 2.0' in lines
+    assert not any(line.startswith("unsupported") for line in lines)
+
+
+async def test_llm_queue_reports_stage_durations():
+    class MockRequestExecutor(BaseRequestController):
+        async def process_request(self, req, chosen_llm_ids, telemetry_data):
+            await asyncio.sleep(0.01)
+            return "done"
+
+    with open(LLM_CONFIG_PATH, "r") as file:
+        llm_config = LLMConfig(**yaml.safe_load(file))
+    metrics_adapter = InMemoryPrometheusMetricsAdapter()
+    llm_queue = LLMQueue(
+        llm_config,
+        {TEST_REQUEST_TYPE: MockRequestExecutor()},
+        event_driven_polling=True,
+        metrics_adapter=metrics_adapter,
+    )
+    await llm_queue.initiate()
+    try:
+        await llm_queue.execute_request(
+            req_type=TEST_REQUEST_TYPE,
+            request_data={},
+            user_id="test-user",
+            model_pref=ModelPreferences(),
+        )
+    finally:
+        await llm_queue.graceful_shutdown()
+
+    text = metrics_adapter.export_prometheus_text()
+    for stage in ("queue_wait", "dispatch", "processing", "response", "total"):
+        assert (
+            f'llm_queue_stage_duration_seconds_count{{req_type="test",stage="{stage}"}} 1'
+            in text
+        )
+    assert 'llm_queue_requests_total{outcome="200",req_type="test"} 1.0' in text
+    assert "llm_queue_main_queue_depth 0.0" in text
+    assert 'llm_queue_in_flight_requests{deployment="GPT4-o"} 0.0' in text
+    assert "llm_queue_pending_futures 0.0" in text
+    processing_sum = next(
+        line
+        for line in text.splitlines()
+        if line.startswith("llm_queue_stage_duration_seconds_sum")
+        and 'stage="processing"' in line
+    )
+    assert float(processing_sum.split()[-1]) >= 0.01
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from llm_queue import LLMQueue
+from llm_queue.base import BaseRequestController
+from llm_queue.base.config_data_classes import LLMConfig
+from llm_queue.base.data_classes import ModelPreferences
+from llm_queue.base.custom_errors import QueueTimeoutError
+
+TEST_REQUEST_TYPE = "test"
+
+
+def create_llm_config(scheduler_limits: dict) -> LLMConfig:
+    return LLMConfig(
+        azure_open_ai=[
+            {
+                "api_key": "***",
+                "api_version": "2023-03-15-preview",
+                "api_type": "azure",
+                "azure_endpoint": "https://***.openai.azure.com/",
+                "azure_oai_models": [
+                    {
+                        "unique_model_id": "gpt-a",
+                        "model_name_in_azure": "gpt-4o",
+                        "deployment_name_in_azure": "gpt-4o",
+                        "model_type": "completion",
+                        "req_per_min": 600000,
+                        "tokens_per_min": 10**9,
+                        "error_backoff_in_seconds": 60,
+                    }
+                ],
+            }
+        ],
+        user_limits={
+            "max_num_requests_in_time_window": 1000,
+            "time_window_length_in_seconds": 60,
+        },
+        scheduler_limits=scheduler_limits,
+        custom_models=[],
+    )
+
+
+@pytest.mark.parametrize("event_driven_polling", [False, True])
+async def test_fast_responses_reach_every_caller(event_driven_polling):
+    class NoOpRequestController(BaseRequestController):
+        async def process_request(self, req, chosen_llm_ids, telemetry_data):
+            return req["i"]
+
+    llm_queue = LLMQueue(
+        create_llm_config({"ttl_in_seconds": 30, "max_queue_size": 100}),
+        {TEST_REQUEST_TYPE: NoOpRequestController()},
+        event_driven_polling=event_driven_polling,
+    )
+    await llm_queue.initiate()
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                *(
+                    llm_queue.execute_request(
+                        req_type=TEST_REQUEST_TYPE,
+                        request_data={"i": i},
+                        user_id="test-user",
+                        model_pref=ModelPreferences(),
+                    )
+                    for i in range(30)
+                )
+            ),
+            timeout=20,
+        )
+        assert results == [(i, 200) for i in range(30)]
+        assert not llm_queue.poller.futures
+    finally:
+        await llm_queue.graceful_shutdown()
+
+
+@pytest.mark.parametrize("event_driven_polling", [False, True])
+async def test_missing_response_times_out(event_driven_polling):
+    release = asyncio.Event()
+
+    class StuckRequestController(BaseRequestController):
+        async def process_request(self, req, chosen_llm_ids, telemetry_data):
+            await release.wait()
+            return "late"
+
+    llm_queue = LLMQueue(
+        create_llm_config(
+            {
+                "ttl_in_seconds": 1,
+                "max_queue_size": 100,
+                "response_timeout_in_seconds": 0.3,
+            }
+        ),
+        {TEST_REQUEST_TYPE: StuckRequestController()},
+        event_driven_polling=event_driven_polling,
+    )
+    await llm_queue.initiate()
+    try:
+        with pytest.raises(QueueTimeoutError):
+            await asyncio.wait_for(
+                llm_queue.execute_request(
+                    req_type=TEST_REQUEST_TYPE,
+                    request_data={},
+                    user_id="test-user",
+                    model_pref=ModelPreferences(),
+                ),
+                timeout=5,
+            )
+        assert not llm_queue.poller.futures
+        # The late response is dropped
+        release.set()
+        await asyncio.sleep(0.2)
+        assert not llm_queue.poller.futures
+    finally:
+        await llm_queue.graceful_shutdown()
@@ -0,0 +1,94 @@
+import pytest
+from llm_queue.base.custom_errors import SchedulerQueueFullError
+from llm_queue.base.data_classes import ScheduledRequest, TelemetryData
+from llm_queue.schedulers import PriorityFairScheduler
+
+DEFAULT_LIMITS = {"ttl_in_seconds": 300, "max_queue_size": 100}
+
+
+def create_request(req_id: str, user_id: str, req_type="chat", priority=0):
+    return ScheduledRequest(
+        req_type=req_type,
+        req_id=req_id,
+        payload={},
+        priority=priority,
+        telemetry_data=TelemetryData(
+            user_id=user_id, req_id=req_id, req_payload="", req_type=req_type
+        ),
+    )
+
+
+async def pop_all_ids(scheduler: PriorityFairScheduler):
+    ids = []
+    while (request := await scheduler.pop_top_new_request()) is not None:
+        ids.append(request.req_id)
+    return ids
+
+
+async def test_higher_priority_class_served_first():
+    scheduler = PriorityFairScheduler(DEFAULT_LIMITS)
+    await scheduler.add_request(create_request("bulk-1", "u1", priority=1))
+    await scheduler.add_request(create_request("chat-1", "u2", priority=0))
+    assert await pop_all_ids(scheduler) == ["chat-1", "bulk-1"]
+
+
+async def test_flows_are_interleaved_within_a_class():
+    scheduler = PriorityFairScheduler(DEFAULT_LIMITS)
+    for i in range(3):
+        await scheduler.add_request(create_request(f"a-{i}", "user-a"))
+    await scheduler.add_request(create_request("b-0", "user-b"))
+    assert await pop_all_ids(scheduler) == ["a-0", "b-0", "a-1", "a-2"]
+
+
+async def test_req_type_weights():
+    scheduler = PriorityFairScheduler(DEFAULT_LIMITS, req_type_weights={"qp": 2})
+    for i in range(4):
+        await scheduler.add_request(create_request(f"qp-{i}", "u", req_type="qp"))
+        await scheduler.add_request(create_request(f"chat-{i}", "u"))
+    popped = (await pop_all_ids(scheduler))[:6]
+    assert sum(req_id.startswith("qp") for req_id in popped) == 4
+
+
+async def test_remove_request_by_id_is_lazy():
+    scheduler = PriorityFairScheduler(DEFAULT_LIMITS)
+    await scheduler.add_request(create_request("r-0", "u1"))
+    await scheduler.add_request(create_request("r-1", "u2"))
+    await scheduler.remove_request_by_id("r-0")
+    top = await scheduler.get_top_requests_model_prefs()
+    assert top.newly_queued_request is not None
+    assert await pop_all_ids(scheduler) == ["r-1"]
+    assert not await scheduler.has_request()
+
+
+async def test_per_class_limits():
+    scheduler = PriorityFairScheduler(
+        DEFAULT_LIMITS,
+        priority_class_limits={1: {"ttl_in_seconds": 3600, "max_queue_size": 1}},
+    )
+    await scheduler.add_request(create_request("bulk-1", "u", priority=1))
+    with pytest.raises(SchedulerQueueFullError):
+        await scheduler.add_request(create_request("bulk-2", "u", priority=1))
+    await scheduler.add_request(create_request("chat-1", "u", priority=0))
+    assert scheduler.get_ttl_in_seconds(create_request("x", "u", priority=1)) == 3600
+    assert scheduler.get_ttl_in_seconds(create_request("y", "u", priority=0)) == 300
+
+
+async def test_pop_returns_the_peeked_request():
+    scheduler = PriorityFairScheduler(DEFAULT_LIMITS)
+    await scheduler.add_request(create_request("bulk-1", "u1", priority=1))
+    await scheduler.get_top_requests_model_prefs()
+    # Added while the poller takes resources for the peeked request
+    await scheduler.add_request(create_request("chat-1", "u2", priority=0))
+    assert (await scheduler.pop_top_new_request()).req_id == "bulk-1"
+    assert await pop_all_ids(scheduler) == ["chat-1"]
+    assert scheduler.get_queue_depths() == (0, 0)
+
+
+async def test_removed_peeked_request_is_not_popped():
+    scheduler = PriorityFairScheduler(DEFAULT_LIMITS)
+    await scheduler.add_request(create_request("a-0", "u1"))
+    await scheduler.get_top_requests_model_prefs()
+    await scheduler.remove_request_by_id("a-0")
+    await scheduler.add_request(create_request("b-0", "u2"))
+    assert await scheduler.pop_top_new_request() is None
+    assert await pop_all_ids(scheduler) == ["b-0"]
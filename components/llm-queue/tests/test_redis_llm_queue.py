@@ -0,0 +1,218 @@
+import asyncio
+
+import pytest
+
+from llm_queue import LLMQueue
+from llm_queue.base import BaseRequestController
+from llm_queue.base.config_data_classes import AzureAOIModels, LLMConfig
+from llm_queue.base.custom_errors import SchedulerQueueFullError
+from llm_queue.base.data_classes import (
+    ModelPreferences,
+    ScheduledRequest,
+    TelemetryData,
+)
+from llm_queue.load_balancers import RedisEvenlySpacedRequestLB
+from llm_queue.schedulers import RedisFIFOScheduler
+
+fakeredis = pytest.importorskip("fakeredis")
+# fakeredis runs the Lua scripts with lupa
+pytest.importorskip("lupa")
+
+LIMITS = {"ttl_in_seconds": 60, "max_queue_size": 10}
+
+
+def create_model(unique_model_id: str, req_per_min=60, error_backoff_in_seconds=60):
+    return AzureAOIModels(
+        unique_model_id=unique_model_id,
+        model_type="completion",
+        req_per_min=req_per_min,
+        tokens_per_min=60000,
+        error_backoff_in_seconds=error_backoff_in_seconds,
+        model_name_in_azure="gpt-4o",
+        deployment_name_in_azure=unique_model_id,
+    )
+
+
+def create_request(req_id: str) -> ScheduledRequest:
+    return ScheduledRequest(
+        req_type="test",
+        req_id=req_id,
+        payload={"data": req_id},
+        telemetry_data=TelemetryData(req_id=req_id, req_payload="", req_type="test"),
+    )
+
+
+def create_clients(num_clients: int):
+    # Clients sharing one server behave like app service replicas sharing one Redis
+    server = fakeredis.FakeServer()
+    return [fakeredis.aioredis.FakeRedis(server=server) for _ in range(num_clients)]
+
+
+async def test_instances_share_one_queue():
+    redis_a, redis_b = create_clients(2)
+    scheduler_a = RedisFIFOScheduler(LIMITS, redis_a)
+    scheduler_b = RedisFIFOScheduler(LIMITS, redis_b)
+
+    await scheduler_a.add_request(create_request("req-1"))
+    await scheduler_a.add_request(create_request("req-2"))
+    assert await scheduler_b.has_request()
+
+    top = await scheduler_b.get_top_requests_model_prefs()
+    assert top.newly_queued_request is not None
+    request = await scheduler_b.pop_top_new_request()
+    assert request.req_id == "req-1"
+    assert scheduler_b.is_remote_request(request)
+
+    request = await scheduler_a.pop_top_new_request()
+    assert request.req_id == "req-2"
+    assert not scheduler_a.is_remote_request(request)
+    assert not await scheduler_b.has_request()
+
+
+async def test_queue_limits_and_removal_are_global():
+    redis_a, redis_b = create_clients(2)
+    limits = {"ttl_in_seconds": 60, "max_queue_size": 1}
+    scheduler_a = RedisFIFOScheduler(limits, redis_a)
+    scheduler_b = RedisFIFOScheduler(limits, redis_b)
+
+    await scheduler_a.add_request(create_request("req-1"))
+    with pytest.raises(SchedulerQueueFullError):
+        await scheduler_b.add_request(create_request("req-2"))
+
+    assert await scheduler_b.remove_request_by_id("req-1")
+    assert not await scheduler_a.remove_request_by_id("req-1")
+    assert not await scheduler_a.has_request()
+
+
+async def test_response_is_routed_to_origin_instance():
+    redis_a, redis_b = create_clients(2)
+    scheduler_a = RedisFIFOScheduler(LIMITS, redis_a)
+    scheduler_b = RedisFIFOScheduler(LIMITS, redis_b)
+    responses = asyncio.Queue()
+    scheduler_a.set_remote_response_handler(
+        lambda *response: responses.put_nowait(response)
+    )
+    await scheduler_a.connect()
+    try:
+        request = create_request("req-1")
+        await scheduler_a.add_request(request)
+        remote_request = await scheduler_b.pop_top_new_request()
+        remote_request.telemetry_data.prompt_tokens = 42
+        await scheduler_b.send_response(remote_request, "done", 200)
+
+        req_id, response, status_code, telemetry_data = await asyncio.wait_for(
+            responses.get(), 5
+        )
+        assert (req_id, response, status_code) == ("req-1", "done", 200)
+        # The caller's telemetry object is updated in place
+        assert telemetry_data is request.telemetry_data
+        assert request.telemetry_data.prompt_tokens == 42
+    finally:
+        await scheduler_a.disconnect()
+
+
+async def test_load_balancer_spacing_is_shared():
+    redis_a, redis_b = create_clients(2)
+    lb_a = RedisEvenlySpacedRequestLB([create_model("gpt-a")], redis_a)
+    lb_b = RedisEvenlySpacedRequestLB([create_model("gpt-a")], redis_b)
+
+    assert await lb_b.ahas_available_llm()
+    assert await lb_a.aget_available_llm_id() == "gpt-a"
+    assert not await lb_b.ahas_available_llm()
+    assert await lb_b.aget_available_llm_id() is None
+    assert 0 < await lb_b.aget_seconds_until_available() <= 1
+
+
+async def test_load_balancer_release_is_shared():
+    redis_a, redis_b = create_clients(2)
+    lb_a = RedisEvenlySpacedRequestLB([create_model("gpt-a")], redis_a)
+    lb_b = RedisEvenlySpacedRequestLB([create_model("gpt-a")], redis_b)
+
+    assert await lb_a.aget_available_llm_id() == "gpt-a"
+    await lb_a.arelease_llm_id("gpt-a")
+    assert await lb_b.aget_available_llm_id() == "gpt-a"
+
+
+async def test_load_balancer_round_robin_and_error_backoff():
+    redis_a, redis_b = create_clients(2)
+    llm_configs = [create_model("gpt-a"), create_model("gpt-b")]
+    lb_a = RedisEvenlySpacedRequestLB(llm_configs, redis_a)
+    lb_b = RedisEvenlySpacedRequestLB(llm_configs, redis_b)
+
+    await lb_a.aregister_error("gpt-a")
+    assert not await lb_b.ahas_available_llm(specific_llm_requried="gpt-a")
+    assert await lb_b.aget_available_llm_id() == "gpt-b"
+    assert await lb_a.aget_available_llm_id() is None
+    assert await lb_a.aget_seconds_until_available(specific_llm_requried="gpt-a") > 1
+
+
+async def test_two_llm_queues_drain_one_queue():
+    class RecordingRequestController(BaseRequestController):
+        def __init__(self, name: str, processed: list):
+            self.name = name
+            self.processed = processed
+
+        async def process_request(self, req, chosen_llm_ids, telemetry_data):
+            self.processed.append(self.name)
+            return f"{self.name}:{req['i']}"
+
+    llm_config = LLMConfig(
+        azure_open_ai=[
+            {
+                "api_key": "***",
+                "api_version": "2023-03-15-preview",
+                "api_type": "azure",
+                "azure_endpoint": "https://***.openai.azure.com/",
+                "azure_oai_models": [
+                    {
+                        "unique_model_id": "gpt-a",
+                        "model_name_in_azure": "gpt-4o",
+                        "deployment_name_in_azure": "gpt-4o",
+                        "model_type": "completion",
+                        "req_per_min": 6000,
+                        "tokens_per_min": 10**9,
+                        "error_backoff_in_seconds": 60,
+                    }
+                ],
+            }
+        ],
+        user_limits={
+            "max_num_requests_in_time_window": 100,
+            "time_window_length_in_seconds": 60,
+        },
+        scheduler_limits={"ttl_in_seconds": 30, "max_queue_size": 100},
+        custom_models=[],
+    )
+    processed = []
+    llm_queues = []
+    for name, redis_client in zip(("a", "b"), create_clients(2)):
+        llm_queue = LLMQueue(
+            llm_config,
+            {"test": RecordingRequestController(name, processed)},
+            scheduler=RedisFIFOScheduler(llm_config.scheduler_limits, redis_client),
+            llm_load_balancer=RedisEvenlySpacedRequestLB(
+                llm_config.azure_open_ai[0].azure_oai_models, redis_client
+            ),
+            event_driven_polling=True,
+        )
+        await llm_queue.initiate()
+        llm_queues.append(llm_queue)
+
+    try:
+        results = await asyncio.gather(
+            *(
+                llm_queues[0].execute_request(
+                    req_type="test",
+                    request_data={"i": i},
+                    user_id="test-user",
+                    model_pref=ModelPreferences(require_llm_model=True),
+                )
+                for i in range(10)
+            )
+        )
+        assert [status for _, status in results] == [200] * 10
+        assert sorted(int(resp.split(":")[1]) for resp, _ in results) == list(range(10))
+        assert len(processed) == 10
+    finally:
+        for llm_queue in llm_queues:
+            await llm_queue.graceful_shutdown()
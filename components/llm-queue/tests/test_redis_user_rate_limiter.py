@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from llm_queue.user_rate_limiter_adapters import RedisUserRateLimitStoreAdapter
+
+fakeredis = pytest.importorskip("fakeredis")
+# fakeredis runs the Lua scripts with lupa
+pytest.importorskip("lupa")
+
+
+async def create_adapter(redis_client=None):
+    adapter = RedisUserRateLimitStoreAdapter(
+        "localhost", "", redis_client=redis_client or fakeredis.aioredis.FakeRedis()
+    )
+    await adapter.connect()
+    return adapter
+
+
+async def test_limit_is_enforced_within_window():
+    adapter = await create_adapter()
+    assert await adapter.check_and_add_request("user", 2, 1_000, 10) == (True, None)
+    assert await adapter.check_and_add_request("user", 2, 2_000, 10) == (True, None)
+
+    allowed, remaining_time = await adapter.check_and_add_request("user", 2, 3_000, 10)
+    assert not allowed
+    # The oldest request, sent at 1s, leaves the 10s window at 11s
+    assert remaining_time == 8
+
+    # Once the oldest request has left the window a new one is accepted
+    assert await adapter.check_and_add_request("user", 2, 11_500, 10) == (True, None)
+
+
+async def test_idle_users_expire():
+    redis_client = fakeredis.aioredis.FakeRedis()
+    adapter = await create_adapter(redis_client)
+    await adapter.check_and_add_request("user", 2, 1_000, 10)
+    assert 0 < await redis_client.pttl("user") <= 10_000
+
+
+async def test_concurrent_requests_never_exceed_limit():
+    adapter = await create_adapter()
+    results = await asyncio.gather(
+        *(adapter.check_and_add_request("user", 5, 1_000, 10) for _ in range(50))
+    )
+    assert sum(allowed for allowed, _ in results) == 5
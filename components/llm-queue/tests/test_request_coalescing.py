@@ -0,0 +1,102 @@
+import asyncio
+
+import yaml
+
+from llm_queue import LLMQueue
+from llm_queue.base import BaseRequestController
+from llm_queue.base.config_data_classes import LLMConfig
+from llm_queue.base.data_classes import ModelPreferences
+
+LLM_CONFIG_PATH = "tests/configs/llm_config.yaml"
+TEST_REQUEST_TYPE = "test"
+
+
+class CountingRequestController(BaseRequestController):
+    def __init__(self):
+        self.num_processed = 0
+
+    async def process_request(self, req, chosen_llm_ids, telemetry_data):
+        self.num_processed += 1
+        await asyncio.sleep(0.05)
+        return f"lesson plan for {req['chapter']}"
+
+
+async def create_llm_queue(request_controller: BaseRequestController) -> LLMQueue:
+    with open(LLM_CONFIG_PATH, "r") as file:
+        llm_config = LLMConfig(**yaml.safe_load(file))
+    llm_queue = LLMQueue(
+        llm_config,
+        {TEST_REQUEST_TYPE: request_controller},
+        event_driven_polling=True,
+        coalesce_identical_requests=True,
+    )
+    await llm_queue.initiate()
+    return llm_queue
+
+
+async def test_identical_requests_are_processed_once():
+    request_controller = CountingRequestController()
+    llm_queue = await create_llm_queue(request_controller)
+    try:
+        results = await asyncio.gather(
+            *(
+                llm_queue.execute_request(
+                    req_type=TEST_REQUEST_TYPE,
+                    # Key order does not matter
+                    request_data=(
+                        {"chapter": "photosynthesis", "grade": 7}
+                        if i % 2
+                        else {"grade": 7, "chapter": "photosynthesis"}
+                    ),
+                    user_id=f"teacher-{i}",
+                    model_pref=ModelPreferences(),
+                )
+                for i in range(5)
+            )
+        )
+        assert results == [("lesson plan for photosynthesis", 200)] * 5
+        assert request_controller.num_processed == 1
+        assert not llm_queue.in_flight_requests
+    finally:
+        await llm_queue.graceful_shutdown()
+
+
+async def test_different_requests_are_not_coalesced():
+    request_controller = CountingRequestController()
+    llm_queue = await create_llm_queue(request_controller)
+    try:
+        await asyncio.gather(
+            *(
+                llm_queue.execute_request(
+                    req_type=TEST_REQUEST_TYPE,
+                    request_data={"chapter": chapter},
+                    user_id="teacher",
+                    model_pref=ModelPreferences(),
+                )
+                for chapter in ("photosynthesis", "fractions")
+            )
+        )
+        assert request_controller.num_processed == 2
+    finally:
+        await llm_queue.graceful_shutdown()
+
+
+async def test_requests_of_different_priorities_are_not_coalesced():
+    request_controller = CountingRequestController()
+    llm_queue = await create_llm_queue(request_controller)
+    try:
+        await asyncio.gather(
+            *(
+                llm_queue.execute_request(
+                    req_type=TEST_REQUEST_TYPE,
+                    request_data={"chapter": "photosynthesis"},
+                    user_id="teacher",
+                    model_pref=ModelPreferences(),
+                    priority=priority,
+                )
+                for priority in (0, 1)
+            )
+        )
+        assert request_controller.num_processed == 2
+    finally:
+        await llm_queue.graceful_shutdown()
@@ -0,0 +1,55 @@
+from llm_queue.base.config_data_classes import AzureAOIModels
+from llm_queue.base.data_classes import ModelPreferences
+from llm_queue.load_balancers import (
+    EvenlySpacedRequestLB,
+    LatencyAwareRequestLB,
+    TokenBucketRequestLB,
+)
+from llm_queue.resource_availability_checker import ResourceAvailabilityChecker
+
+BOTH_MODELS = ModelPreferences(require_embedding_model=True, require_llm_model=True)
+
+
+def create_model(unique_model_id: str, model_type: str = "completion"):
+    return AzureAOIModels(
+        unique_model_id=unique_model_id,
+        model_type=model_type,
+        req_per_min=60,
+        tokens_per_min=60000,
+        error_backoff_in_seconds=60,
+        model_name_in_azure="gpt-4o",
+        deployment_name_in_azure=unique_model_id,
+    )
+
+
+async def test_both_slots_are_taken():
+    checker = ResourceAvailabilityChecker(
+        EvenlySpacedRequestLB([create_model("emb-a", "embeddings")]),
+        EvenlySpacedRequestLB([create_model("gpt-a")]),
+    )
+    assert await checker.get_model_ids_if_available(BOTH_MODELS) == ["emb-a", "gpt-a"]
+    # The spacing of both models was taken
+    assert await checker.get_model_ids_if_available(BOTH_MODELS) is None
+
+
+async def test_embedding_slot_is_released_when_llm_is_unavailable():
+    for create_lb in (
+        EvenlySpacedRequestLB,
+        TokenBucketRequestLB,
+        LatencyAwareRequestLB,
+    ):
+        released = []
+        emb_lb = create_lb([create_model("emb-a", "embeddings")])
+        emb_lb.set_capacity_release_listener(lambda: released.append(True))
+        llm_lb = create_lb([create_model("gpt-a")])
+        # Take every slot of the LLM
+        while llm_lb.get_available_llm_id() is not None:
+            pass
+        checker = ResourceAvailabilityChecker(emb_lb, llm_lb)
+
+        assert await checker.get_model_ids_if_available(BOTH_MODELS) is None
+        assert released
+        # The embedding model is still available to requests that only need it
+        assert await checker.get_model_ids_if_available(
+            ModelPreferences(require_embedding_model=True, require_llm_model=False)
+        ) == ["emb-a"]
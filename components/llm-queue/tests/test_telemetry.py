@@ -0,0 +1,91 @@
+import asyncio
+import csv
+import os
+import tempfile
+
+from llm_queue.base.adapter_base_classes import TelemetryDataStoreAdapter
+from llm_queue.base.data_classes import TelemetryData
+from llm_queue.telemetry import Telemetry
+from llm_queue.telemetry_data_store_adapters import CSVTelemetryDataStore
+
+
+class RecordingTelemetryStore(TelemetryDataStoreAdapter):
+    def __init__(self):
+        self.batches = []
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def insert_telemetry_data(self, telemetry_data: TelemetryData):
+        self.batches.append([telemetry_data])
+
+    async def insert_telemetry_data_batch(self, telemetry_data_list):
+        self.batches.append(telemetry_data_list)
+
+
+def create_telemetry_data(i: int) -> TelemetryData:
+    return TelemetryData(req_id=f"req-{i}", req_payload="", req_type="test")
+
+
+async def test_rows_are_flushed_in_batches():
+    store = RecordingTelemetryStore()
+    telemetry = Telemetry(store, flush_batch_size=10, flush_interval_in_ms=10_000)
+    await telemetry.connect_database()
+    for i in range(25):
+        telemetry.sink_successfull(create_telemetry_data(i))
+    await asyncio.sleep(0.01)
+    # The batch size wakes the flusher before the interval passes
+    assert [len(batch) for batch in store.batches] == [10, 10, 5]
+    assert telemetry.get_stats()["sunk"] == 25
+
+
+async def test_full_buffer_drops_oldest_rows_and_shutdown_flushes():
+    store = RecordingTelemetryStore()
+    telemetry = Telemetry(store, max_buffer_size=5, flush_batch_size=100)
+    await telemetry.connect_database()
+    for i in range(8):
+        telemetry.sink_with_error("error", create_telemetry_data(i))
+    assert telemetry.get_stats()["dropped"] == 3
+
+    await telemetry.disconnect_database()
+    assert [t.req_id for batch in store.batches for t in batch] == [
+        f"req-{i}" for i in range(3, 8)
+    ]
+    assert all(t.error_message == "error" for batch in store.batches for t in batch)
+
+
+async def test_shutdown_waits_for_in_flight_batch():
+    class SlowTelemetryStore(RecordingTelemetryStore):
+        async def insert_telemetry_data_batch(self, telemetry_data_list):
+            await asyncio.sleep(0.05)
+            await super().insert_telemetry_data_batch(telemetry_data_list)
+
+    store = SlowTelemetryStore()
+    telemetry = Telemetry(store, flush_batch_size=5, flush_interval_in_ms=10_000)
+    await telemetry.connect_database()
+    for i in range(12):
+        telemetry.sink_successfull(create_telemetry_data(i))
+    # Let the flusher take the first batch from the buffer
+    await asyncio.sleep(0.01)
+
+    await telemetry.disconnect_database()
+    assert [t.req_id for batch in store.batches for t in batch] == [
+        f"req-{i}" for i in range(12)
+    ]
+
+
+async def test_csv_store_writes_batches():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "telemetry.csv")
+        store = CSVTelemetryDataStore(file_path)
+        await store.connect()
+        await store.insert_telemetry_data_batch(
+            [create_telemetry_data(i) for i in range(3)]
+        )
+        with open(file_path, newline="") as file:
+            rows = list(csv.reader(file))
+        assert rows[0][1] == "req_id"
+        assert [row[1] for row in rows[1:]] == ["req-0", "req-1", "req-2"]
@@ -0,0 +1,74 @@
+from llm_queue.base.config_data_classes import AzureAOIModels
+from llm_queue.load_balancers import TokenBucketRequestLB
+
+
+def create_model(unique_model_id: str, req_per_min=600, tokens_per_min=60000):
+    return AzureAOIModels(
+        unique_model_id=unique_model_id,
+        model_type="completion",
+        req_per_min=req_per_min,
+        tokens_per_min=tokens_per_min,
+        error_backoff_in_seconds=60,
+        model_name_in_azure="gpt-4o",
+        deployment_name_in_azure=unique_model_id,
+    )
+
+
+def test_token_budget_limits_dispatch():
+    # 60000 TPM with a 10s burst window holds 10000 tokens
+    lb = TokenBucketRequestLB([create_model("gpt-a")])
+    assert lb.get_available_llm_id(num_tokens_per_call=6000) == "gpt-a"
+    assert not lb.has_available_llm(num_tokens_per_call=6000)
+    assert lb.get_seconds_until_available(num_tokens_per_call=6000) > 0
+    # Smaller requests still fit in the remaining token budget
+    assert lb.has_available_llm(num_tokens_per_call=3000)
+
+
+def test_actual_usage_releases_tokens():
+    released = []
+    lb = TokenBucketRequestLB([create_model("gpt-a")])
+    lb.set_capacity_release_listener(lambda: released.append(True))
+    lb.get_available_llm_id(num_tokens_per_call=9000)
+    assert not lb.has_available_llm(num_tokens_per_call=5000)
+
+    lb.register_usage("gpt-a", 1, 9000, actual_tokens=2000)
+    assert lb.has_available_llm(num_tokens_per_call=5000)
+    assert released
+
+
+def test_prefers_deployment_with_most_headroom():
+    lb = TokenBucketRequestLB([create_model("gpt-a"), create_model("gpt-b")])
+    assert lb.get_available_llm_id(num_tokens_per_call=5000) == "gpt-a"
+    assert lb.get_available_llm_id(num_tokens_per_call=1000) == "gpt-b"
+    assert lb.get_available_llm_id(num_tokens_per_call=1000) == "gpt-b"
+
+
+def test_error_backoff():
+    lb = TokenBucketRequestLB([create_model("gpt-a")])
+    lb.register_error("gpt-a")
+    assert not lb.has_available_llm()
+    assert lb.get_seconds_until_available() > 59
+
+
+def test_cold_start_estimate_is_a_quarter_of_the_token_bucket():
+    # 60000 TPM with a 10s burst window holds 10000 tokens, an even share would only be 100 tokens per call
+    lb = TokenBucketRequestLB([create_model("gpt-a")])
+    for _ in range(4):
+        assert lb.get_available_llm_id() == "gpt-a"
+    assert lb.get_available_llm_id() is None
+
+
+def test_usage_is_corrected_against_the_debited_estimate():
+    lb = TokenBucketRequestLB([create_model("gpt-a")], initial_tokens_per_call=1000)
+    token_bucket = lb.llm_entity_token_bucket_map["gpt-a"]
+    lb.get_available_llm_id()
+    lb.get_available_llm_id()
+    assert round(token_bucket.level) == 8000
+
+    # The first usage moves the average to 3000, the second request was still debited with 1000
+    lb.register_usage("gpt-a", 1, None, actual_tokens=3000)
+    lb.register_usage("gpt-a", 1, None, actual_tokens=1000)
+    assert lb.llm_entity_avg_tokens_per_call_map["gpt-a"] == 2600
+    # 4000 tokens were used, only the refill since dispatch may be credited on top
+    assert 6000 <= token_bucket.level < 6100
+    assert not lb.llm_entity_pending_token_debits_map["gpt-a"]
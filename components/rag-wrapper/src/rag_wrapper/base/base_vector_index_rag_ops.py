@@ -1,17 +1,19 @@
+import asyncio
+import json
 import logging
-import uuid
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict, Optional
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, List, Dict, Optional
 
 from tenacity import (
-    retry,
+    AsyncRetrying,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
+    retry_if_exception,
     retry_if_result,
 )
 
-from llama_index.core.chat_engine.types import ChatMode
+from llama_index.core.chat_engine import ContextChatEngine
 from llama_index.core.query_engine import RetrieverQueryEngine
 from llama_index.core import (
     QueryBundle,
@@ -22,10 +24,21 @@ from llama_index.core import (
     get_response_synthesizer,
 )
 from llama_index.core.indices.base import BaseIndex
+from llama_index.core.base.base_retriever import BaseRetriever
 from llama_index.core.llms import ChatMessage, LLM
-from llama_index.core.schema import TransformComponent
+from llama_index.core.ingestion import arun_transformations
+from llama_index.core.schema import BaseNode, MetadataMode, TransformComponent
 from llama_index.core.vector_stores import MetadataFilters, ExactMatchFilter
 from llama_index.core.callbacks import CallbackManager, TokenCountingHandler
+
+from .base_embedding_cache_store import BaseEmbeddingCacheStore
+from ..embedding_cache.cached_embedding import CachedEmbedding
+from ..response_synthesizers.token_budget_synthesizer import (
+    PACKED_RESPONSE_MODE,
+    TokenBudgetSynthesizer,
+)
+from ..utils.doc_ids import get_text_chunk_doc_id
+from ..utils.retry import is_invalid_response, is_retryable_error
 import traceback
 from llama_index.core.response_synthesizers import (
     ResponseMode,
@@ -61,6 +74,11 @@ class BaseVectorIndexRagOps(ABC):
         emb_llm: Optional[LLM] = None,
         similarity_top_k: int = 10,
         response_mode: str = "tree_summarize",
+        embedding_cache_store: Optional[BaseEmbeddingCacheStore] = None,
+        insert_batch_size: int = 256,
+        insert_concurrency: int = 4,
+        context_token_budget: int = 3000,
+        max_memoized_engines: int = 32,
     ):
         """Initialize with embedding and completion language models and configuration parameters.
 
@@ -68,15 +86,32 @@ class BaseVectorIndexRagOps(ABC):
             emb_llm: Embedding language model
             completion_llm: Completion language model
             similarity_top_k: Number of top similar documents to retrieve (default: 3)
-            response_mode: Response synthesis mode (default: "tree_summarize")
+            response_mode: Response synthesis mode, a llama-index ResponseMode or "packed" (default: "tree_summarize")
+            embedding_cache_store: Optional persistent embedding cache, wraps emb_llm in a CachedEmbedding when set
+            insert_batch_size: Number of nodes embedded and upserted per batch when indexing (default: 256)
+            insert_concurrency: Maximum number of batches indexed concurrently (default: 4)
+            context_token_budget: Maximum context tokens per prompt in the "packed" response mode (default: 3000)
+            max_memoized_engines: Maximum number of query engines and of retrievers kept per index, the least recently used are dropped (default: 32)
         """
+        if emb_llm is not None and embedding_cache_store is not None:
+            emb_llm = CachedEmbedding(emb_llm, cache_store=embedding_cache_store)
         self.emb_llm = emb_llm
         self.completion_llm = completion_llm
         self.similarity_top_k = similarity_top_k
         self.response_mode = response_mode
+        self.insert_batch_size = insert_batch_size
+        self.insert_concurrency = insert_concurrency
+        self.context_token_budget = context_token_budget
         self.logger = logging.getLogger(__name__)
         self.token_counter = TokenCountingHandler()
         self._callback_manager = CallbackManager([self.token_counter])
+        # Query engines and retrievers of the current rag_index, see _get_query_engine()
+        self.max_memoized_engines = max_memoized_engines
+        self._query_engines: OrderedDict[tuple, RetrieverQueryEngine] = OrderedDict()
+        self._retrievers: OrderedDict[tuple, BaseRetriever] = OrderedDict()
+        self._engines_rag_index: Optional[VectorStoreIndex] = None
+        # Retries per query stage ("embed", "retrieve", "synthesize"), see get_retry_stats()
+        self.stage_retry_counts: Dict[str, int] = {}
 
     def _get_response_mode(self) -> ResponseMode:
         """Convert string response mode to ResponseMode enum."""
@@ -108,64 +143,90 @@ class BaseVectorIndexRagOps(ABC):
             filter_list.append(ExactMatchFilter(key=key, value=value))
         return MetadataFilters(filters=filter_list)
 
-    async def _query_with_retries(
+    async def _run_stage_with_retries(
+        self, stage: str, stage_fn, retry_on_result=None
+    ) -> Any:
+        """Run one stage of a query, retrying it on transient errors and, optionally, on invalid results.
+
+        Args:
+            stage: Name of the stage, counted in stage_retry_counts
+            stage_fn: Async function running the stage
+            retry_on_result: Optional predicate on the result that triggers a retry
+        """
+        retry_condition = retry_if_exception(is_retryable_error)
+        if retry_on_result is not None:
+            retry_condition = retry_condition | retry_if_result(retry_on_result)
+
+        def before_sleep(retry_state):
+            self.stage_retry_counts[stage] = self.stage_retry_counts.get(stage, 0) + 1
+            self._log_retry_attempt(retry_state)
+
+        return await AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=wait_exponential(multiplier=1, min=1, max=10),
+            retry=retry_condition,
+            before_sleep=before_sleep,
+        )(stage_fn)
+
+    async def _retrieve_with_retries(
         self,
         text_str: str,
         retrieval_query: Optional[str] = None,
         metadata_filter: Optional[Dict[str, str]] = None,
     ):
-        """Internal method with retry logic for robust querying."""
+        """Embed the query and retrieve its nodes, retrying each stage on its own.
 
-        @retry(
-            stop=stop_after_attempt(3),
-            wait=wait_exponential(multiplier=1, min=1, max=10),
-            retry=(
-                retry_if_exception_type(Exception)
-                | retry_if_result(
-                    lambda result: self._retry_on_empty_string_or_timeout_response(
-                        result
-                    )
-                )
-            ),
-            before_sleep=self._log_retry_attempt,
+        Returns:
+            The query engine, the query bundle with its embedding and the retrieved nodes
+        """
+        query_engine = self._get_query_engine(metadata_filter)
+        qb = QueryBundle(
+            query_str=text_str,
+            custom_embedding_strs=[retrieval_query or text_str],  # fallback if empty
         )
-        async def _aquery_with_retries():
-            """Internal retry wrapper."""
-            try:
-                # Create query engine with metadata filters and response synthesizer
-                query_engine_kwargs = {
-                    "response_synthesizer": get_response_synthesizer(
-                        llm=self.completion_llm,
-                        response_mode=self._get_response_mode(),
-                        callback_manager=self._callback_manager,
-                    ),
-                    "similarity_top_k": self.similarity_top_k,
-                }
 
-                # Add metadata filters if provided
-                if metadata_filter:
-                    filters = self._create_metadata_filters(metadata_filter)
-                    query_engine_kwargs["filters"] = filters
+        if self.rag_index.vector_store.is_embedding_query:
+            embed_model = self.emb_llm or Settings.embed_model
 
-                query_engine = self.rag_index.as_query_engine(
-                    llm=self.completion_llm, **query_engine_kwargs
+            async def _embed():
+                return await embed_model.aget_agg_embedding_from_queries(
+                    qb.embedding_strs
                 )
 
-                # Generate response using the query engine
-                qb = QueryBundle(
-                    query_str=text_str,
-                    custom_embedding_strs=[
-                        retrieval_query or text_str
-                    ],  # fallback if empty
-                )
-                response = await query_engine.aquery(qb)
-                return response
+            qb.embedding = await self._run_stage_with_retries("embed", _embed)
 
-            except Exception as e:
-                self.logger.error(traceback.format_exc())
-                raise e
+        async def _retrieve():
+            return await query_engine.aretrieve(qb)
 
-        return await _aquery_with_retries()
+        nodes = await self._run_stage_with_retries("retrieve", _retrieve)
+        return query_engine, qb, nodes
+
+    async def _query_with_retries(
+        self,
+        text_str: str,
+        retrieval_query: Optional[str] = None,
+        metadata_filter: Optional[Dict[str, str]] = None,
+    ):
+        """Internal method with retry logic for robust querying.
+
+        The query is embedded, retrieved and synthesized as separate stages and only the
+        failed stage is retried, so e.g. an LLM timeout reuses the query embedding and the
+        retrieved nodes instead of embedding and searching again.
+        """
+        query_engine, qb, nodes = await self._retrieve_with_retries(
+            text_str, retrieval_query, metadata_filter
+        )
+
+        async def _synthesize():
+            return await query_engine.asynthesize(qb, nodes)
+
+        return await self._run_stage_with_retries(
+            "synthesize", _synthesize, retry_on_result=is_invalid_response
+        )
+
+    def get_retry_stats(self) -> Dict[str, int]:
+        """Get the number of retries per query stage."""
+        return dict(self.stage_retry_counts)
 
     async def query_index(
         self,
@@ -199,7 +260,7 @@ class BaseVectorIndexRagOps(ABC):
                 text_str, retrieval_query, metadata_filter
             )
             # Validate response quality
-            if self._retry_on_empty_string_or_timeout_response(answer):
+            if is_invalid_response(answer):
                 raise ValueError(f"LLM RESPONSE IS NOT VALID: {answer}")
 
             return answer
@@ -237,22 +298,12 @@ class BaseVectorIndexRagOps(ABC):
         try:
             if metadata_filter:
                 await self._prequery_filter_guard(metadata_filter)
-            # Create chat engine with context awareness
-            chat_engine_kwargs = {
-                "chat_mode": ChatMode.CONTEXT,
-                "llm": self.completion_llm,
-                "embed_model": self.emb_llm,
-                "similarity_top_k": self.similarity_top_k,
-            }
-
-            # Add metadata filters if provided
-            if metadata_filter:
-                filters = self._create_metadata_filters(metadata_filter)
-                chat_engine_kwargs["filters"] = filters
-
-            chat_engine = self.rag_index.as_chat_engine(**chat_engine_kwargs)
-            if hasattr(chat_engine, "callback_manager"):
-                chat_engine.callback_manager = self._callback_manager
+            # Chat engines hold the conversation memory, so only their retriever is reused
+            chat_engine = ContextChatEngine.from_defaults(
+                retriever=self._get_retriever(metadata_filter),
+                llm=self.completion_llm,
+            )
+            chat_engine.callback_manager = self._callback_manager
 
             # Generate response with chat history context
             response = await chat_engine.achat(curr_message, chat_history)
@@ -267,6 +318,167 @@ class BaseVectorIndexRagOps(ABC):
             self.logger.error(traceback.format_exc())
             raise
 
+    async def astream_query_index(
+        self,
+        text_str: str,
+        retrieval_query: Optional[str] = None,
+        metadata_filter: Optional[Dict[str, str]] = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Query the index like query_index(), yielding the response tokens as they are generated.
+
+        Embedding, retrieval and the start of the synthesis are retried like in query_index(),
+        a stream that fails midway is not.
+
+        Args:
+            text_str: Main query for response generation
+            retrieval_query: Optional separate query for document retrieval
+            metadata_filter: Optional metadata filters for results
+
+        Yields:
+            Response text deltas
+        """
+        if not self.rag_index:
+            exists = await self.index_exists()
+            if exists:
+                await self.initiate_index()
+            else:
+                raise ValueError(
+                    "No index exists. Create an index first using create_index()."
+                )
+
+        if metadata_filter:
+            await self._prequery_filter_guard(metadata_filter)
+        _, qb, nodes = await self._retrieve_with_retries(
+            text_str, retrieval_query, metadata_filter
+        )
+        synthesizer = self._create_response_synthesizer(streaming=True)
+
+        async def _synthesize():
+            return await synthesizer.asynthesize(qb, nodes)
+
+        response = await self._run_stage_with_retries("synthesize", _synthesize)
+        async for token in response.async_response_gen():
+            yield token
+
+    async def astream_chat_with_index(
+        self,
+        curr_message: str,
+        chat_history: List[ChatMessage],
+        metadata_filter: Optional[Dict[str, str]] = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Chat with the index like chat_with_index(), yielding the response tokens as they are generated.
+
+        Args:
+            curr_message: Current user message
+            chat_history: Previous messages for context
+            metadata_filter: Optional metadata filters for results
+
+        Yields:
+            Response text deltas
+        """
+        if not self.rag_index:
+            exists = await self.index_exists()
+            if exists:
+                await self.initiate_index()
+            else:
+                raise ValueError(
+                    "No index exists. Create an index first using create_index()."
+                )
+
+        if metadata_filter:
+            await self._prequery_filter_guard(metadata_filter)
+        chat_engine = ContextChatEngine.from_defaults(
+            retriever=self._get_retriever(metadata_filter),
+            llm=self.completion_llm,
+        )
+        chat_engine.callback_manager = self._callback_manager
+
+        response = await chat_engine.astream_chat(curr_message, chat_history)
+        async for token in response.async_response_gen():
+            yield token
+
+    def _reset_engines_if_index_changed(self) -> None:
+        """Drop the memoized engines and retrievers once rag_index is replaced."""
+        if self._engines_rag_index is not self.rag_index:
+            self._query_engines.clear()
+            self._retrievers.clear()
+            self._engines_rag_index = self.rag_index
+
+    def _get_memoized(self, memo: OrderedDict, key: tuple, create) -> Any:
+        """Get the memoized value of the key, creating it on a miss and dropping the least recently used beyond max_memoized_engines."""
+        if key in memo:
+            memo.move_to_end(key)
+            return memo[key]
+        value = create()
+        memo[key] = value
+        while len(memo) > self.max_memoized_engines:
+            memo.popitem(last=False)
+        return value
+
+    def _get_retriever(
+        self, metadata_filter: Optional[Dict[str, str]] = None
+    ) -> BaseRetriever:
+        """Get the retriever for a metadata filter, memoized per (metadata_filter, top_k)."""
+        self._reset_engines_if_index_changed()
+        key = (json.dumps(metadata_filter or {}, sort_keys=True), self.similarity_top_k)
+        return self._get_memoized(
+            self._retrievers,
+            key,
+            lambda: self.rag_index.as_retriever(
+                similarity_top_k=self.similarity_top_k,
+                filters=self._create_metadata_filters(metadata_filter),
+            ),
+        )
+
+    def _get_query_engine(
+        self, metadata_filter: Optional[Dict[str, str]] = None
+    ) -> RetrieverQueryEngine:
+        """Get the query engine for a metadata filter, memoized per (metadata_filter, response_mode, top_k, token budget).
+
+        Query engines keep no per-request state, so concurrent queries can share them.
+        """
+        self._reset_engines_if_index_changed()
+        key = (
+            json.dumps(metadata_filter or {}, sort_keys=True),
+            self.response_mode,
+            self.similarity_top_k,
+            self.context_token_budget,
+        )
+        return self._get_memoized(
+            self._query_engines,
+            key,
+            lambda: RetrieverQueryEngine.from_args(
+                retriever=self._get_retriever(metadata_filter),
+                llm=self.completion_llm,
+                response_synthesizer=self._create_response_synthesizer(),
+            ),
+        )
+
+    def _create_response_synthesizer(self, streaming: bool = False):
+        """Create the response synthesizer of the configured response mode.
+
+        The "packed" mode deduplicates the retrieved chunks and packs them into
+        `context_token_budget` tokens for a single LLM call, see TokenBudgetSynthesizer.
+        """
+        if (
+            isinstance(self.response_mode, str)
+            and self.response_mode.lower() == PACKED_RESPONSE_MODE
+        ):
+            return TokenBudgetSynthesizer(
+                llm=self.completion_llm,
+                callback_manager=self._callback_manager,
+                context_token_budget=self.context_token_budget,
+                streaming=streaming,
+            )
+        return get_response_synthesizer(
+            llm=self.completion_llm,
+            response_mode=self._get_response_mode(),
+            callback_manager=self._callback_manager,
+            streaming=streaming,
+        )
+
     async def create_index(
         self,
         text_chunks: List[str],
@@ -283,7 +495,8 @@ class BaseVectorIndexRagOps(ABC):
             metadata: Optional metadata for all chunks
 
         Returns:
-            List of document IDs for the indexed chunks
+            List of document IDs of the non-empty chunks, in order. Repeated chunks are
+            indexed once and share the same ID.
         """
         try:
             if not self.rag_index:
@@ -293,15 +506,15 @@ class BaseVectorIndexRagOps(ABC):
                 text_chunks, metadata
             )
 
-            # Create a new index from documents
-            self.rag_index = VectorStoreIndex.from_documents(
-                documents,
+            # Create a new empty index and bulk insert the documents into it
+            self.rag_index = VectorStoreIndex(
+                nodes=[],
                 storage_context=self.storage_context,
                 embed_model=self.emb_llm,
-                use_async=True,
                 transformations=transformations,
                 callback_manager=self._callback_manager,
             )
+            await self._bulk_insert_documents(documents, transformations)
 
             self.logger.info(f"Created new index with {len(documents)} documents")
 
@@ -330,7 +543,8 @@ class BaseVectorIndexRagOps(ABC):
             transformations: Optional list of transformations to apply
 
         Returns:
-            List of document IDs for the inserted chunks
+            List of document IDs of the non-empty chunks, in order. Repeated chunks are
+            inserted once and share the same ID.
         """
         if not self.rag_index:
             raise ValueError("Index must be created before inserting text chunks")
@@ -345,9 +559,7 @@ class BaseVectorIndexRagOps(ABC):
             if transformations:
                 self.rag_index._transformations = transformations
 
-            # Insert documents
-            for document in documents:
-                self.rag_index.insert(document)
+            await self._bulk_insert_documents(documents, transformations)
 
             self.logger.info(f"Successfully inserted {len(documents)} text chunks")
 
@@ -360,6 +572,108 @@ class BaseVectorIndexRagOps(ABC):
             self.logger.error(f"Failed to insert text chunks: {e}")
             raise
 
+    async def upsert_text_chunks(
+        self,
+        text_chunks: List[str],
+        metadata: dict = None,
+        scope_filter: Optional[Dict[str, str]] = None,
+        transformations: List[TransformComponent] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Sync the documents in a metadata filter scope with the given text chunks.
+
+        Document ids are derived from the chunk text and metadata, so only chunks whose
+        document is not indexed yet are embedded and inserted, and documents in the scope
+        that are no longer among the chunks are deleted. E.g. re-ingesting a corrected
+        chapter with its chapter id as scope only re-indexes the changed pages.
+
+        Args:
+            text_chunks: List of text segments that the scope should contain
+            metadata: Optional metadata for all chunks
+            scope_filter: Metadata filter of the documents to sync (default: metadata,
+                          an empty scope syncs the whole index)
+            transformations: Optional list of transformations to apply
+
+        Returns:
+            Dictionary with the "inserted", "deleted" and "unchanged" document IDs
+        """
+        try:
+            if not self.rag_index:
+                await self.initiate_index()
+            if not self.rag_index:
+                doc_ids = await self.create_index(
+                    text_chunks, metadata, transformations
+                )
+                return {
+                    "inserted": list(dict.fromkeys(doc_ids)),
+                    "deleted": [],
+                    "unchanged": [],
+                }
+
+            if scope_filter is None:
+                scope_filter = metadata or {}
+            existing_doc_ids = await self._get_existing_doc_ids(scope_filter)
+            documents, doc_ids = self._create_documents_from_text_chunks(
+                text_chunks, metadata
+            )
+
+            new_documents = [
+                document
+                for document in documents
+                if document.doc_id not in existing_doc_ids
+            ]
+            deleted_doc_ids = sorted(existing_doc_ids.difference(doc_ids))
+
+            if deleted_doc_ids:
+                await self._bulk_delete_documents(deleted_doc_ids)
+            if new_documents:
+                if transformations:
+                    self.rag_index._transformations = transformations
+                await self._bulk_insert_documents(new_documents, transformations)
+            if deleted_doc_ids or new_documents:
+                await self.persist_index()
+
+            self.logger.info(
+                f"Upserted text chunks: {len(new_documents)} inserted, {len(deleted_doc_ids)} deleted, "
+                f"{len(documents) - len(new_documents)} unchanged"
+            )
+            return {
+                "inserted": [document.doc_id for document in new_documents],
+                "deleted": deleted_doc_ids,
+                "unchanged": [
+                    document.doc_id
+                    for document in documents
+                    if document.doc_id in existing_doc_ids
+                ],
+            }
+
+        except Exception as e:
+            self.logger.error(f"Failed to upsert text chunks: {e}")
+            raise
+
+    async def _get_existing_doc_ids(self, scope_filter: Dict[str, str]) -> set:
+        """Get the IDs of the indexed documents whose metadata matches the scope filter.
+
+        Reads the document infos of the docstore, or the nodes of the vector store if the
+        vector store keeps the text; backends that support it override this with a
+        lighter query.
+        """
+        if self.rag_index.vector_store.stores_text:
+            nodes = await self.rag_index.vector_store.aget_nodes(
+                filters=self._create_metadata_filters(scope_filter)
+            )
+            return {node.ref_doc_id for node in nodes if node.ref_doc_id}
+
+        ref_doc_infos = await self.rag_index.docstore.aget_all_ref_doc_info() or {}
+        return {
+            doc_id
+            for doc_id, ref_doc_info in ref_doc_infos.items()
+            if all(
+                ref_doc_info.metadata.get(key) == value
+                for key, value in scope_filter.items()
+            )
+        }
+
     async def delete_documents(
         self,
         doc_ids: List[str],
@@ -374,8 +688,7 @@ class BaseVectorIndexRagOps(ABC):
             raise ValueError("Index must be created before deleting documents")
 
         try:
-            for doc_id in doc_ids:
-                self.rag_index.delete(doc_id)
+            await self._bulk_delete_documents(doc_ids)
 
             self.logger.info(f"Successfully deleted {len(doc_ids)} documents")
 
@@ -386,28 +699,88 @@ class BaseVectorIndexRagOps(ABC):
             self.logger.error(f"Failed to delete documents: {e}")
             raise
 
+    async def _bulk_insert_documents(
+        self,
+        documents: List[Document],
+        transformations: Optional[List[TransformComponent]] = None,
+    ) -> None:
+        """Run the transformations once over all documents, then embed and upsert the nodes
+        in batches of `insert_batch_size`, with at most `insert_concurrency` batches in flight.
+        """
+        nodes = await arun_transformations(
+            documents, transformations or self.rag_index._transformations
+        )
+        semaphore = asyncio.Semaphore(self.insert_concurrency)
+        embed_model = self.emb_llm or Settings.embed_model
+
+        async def _insert_batch(batch: List[BaseNode]) -> None:
+            async with semaphore:
+                pending_nodes = [node for node in batch if node.embedding is None]
+                if pending_nodes:
+                    embeddings = await embed_model.aget_text_embedding_batch(
+                        [
+                            node.get_content(metadata_mode=MetadataMode.EMBED)
+                            for node in pending_nodes
+                        ]
+                    )
+                    for node, embedding in zip(pending_nodes, embeddings):
+                        node.embedding = embedding
+                await self.rag_index.ainsert_nodes(batch)
+
+        await asyncio.gather(
+            *(
+                _insert_batch(nodes[start : start + self.insert_batch_size])
+                for start in range(0, len(nodes), self.insert_batch_size)
+            )
+        )
+        self.logger.debug(
+            f"Bulk inserted {len(nodes)} nodes from {len(documents)} documents"
+        )
+
+    async def _bulk_delete_documents(self, doc_ids: List[str]) -> None:
+        """Delete the nodes of all documents from the index.
+
+        Deletes the documents concurrently by default; backends that support it override
+        this with a single filter-based delete.
+        """
+        await asyncio.gather(
+            *(
+                self.rag_index.adelete_ref_doc(doc_id, delete_from_docstore=True)
+                for doc_id in doc_ids
+            )
+        )
+
     def _create_documents_from_text_chunks(
         self, text_chunks: List[str], metadata: dict = None
     ) -> tuple[List[Document], List[str]]:
-        """Create Document objects from text chunks with optional metadata."""
+        """Create Document objects from text chunks with optional metadata.
+
+        Document ids are derived from the chunk text and metadata, so repeated chunks
+        are only indexed once. Returns one document per distinct chunk, and the document
+        id of every non-empty chunk in order, repeated chunks sharing the same id.
+        """
         if not text_chunks:
             raise ValueError("text_chunks cannot be empty")
 
         documents = []
         doc_ids = []
+        seen_doc_ids = set()
 
         for text in text_chunks:
             if not text.strip():  # Skip empty or whitespace-only chunks
                 continue
 
-            doc_id = f"doc_id_{uuid.uuid4()}"
+            doc_id = get_text_chunk_doc_id(text, metadata)
+            doc_ids.append(doc_id)
+            if doc_id in seen_doc_ids:  # Index repeated chunks once
+                continue
+            seen_doc_ids.add(doc_id)
             doc_chunk = Document(text=text, id_=doc_id)
 
             if metadata:
                 doc_chunk.metadata = metadata.copy()
 
             documents.append(doc_chunk)
-            doc_ids.append(doc_id)
 
         if not documents:
             raise ValueError("No valid text chunks provided after filtering")
@@ -421,21 +794,6 @@ class BaseVectorIndexRagOps(ABC):
             f"Next attempt in {retry_state.next_action.sleep} seconds."
         )
 
-    def _retry_on_empty_string_or_timeout_response(self, result) -> bool:
-        """Check if response indicates failure requiring retry."""
-        if hasattr(result, "response"):
-            response_text = str(result.response)
-        else:
-            response_text = str(result)
-
-        # Check for empty responses or known error patterns
-        return (
-            response_text == ""
-            or response_text == "504.0 GatewayTimeout"
-            or "timeout" in response_text.lower()
-            or len(response_text.strip()) == 0
-        )
-
     async def _prequery_filter_guard(
         self, metadata_filter: Optional[Dict[str, Any]]
     ) -> None:
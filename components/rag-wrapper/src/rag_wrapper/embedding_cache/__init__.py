@@ -0,0 +1,4 @@
+from .cached_embedding import CachedEmbedding
+from .sqlite_embedding_cache_store import SQLiteEmbeddingCacheStore
+
+__all__ = ["CachedEmbedding", "SQLiteEmbeddingCacheStore"]
@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import logging
+import unicodedata
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from pydantic import PrivateAttr
+
+from ..base.base_embedding_cache_store import BaseEmbeddingCacheStore
+
+QUERY_EMBEDDING = "query"
+TEXT_EMBEDDING = "text"
+
+
+class CachedEmbedding(BaseEmbedding):
+    """
+    Content-addressed cache in front of an embedding model.
+
+    Embeddings are keyed on a hash of the model id, the kind of embedding (query or text,
+    as some models embed them differently) and the normalized text, so re-ingesting a
+    document only pays for the chunks that actually changed. Lookups go to an in-memory
+    LRU first and to the optional persistent `cache_store` next. Only the misses are sent
+    to the wrapped model, in batches, with duplicates within a batch embedded once.
+    `get_stats()` reports the hit and miss counters.
+    """
+
+    _embed_model: BaseEmbedding = PrivateAttr()
+    _cache_store: Optional[BaseEmbeddingCacheStore] = PrivateAttr(default=None)
+    _model_id: str = PrivateAttr()
+    _max_lru_size: int = PrivateAttr()
+    _lru: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _logger: logging.Logger = PrivateAttr()
+    _hits: int = PrivateAttr(default=0)
+    _misses: int = PrivateAttr(default=0)
+
+    def __init__(
+        self,
+        embed_model: BaseEmbedding,
+        cache_store: Optional[BaseEmbeddingCacheStore] = None,
+        max_lru_size: int = 10000,
+        model_id: Optional[str] = None,
+        **kwargs,
+    ):
+        """Wrap an embedding model with the cache.
+
+        Args:
+            embed_model: Embedding model to send cache misses to
+            cache_store: Optional persistent backend, e.g. SQLiteEmbeddingCacheStore
+            max_lru_size: Maximum number of embeddings kept in memory (default: 10000)
+            model_id: Identifies the model in the cache keys (default: derived from the model class, name and dimensions)
+        """
+        kwargs.setdefault("model_name", embed_model.model_name)
+        kwargs.setdefault("embed_batch_size", embed_model.embed_batch_size)
+        kwargs.setdefault("num_workers", embed_model.num_workers)
+        super().__init__(**kwargs)
+        self._embed_model = embed_model
+        self._cache_store = cache_store
+        self._max_lru_size = max_lru_size
+        self._model_id = model_id or self._default_model_id(embed_model)
+        self._logger = logging.getLogger(__name__)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    @staticmethod
+    def _default_model_id(embed_model: BaseEmbedding) -> str:
+        dimensions = getattr(embed_model, "dimensions", None)
+        return f"{embed_model.class_name()}:{embed_model.model_name}:{dimensions}"
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Unicode-normalize the text and collapse whitespace runs."""
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    def _get_cache_key(self, kind: str, text: str) -> str:
+        content = "\x1f".join((self._model_id, kind, self._normalize(text)))
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the cache hit and miss counters and the number of embeddings held in memory."""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "lru_size": len(self._lru),
+        }
+
+    def _lookup_lru(self, keys: List[str]) -> Dict[str, Embedding]:
+        found = {}
+        for key in keys:
+            embedding = self._lru.get(key)
+            if embedding is not None:
+                self._lru.move_to_end(key)
+                found[key] = embedding
+        return found
+
+    def _remember(self, embeddings: Dict[str, Embedding]) -> None:
+        for key, embedding in embeddings.items():
+            self._lru[key] = embedding
+            self._lru.move_to_end(key)
+        while len(self._lru) > self._max_lru_size:
+            self._lru.popitem(last=False)
+
+    @staticmethod
+    def _get_missing(
+        keys: List[str], texts: List[str], found: Dict[str, Embedding]
+    ) -> Dict[str, str]:
+        """Get the distinct texts whose keys are not in `found`, by key."""
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        return missing
+
+    def _count(self, num_texts: int, num_embedded: int) -> None:
+        self._misses += num_embedded
+        self._hits += num_texts - num_embedded
+        self._logger.debug(
+            f"Embedding cache: {num_texts - num_embedded} hits, {num_embedded} misses"
+        )
+
+    def _get_cached_embeddings(
+        self,
+        kind: str,
+        texts: List[str],
+        embed_fn: Callable[[List[str]], List[Embedding]],
+    ) -> List[Embedding]:
+        keys = [self._get_cache_key(kind, text) for text in texts]
+        found = self._lookup_lru(keys)
+        missing = self._get_missing(keys, texts, found)
+        if missing and self._cache_store:
+            stored = self._cache_store.get_many(list(missing))
+            self._remember(stored)
+            found.update(stored)
+            missing = self._get_missing(keys, texts, found)
+
+        if missing:
+            embedded = dict(zip(missing, embed_fn(list(missing.values()))))
+            if self._cache_store:
+                self._cache_store.put_many(embedded)
+            self._remember(embedded)
+            found.update(embedded)
+        self._count(len(texts), len(missing))
+        return [found[key] for key in keys]
+
+    async def _aget_cached_embeddings(
+        self,
+        kind: str,
+        texts: List[str],
+        embed_fn: Callable[[List[str]], Awaitable[List[Embedding]]],
+    ) -> List[Embedding]:
+        keys = [self._get_cache_key(kind, text) for text in texts]
+        found = self._lookup_lru(keys)
+        missing = self._get_missing(keys, texts, found)
+        if missing and self._cache_store:
+            stored = await asyncio.to_thread(self._cache_store.get_many, list(missing))
+            self._remember(stored)
+            found.update(stored)
+            missing = self._get_missing(keys, texts, found)
+
+        if missing:
+            embedded = dict(zip(missing, await embed_fn(list(missing.values()))))
+            if self._cache_store:
+                await asyncio.to_thread(self._cache_store.put_many, embedded)
+            self._remember(embedded)
+            found.update(embedded)
+        self._count(len(texts), len(missing))
+        return [found[key] for key in keys]
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        return self._get_cached_embeddings(
+            QUERY_EMBEDDING,
+            [query],
+            lambda queries: [self._embed_model.get_query_embedding(queries[0])],
+        )[0]
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        async def aembed(queries: List[str]) -> List[Embedding]:
+            return [await self._embed_model.aget_query_embedding(queries[0])]
+
+        return (await self._aget_cached_embeddings(QUERY_EMBEDDING, [query], aembed))[0]
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._get_text_embeddings([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> Embedding:
+        return (await self._aget_text_embeddings([text]))[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        return self._get_cached_embeddings(
+            TEXT_EMBEDDING, texts, self._embed_model.get_text_embedding_batch
+        )
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        return await self._aget_cached_embeddings(
+            TEXT_EMBEDDING, texts, self._embed_model.aget_text_embedding_batch
+        )
@@ -1,7 +1,18 @@
+import json
+import time
 from typing import Any, Dict, Optional, Union, List
 from llama_index.core import StorageContext, VectorStoreIndex
 from llama_index.core.llms import LLM
-from llama_index.vector_stores.qdrant.base import QdrantVectorStore, DEFAULT_DENSE_VECTOR_NAME
+from llama_index.core.vector_stores import (
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+from llama_index.vector_stores.qdrant.base import (
+    QdrantVectorStore,
+    DEFAULT_DENSE_VECTOR_NAME,
+    DOCUMENT_ID_KEY,
+)
 from qdrant_client.http.models import VectorParams, Distance, PayloadSchemaType, Filter as QFilter, FieldCondition, MatchValue
 from qdrant_client import QdrantClient, AsyncQdrantClient
 from rag_wrapper.base.base_vector_index_rag_ops import BaseVectorIndexRagOps
@@ -12,6 +23,14 @@ class QdrantRagOps(BaseVectorIndexRagOps):
     Supports both synchronous and asynchronous Qdrant clients by providing
     both client types to the QdrantVectorStore for maximum flexibility.
     Uses async client for index existence checks.
+
+    One sync and one async client are created lazily and reused for all calls,
+    so their connection pools survive across requests. Call `aclose()` to close them.
+
+    Positive collection existence checks and metadata filters that matched data are
+    cached for `cache_ttl_in_seconds`, so repeated queries with the same filter skip
+    those round trips. The cache is cleared by `create_index()`, `upsert_text_chunks()` and
+    `delete_documents()`.
     """
 
     _ERROR = ValueError(
@@ -28,6 +47,7 @@ class QdrantRagOps(BaseVectorIndexRagOps):
         api_key: Optional[str] = None,
         vector_store_kwargs: Optional[Dict] = None,
         payload_fields: Optional[List[str]] = None,
+        cache_ttl_in_seconds: float = 60,
         **kwargs,
     ):
         """Initialize Qdrant RAG operations with authentication and LLM models.
@@ -42,6 +62,7 @@ class QdrantRagOps(BaseVectorIndexRagOps):
             payload_fields: Optional list of payload field names to create indexes for.
                            All fields will use "keyword" schema type for exact matching filters.
                            These indexes enable efficient filtering on metadata fields.
+            cache_ttl_in_seconds: How long existence checks of the collection and of metadata filters are cached
             **kwargs: Additional arguments passed to BaseRagOps (similarity_top_k, response_mode)
         """
         super().__init__(completion_llm, emb_llm, **kwargs)
@@ -51,6 +72,13 @@ class QdrantRagOps(BaseVectorIndexRagOps):
         self.vector_store_kwargs = vector_store_kwargs or {}
         self.payload_fields = payload_fields or []
         self.vector_store = None
+        self._sync_client: Optional[QdrantClient] = None
+        self._async_client: Optional[AsyncQdrantClient] = None
+        self.cache_ttl_in_seconds = cache_ttl_in_seconds
+        # Expiry times (time.monotonic()) of the positive existence checks
+        self._collection_exists_until = 0.0
+        self._validated_filters_until: Dict[str, float] = {}
+        self.num_round_trips_saved = 0
 
     def _create_sync_client(self) -> QdrantClient:
         """Create a synchronous Qdrant client."""
@@ -66,12 +94,33 @@ class QdrantRagOps(BaseVectorIndexRagOps):
             api_key=self.api_key,
         )
 
+    def _get_sync_client(self) -> QdrantClient:
+        """Get the long-lived synchronous Qdrant client, creating it on first use."""
+        if self._sync_client is None:
+            self._sync_client = self._create_sync_client()
+        return self._sync_client
+
+    def _get_async_client(self) -> AsyncQdrantClient:
+        """Get the long-lived asynchronous Qdrant client, creating it on first use."""
+        if self._async_client is None:
+            self._async_client = self._create_async_client()
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Close the Qdrant clients and their connection pools."""
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
     def _get_vector_store_config(self) -> Dict:
         """Get the vector store configuration with both sync and async clients."""
         base_config = {
             "collection_name": self.collection_name,
-            "client": self._create_sync_client(),
-            "aclient": self._create_async_client(),
+            "client": self._get_sync_client(),
+            "aclient": self._get_async_client(),
             "dense_vector_name": DEFAULT_DENSE_VECTOR_NAME,
             **self.vector_store_kwargs,
         }
@@ -101,15 +150,31 @@ class QdrantRagOps(BaseVectorIndexRagOps):
             except Exception as e:
                 self.logger.warning(f"Failed to create payload index for field {field_name}: {e}")
 
+    def invalidate_caches(self) -> None:
+        """Forget the cached collection and metadata filter existence checks."""
+        self._collection_exists_until = 0.0
+        self._validated_filters_until.clear()
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get the number of Qdrant round trips saved by the cache and the number of cached filters."""
+        return {
+            "round_trips_saved": self.num_round_trips_saved,
+            "cached_filters": len(self._validated_filters_until),
+        }
+
     async def index_exists(self) -> bool:
         """Check if the Qdrant collection exists using async client."""
+        if time.monotonic() < self._collection_exists_until:
+            self.num_round_trips_saved += 1
+            return True
         try:
-            client = self._create_async_client()
-            collections = await client.get_collections()
+            collections = await self._get_async_client().get_collections()
             collection_names = [c.name for c in collections.collections]
             exists = self.collection_name in collection_names
             
             self.logger.info(f"Qdrant collection '{self.collection_name}' exists: {exists}")
+            if exists:
+                self._collection_exists_until = time.monotonic() + self.cache_ttl_in_seconds
             return exists
         except Exception as e:
             self.logger.error(f"Error checking Qdrant collection existence: {e}")
@@ -124,7 +189,7 @@ class QdrantRagOps(BaseVectorIndexRagOps):
                     f"Collection {self.collection_name} does not exist. Use create_index() to create a new collection."
                 )
                 # Create the collection
-                client = self._create_sync_client()
+                client = self._get_sync_client()
                 probe_vec = self.emb_llm.get_text_embedding("dim-probe")
                 dim = len(probe_vec)
                 client.create_collection(
@@ -172,6 +237,64 @@ class QdrantRagOps(BaseVectorIndexRagOps):
         """No-op as Qdrant automatically persists the index."""
         pass
 
+    async def create_index(self, *args, **kwargs) -> List[str]:
+        """Create a new index from text chunks, see BaseVectorIndexRagOps.create_index()."""
+        try:
+            return await super().create_index(*args, **kwargs)
+        finally:
+            self.invalidate_caches()
+
+    async def upsert_text_chunks(self, *args, **kwargs) -> Dict[str, List[str]]:
+        """Sync the documents of a scope with text chunks, see BaseVectorIndexRagOps.upsert_text_chunks()."""
+        try:
+            return await super().upsert_text_chunks(*args, **kwargs)
+        finally:
+            self.invalidate_caches()
+
+    async def delete_documents(self, doc_ids: List[str]) -> None:
+        """Delete documents from the collection, see BaseVectorIndexRagOps.delete_documents()."""
+        try:
+            await super().delete_documents(doc_ids)
+        finally:
+            self.invalidate_caches()
+
+    async def _bulk_delete_documents(self, doc_ids: List[str]) -> None:
+        """Delete the points of all documents with a single filter-based delete."""
+        await self.vector_store.adelete_nodes(
+            filters=MetadataFilters(
+                filters=[
+                    MetadataFilter(
+                        key=DOCUMENT_ID_KEY,
+                        value=doc_ids,
+                        operator=FilterOperator.IN,
+                    )
+                ]
+            )
+        )
+
+    async def _get_existing_doc_ids(self, scope_filter: Dict[str, str]) -> set:
+        """Get the document IDs in the scope by scrolling only the document id payload of its points."""
+        aclient = self._get_async_client()
+        scroll_filter = self._to_qdrant_filter(scope_filter)
+        doc_ids = set()
+        offset = None
+        while True:
+            points, offset = await aclient.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                with_payload=[DOCUMENT_ID_KEY],
+                with_vectors=False,
+                limit=1000,
+                offset=offset,
+            )
+            doc_ids.update(
+                point.payload[DOCUMENT_ID_KEY]
+                for point in points
+                if point.payload and point.payload.get(DOCUMENT_ID_KEY)
+            )
+            if offset is None:
+                return doc_ids
+
     def _to_qdrant_filter(self, metadata_filter: Dict[str, Any]) -> QFilter:
         # Exact-match map (you already build ExactMatchFilter upstream)
         return QFilter(
@@ -184,7 +307,11 @@ class QdrantRagOps(BaseVectorIndexRagOps):
     async def _prequery_filter_guard(self, metadata_filter: Optional[Dict[str, Any]]) -> None:
         if not metadata_filter:
             return
-        aclient = self._create_async_client()
+        cache_key = json.dumps(metadata_filter, sort_keys=True)
+        if time.monotonic() < self._validated_filters_until.get(cache_key, 0.0):
+            self.num_round_trips_saved += 1
+            return
+        aclient = self._get_async_client()
         qf = self._to_qdrant_filter(metadata_filter)
 
         # Fast existence check: scroll 1 point by filter only (no vectors/payload)
@@ -197,3 +324,16 @@ class QdrantRagOps(BaseVectorIndexRagOps):
         )
         if not points:
             raise ValueError(f"No data matches metadata filter: {metadata_filter}")
+        self._remember_validated_filter(cache_key)
+
+    def _remember_validated_filter(self, cache_key: str) -> None:
+        now = time.monotonic()
+        # Filters are kept in validation order, which is their expiry order: drop the
+        # expired ones from the front, and move a re-validated filter to the back
+        while self._validated_filters_until:
+            oldest_key = next(iter(self._validated_filters_until))
+            if self._validated_filters_until[oldest_key] > now:
+                break
+            del self._validated_filters_until[oldest_key]
+        self._validated_filters_until.pop(cache_key, None)
+        self._validated_filters_until[cache_key] = now + self.cache_ttl_in_seconds
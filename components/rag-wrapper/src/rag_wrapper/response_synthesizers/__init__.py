@@ -0,0 +1,3 @@
+from .token_budget_synthesizer import PACKED_RESPONSE_MODE, TokenBudgetSynthesizer
+
+__all__ = ["PACKED_RESPONSE_MODE", "TokenBudgetSynthesizer"]
@@ -0,0 +1,341 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+import fsspec
+import numpy as np
+from fsspec.implementations.local import LocalFileSystem
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.schema import BaseNode
+from llama_index.core.vector_stores.simple import NAMESPACE_SEP
+from llama_index.core.vector_stores.types import (
+    BasePydanticVectorStore,
+    FilterCondition,
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+    VectorStoreQuery,
+    VectorStoreQueryMode,
+    VectorStoreQueryResult,
+)
+
+DEFAULT_NAMESPACE = "default"
+EMBEDDINGS_FNAME = "numpy_embeddings.npy"
+METADATA_FNAME = "numpy_metadata.json"
+
+# Metadata values that can be filtered on, other values are not kept in the sidecar
+_SCALAR_TYPES = (str, int, float, bool)
+
+
+class NumpyVectorStore(BasePydanticVectorStore):
+    """
+    In-memory vector store that keeps all embeddings in one contiguous NumPy matrix.
+
+    Embeddings are L2-normalized on insert, so cosine similarity is a single
+    matrix-vector product and the top k are selected with `argpartition`. The matrix
+    is persisted as a `.npy` file and memory-mapped on load, so opening a large index
+    does not parse JSON. Node ids, ref doc ids and the scalar metadata go into a
+    columnar JSON sidecar; metadata filters are evaluated on boolean bitmaps built
+    per metadata key on first use.
+
+    Supports the default query mode and the ==, !=, in and nin filter operators,
+    which is what the RAG ops use. Text is kept in the docstore, like with
+    llama-index's SimpleVectorStore.
+    """
+
+    stores_text: bool = False
+    dtype: str = "float32"
+
+    _embeddings: np.ndarray = PrivateAttr()
+    # Rows added since the matrix was last consolidated, see _get_embeddings()
+    _pending_embeddings: List[np.ndarray] = PrivateAttr(default_factory=list)
+    _node_ids: List[str] = PrivateAttr(default_factory=list)
+    _ref_doc_ids: List[Optional[str]] = PrivateAttr(default_factory=list)
+    _metadata_columns: Dict[str, List[Any]] = PrivateAttr(default_factory=dict)
+    # metadata key -> value -> rows with that value
+    _bitmaps: Dict[str, Dict[Any, np.ndarray]] = PrivateAttr(default_factory=dict)
+    _is_dirty: bool = PrivateAttr(default=False)
+
+    def __init__(self, dtype: str = "float32", **kwargs: Any) -> None:
+        """
+        Create an empty vector store.
+
+        Args:
+            dtype: Precision the embeddings are stored in, "float32" or "float16" (default: "float32")
+        """
+        super().__init__(dtype=dtype, **kwargs)
+        self._embeddings = np.empty((0, 0), dtype=self.dtype)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "NumpyVectorStore"
+
+    @property
+    def client(self) -> None:
+        """Get client."""
+        return None
+
+    @classmethod
+    def get_persist_paths(
+        cls, persist_dir: str, namespace: str = DEFAULT_NAMESPACE
+    ) -> tuple:
+        """Get the paths of the embedding matrix and of the metadata sidecar."""
+        prefix = f"{namespace}{NAMESPACE_SEP}"
+        return (
+            os.path.join(persist_dir, prefix + EMBEDDINGS_FNAME),
+            os.path.join(persist_dir, prefix + METADATA_FNAME),
+        )
+
+    @classmethod
+    def exists_in_persist_dir(
+        cls, persist_dir: str, namespace: str = DEFAULT_NAMESPACE
+    ) -> bool:
+        """Check if a vector store of this type was persisted in the directory."""
+        embeddings_path, _ = cls.get_persist_paths(persist_dir, namespace)
+        return os.path.exists(embeddings_path)
+
+    @classmethod
+    def from_persist_dir(
+        cls, persist_dir: str, namespace: str = DEFAULT_NAMESPACE
+    ) -> "NumpyVectorStore":
+        """
+        Load a persisted vector store, memory-mapping the embedding matrix read-only.
+
+        Args:
+            persist_dir: Directory the storage context was persisted to
+            namespace: Vector store namespace (default: "default")
+        """
+        embeddings_path, metadata_path = cls.get_persist_paths(persist_dir, namespace)
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            sidecar = json.load(f)
+
+        vector_store = cls(dtype=sidecar["dtype"])
+        vector_store._embeddings = np.load(embeddings_path, mmap_mode="r")
+        vector_store._node_ids = sidecar["node_ids"]
+        vector_store._ref_doc_ids = sidecar["ref_doc_ids"]
+        vector_store._metadata_columns = sidecar["metadata_columns"]
+        return vector_store
+
+    def persist(
+        self, persist_path: str, fs: Optional[fsspec.AbstractFileSystem] = None
+    ) -> None:
+        """
+        Save the embedding matrix and the metadata sidecar next to `persist_path`.
+
+        The storage context passes the path of the default JSON vector store file,
+        its directory and namespace are used. The matrix is only rewritten when it changed.
+        """
+        if fs is not None and not isinstance(fs, LocalFileSystem):
+            raise NotImplementedError(
+                "NumpyVectorStore only persists to the local file system"
+            )
+
+        persist_dir, fname = os.path.split(persist_path)
+        namespace = (
+            fname.split(NAMESPACE_SEP)[0]
+            if NAMESPACE_SEP in fname
+            else DEFAULT_NAMESPACE
+        )
+        embeddings_path, metadata_path = self.get_persist_paths(persist_dir, namespace)
+        os.makedirs(persist_dir or ".", exist_ok=True)
+
+        embeddings = self._get_embeddings()
+        if self._is_dirty or not os.path.exists(embeddings_path):
+            # Write to a temporary file first, a reader may have the old matrix memory-mapped
+            tmp_path = embeddings_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, embeddings)
+            os.replace(tmp_path, embeddings_path)
+            self._is_dirty = False
+
+        sidecar = {
+            "dtype": self.dtype,
+            "node_ids": self._node_ids,
+            "ref_doc_ids": self._ref_doc_ids,
+            "metadata_columns": self._metadata_columns,
+        }
+        tmp_path = metadata_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(sidecar, f)
+        os.replace(tmp_path, metadata_path)
+
+    def _get_embeddings(self) -> np.ndarray:
+        """Get the embedding matrix, merging the rows added since the last call into it."""
+        if self._pending_embeddings:
+            blocks = self._pending_embeddings
+            if len(self._embeddings):
+                blocks = [self._embeddings] + blocks
+            self._embeddings = np.concatenate(blocks).astype(self.dtype, copy=False)
+            self._pending_embeddings = []
+        return self._embeddings
+
+    @staticmethod
+    def _normalize(embeddings: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+        return embeddings / np.where(norms == 0, 1, norms)
+
+    def add(self, nodes: Sequence[BaseNode], **add_kwargs: Any) -> List[str]:
+        """Add nodes with their embeddings to the vector store."""
+        if not nodes:
+            return []
+        embeddings = np.asarray(
+            [node.get_embedding() for node in nodes], dtype=np.float32
+        )
+        self._pending_embeddings.append(self._normalize(embeddings).astype(self.dtype))
+
+        num_rows = len(self._node_ids)
+        for node in nodes:
+            for key, value in node.metadata.items():
+                if key not in self._metadata_columns and isinstance(
+                    value, _SCALAR_TYPES
+                ):
+                    self._metadata_columns[key] = [None] * num_rows
+            for key, column in self._metadata_columns.items():
+                value = node.metadata.get(key)
+                column.append(value if isinstance(value, _SCALAR_TYPES) else None)
+            self._node_ids.append(node.node_id)
+            self._ref_doc_ids.append(node.ref_doc_id)
+            num_rows += 1
+
+        self._bitmaps.clear()
+        self._is_dirty = True
+        return [node.node_id for node in nodes]
+
+    def _keep_rows(self, keep: np.ndarray) -> None:
+        """Drop all rows whose entry in the boolean mask `keep` is False."""
+        if keep.all():
+            return
+        self._embeddings = np.ascontiguousarray(self._get_embeddings()[keep])
+        indices = np.flatnonzero(keep)
+        self._node_ids = [self._node_ids[i] for i in indices]
+        self._ref_doc_ids = [self._ref_doc_ids[i] for i in indices]
+        self._metadata_columns = {
+            key: [column[i] for i in indices]
+            for key, column in self._metadata_columns.items()
+        }
+        self._bitmaps.clear()
+        self._is_dirty = True
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        """Delete all nodes of a document."""
+        self._keep_rows(np.asarray(self._ref_doc_ids, dtype=object) != ref_doc_id)
+
+    def delete_nodes(
+        self,
+        node_ids: Optional[List[str]] = None,
+        filters: Optional[MetadataFilters] = None,
+        **delete_kwargs: Any,
+    ) -> None:
+        """Delete the nodes that match both the node ids and the filters, if given."""
+        self._keep_rows(~self._get_mask(node_ids=node_ids, filters=filters))
+
+    def clear(self) -> None:
+        """Delete all nodes."""
+        self._keep_rows(np.zeros(len(self._node_ids), dtype=bool))
+
+    def _get_bitmap(self, key: str, value: Any) -> np.ndarray:
+        bitmaps = self._bitmaps.get(key)
+        if bitmaps is None:
+            bitmaps = self._bitmaps[key] = {}
+            column = self._metadata_columns.get(key, [])
+            indices_by_value: Dict[Any, List[int]] = {}
+            for i, column_value in enumerate(column):
+                if column_value is not None:
+                    indices_by_value.setdefault(column_value, []).append(i)
+            for column_value, indices in indices_by_value.items():
+                bitmap = np.zeros(len(self._node_ids), dtype=bool)
+                bitmap[indices] = True
+                bitmaps[column_value] = bitmap
+        bitmap = bitmaps.get(value)
+        if bitmap is None:
+            return np.zeros(len(self._node_ids), dtype=bool)
+        return bitmap
+
+    def _get_filter_mask(self, metadata_filter: MetadataFilter) -> np.ndarray:
+        operator = metadata_filter.operator
+        key, value = metadata_filter.key, metadata_filter.value
+        if operator in (FilterOperator.EQ, FilterOperator.NE):
+            mask = self._get_bitmap(key, value)
+        elif operator in (FilterOperator.IN, FilterOperator.NIN):
+            mask = np.zeros(len(self._node_ids), dtype=bool)
+            for item in value:
+                mask = mask | self._get_bitmap(key, item)
+        else:
+            raise NotImplementedError(
+                f"Filter operator {operator} is not supported by NumpyVectorStore"
+            )
+        if operator in (FilterOperator.NE, FilterOperator.NIN):
+            return ~mask
+        return mask
+
+    def _get_filters_mask(self, filters: MetadataFilters) -> np.ndarray:
+        masks = [
+            (
+                self._get_filters_mask(f)
+                if isinstance(f, MetadataFilters)
+                else self._get_filter_mask(f)
+            )
+            for f in filters.filters
+        ]
+        if not masks:
+            mask = np.ones(len(self._node_ids), dtype=bool)
+        elif filters.condition == FilterCondition.OR:
+            mask = np.logical_or.reduce(masks)
+        else:
+            mask = np.logical_and.reduce(masks)
+        if filters.condition == FilterCondition.NOT:
+            return ~mask
+        return mask
+
+    def _get_mask(
+        self,
+        node_ids: Optional[List[str]] = None,
+        doc_ids: Optional[List[str]] = None,
+        filters: Optional[MetadataFilters] = None,
+    ) -> np.ndarray:
+        """Get the rows matching all the given conditions as a boolean mask."""
+        mask = np.ones(len(self._node_ids), dtype=bool)
+        if node_ids is not None:
+            mask &= np.isin(np.asarray(self._node_ids, dtype=object), node_ids)
+        if doc_ids is not None:
+            mask &= np.isin(np.asarray(self._ref_doc_ids, dtype=object), doc_ids)
+        if filters is not None:
+            mask &= self._get_filters_mask(filters)
+        return mask
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        """Get the nodes most similar to the query embedding by cosine similarity."""
+        if query.mode != VectorStoreQueryMode.DEFAULT:
+            raise NotImplementedError(
+                f"Query mode {query.mode} is not supported by NumpyVectorStore"
+            )
+        embeddings = self._get_embeddings()
+        if not len(embeddings):
+            return VectorStoreQueryResult(similarities=[], ids=[])
+
+        query_embedding = self._normalize(
+            np.asarray(query.query_embedding, dtype=np.float32)
+        ).astype(embeddings.dtype)
+        if query.node_ids is None and query.doc_ids is None and query.filters is None:
+            candidates = None
+            scores = embeddings @ query_embedding
+        else:
+            candidates = np.flatnonzero(
+                self._get_mask(query.node_ids, query.doc_ids, query.filters)
+            )
+            scores = embeddings[candidates] @ query_embedding
+
+        top_k = min(query.similarity_top_k, len(scores))
+        if top_k == 0:
+            return VectorStoreQueryResult(similarities=[], ids=[])
+        if top_k < len(scores):
+            top_indices = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top_indices = np.arange(len(scores))
+        top_indices = top_indices[np.argsort(-scores[top_indices], kind="stable")]
+
+        rows = top_indices if candidates is None else candidates[top_indices]
+        return VectorStoreQueryResult(
+            similarities=scores[top_indices].astype(float).tolist(),
+            ids=[self._node_ids[row] for row in rows],
+        )
@@ -0,0 +1,88 @@
+"""
+Bulk Index Operation Tests
+
+Uses a mock embedding model and an in-memory index, no external services are required.
+"""
+
+from typing import List
+
+import pytest
+
+from llama_index.core import MockEmbedding, Settings
+from llama_index.core.llms import MockLLM
+from llama_index.core.node_parser import SentenceSplitter
+from rag_wrapper.rag_ops.in_mem_rag_ops import InMemRagOps
+
+
+class CountingMockEmbedding(MockEmbedding):
+    """Mock embedding model that records the size of every batch request."""
+
+    batch_sizes: List[int] = []
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        self.batch_sizes.append(len(texts))
+        return await super()._aget_text_embeddings(texts)
+
+
+@pytest.fixture
+def rag_ops(tmp_path):
+    rag_ops = InMemRagOps(
+        persist_dir=str(tmp_path / "index"),
+        emb_llm=CountingMockEmbedding(embed_dim=8, batch_sizes=[]),
+        completion_llm=MockLLM(),
+        insert_batch_size=4,
+    )
+    persist_index = rag_ops.persist_index
+
+    async def counting_persist_index():
+        rag_ops.num_persists += 1
+        await persist_index()
+
+    rag_ops.num_persists = 0
+    rag_ops.persist_index = counting_persist_index
+    return rag_ops
+
+
+async def test_create_and_insert_embed_in_batches(rag_ops):
+    await rag_ops.create_index(
+        [f"chunk {i}" for i in range(10)], transformations=[SentenceSplitter()]
+    )
+    await rag_ops.insert_text_chunks([f"more {i}" for i in range(5)])
+
+    assert sorted(rag_ops.emb_llm.batch_sizes) == [1, 2, 4, 4, 4]
+    assert len(rag_ops.rag_index.index_struct.nodes_dict) == 15
+    assert rag_ops.num_persists == 2
+
+
+async def test_insert_without_emb_llm_uses_the_global_embed_model(
+    tmp_path, monkeypatch
+):
+    embed_model = CountingMockEmbedding(embed_dim=8, batch_sizes=[])
+    monkeypatch.setattr(Settings, "_embed_model", embed_model)
+    rag_ops = InMemRagOps(
+        persist_dir=str(tmp_path / "index"),
+        emb_llm=None,
+        completion_llm=MockLLM(),
+        insert_batch_size=4,
+    )
+
+    await rag_ops.create_index([f"chunk {i}" for i in range(6)])
+
+    assert sorted(embed_model.batch_sizes) == [2, 4]
+    assert len(rag_ops.rag_index.index_struct.nodes_dict) == 6
+
+
+async def test_delete_documents_persists_once(rag_ops):
+    doc_ids = await rag_ops.create_index([f"chunk {i}" for i in range(10)])
+    rag_ops.num_persists = 0
+
+    await rag_ops.delete_documents(doc_ids[:6])
+
+    remaining_doc_ids = {
+        node.ref_doc_id
+        for node in rag_ops.rag_index.docstore.get_nodes(
+            list(rag_ops.rag_index.index_struct.nodes_dict.values())
+        )
+    }
+    assert remaining_doc_ids == set(doc_ids[6:])
+    assert rag_ops.num_persists == 1
@@ -0,0 +1,96 @@
+"""
+Embedding Cache Tests
+
+Uses a deterministic fake embedding model, no external services are required.
+"""
+
+from typing import List
+
+import pytest
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from rag_wrapper.embedding_cache import CachedEmbedding, SQLiteEmbeddingCacheStore
+
+
+class CountingEmbedding(BaseEmbedding):
+    """Fake embedding model that records every text it embeds."""
+
+    embedded_texts: List[str] = []
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CountingEmbedding"
+
+    def _embed(self, text: str) -> List[float]:
+        self.embedded_texts.append(text)
+        return [float(len(text)), float(sum(map(ord, text)) % 97), 0.5]
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._embed(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._embed(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+@pytest.fixture
+def embed_model():
+    return CountingEmbedding(model_name="counting", embedded_texts=[])
+
+
+@pytest.fixture
+def cache_store(tmp_path):
+    store = SQLiteEmbeddingCacheStore(str(tmp_path / "embeddings.sqlite"))
+    yield store
+    store.close()
+
+
+async def test_only_new_chunks_are_embedded(embed_model, cache_store):
+    cached_model = CachedEmbedding(embed_model, cache_store=cache_store)
+
+    first = await cached_model.aget_text_embedding_batch(["a chunk", "b chunk"])
+    # Whitespace-only differences hit the cache, duplicates are embedded once
+    second = await cached_model.aget_text_embedding_batch(
+        ["a  chunk ", "c chunk", "c chunk"]
+    )
+
+    assert embed_model.embedded_texts == ["a chunk", "b chunk", "c chunk"]
+    assert second[0] == first[0]
+    assert second[1] == second[2]
+    assert cached_model.get_stats() == {"hits": 2, "misses": 3, "lru_size": 3}
+
+
+def test_embeddings_persist_across_instances(embed_model, cache_store):
+    CachedEmbedding(embed_model, cache_store=cache_store).get_text_embedding_batch(
+        ["persisted chunk"]
+    )
+    embed_model.embedded_texts.clear()
+
+    cached_model = CachedEmbedding(embed_model, cache_store=cache_store)
+    embedding = cached_model.get_text_embedding("persisted chunk")
+
+    assert embed_model.embedded_texts == []
+    assert embedding == [15.0, float(sum(map(ord, "persisted chunk")) % 97), 0.5]
+    assert cached_model.get_stats()["hits"] == 1
+
+
+async def test_query_embeddings_are_cached_separately(embed_model):
+    cached_model = CachedEmbedding(embed_model, max_lru_size=1)
+
+    await cached_model.aget_query_embedding("photosynthesis")
+    await cached_model.aget_query_embedding("photosynthesis")
+    await cached_model.aget_text_embedding("photosynthesis")
+
+    assert embed_model.embedded_texts == ["photosynthesis", "photosynthesis"]
+    assert cached_model.get_stats() == {"hits": 1, "misses": 2, "lru_size": 1}
+
+
+def test_cache_keys_depend_on_the_model(embed_model, cache_store):
+    CachedEmbedding(embed_model, cache_store=cache_store).get_text_embedding("chunk")
+    CachedEmbedding(
+        embed_model, cache_store=cache_store, model_id="other-model"
+    ).get_text_embedding("chunk")
+
+    assert embed_model.embedded_texts == ["chunk", "chunk"]
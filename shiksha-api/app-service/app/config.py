@@ -29,6 +29,30 @@ class Settings(BaseSettings):
     qdrant_url: Optional[str] = None
     qdrant_api_key: Optional[str] = None
 
+    # RAG Adapter Cache Configuration
+    rag_adapter_cache_max_size_in_bytes: int = 2 * 1024**3
+    # Directory the RAG index files are downloaded to, defaults to the temp directory.
+    # Downloaded indexes are only re-downloaded when their blobs change.
+    index_cache_dir: Optional[str] = None
+
+    # Question Paper Generation Configuration
+    # Concurrent LLM calls of all question paper requests, adapted between 1 and the maximum
+    # with AIMD: increased while calls succeed, halved on rate limit and timeout errors
+    question_paper_initial_concurrency: int = 4
+    question_paper_max_concurrency: int = 16
+    # SQLite file of the generated questions reused by question paper requests with a
+    # `reuse_ratio`, the questions are kept in memory if not set
+    question_item_store_path: Optional[str] = None
+
+    # Response Cache Configuration, for the question distribution endpoint
+    # Backend: "memory", "disk" (SQLite file at `response_cache_path`) or "redis"
+    response_cache_backend: str = "memory"
+    response_cache_ttl_seconds: int = 24 * 3600
+    # Maximum number of cached responses of the memory and disk backends
+    response_cache_max_entries: int = 1024
+    response_cache_path: Optional[str] = None
+    response_cache_redis_url: Optional[str] = None
+
     class Config:
         env_file = ".env"
         extra = "ignore"  # Allow extra fields to be ignored
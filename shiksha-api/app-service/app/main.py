@@ -16,11 +16,13 @@ async def lifespan(app: FastAPI):
     from app.services.general_chat_service import GENERAL_CHAT_SERVICE_INSTANCE
     from app.services.lesson_chat_service import LESSON_CHAT_SERVICE_INSTANCE
     from app.services.question_paper_service import QUESTION_PAPER_SERVICE_INSTANCE
+    from app.services.response_cache import RESPONSE_CACHE
 
     try:
         await GENERAL_CHAT_SERVICE_INSTANCE.cleanup()
         await LESSON_CHAT_SERVICE_INSTANCE.cleanup()
         await QUESTION_PAPER_SERVICE_INSTANCE.cleanup()
+        await RESPONSE_CACHE.close()
     except Exception as e:
         print(f"Error during cleanup: {e}")
 
@@ -5,7 +5,7 @@ from enum import Enum
 from functools import reduce
 from math import gcd
 from typing import List, Dict, Any, Optional, Union, Tuple
-from pydantic import BaseModel, computed_field, validator
+from pydantic import BaseModel, Field, computed_field, validator
 
 
 # ==============================
@@ -210,6 +210,8 @@ class QuestionBankPartsGenerationRequest(BaseModel):
     total_marks: int
     template: List[Template]
     existing_questions: List[QuestionTypeResponse] = []
+    # Share of the questions taken from previously generated questions, when available
+    reuse_ratio: float = Field(default=0.0, ge=0.0, le=1.0)
 
 
 class QBQuestionDistributionGenerationRequest(BaseModel):
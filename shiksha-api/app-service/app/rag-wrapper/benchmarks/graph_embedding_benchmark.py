@@ -0,0 +1,171 @@
+"""
+Benchmark for embedding the text nodes of a graph during NetworkX graph ingestion.
+
+Compares the previous ingestion path, which embedded one node per synchronous request, with the batched and
+concurrent `_embed_text_nodes()`. The embedding model is a fake with an injected latency per request and per text,
+and an optional failure rate per request to exercise the batch retries. No external services are required.
+
+Usage (from shiksha-api/app-service/app/rag-wrapper):
+    python benchmarks/graph_embedding_benchmark.py
+    python benchmarks/graph_embedding_benchmark.py --nodes 300 --batch-size 32 --concurrency 1 4 8 --failure-rate 0.1
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.llms import MockLLM
+from llama_index.core.schema import TextNode
+
+from rag_wrapper import InMemGraphRagOps
+
+
+class FakeLatencyEmbedding(BaseEmbedding):
+    """Fake embedding model that sleeps like a remote embedding API and fails at random."""
+
+    request_latency: float = 0.05
+    text_latency: float = 0.001
+    failure_rate: float = 0.0
+    num_requests: int = 0
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "FakeLatencyEmbedding"
+
+    def _maybe_fail(self):
+        self.num_requests += 1
+        if random.random() < self.failure_rate:
+            raise RuntimeError("Injected embedding failure")
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._get_text_embedding(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return (await self._aget_text_embeddings([query]))[0]
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        time.sleep(self.request_latency + self.text_latency)
+        self._maybe_fail()
+        return [float(len(text))]
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.request_latency + self.text_latency * len(texts))
+        self._maybe_fail()
+        return [[float(len(text))] for text in texts]
+
+
+def make_text_nodes(num_nodes: int) -> List[TextNode]:
+    return [
+        TextNode(id_=f"node_{i}", text=f"Concept {i} of the chapter. " * 20)
+        for i in range(num_nodes)
+    ]
+
+
+def make_rag_ops(args, concurrency: int) -> InMemGraphRagOps:
+    emb_llm = FakeLatencyEmbedding(
+        model_name="fake",
+        request_latency=args.request_latency,
+        text_latency=args.text_latency,
+        failure_rate=args.failure_rate,
+        embed_batch_size=args.batch_size,
+    )
+    return InMemGraphRagOps(
+        emb_llm=emb_llm,
+        completion_llm=MockLLM(),
+        kg_extractors=[],
+        embedding_batch_size=args.batch_size,
+        embedding_concurrency=concurrency,
+    )
+
+
+def run_sequential(args) -> dict:
+    # The previous ingestion path: one blocking request per node, no retries
+    rag_ops = make_rag_ops(args, concurrency=1)
+    rag_ops.emb_llm.failure_rate = 0.0
+    text_nodes = make_text_nodes(args.nodes)
+    start = time.perf_counter()
+    for node in text_nodes:
+        node.embedding = rag_ops.emb_llm.get_text_embedding(node.text)
+    return {
+        "mode": "sequential",
+        "concurrency": 1,
+        "seconds": time.perf_counter() - start,
+        "requests": rag_ops.emb_llm.num_requests,
+    }
+
+
+async def run_batched(args, concurrency: int) -> dict:
+    rag_ops = make_rag_ops(args, concurrency)
+    # Silence the retry warnings of the injected failures
+    rag_ops._log_retry_attempt = lambda retry_state: None
+    text_nodes = make_text_nodes(args.nodes)
+    start = time.perf_counter()
+    await rag_ops._embed_text_nodes(text_nodes)
+    assert all(node.embedding is not None for node in text_nodes)
+    return {
+        "mode": "batched",
+        "concurrency": concurrency,
+        "seconds": time.perf_counter() - start,
+        "requests": rag_ops.emb_llm.num_requests,
+    }
+
+
+async def main(args):
+    random.seed(args.seed)
+    results = [run_sequential(args)]
+    for concurrency in args.concurrency:
+        results.append(await run_batched(args, concurrency))
+
+    header = f"{'mode':<12} {'concurrency':>12} {'seconds':>10} {'nodes/s':>10} {'requests':>10}"
+    print(
+        f"{args.nodes} nodes, batch size {args.batch_size}, failure rate {args.failure_rate}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['mode']:<12} {r['concurrency']:>12} {r['seconds']:>10.2f} "
+            f"{args.nodes / r['seconds']:>10.0f} {r['requests']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--nodes", type=int, default=300, help="Text nodes in the graph"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=32, help="Texts per embedding request"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 4, 8],
+        help="Numbers of concurrent embedding requests",
+    )
+    parser.add_argument(
+        "--request-latency",
+        type=float,
+        default=0.05,
+        help="Seconds per embedding request",
+    )
+    parser.add_argument(
+        "--text-latency",
+        type=float,
+        default=0.001,
+        help="Additional seconds per embedded text",
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="Probability that a request fails",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Random seed for the injected failures"
+    )
+    asyncio.run(main(parser.parse_args()))
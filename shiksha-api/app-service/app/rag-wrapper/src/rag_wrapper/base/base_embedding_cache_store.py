@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+
+class BaseEmbeddingCacheStore(ABC):
+    """
+    Abstract base class for persistent embedding cache backends.
+
+    Stores embeddings by an opaque content-addressed key, computed by `CachedEmbedding`
+    from the embedding model id and the normalized text. Implementations only need to
+    support batched lookups and writes.
+    """
+
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up the embeddings of the given keys.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Mapping of the keys that were found to their embeddings
+        """
+        pass
+
+    @abstractmethod
+    def put_many(self, embeddings: Dict[str, List[float]]) -> None:
+        """
+        Store the given embeddings, replacing existing entries with the same key.
+
+        Args:
+            embeddings: Mapping of cache keys to embeddings
+        """
+        pass
+
+    def close(self) -> None:
+        """Release the resources held by the backend."""
+        pass
@@ -1,7 +1,12 @@
 from typing import Any, Dict, Optional, List
 from llama_index.core import StorageContext, VectorStoreIndex
 from llama_index.core.llms import LLM
-from llama_index.vector_stores.qdrant.base import QdrantVectorStore
+from llama_index.core.vector_stores import (
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+from llama_index.vector_stores.qdrant.base import QdrantVectorStore, DOCUMENT_ID_KEY
 from rag_wrapper.base.base_vector_index_rag_ops import BaseVectorIndexRagOps
 from rag_wrapper.utils.qdrant import QdrantUtils
 
@@ -28,6 +33,7 @@ class QdrantRagOps(BaseVectorIndexRagOps):
         api_key: Optional[str] = None,
         vector_store_kwargs: Optional[Dict] = None,
         payload_fields: Optional[List[str]] = None,
+        cache_ttl_in_seconds: float = 60,
         **kwargs,
     ):
         super().__init__(completion_llm, emb_llm, **kwargs)
@@ -46,6 +52,7 @@ class QdrantRagOps(BaseVectorIndexRagOps):
             payload_fields=self.payload_fields,
             vector_store_kwargs=self.vector_store_kwargs,
             logger=self.logger,
+            cache_ttl_in_seconds=cache_ttl_in_seconds,
         )
 
     async def index_exists(self) -> bool:
@@ -100,10 +107,57 @@ class QdrantRagOps(BaseVectorIndexRagOps):
             self.logger.error(f"Failed to initialize Qdrant RAG operations: {e}")
             raise
 
+    async def aclose(self) -> None:
+        """Close the long-lived Qdrant clients."""
+        await self.qdrant_utils.aclose()
+
     async def persist_index(self):
         """No-op as Qdrant automatically persists the index."""
         pass
 
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get the number of Qdrant round trips saved by the existence check cache."""
+        return self.qdrant_utils.get_cache_stats()
+
+    async def create_index(self, *args, **kwargs) -> List[str]:
+        """Create a new index from text chunks, see BaseVectorIndexRagOps.create_index()."""
+        try:
+            return await super().create_index(*args, **kwargs)
+        finally:
+            self.qdrant_utils.invalidate_caches()
+
+    async def upsert_text_chunks(self, *args, **kwargs) -> Dict[str, List[str]]:
+        """Sync the documents of a scope with text chunks, see BaseVectorIndexRagOps.upsert_text_chunks()."""
+        try:
+            return await super().upsert_text_chunks(*args, **kwargs)
+        finally:
+            self.qdrant_utils.invalidate_caches()
+
+    async def delete_documents(self, doc_ids: List[str]) -> None:
+        """Delete documents from the collection, see BaseVectorIndexRagOps.delete_documents()."""
+        try:
+            await super().delete_documents(doc_ids)
+        finally:
+            self.qdrant_utils.invalidate_caches()
+
+    async def _bulk_delete_documents(self, doc_ids: List[str]) -> None:
+        """Delete the points of all documents with a single filter-based delete."""
+        await self.vector_store.adelete_nodes(
+            filters=MetadataFilters(
+                filters=[
+                    MetadataFilter(
+                        key=DOCUMENT_ID_KEY,
+                        value=doc_ids,
+                        operator=FilterOperator.IN,
+                    )
+                ]
+            )
+        )
+
+    async def _get_existing_doc_ids(self, scope_filter: Dict[str, str]) -> set:
+        """Delegate the document id listing of the scope to utils."""
+        return await self.qdrant_utils.get_doc_ids(scope_filter)
+
     def _to_qdrant_filter(self, metadata_filter: Dict[str, Any]):
         """Delegate filter conversion to utils for compatibility."""
         return self.qdrant_utils.to_qdrant_filter(metadata_filter)
@@ -0,0 +1,158 @@
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from llama_index.core.callbacks import CallbackManager
+from llama_index.core.llms import LLM
+from llama_index.core.response_synthesizers import SimpleSummarize
+from llama_index.core.schema import MetadataMode, NodeWithScore, QueryBundle
+from llama_index.core.utils import get_tokenizer
+
+# Value of `response_mode` that selects the TokenBudgetSynthesizer
+PACKED_RESPONSE_MODE = "packed"
+
+_SHINGLE_SIZE = 3
+
+
+class TokenBudgetSynthesizer(SimpleSummarize):
+    """
+    Answers from the best retrieved chunks that fit a prompt token budget, with one LLM call.
+
+    Chunks are taken in retrieval score order. A chunk is dropped when it repeats a chunk
+    already taken: when most of its word shingles appear in a chunk of the same document
+    (overlapping chunks), or when its shingles are near-identical to those of any chunk.
+    The remaining chunks are packed into `context_token_budget` tokens, counted with a
+    real tokenizer, and sent to the LLM in a single completion call, unlike tree_summarize
+    which makes a call per group of chunks.
+
+    The response metadata reports the context tokens sent and saved, and the number of
+    duplicate and over-budget chunks dropped.
+    """
+
+    def __init__(
+        self,
+        llm: Optional[LLM] = None,
+        callback_manager: Optional[CallbackManager] = None,
+        context_token_budget: int = 3000,
+        similarity_threshold: float = 0.9,
+        tokenizer: Optional[Callable[[str], List]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Args:
+            llm: Completion language model
+            callback_manager: Callback manager, e.g. for token counting
+            context_token_budget: Maximum number of tokens of retrieved context in the prompt (default: 3000)
+            similarity_threshold: Shingle overlap from which two chunks count as duplicates (default: 0.9)
+            tokenizer: Tokenizer used to count the tokens (default: llama-index's global tokenizer)
+            **kwargs: Additional arguments passed to SimpleSummarize, e.g. text_qa_template
+        """
+        super().__init__(llm=llm, callback_manager=callback_manager, **kwargs)
+        self.context_token_budget = context_token_budget
+        self.similarity_threshold = similarity_threshold
+        self._tokenizer = tokenizer or get_tokenizer()
+
+    @staticmethod
+    def _get_shingles(text: str) -> set:
+        words = re.findall(r"\w+", text.lower())
+        if len(words) <= _SHINGLE_SIZE:
+            return {tuple(words)}
+        return {
+            tuple(words[i : i + _SHINGLE_SIZE])
+            for i in range(len(words) - _SHINGLE_SIZE + 1)
+        }
+
+    def _is_duplicate(
+        self,
+        shingles: set,
+        doc_id: Optional[str],
+        packed: List[Tuple[set, Optional[str]]],
+    ) -> bool:
+        for packed_shingles, packed_doc_id in packed:
+            common = len(shingles & packed_shingles)
+            if doc_id is not None and doc_id == packed_doc_id:
+                # Overlap coefficient, so that a chunk contained in another counts as a duplicate
+                similarity = common / max(min(len(shingles), len(packed_shingles)), 1)
+            else:
+                similarity = common / max(len(shingles | packed_shingles), 1)
+            if similarity >= self.similarity_threshold:
+                return True
+        return False
+
+    def pack_nodes(
+        self, nodes: List[NodeWithScore]
+    ) -> Tuple[List[NodeWithScore], Dict[str, int]]:
+        """
+        Deduplicate the nodes and pack the best ones into the token budget.
+
+        Returns:
+            The packed nodes, in score order, and the packing stats
+        """
+        ranked = sorted(nodes, key=lambda n: n.score or 0.0, reverse=True)
+        packed_nodes: List[NodeWithScore] = []
+        packed: List[Tuple[set, Optional[str]]] = []
+        seen_node_ids = set()
+        stats = {
+            "retrieved_context_tokens": 0,
+            "context_tokens": 0,
+            "num_duplicate_chunks": 0,
+            "num_over_budget_chunks": 0,
+        }
+
+        for node in ranked:
+            text = node.node.get_content(metadata_mode=MetadataMode.LLM)
+            num_tokens = len(self._tokenizer(text))
+            stats["retrieved_context_tokens"] += num_tokens
+
+            shingles = self._get_shingles(text)
+            if node.node.node_id in seen_node_ids or self._is_duplicate(
+                shingles, node.node.ref_doc_id, packed
+            ):
+                stats["num_duplicate_chunks"] += 1
+                continue
+            # The best chunk is always kept, the prompt helper truncates it if it is too long
+            if packed_nodes and (
+                stats["context_tokens"] + num_tokens > self.context_token_budget
+            ):
+                stats["num_over_budget_chunks"] += 1
+                continue
+
+            seen_node_ids.add(node.node.node_id)
+            packed.append((shingles, node.node.ref_doc_id))
+            packed_nodes.append(node)
+            stats["context_tokens"] += num_tokens
+
+        stats["context_tokens_saved"] = (
+            stats["retrieved_context_tokens"] - stats["context_tokens"]
+        )
+        return packed_nodes, stats
+
+    @staticmethod
+    def _add_stats(response: Any, stats: Dict[str, int]) -> Any:
+        response.metadata = {**(response.metadata or {}), **stats}
+        return response
+
+    def synthesize(
+        self,
+        query: QueryBundle,
+        nodes: List[NodeWithScore],
+        additional_source_nodes: Optional[Sequence[NodeWithScore]] = None,
+        **response_kwargs: Any,
+    ) -> Any:
+        packed_nodes, stats = self.pack_nodes(nodes)
+        response = super().synthesize(
+            query, packed_nodes, additional_source_nodes, **response_kwargs
+        )
+        return self._add_stats(response, stats)
+
+    async def asynthesize(
+        self,
+        query: QueryBundle,
+        nodes: List[NodeWithScore],
+        additional_source_nodes: Optional[Sequence[NodeWithScore]] = None,
+        **response_kwargs: Any,
+    ) -> Any:
+        packed_nodes, stats = self.pack_nodes(nodes)
+        response = await super().asynthesize(
+            query, packed_nodes, additional_source_nodes, **response_kwargs
+        )
+        return self._add_stats(response, stats)
@@ -1,4 +1,6 @@
+import json
 import logging
+import time
 from typing import Any, Dict, Optional, List
 
 from qdrant_client import QdrantClient, AsyncQdrantClient
@@ -10,7 +12,10 @@ from qdrant_client.http.models import (
     FieldCondition,
     MatchValue,
 )
-from llama_index.vector_stores.qdrant.base import DEFAULT_DENSE_VECTOR_NAME
+from llama_index.vector_stores.qdrant.base import (
+    DEFAULT_DENSE_VECTOR_NAME,
+    DOCUMENT_ID_KEY,
+)
 
 
 class QdrantUtils:
@@ -21,6 +26,13 @@ class QdrantUtils:
 
     This keeps qdrant-specific code in a single place so higher-level classes
     (like QdrantRagOps) can remain focused on RAG logic.
+
+    One sync and one async client are created lazily and reused for all calls,
+    so their connection pools survive across requests. Call `aclose()` to close them.
+
+    Positive collection existence checks and metadata filters that matched data are
+    cached for `cache_ttl_in_seconds`, so repeated queries with the same filter skip
+    those round trips. Call `invalidate_caches()` after the collection changes.
     """
 
     def __init__(
@@ -31,6 +43,7 @@ class QdrantUtils:
         payload_fields: Optional[List[str]] = None,
         vector_store_kwargs: Optional[Dict] = None,
         logger: Optional[logging.Logger] = None,
+        cache_ttl_in_seconds: float = 60,
     ) -> None:
         self.url = url
         self.collection_name = collection_name
@@ -38,6 +51,13 @@ class QdrantUtils:
         self.payload_fields = payload_fields or []
         self.vector_store_kwargs = vector_store_kwargs or {}
         self.logger = logger or logging.getLogger(__name__)
+        self._sync_client: Optional[QdrantClient] = None
+        self._async_client: Optional[AsyncQdrantClient] = None
+        self.cache_ttl_in_seconds = cache_ttl_in_seconds
+        # Expiry times (time.monotonic()) of the positive existence checks
+        self._collection_exists_until = 0.0
+        self._validated_filters_until: Dict[str, float] = {}
+        self.num_round_trips_saved = 0
 
     def create_sync_client(self) -> QdrantClient:
         """Create a synchronous Qdrant client."""
@@ -47,6 +67,39 @@ class QdrantUtils:
         """Create an asynchronous Qdrant client."""
         return AsyncQdrantClient(url=self.url, api_key=self.api_key)
 
+    def get_sync_client(self) -> QdrantClient:
+        """Get the long-lived synchronous Qdrant client, creating it on first use."""
+        if self._sync_client is None:
+            self._sync_client = self.create_sync_client()
+        return self._sync_client
+
+    def get_async_client(self) -> AsyncQdrantClient:
+        """Get the long-lived asynchronous Qdrant client, creating it on first use."""
+        if self._async_client is None:
+            self._async_client = self.create_async_client()
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Close the Qdrant clients and their connection pools."""
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    def invalidate_caches(self) -> None:
+        """Forget the cached collection and metadata filter existence checks."""
+        self._collection_exists_until = 0.0
+        self._validated_filters_until.clear()
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get the number of Qdrant round trips saved by the cache and the number of cached filters."""
+        return {
+            "round_trips_saved": self.num_round_trips_saved,
+            "cached_filters": len(self._validated_filters_until),
+        }
+
     def get_vector_store_config(
         self, dense_vector_name: str = DEFAULT_DENSE_VECTOR_NAME
     ) -> Dict:
@@ -56,8 +109,8 @@ class QdrantUtils:
         """
         return {
             "collection_name": self.collection_name,
-            "client": self.create_sync_client(),
-            "aclient": self.create_async_client(),
+            "client": self.get_sync_client(),
+            "aclient": self.get_async_client(),
             "dense_vector_name": dense_vector_name,
             **self.vector_store_kwargs,
         }
@@ -89,14 +142,20 @@ class QdrantUtils:
 
     async def index_exists(self) -> bool:
         """Asynchronously check whether the target collection exists."""
+        if time.monotonic() < self._collection_exists_until:
+            self.num_round_trips_saved += 1
+            return True
         try:
-            aclient = self.create_async_client()
-            collections = await aclient.get_collections()
+            collections = await self.get_async_client().get_collections()
             collection_names = [c.name for c in collections.collections]
             exists = self.collection_name in collection_names
             self.logger.info(
                 f"Qdrant collection '{self.collection_name}' exists: {exists}"
             )
+            if exists:
+                self._collection_exists_until = (
+                    time.monotonic() + self.cache_ttl_in_seconds
+                )
             return exists
         except Exception as exc:  # pragma: no cover - surface connectivity errors
             self.logger.error(f"Error checking Qdrant collection existence: {exc}")
@@ -107,7 +166,7 @@ class QdrantUtils:
 
         Also attempts to create configured payload indexes.
         """
-        client = self.create_sync_client()
+        client = self.get_sync_client()
         client.create_collection(
             collection_name=self.collection_name,
             vectors_config={
@@ -141,8 +200,12 @@ class QdrantUtils:
         """
         if not metadata_filter:
             return
+        cache_key = json.dumps(metadata_filter, sort_keys=True)
+        if time.monotonic() < self._validated_filters_until.get(cache_key, 0.0):
+            self.num_round_trips_saved += 1
+            return
 
-        aclient = self.create_async_client()
+        aclient = self.get_async_client()
         qf = self.to_qdrant_filter(metadata_filter)
 
         points, _ = await aclient.scroll(
@@ -154,3 +217,42 @@ class QdrantUtils:
         )
         if not points:
             raise ValueError(f"No data matches metadata filter: {metadata_filter}")
+        self._remember_validated_filter(cache_key)
+
+    def _remember_validated_filter(self, cache_key: str) -> None:
+        now = time.monotonic()
+        # Filters are kept in validation order, which is their expiry order: drop the
+        # expired ones from the front, and move a re-validated filter to the back
+        while self._validated_filters_until:
+            oldest_key = next(iter(self._validated_filters_until))
+            if self._validated_filters_until[oldest_key] > now:
+                break
+            del self._validated_filters_until[oldest_key]
+        self._validated_filters_until.pop(cache_key, None)
+        self._validated_filters_until[cache_key] = now + self.cache_ttl_in_seconds
+
+    async def get_doc_ids(self, metadata_filter: Dict[str, Any]) -> set:
+        """Get the document IDs of the points matching the metadata filter.
+
+        Scrolls through the matching points requesting only the document id payload.
+        """
+        aclient = self.get_async_client()
+        scroll_filter = self.to_qdrant_filter(metadata_filter)
+        doc_ids = set()
+        offset = None
+        while True:
+            points, offset = await aclient.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                with_payload=[DOCUMENT_ID_KEY],
+                with_vectors=False,
+                limit=1000,
+                offset=offset,
+            )
+            doc_ids.update(
+                point.payload[DOCUMENT_ID_KEY]
+                for point in points
+                if point.payload and point.payload.get(DOCUMENT_ID_KEY)
+            )
+            if offset is None:
+                return doc_ids
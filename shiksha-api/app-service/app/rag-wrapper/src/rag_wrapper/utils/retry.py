@@ -0,0 +1,48 @@
+import asyncio
+from typing import Any, Optional
+
+import httpx
+import openai
+
+# Request timeout, conflict, rate limit and transient server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# Responses that the LLM endpoints return instead of an answer
+INVALID_RESPONSES = {"", "504.0 GatewayTimeout"}
+
+RETRYABLE_ERROR_TYPES = (
+    asyncio.TimeoutError,
+    TimeoutError,
+    ConnectionError,
+    openai.APIConnectionError,  # includes openai.APITimeoutError
+    httpx.TimeoutException,
+    httpx.NetworkError,
+)
+
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """Get the HTTP status code of an error raised by an HTTP client, if it has one."""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Check if an error is transient, i.e. a timeout, a connection error or a retryable HTTP status.
+
+    Errors raised from another error, e.g. a client error raised from an httpx error, are
+    also retryable when the error they were raised from is.
+    """
+    if isinstance(error, RETRYABLE_ERROR_TYPES):
+        return True
+    if get_status_code(error) in RETRYABLE_STATUS_CODES:
+        return True
+    return error.__cause__ is not None and is_retryable_error(error.__cause__)
+
+
+def is_invalid_response(result: Any) -> bool:
+    """Check if an LLM response is empty or a gateway error placeholder instead of an answer."""
+    response_text = str(result.response) if hasattr(result, "response") else str(result)
+    return response_text.strip() in INVALID_RESPONSES
@@ -0,0 +1,95 @@
+"""
+Engine and Client Reuse Tests
+
+Uses mock models, an in-memory index and mock Qdrant clients, no external services are required.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from llama_index.core import MockEmbedding
+from llama_index.core.llms import ChatMessage, MockLLM
+from rag_wrapper.rag_ops.in_mem_rag_ops import InMemRagOps
+from rag_wrapper.rag_ops.qdrant_rag_ops import QdrantRagOps
+
+
+@pytest.fixture
+async def rag_ops(tmp_path):
+    rag_ops = InMemRagOps(
+        persist_dir=str(tmp_path / "index"),
+        emb_llm=MockEmbedding(embed_dim=8),
+        completion_llm=MockLLM(),
+    )
+    await rag_ops.create_index(
+        ["Plants make food by photosynthesis."], metadata={"chapter": "1"}
+    )
+    return rag_ops
+
+
+async def test_query_engines_are_memoized_per_filter(rag_ops):
+    await rag_ops.query_index(
+        "What is photosynthesis?", metadata_filter={"chapter": "1"}
+    )
+    await rag_ops.query_index("What do plants make?", metadata_filter={"chapter": "1"})
+    await rag_ops.query_index("What do plants make?")
+
+    assert len(rag_ops._query_engines) == 2
+    assert len(rag_ops._retrievers) == 2
+    assert rag_ops._get_query_engine({"chapter": "1"}) is rag_ops._get_query_engine(
+        {"chapter": "1"}
+    )
+
+
+async def test_least_recently_used_engines_are_dropped(rag_ops):
+    rag_ops.max_memoized_engines = 2
+    query_engine = rag_ops._get_query_engine({"chapter": "1"})
+    rag_ops._get_query_engine({"chapter": "2"})
+    # chapter 1 becomes the most recently used
+    assert rag_ops._get_query_engine({"chapter": "1"}) is query_engine
+    rag_ops._get_query_engine({"chapter": "3"})
+
+    assert len(rag_ops._query_engines) == 2
+    assert len(rag_ops._retrievers) == 2
+    assert rag_ops._get_query_engine({"chapter": "1"}) is query_engine
+    assert len(rag_ops._retrievers) == 2
+
+
+async def test_chat_reuses_retriever_but_not_memory(rag_ops):
+    await rag_ops.chat_with_index("Hi", [ChatMessage(role="user", content="Earlier")])
+    retriever = rag_ops._get_retriever()
+    await rag_ops.chat_with_index("Hi again", [])
+
+    assert rag_ops._get_retriever() is retriever
+
+
+async def test_engines_are_rebuilt_for_a_new_index(rag_ops):
+    query_engine = rag_ops._get_query_engine()
+
+    await rag_ops.create_index(["A new index."])
+
+    assert rag_ops._get_query_engine() is not query_engine
+
+
+async def test_qdrant_clients_are_reused_until_closed():
+    async_client = MagicMock()
+    async_client.get_collections = AsyncMock(
+        return_value=SimpleNamespace(collections=[SimpleNamespace(name="books")])
+    )
+    async_client.scroll = AsyncMock(return_value=(["point"], None))
+    async_client.close = AsyncMock()
+    rag_ops = QdrantRagOps(
+        collection_name="books",
+        emb_llm=MockEmbedding(embed_dim=8),
+        completion_llm=MockLLM(),
+    )
+    rag_ops.qdrant_utils.create_async_client = MagicMock(return_value=async_client)
+
+    assert await rag_ops.index_exists()
+    await rag_ops._prequery_filter_guard({"chapter": "1"})
+    await rag_ops._prequery_filter_guard({"chapter": "2"})
+    await rag_ops.aclose()
+
+    rag_ops.qdrant_utils.create_async_client.assert_called_once()
+    async_client.close.assert_awaited_once()
@@ -0,0 +1,106 @@
+"""
+Graph Node Embedding Tests
+
+Uses a fake embedding model, no external services are required.
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.llms import MockLLM
+from llama_index.core.schema import TextNode
+from rag_wrapper import InMemGraphRagOps
+
+
+class FlakyEmbedding(BaseEmbedding):
+    """Fake embedding model that fails the first request of the given texts with `error`."""
+
+    failing_texts: List[str] = []
+    error: Exception = TimeoutError("Injected embedding timeout")
+    requests: List[List[str]] = []
+    max_in_flight: int = 0
+    in_flight: int = 0
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "FlakyEmbedding"
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return [float(len(query))]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return [float(len(query))]
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return [float(len(text))]
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        self.requests.append(list(texts))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if any(text in self.failing_texts for text in texts):
+            self.failing_texts = [t for t in self.failing_texts if t not in texts]
+            raise self.error
+        return [[float(len(text))] for text in texts]
+
+
+@pytest.fixture
+def emb_llm():
+    return FlakyEmbedding(model_name="flaky", embed_batch_size=100)
+
+
+async def test_text_nodes_are_embedded_in_bounded_batches(emb_llm):
+    rag_ops = InMemGraphRagOps(
+        emb_llm=emb_llm,
+        completion_llm=MockLLM(),
+        kg_extractors=[],
+        embedding_batch_size=3,
+        embedding_concurrency=2,
+    )
+    text_nodes = [TextNode(id_=f"node_{i}", text="x" * (i + 1)) for i in range(10)]
+
+    await rag_ops._embed_text_nodes(text_nodes)
+
+    assert [node.embedding for node in text_nodes] == [
+        [float(i + 1)] for i in range(10)
+    ]
+    assert [len(texts) for texts in emb_llm.requests] == [3, 3, 3, 1]
+    assert emb_llm.max_in_flight == 2
+
+
+async def test_only_failed_batches_are_retried(emb_llm):
+    rag_ops = InMemGraphRagOps(
+        emb_llm=emb_llm,
+        completion_llm=MockLLM(),
+        kg_extractors=[],
+        embedding_batch_size=2,
+    )
+    text_nodes = [TextNode(id_=f"node_{i}", text=f"text {i}") for i in range(4)]
+    emb_llm.failing_texts = ["text 3"]
+
+    await rag_ops._embed_text_nodes(text_nodes)
+
+    assert all(node.embedding is not None for node in text_nodes)
+    assert emb_llm.requests.count(["text 0", "text 1"]) == 1
+    assert emb_llm.requests.count(["text 2", "text 3"]) == 2
+
+
+async def test_non_retryable_errors_are_not_retried(emb_llm):
+    rag_ops = InMemGraphRagOps(
+        emb_llm=emb_llm,
+        completion_llm=MockLLM(),
+        kg_extractors=[],
+        embedding_batch_size=2,
+    )
+    text_nodes = [TextNode(id_=f"node_{i}", text=f"text {i}") for i in range(2)]
+    emb_llm.failing_texts = ["text 1"]
+    emb_llm.error = ValueError("Injected invalid request")
+
+    with pytest.raises(ValueError):
+        await rag_ops._embed_text_nodes(text_nodes)
+    assert len(emb_llm.requests) == 1
@@ -0,0 +1,104 @@
+"""
+Deterministic Document ID and Incremental Re-Indexing Tests
+
+Uses mock models, an in-memory index and a mock Qdrant client, no external services are required.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from llama_index.core import MockEmbedding
+from llama_index.core.llms import MockLLM
+from rag_wrapper.rag_ops.in_mem_rag_ops import InMemRagOps
+from rag_wrapper.rag_ops.qdrant_rag_ops import QdrantRagOps
+
+CHAPTER_1 = {"chapter_id": "1"}
+CHAPTER_2 = {"chapter_id": "2"}
+
+
+class CountingEmbedding(MockEmbedding):
+    num_embedded_texts: int = 0
+
+    async def _aget_text_embeddings(self, texts):
+        self.num_embedded_texts += len(texts)
+        return await super()._aget_text_embeddings(texts)
+
+
+def create_rag_ops(persist_dir, emb_llm, use_numpy_vector_store=False):
+    return InMemRagOps(
+        persist_dir=str(persist_dir),
+        emb_llm=emb_llm,
+        completion_llm=MockLLM(),
+        use_numpy_vector_store=use_numpy_vector_store,
+    )
+
+
+async def test_doc_ids_are_derived_from_text_and_metadata(tmp_path):
+    rag_ops = create_rag_ops(tmp_path, MockEmbedding(embed_dim=8))
+
+    first_ids = await rag_ops.create_index(["Page 1", "Page 2", "Page 1"], CHAPTER_1)
+    second_ids = await rag_ops.create_index(["Page 1", "Page 2"], CHAPTER_1)
+    other_chapter_ids = await rag_ops.create_index(["Page 1"], CHAPTER_2)
+
+    # One id per chunk, the repeated chunk shares the id of its document
+    assert len(first_ids) == 3 and len(set(first_ids)) == 2
+    assert first_ids[2] == first_ids[0]
+    assert first_ids[:2] == second_ids
+    assert other_chapter_ids[0] not in first_ids
+
+
+@pytest.mark.parametrize("use_numpy_vector_store", [False, True])
+async def test_upsert_embeds_new_chunks_and_deletes_vanished_ones(
+    tmp_path, use_numpy_vector_store
+):
+    emb_llm = CountingEmbedding(embed_dim=8)
+    rag_ops = create_rag_ops(tmp_path, emb_llm, use_numpy_vector_store)
+    await rag_ops.upsert_text_chunks(["Page 1", "Page 2", "Page 3"], CHAPTER_1)
+    await rag_ops.upsert_text_chunks(["Other page"], CHAPTER_2)
+    emb_llm.num_embedded_texts = 0
+
+    # Reload from disk, as a re-run of the ingestion would
+    rag_ops = create_rag_ops(tmp_path, emb_llm, use_numpy_vector_store)
+    result = await rag_ops.upsert_text_chunks(
+        ["Page 1", "Page 2 corrected", "Page 3"], CHAPTER_1
+    )
+
+    assert len(result["inserted"]) == 1
+    assert len(result["deleted"]) == 1
+    assert len(result["unchanged"]) == 2
+    assert emb_llm.num_embedded_texts == 1
+    assert await rag_ops._get_existing_doc_ids(CHAPTER_1) == set(
+        result["inserted"] + result["unchanged"]
+    )
+    # Documents outside of the scope are kept
+    assert len(await rag_ops._get_existing_doc_ids(CHAPTER_2)) == 1
+
+    result = await rag_ops.upsert_text_chunks(
+        ["Page 1", "Page 2 corrected", "Page 3"], CHAPTER_1
+    )
+    assert result["inserted"] == result["deleted"] == []
+
+
+async def test_qdrant_existing_doc_ids_are_scrolled_by_scope():
+    async_client = MagicMock()
+    async_client.scroll = AsyncMock(
+        side_effect=[
+            ([SimpleNamespace(payload={"doc_id": "doc_id_1"})] * 2, "next-page"),
+            ([SimpleNamespace(payload={"doc_id": "doc_id_2"})], None),
+        ]
+    )
+    rag_ops = QdrantRagOps(
+        collection_name="books",
+        emb_llm=MockEmbedding(embed_dim=8),
+        completion_llm=MockLLM(),
+    )
+    rag_ops.qdrant_utils.create_async_client = MagicMock(return_value=async_client)
+
+    assert await rag_ops._get_existing_doc_ids(CHAPTER_1) == {"doc_id_1", "doc_id_2"}
+    assert async_client.scroll.await_count == 2
+    scroll_kwargs = async_client.scroll.await_args.kwargs
+    assert scroll_kwargs["with_payload"] == ["doc_id"]
+    assert scroll_kwargs["with_vectors"] is False
+    assert scroll_kwargs["offset"] == "next-page"
@@ -0,0 +1,114 @@
+"""
+NumPy Vector Store Tests
+
+Uses random embeddings and mock models, no external services are required.
+"""
+
+import numpy as np
+import pytest
+
+from llama_index.core import MockEmbedding
+from llama_index.core.llms import MockLLM
+from llama_index.core.schema import NodeRelationship, RelatedNodeInfo, TextNode
+from llama_index.core.vector_stores import (
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+    VectorStoreQuery,
+)
+from rag_wrapper.rag_ops.in_mem_rag_ops import InMemRagOps
+from rag_wrapper.vector_stores import NumpyVectorStore
+
+
+@pytest.fixture
+def embeddings():
+    return np.random.default_rng(0).normal(size=(50, 16)).astype(np.float32)
+
+
+def create_nodes(embeddings):
+    return [
+        TextNode(
+            id_=f"node-{i}",
+            text=f"chunk {i}",
+            embedding=embedding.tolist(),
+            metadata={"chapter": str(i % 5), "page": i},
+            relationships={
+                NodeRelationship.SOURCE: RelatedNodeInfo(node_id=f"doc-{i % 10}")
+            },
+        )
+        for i, embedding in enumerate(embeddings)
+    ]
+
+
+def brute_force_top_k(embeddings, query, rows, k):
+    normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    scores = normalized[rows] @ (query / np.linalg.norm(query))
+    return [f"node-{rows[i]}" for i in np.argsort(-scores)[:k]]
+
+
+def test_top_k_with_filters_matches_brute_force(embeddings):
+    vector_store = NumpyVectorStore()
+    nodes = create_nodes(embeddings)
+    vector_store.add(nodes[:20])
+    vector_store.add(nodes[20:])
+    query = embeddings[7] + 0.1
+
+    result = vector_store.query(
+        VectorStoreQuery(query_embedding=query.tolist(), similarity_top_k=5)
+    )
+    assert result.ids == brute_force_top_k(embeddings, query, np.arange(50), 5)
+
+    filters = MetadataFilters(
+        filters=[
+            MetadataFilter(key="chapter", value="2"),
+            MetadataFilter(key="page", value=[2, 7, 12], operator=FilterOperator.NIN),
+        ]
+    )
+    result = vector_store.query(
+        VectorStoreQuery(
+            query_embedding=query.tolist(), similarity_top_k=3, filters=filters
+        )
+    )
+    rows = np.array([i for i in range(50) if i % 5 == 2 and i not in (2, 7, 12)])
+    assert result.ids == brute_force_top_k(embeddings, query, rows, 3)
+
+
+def test_delete_and_persist_round_trip(embeddings, tmp_path):
+    vector_store = NumpyVectorStore(dtype="float16")
+    vector_store.add(create_nodes(embeddings))
+    vector_store.delete("doc-3")
+    vector_store.persist(str(tmp_path / "default__vector_store.json"))
+
+    loaded = NumpyVectorStore.from_persist_dir(str(tmp_path))
+    assert isinstance(loaded._embeddings, np.memmap)
+    assert loaded._embeddings.dtype == np.float16
+    result = loaded.query(
+        VectorStoreQuery(query_embedding=embeddings[3].tolist(), similarity_top_k=50)
+    )
+    assert len(result.ids) == 45
+    assert "node-3" not in result.ids
+    assert result.similarities == sorted(result.similarities, reverse=True)
+
+
+async def test_in_mem_rag_ops_with_numpy_vector_store(tmp_path):
+    persist_dir = str(tmp_path / "index")
+    models = dict(emb_llm=MockEmbedding(embed_dim=8), completion_llm=MockLLM())
+    rag_ops = InMemRagOps(
+        persist_dir=persist_dir, use_numpy_vector_store=True, **models
+    )
+    doc_ids = await rag_ops.create_index(
+        ["Plants make food.", "Animals eat plants."], metadata={"chapter": "1"}
+    )
+    await rag_ops.insert_text_chunks(["Fungi decompose."], metadata={"chapter": "2"})
+    await rag_ops.delete_documents(doc_ids[:1])
+    assert NumpyVectorStore.exists_in_persist_dir(persist_dir)
+
+    # The persisted index is loaded with the NumPy store even without the flag
+    loaded = InMemRagOps(persist_dir=persist_dir, **models)
+    await loaded.initiate_index()
+    assert isinstance(loaded.storage_context.vector_store, NumpyVectorStore)
+
+    response = await loaded.query_index(
+        "What do plants do?", metadata_filter={"chapter": "1"}
+    )
+    assert [n.node.text for n in response.source_nodes] == ["Animals eat plants."]
@@ -0,0 +1,90 @@
+"""
+Stage-Level Query Retry Tests
+
+Uses mock models and an in-memory index, no external services are required.
+"""
+
+from unittest.mock import AsyncMock
+
+import httpx
+import openai
+import pytest
+
+from llama_index.core import MockEmbedding
+from llama_index.core.base.response.schema import Response
+from llama_index.core.llms import MockLLM
+from rag_wrapper.rag_ops.in_mem_rag_ops import InMemRagOps
+from rag_wrapper.utils.retry import is_invalid_response, is_retryable_error
+
+REQUEST = httpx.Request("POST", "https://example.openai.azure.com")
+
+
+class CountingEmbedding(MockEmbedding):
+    num_query_embeddings: int = 0
+
+    async def _aget_query_embedding(self, query: str):
+        self.num_query_embeddings += 1
+        return await super()._aget_query_embedding(query)
+
+
+@pytest.fixture
+async def rag_ops(tmp_path):
+    rag_ops = InMemRagOps(
+        persist_dir=str(tmp_path / "index"),
+        emb_llm=CountingEmbedding(embed_dim=8),
+        completion_llm=MockLLM(),
+    )
+    await rag_ops.create_index(["Plants make food by photosynthesis."])
+    return rag_ops
+
+
+async def test_synthesis_retry_reuses_embedding_and_nodes(rag_ops):
+    query_engine = rag_ops._get_query_engine()
+    query_engine.aretrieve = AsyncMock(wraps=query_engine.aretrieve)
+    query_engine.asynthesize = AsyncMock(
+        side_effect=[
+            openai.APITimeoutError(request=REQUEST),
+            Response(response=""),
+            Response(response="Plants use the timeout of sunlight."),
+        ]
+    )
+
+    response = await rag_ops.query_index("What is photosynthesis?")
+
+    assert response.response == "Plants use the timeout of sunlight."
+    assert rag_ops.emb_llm.num_query_embeddings == 1
+    query_engine.aretrieve.assert_awaited_once()
+    assert query_engine.asynthesize.await_count == 3
+    assert rag_ops.get_retry_stats() == {"synthesize": 2}
+
+
+async def test_non_retryable_errors_are_raised_right_away(rag_ops):
+    query_engine = rag_ops._get_query_engine()
+    query_engine.asynthesize = AsyncMock(
+        side_effect=openai.BadRequestError(
+            "content filter", response=httpx.Response(400, request=REQUEST), body=None
+        )
+    )
+
+    with pytest.raises(openai.BadRequestError):
+        await rag_ops.query_index("What is photosynthesis?")
+
+    query_engine.asynthesize.assert_awaited_once()
+    assert rag_ops.get_retry_stats() == {}
+
+
+def test_retry_classification():
+    rate_limited = openai.RateLimitError(
+        "rate limited", response=httpx.Response(429, request=REQUEST), body=None
+    )
+    wrapped = ValueError("embedding failed")
+    wrapped.__cause__ = httpx.ReadTimeout("read timeout", request=REQUEST)
+
+    assert is_retryable_error(rate_limited)
+    assert is_retryable_error(TimeoutError())
+    assert is_retryable_error(wrapped)
+    assert not is_retryable_error(ValueError("timeout"))
+
+    assert is_invalid_response(Response(response="  "))
+    assert is_invalid_response("504.0 GatewayTimeout")
+    assert not is_invalid_response("A timeout is a pause in a game.")
@@ -0,0 +1,64 @@
+"""
+Streaming Response Tests
+
+Uses mock models and an in-memory index, no external services are required.
+"""
+
+import pytest
+from llama_index.core import MockEmbedding
+from llama_index.core.llms import ChatMessage, MessageRole, MockLLM
+from rag_wrapper.rag_ops.in_mem_rag_ops import InMemRagOps
+
+TEXT_CHUNKS = [
+    "Plants make their own food by photosynthesis.",
+    "The water cycle includes evaporation, condensation and precipitation.",
+]
+
+
+@pytest.fixture
+async def rag_ops(tmp_path):
+    rag_ops = InMemRagOps(
+        persist_dir=str(tmp_path),
+        emb_llm=MockEmbedding(embed_dim=8),
+        completion_llm=MockLLM(max_tokens=6),
+    )
+    await rag_ops.create_index(TEXT_CHUNKS)
+    return rag_ops
+
+
+@pytest.mark.asyncio
+async def test_stream_query_yields_the_query_response(rag_ops):
+    tokens = [token async for token in rag_ops.astream_query_index("photosynthesis")]
+
+    assert len(tokens) > 1
+    response = await rag_ops.query_index("photosynthesis")
+    assert "".join(tokens) == str(response)
+
+
+@pytest.mark.asyncio
+async def test_stream_chat_yields_the_chat_response(rag_ops):
+    chat_history = [ChatMessage(role=MessageRole.USER, content="Hi")]
+
+    tokens = [
+        token
+        async for token in rag_ops.astream_chat_with_index(
+            "What is photosynthesis?", chat_history
+        )
+    ]
+
+    assert len(tokens) > 1
+    response = await rag_ops.chat_with_index("What is photosynthesis?", chat_history)
+    assert "".join(tokens) == response
+
+
+@pytest.mark.asyncio
+async def test_stream_query_without_index_raises(tmp_path):
+    rag_ops = InMemRagOps(
+        persist_dir=str(tmp_path / "missing"),
+        emb_llm=MockEmbedding(embed_dim=8),
+        completion_llm=MockLLM(max_tokens=6),
+    )
+
+    with pytest.raises(ValueError, match="No index exists"):
+        async for _ in rag_ops.astream_query_index("photosynthesis"):
+            pass
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from app.models.chat import (
     ChatRequest,
     ChatResponse,
@@ -7,7 +8,8 @@ from app.models.chat import (
     ErrorResponse,
 )
 from app.services.general_chat_service import GENERAL_CHAT_SERVICE_INSTANCE
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any
+import json
 import logging
 
 from app.services.lesson_chat_service import LESSON_CHAT_SERVICE_INSTANCE
@@ -31,6 +33,47 @@ router = APIRouter(
 )
 
 
+def _format_sse(data: Dict[str, Any], event: str = None) -> str:
+    """Format a server-sent event with a JSON payload."""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data)}\n\n"
+
+
+async def _stream_sse(
+    tokens: AsyncIterator[str], user_id: str, chat_type: str
+) -> AsyncIterator[str]:
+    """
+    Stream the response tokens as server-sent events.
+
+    Each token is sent as a `data: {"token": ...}` event and the stream ends with an `end` event.
+    The response status is sent before the first token, so a failure midway is sent as an
+    `error` event instead of an HTTP error status.
+    """
+    try:
+        async for token in tokens:
+            yield _format_sse({"token": token})
+        logger.info(f"Successfully streamed {chat_type} for user: {user_id}")
+        yield _format_sse({"user_id": user_id}, event="end")
+    except Exception as e:
+        logger.error(f"{chat_type.capitalize()} stream failed for user {user_id}: {e}")
+        yield _format_sse(
+            {"error": f"Failed to process {chat_type} request"}, event="error"
+        )
+
+
+_SSE_RESPONSE_DOCS = {
+    200: {
+        "description": "Stream of server-sent events with the response tokens",
+        "content": {
+            "text/event-stream": {
+                "example": 'data: {"token": "Photo"}\n\ndata: {"token": "synthesis"}\n\n'
+                'event: end\ndata: {"user_id": "student123"}\n\n'
+            }
+        },
+    },
+}
+
+
 @router.post(
     "",
     response_model=ChatResponse,
@@ -248,3 +291,80 @@ async def lesson_chat(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to process lesson chat request",
         )
+
+
+@router.post(
+    "/stream",
+    status_code=status.HTTP_200_OK,
+    summary="General Educational Chat (Streaming)",
+    description="""
+    **Stream the response of a general educational chat as server-sent events**
+
+    Takes the same request as `POST /chat` and streams the assistant's answer token by token,
+    so clients can show the first words as soon as they are generated.
+
+    **Events:**
+    - `data: {"token": "..."}`: the next piece of the response text
+    - `event: end`: the response is complete
+    - `event: error`: the response failed midway
+    """,
+    responses=_SSE_RESPONSE_DOCS,
+)
+async def chat_stream(
+    request: ChatRequest,
+):
+    """
+    **General Educational Chat Streaming Endpoint**
+
+    Streams the response of the general chat as server-sent events.
+    """
+    logger.info(f"Processing general chat stream request for user: {request.user_id}")
+    return StreamingResponse(
+        _stream_sse(
+            GENERAL_CHAT_SERVICE_INSTANCE.stream(request.messages),
+            request.user_id,
+            "chat",
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/lesson/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Lesson-Specific Educational Chat (Streaming)",
+    description="""
+    **Stream the response of a lesson-specific chat as server-sent events**
+
+    Takes the same request as `POST /chat/lesson` and streams the answer generated from the
+    chapter's indexed content token by token, so clients can show the first words as soon as
+    they are generated.
+
+    **Events:**
+    - `data: {"token": "..."}`: the next piece of the response text
+    - `event: end`: the response is complete
+    - `event: error`: the response failed midway
+    """,
+    responses=_SSE_RESPONSE_DOCS,
+)
+async def lesson_chat_stream(
+    request: LessonChatRequest,
+):
+    """
+    **Lesson-Specific Educational Chat Streaming Endpoint**
+
+    Streams the response of the lesson chat as server-sent events.
+    """
+    logger.info(
+        f"Processing lesson chat stream request for user: {request.user_id}, chapter: {request.chapter_id}"
+    )
+    return StreamingResponse(
+        _stream_sse(
+            LESSON_CHAT_SERVICE_INSTANCE.stream(request),
+            request.user_id,
+            "lesson chat",
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,5 +1,5 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from app.models.question_paper import (
     QBQuestionDistributionGenerationRequest,
     QBTemplateGenerationRequest,
@@ -9,6 +9,11 @@ from app.models.question_paper import (
 )
 from app.models.chat import ErrorResponse
 from app.services.question_paper_service import QUESTION_PAPER_SERVICE_INSTANCE
+from app.services.response_cache import (
+    CACHE_STATUS_HEADER,
+    RESPONSE_CACHE,
+    get_request_cache_key,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -226,6 +231,12 @@ async def generate_question_paper_by_parts(
                     ]
                 }
             },
+            "headers": {
+                CACHE_STATUS_HEADER: {
+                    "description": "HIT if the templates were served from the response cache, MISS if they were generated, BYPASS if the cache was unavailable",
+                    "schema": {"type": "string"},
+                }
+            },
         },
         400: {"description": "Invalid distribution parameters or configuration"},
         500: {"description": "Template generation process failed"},
@@ -233,6 +244,7 @@ async def generate_question_paper_by_parts(
 )
 async def get_question_distribution(
     request: QBQuestionDistributionGenerationRequest,
+    response: Response,
 ) -> List[Template]:
     """
     **Generate Question Distribution Templates**
@@ -273,17 +285,38 @@ async def get_question_distribution(
     - **Synthesis**: Combining elements to form new patterns
     - **Evaluation**: Making judgments based on criteria
 
+    **Caching:**
+    Templates that match the requested distributions are cached by request (excluding
+    `user_id`), the `X-Cache` response header reports HIT, MISS or BYPASS.
+
     **Error Handling:**
     - Validates distribution percentages sum to 100%
     - Ensures marks distribution aligns with total marks
     - Verifies chapter information completeness
     - Handles generation process failures gracefully
     """
+
+    def matches_distributions(templates: List[Template]) -> bool:
+        # Templates not matching the requested distributions are not cached
+        is_valid, _ = request.verify_template_for_marks_and_objective_distribution(
+            templates
+        )
+        return is_valid
+
     try:
-        response = await QUESTION_PAPER_SERVICE_INSTANCE.get_question_distribution(
-            request
+        templates, cache_status = await RESPONSE_CACHE.get_or_compute(
+            key=get_request_cache_key(
+                "question-distribution", request, exclude={"user_id"}
+            ),
+            compute=lambda: QUESTION_PAPER_SERVICE_INSTANCE.get_question_distribution(
+                request
+            ),
+            serialize=lambda templates: [t.model_dump(mode="json") for t in templates],
+            deserialize=lambda data: [Template(**item) for item in data],
+            should_cache=matches_distributions,
         )
-        return response
+        response.headers[CACHE_STATUS_HEADER] = cache_status
+        return templates
     except Exception as ex:
         logger.exception(f"Unexpected error occurred: {str(ex)}")
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
@@ -411,3 +444,19 @@ async def get_question_paper_template_v2(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate question paper template",
         )
+
+
+@router.get(
+    "/response-cache",
+    status_code=status.HTTP_200_OK,
+    summary="Response Cache Statistics",
+    description="Reports the backend, hit, miss and error counts and the hit rate of the response cache.",
+)
+async def get_response_cache_info() -> dict:
+    """
+    **Response Cache Statistics**
+
+    Returns the usage of the response cache of the question distribution endpoint since
+    startup.
+    """
+    return RESPONSE_CACHE.get_cache_info()
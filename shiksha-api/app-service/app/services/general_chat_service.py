@@ -1,8 +1,9 @@
-from typing import List
+from typing import AsyncGenerator, List, Tuple
 from pathlib import Path
 import logging
 
 from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.messages import ModelClientStreamingChunkEvent
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
 
 from app.models.chat import ConversationMessage
@@ -15,6 +16,7 @@ logger = logging.getLogger(__name__)
 # Constants for internal logic
 CHAT_HISTORY_IRRELEVANT = "HISTORY IS NOT RELEVANT"
 TERMINATE = "TERMINATE"
+CONTENT_FILTERED_RESPONSE = "I'm sorry, but I can't help with that."
 
 
 class GeneralChatService:
@@ -51,44 +53,7 @@ class GeneralChatService:
             AI-generated response
         """
         try:
-            system_prompt = self.prompt_template.get_prompt("general_chat")
-            if system_prompt is None:
-                raise ValueError("General chat prompt not found in chat_prompts.yaml")
-
-            assistant_system_prompt = self._get_assistant_prompt_with_termination(
-                system_prompt
-            )
-
-            # Convert messages to the format expected by the new API
-            message_list = [
-                {"role": msg.role.value, "message": msg.message} for msg in messages
-            ]
-
-            # Step 1: Create the main assistant agent
-            assistant = AssistantAgent(
-                name="assistant",
-                model_client=self.model_client,
-                system_message=assistant_system_prompt,
-                reflect_on_tool_use=True,
-                tools=[
-                    bing_search_service.search_videos,
-                    bing_search_service.search_web,
-                ],
-            )
-
-            # Step 2: Extract relevant context from chat history
-            current_message = message_list[-1]["message"]
-            chat_history_items = message_list[:-1]
-
-            extracted_context = await self._extract_relevant_context(
-                chat_history_items, current_message
-            )
-
-            # Step 3: Create the user message with context
-            user_content = f"Chat Context: {extracted_context}\n\nCurrent Message: {current_message}"
-
-            # Log user_content for debugging
-            logger.info(f"User content for assistant: {user_content}")
+            assistant, user_content = await self._create_assistant(messages)
 
             # Step 4: Run the assistant agent
             task_result = await assistant.run(task=user_content)
@@ -103,7 +68,7 @@ class GeneralChatService:
                 logger.warning(
                     "Content filter was triggered. Returning default message."
                 )
-                return "I'm sorry, but I can't help with that."
+                return CONTENT_FILTERED_RESPONSE
 
             # Return the final content after removing the TERMINATE marker
             return final_content.replace(TERMINATE, "").strip()
@@ -112,6 +77,116 @@ class GeneralChatService:
             logger.error(f"Error in _chat_with_autogen_agent: {e}")
             raise
 
+    async def stream(
+        self,
+        messages: List[ConversationMessage],
+    ) -> AsyncGenerator[str, None]:
+        """
+        Chat like __call__, yielding the assistant's response tokens as they are generated.
+
+        The TERMINATE marker is removed from the stream, so the last few characters are only
+        yielded once it is clear that they are not part of the marker.
+
+        Args:
+            messages: List of conversation messages
+
+        Yields:
+            AI-generated response text deltas
+        """
+        try:
+            assistant, user_content = await self._create_assistant(
+                messages, stream=True
+            )
+
+            pending = ""
+            has_streamed = False
+            async for event in assistant.run_stream(task=user_content):
+                if not isinstance(event, ModelClientStreamingChunkEvent):
+                    continue
+
+                pending = (pending + event.content).replace(TERMINATE, "")
+                if not has_streamed:
+                    pending = pending.lstrip()
+
+                # Hold back what could be the start of the TERMINATE marker
+                safe_length = len(pending) - (len(TERMINATE) - 1)
+                if safe_length > 0:
+                    yield pending[:safe_length]
+                    pending = pending[safe_length:]
+                    has_streamed = True
+
+            pending = pending.rstrip()
+            if pending:
+                yield pending
+            elif not has_streamed:
+                logger.warning(
+                    "Content filter was triggered. Returning default message."
+                )
+                yield CONTENT_FILTERED_RESPONSE
+
+        except Exception as e:
+            logger.error(f"Error in general chat stream: {e}")
+            raise
+
+    async def _create_assistant(
+        self,
+        messages: List[ConversationMessage],
+        stream: bool = False,
+    ) -> Tuple[AssistantAgent, str]:
+        """
+        Create the assistant agent and its task for the conversation.
+
+        Args:
+            messages: List of conversation messages
+            stream: Whether the agent streams the model's response tokens
+
+        Returns:
+            The assistant agent and the user message with the relevant chat context
+        """
+        system_prompt = self.prompt_template.get_prompt("general_chat")
+        if system_prompt is None:
+            raise ValueError("General chat prompt not found in chat_prompts.yaml")
+
+        assistant_system_prompt = self._get_assistant_prompt_with_termination(
+            system_prompt
+        )
+
+        # Convert messages to the format expected by the new API
+        message_list = [
+            {"role": msg.role.value, "message": msg.message} for msg in messages
+        ]
+
+        # Step 1: Create the main assistant agent
+        assistant = AssistantAgent(
+            name="assistant",
+            model_client=self.model_client,
+            system_message=assistant_system_prompt,
+            reflect_on_tool_use=True,
+            model_client_stream=stream,
+            tools=[
+                bing_search_service.search_videos,
+                bing_search_service.search_web,
+            ],
+        )
+
+        # Step 2: Extract relevant context from chat history
+        current_message = message_list[-1]["message"]
+        chat_history_items = message_list[:-1]
+
+        extracted_context = await self._extract_relevant_context(
+            chat_history_items, current_message
+        )
+
+        # Step 3: Create the user message with context
+        user_content = (
+            f"Chat Context: {extracted_context}\n\nCurrent Message: {current_message}"
+        )
+
+        # Log user_content for debugging
+        logger.info(f"User content for assistant: {user_content}")
+
+        return assistant, user_content
+
     async def _extract_relevant_context(
         self,
         chat_history: List[dict],
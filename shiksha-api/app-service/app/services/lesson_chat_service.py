@@ -2,7 +2,8 @@ import os
 from pathlib import Path
 import logging
 import re
-from typing import Optional
+from contextlib import AbstractAsyncContextManager
+from typing import AsyncGenerator, List, Optional, Tuple
 from app.config import settings
 from app.models.chat import LessonChatRequest
 from app.utils.prompt_template import PromptTemplate
@@ -61,37 +62,75 @@ class LessonChatService:
             str: The chat response from the RAG system
         """
         try:
-            # Get or create cached RAG adapter instance
-            rag_adapter = await self._get_or_create_rag_adapter(request.index_path)
+            curr_message, chat_history = self._build_chat_history(request)
 
-            # Initiate the index (download files for InMem, no-op for Qdrant)
-            await rag_adapter.initiate_index()
+            # Get or create cached RAG adapter instance, kept in the cache while in use
+            async with self._acquire_rag_adapter(request.index_path) as rag_adapter:
+                # Get response from RAG system using current message and chat history
+                return await rag_adapter.chat_with_index(
+                    curr_message=curr_message, chat_history=chat_history
+                )
 
-            # Extract chapter details and build system message
-            system_message = self._prompt_template.get_prompt_with_variables(
-                "lesson_chat", **self._extract_details(request.chapter_id)
-            )
+        except Exception as e:
+            logger.error(f"Error in lesson chat service: {e}", exc_info=True)
+            raise
+
+    async def stream(
+        self,
+        request: LessonChatRequest,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Process a lesson chat request, yielding the response tokens as they are generated.
 
-            # Convert request messages to chat format
-            chat_messages = [
-                ChatMessage(role=message.role.value, content=message.message)
-                for message in request.messages
-            ]
+        Args:
+            request: The lesson chat request containing messages and index path
 
-            # Build chat history with system message and previous messages
-            chat_history = [
-                ChatMessage(role="system", content=system_message)
-            ] + chat_messages[:-1]
+        Yields:
+            str: Response text deltas from the RAG system
+        """
+        try:
+            curr_message, chat_history = self._build_chat_history(request)
 
-            # Get response from RAG system using current message and chat history
-            return await rag_adapter.chat_with_index(
-                curr_message=chat_messages[-1].content, chat_history=chat_history
-            )
+            # The adapter stays acquired until the stream ends or the client disconnects
+            async with self._acquire_rag_adapter(request.index_path) as rag_adapter:
+                async for token in rag_adapter.astream_chat_with_index(
+                    curr_message=curr_message, chat_history=chat_history
+                ):
+                    yield token
 
         except Exception as e:
-            logger.error(f"Error in lesson chat service: {e}", exc_info=True)
+            logger.error(f"Error in lesson chat stream: {e}", exc_info=True)
             raise
 
+    def _build_chat_history(
+        self, request: LessonChatRequest
+    ) -> Tuple[str, List[ChatMessage]]:
+        """
+        Build the chat history with the lesson system message.
+
+        Args:
+            request: The lesson chat request containing messages and index path
+
+        Returns:
+            Tuple of the current message and the chat history
+        """
+        # Extract chapter details and build system message
+        system_message = self._prompt_template.get_prompt_with_variables(
+            "lesson_chat", **self._extract_details(request.chapter_id)
+        )
+
+        # Convert request messages to chat format
+        chat_messages = [
+            ChatMessage(role=message.role.value, content=message.message)
+            for message in request.messages
+        ]
+
+        # Build chat history with system message and previous messages
+        chat_history = [ChatMessage(role="system", content=system_message)] + (
+            chat_messages[:-1]
+        )
+        return chat_messages[-1].content, chat_history
+
     def _extract_details(self, chapter_id: str):
         """
         Extract chapter details from the chapter ID string.
@@ -121,17 +160,20 @@ class LessonChatService:
         else:
             raise ValueError(f"Invalid chapter_id format: {chapter_id}")
 
-    async def _get_or_create_rag_adapter(self, index_path: str) -> BaseRagAdapter:
+    def _acquire_rag_adapter(
+        self, index_path: str
+    ) -> AbstractAsyncContextManager[BaseRagAdapter]:
         """
-        Get or create a RAG adapter instance with LRU caching.
+        Get or create a RAG adapter instance with LRU caching, with its index initiated
+        (files downloaded for InMem, no-op for Qdrant).
 
         Args:
             index_path: Path to the RAG index
 
         Returns:
-            BaseRagAdapter: Cached or newly created RAG adapter instance
+            Async context manager yielding the cached or newly created RAG adapter instance
         """
-        return await self._rag_adapter_cache.get_or_create_adapter(
+        return self._rag_adapter_cache.acquire_adapter(
             index_path=index_path,
             completion_llm=self._completion_llm,
             embedding_llm=self._embedding_llm,
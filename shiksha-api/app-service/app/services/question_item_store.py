@@ -0,0 +1,260 @@
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_learning_outcomes_hash(learning_outcomes: Iterable[str]) -> str:
+    """Hash the learning outcomes of a unit, independent of their order."""
+    content = json.dumps(sorted(learning_outcomes), ensure_ascii=False)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def get_question_text(item: Dict[str, Any]) -> str:
+    """Get the text identifying a question, as compared with the existing questions of a request."""
+    if item.get("question"):
+        return item["question"]
+    if "value1" in item and "value2" in item:
+        # For matching questions
+        return f"{item['value1']} :: {item['value2']}"
+    return ""
+
+
+@dataclass(frozen=True)
+class QuestionItemKey:
+    """Identifies the questions that can fill the same question slot."""
+
+    index_path: str
+    question_type: str
+    objective: str
+    marks_per_question: int
+    learning_outcomes_hash: str
+
+    @classmethod
+    def create(
+        cls,
+        index_path: str,
+        question_type: str,
+        objective: str,
+        marks_per_question: int,
+        learning_outcomes: Iterable[str],
+    ) -> "QuestionItemKey":
+        # Objectives are compared case-insensitively, like when questions are organized
+        return cls(
+            index_path=index_path,
+            question_type=str(question_type),
+            objective=objective.strip().lower(),
+            marks_per_question=marks_per_question,
+            learning_outcomes_hash=get_learning_outcomes_hash(learning_outcomes),
+        )
+
+
+class QuestionItemStore:
+    """
+    A persistent store of generated questions, so that question paper requests can reuse
+    questions instead of generating all of them.
+
+    Questions are stored in SQLite under their QuestionItemKey (index path, question type,
+    objective, marks and learning outcomes hash), at most `max_items_per_key` per key, newest
+    first. Questions older than `max_age_seconds` aren't returned, so that questions follow
+    re-ingested content.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_items_per_key: int = 100,
+        max_age_seconds: Optional[int] = 30 * 24 * 3600,
+    ):
+        """
+        Initialize the question item store.
+
+        Args:
+            db_path: Path to the SQLite database file, the store is kept in memory if not set
+            max_items_per_key: Maximum number of questions kept per key (default: 100)
+            max_age_seconds: Maximum age of returned questions, unlimited if None (default: 30 days)
+        """
+        if not db_path:
+            logger.warning(
+                "No question item store path set (QUESTION_ITEM_STORE_PATH), stored questions "
+                "are kept in memory and lost on restart"
+            )
+        self._db_path = db_path or ":memory:"
+        self._max_items_per_key = max_items_per_key
+        self._max_age_seconds = max_age_seconds
+        self._connection: Optional[sqlite3.Connection] = None
+        # Serializes the database operations, which run in worker threads
+        self._lock = asyncio.Lock()
+        self._reused = 0
+        self._added = 0
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self._db_path, check_same_thread=False)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS question_items (
+                    index_path TEXT NOT NULL,
+                    question_type TEXT NOT NULL,
+                    objective TEXT NOT NULL,
+                    marks_per_question INTEGER NOT NULL,
+                    learning_outcomes_hash TEXT NOT NULL,
+                    item_hash TEXT NOT NULL,
+                    item_text TEXT NOT NULL,
+                    item_json TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (index_path, question_type, objective,
+                                 marks_per_question, learning_outcomes_hash, item_hash)
+                )
+                """)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    async def add_items(
+        self, items: List[Tuple[QuestionItemKey, Dict[str, Any]]]
+    ) -> None:
+        """
+        Store generated questions, refreshing the creation time of questions stored before.
+
+        Args:
+            items: Keys and questions (model dumps of the question type's model) to store
+        """
+        if not items:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._add_items, items)
+        self._added += len(items)
+
+    def _add_items(self, items: List[Tuple[QuestionItemKey, Dict[str, Any]]]) -> None:
+        connection = self._get_connection()
+        now = time.time()
+        rows = []
+        for key, item in items:
+            item_json = json.dumps(item, ensure_ascii=False, sort_keys=True)
+            rows.append(
+                (
+                    key.index_path,
+                    key.question_type,
+                    key.objective,
+                    key.marks_per_question,
+                    key.learning_outcomes_hash,
+                    hashlib.sha256(item_json.encode("utf-8")).hexdigest(),
+                    get_question_text(item).strip().lower(),
+                    item_json,
+                    now,
+                )
+            )
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO question_items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            # Keep the newest questions of each key
+            for key in {key for key, _ in items}:
+                connection.execute(
+                    """
+                    DELETE FROM question_items
+                    WHERE index_path = ? AND question_type = ? AND objective = ?
+                      AND marks_per_question = ? AND learning_outcomes_hash = ?
+                      AND rowid NOT IN (
+                        SELECT rowid FROM question_items
+                        WHERE index_path = ? AND question_type = ? AND objective = ?
+                          AND marks_per_question = ? AND learning_outcomes_hash = ?
+                        ORDER BY created_at DESC LIMIT ?
+                      )
+                    """,
+                    (
+                        *self._key_params(key),
+                        *self._key_params(key),
+                        self._max_items_per_key,
+                    ),
+                )
+
+    async def get_items(
+        self,
+        key: QuestionItemKey,
+        limit: int,
+        exclude_texts: Optional[Set[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get up to `limit` distinct random questions of the key.
+
+        Args:
+            key: Key of the questions
+            limit: Maximum number of questions to return
+            exclude_texts: Question texts to leave out, compared case-insensitively
+
+        Returns:
+            List of questions (model dumps of the question type's model)
+        """
+        if limit <= 0:
+            return []
+        async with self._lock:
+            rows = await asyncio.to_thread(self._get_rows, key)
+
+        exclude_texts = {text.strip().lower() for text in exclude_texts or ()}
+        candidates = [
+            item_json for item_text, item_json in rows if item_text not in exclude_texts
+        ]
+        items = [
+            json.loads(item_json)
+            for item_json in random.sample(candidates, min(limit, len(candidates)))
+        ]
+        self._reused += len(items)
+        return items
+
+    def _get_rows(self, key: QuestionItemKey) -> List[Tuple[str, str]]:
+        min_created_at = (
+            time.time() - self._max_age_seconds if self._max_age_seconds else 0
+        )
+        return (
+            self._get_connection()
+            .execute(
+                """
+            SELECT item_text, item_json FROM question_items
+            WHERE index_path = ? AND question_type = ? AND objective = ?
+              AND marks_per_question = ? AND learning_outcomes_hash = ?
+              AND created_at >= ?
+            """,
+                (*self._key_params(key), min_created_at),
+            )
+            .fetchall()
+        )
+
+    @staticmethod
+    def _key_params(key: QuestionItemKey) -> tuple:
+        return (
+            key.index_path,
+            key.question_type,
+            key.objective,
+            key.marks_per_question,
+            key.learning_outcomes_hash,
+        )
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        async with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def get_stats(self) -> dict:
+        """
+        Get the number of questions added to and reused from the store since startup.
+
+        Returns:
+            dict: Dictionary containing the added and reused question counts
+        """
+        return {"added": self._added, "reused": self._reused}
+
+
+# Global store instance that can be shared across services
+QUESTION_ITEM_STORE = QuestionItemStore(db_path=settings.question_item_store_path)
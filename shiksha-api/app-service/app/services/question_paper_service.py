@@ -2,8 +2,10 @@ import os
 import json
 import yaml
 import asyncio
+import math
+from contextlib import AbstractAsyncContextManager, AsyncExitStack
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional, Set, Tuple
 import logging
 
 from llama_index.llms.azure_openai import AzureOpenAI
@@ -11,6 +13,11 @@ from llama_index.embeddings.azure_openai import AzureOpenAIEmbedding
 from llama_index.core.llms import ChatMessage
 from app.services.rag_adapters import BaseRagAdapter
 from app.services.rag_adapter_cache import RAG_ADAPTER_CACHE
+from app.services.question_item_store import (
+    QUESTION_ITEM_STORE,
+    QuestionItemKey,
+    get_question_text,
+)
 from app.models.question_paper import (
     QBQuestionDistributionGenerationRequest,
     QuestionBankPartsGenerationRequest,
@@ -22,9 +29,17 @@ from app.models.question_paper import (
     Template,
 )
 from app.config import settings
+from app.utils.aimd_limiter import AIMDConcurrencyLimiter, is_overload_error
 
 logger = logging.getLogger(__name__)
 
+# Limits the concurrent LLM calls of all question paper requests, so that concurrent
+# requests back off together when the deployment is rate limited
+QUESTION_PAPER_CONCURRENCY_LIMITER = AIMDConcurrencyLimiter(
+    initial_limit=settings.question_paper_initial_concurrency,
+    max_limit=settings.question_paper_max_concurrency,
+)
+
 
 class QuestionPaperService:
     """Service for handling question paper generation using Azure OpenAI."""
@@ -64,6 +79,12 @@ class QuestionPaperService:
         # Initialize LRU cache for RAG adapter instances (max 32 items)
         self._rag_adapter_cache = RAG_ADAPTER_CACHE
 
+        # Adaptive limit on the concurrent question generation calls
+        self._concurrency_limiter = QUESTION_PAPER_CONCURRENCY_LIMITER
+
+        # Persistent store of generated questions, reused by requests with a `reuse_ratio`
+        self._question_item_store = QUESTION_ITEM_STORE
+
     def _load_prompts(self) -> Dict[str, Any]:
         """Load prompts from YAML files."""
         # Load question paper prompts
@@ -130,22 +151,33 @@ class QuestionPaperService:
         return ""
 
     def _build_generation_slots(
-        self, request: QuestionBankPartsGenerationRequest
+        self,
+        request: QuestionBankPartsGenerationRequest,
+        skip_positions: Optional[Set[Tuple[int, int]]] = None,
     ) -> List[Dict[str, Any]]:
-        """Build generation slots from template distributions, grouped by unit with max 20 questions per slot."""
+        """
+        Build generation slots from template distributions, grouped by unit with max 20 questions per slot.
+
+        Questions at `skip_positions`, (template index, distribution index) pairs, e.g. filled with
+        stored questions, are left out.
+        """
         units_dict = self._get_unit_los_dict(request)
         units_index_path_dict = self._get_unit_index_path_dict(request)
+        skip_positions = skip_positions or set()
 
         # Group questions by unit_name first
         unit_questions = {}
 
-        for template in request.template:
+        for template_idx, template in enumerate(request.template):
             if (
                 template.question_distribution
                 and len(template.question_distribution) > 0
             ):
                 # Use specified distribution
-                for dist in template.question_distribution:
+                for dist_idx, dist in enumerate(template.question_distribution):
+                    if (template_idx, dist_idx) in skip_positions:
+                        continue
+
                     unit_los = units_dict.get(dist.unit_name)
                     if unit_los is None:
                         raise ValueError(
@@ -221,6 +253,101 @@ class QuestionPaperService:
         )
         return units_dict
 
+    def _get_question_item_key(
+        self,
+        request: QuestionBankPartsGenerationRequest,
+        unit_name: str,
+        qtype: QuestionType,
+        objective: str,
+        marks_per_question: int,
+    ) -> Optional[QuestionItemKey]:
+        """Get the key of the stored questions for a question of the unit, None if the unit is unknown."""
+        learning_outcomes = self._get_unit_los_dict(request).get(unit_name)
+        if learning_outcomes is None:
+            return None
+        return QuestionItemKey.create(
+            index_path=self._get_unit_index_path_dict(request)[unit_name],
+            question_type=qtype.value,
+            objective=objective,
+            marks_per_question=marks_per_question,
+            learning_outcomes=learning_outcomes,
+        )
+
+    async def _get_stored_questions(
+        self,
+        request: QuestionBankPartsGenerationRequest,
+        existing_questions: List[str],
+    ) -> Tuple[List[Dict[str, Any]], Set[Tuple[int, int]]]:
+        """
+        Fill a `reuse_ratio` share of the requested questions, spread evenly over the template,
+        with stored questions that aren't among the existing questions.
+
+        Args:
+            request: The question bank request
+            existing_questions: Texts of the request's existing questions
+
+        Returns:
+            The stored questions, in the format of generated questions, and the (template index,
+            distribution index) positions they fill
+        """
+        if request.reuse_ratio <= 0:
+            return [], set()
+
+        # Group the positions to fill by key, so that each key's questions are distinct
+        positions_by_key: Dict[QuestionItemKey, List[Tuple[int, int]]] = {}
+        position_count = 0
+        for template_idx, template in enumerate(request.template):
+            for dist_idx, dist in enumerate(template.question_distribution or []):
+                # Reuse whenever the reused share crosses the next whole question
+                reuse = math.floor(
+                    (position_count + 1) * request.reuse_ratio
+                ) > math.floor(position_count * request.reuse_ratio)
+                position_count += 1
+                if not reuse:
+                    continue
+                key = self._get_question_item_key(
+                    request,
+                    dist.unit_name,
+                    template.type,
+                    dist.objective,
+                    template.marks_per_question,
+                )
+                if key is not None:
+                    positions_by_key.setdefault(key, []).append(
+                        (template_idx, dist_idx)
+                    )
+
+        stored_questions = []
+        filled_positions = set()
+        for key, positions in positions_by_key.items():
+            try:
+                items = await self._question_item_store.get_items(
+                    key, len(positions), exclude_texts=set(existing_questions)
+                )
+            except Exception as e:
+                logger.error(f"Error getting stored questions, generating them: {e}")
+                continue
+
+            for (template_idx, dist_idx), item in zip(positions, items):
+                template = request.template[template_idx]
+                dist = template.question_distribution[dist_idx]
+                stored_questions.append(
+                    {
+                        "unit_name": dist.unit_name,
+                        "type": template.type.value,
+                        "objective": dist.objective,
+                        "marks_per_question": template.marks_per_question,
+                        "item": item,
+                        "reused": True,
+                    }
+                )
+                filled_positions.add((template_idx, dist_idx))
+
+        logger.info(
+            f"Reused {len(stored_questions)} of {position_count} questions from the question item store"
+        )
+        return stored_questions, filled_positions
+
     def _format_system_prompt(
         self,
         request: QuestionBankPartsGenerationRequest,
@@ -327,6 +454,9 @@ class QuestionPaperService:
             return items
 
         except Exception as e:
+            # Overload errors are raised for the concurrency limiter to back off and retry
+            if is_overload_error(e):
+                raise
             logger.exception(f"Error in batch generation: {e}")
             return []
 
@@ -335,22 +465,30 @@ class QuestionPaperService:
         system_prompt: str,
         slot: Dict[str, Any],
         rag_adapter: BaseRagAdapter,
-        delay_seconds: int = 0,
     ) -> List[Dict[str, Any]]:
-        """Async version of _generate_questions_batch with optional delay."""
-        # Apply delay if specified
-        if delay_seconds > 0:
-            await asyncio.sleep(delay_seconds)
-
-        # Run the async method directly since it's now async
-        return await self._generate_questions_batch(system_prompt, slot, rag_adapter)
+        """Generate questions for a slot once the concurrency limiter allows it, retrying on rate limit and timeout errors."""
+        try:
+            return await self._concurrency_limiter.run(
+                lambda: self._generate_questions_batch(system_prompt, slot, rag_adapter)
+            )
+        except Exception as e:
+            logger.error(f"Giving up on question slot after retries: {e}")
+            return []
 
     def _organize_questions_into_response(
         self,
         request: QuestionBankPartsGenerationRequest,
         all_generated: List[Dict[str, Any]],
+        new_question_items: Optional[
+            List[Tuple[QuestionItemKey, Dict[str, Any]]]
+        ] = None,
     ) -> List[QuestionTypeResponse]:
-        """Organize all generated questions into the final response structure."""
+        """
+        Organize all generated questions into the final response structure.
+
+        The generated questions used in the response, apart from reused ones, are appended to
+        `new_question_items` with their question item store key, if given.
+        """
         try:
             # Create a question directory to organize questions by their specification
             question_directory = {}
@@ -368,7 +506,9 @@ class QuestionPaperService:
                 if key not in question_directory:
                     question_directory[key] = []
 
-                question_directory[key].append(qtype.cast(item))
+                question_directory[key].append(
+                    (qtype.cast(item), generated.get("reused", False))
+                )
 
             # Build the final response structure following the original template order
             response_questions = []
@@ -390,9 +530,22 @@ class QuestionPaperService:
                     key = f"{template.type.value}|{template.marks_per_question}|{q_dist.unit_name}|{q_dist.objective}".lower()
 
                     if key in question_directory and len(question_directory[key]) > 0:
-                        question = question_directory[key].pop(0)
+                        question, reused = question_directory[key].pop(0)
                         question_type_resp.questions.append(question)
 
+                        if new_question_items is not None and not reused:
+                            item_key = self._get_question_item_key(
+                                request,
+                                q_dist.unit_name,
+                                template.type,
+                                q_dist.objective,
+                                template.marks_per_question,
+                            )
+                            if item_key is not None:
+                                new_question_items.append(
+                                    (item_key, question.model_dump())
+                                )
+
                         # Clean up empty entries
                         if len(question_directory[key]) == 0:
                             del question_directory[key]
@@ -409,79 +562,125 @@ class QuestionPaperService:
             logger.exception(f"Error organizing questions into response: {e}")
             raise
 
-    async def _get_or_create_rag_adapter(self, index_path: str) -> BaseRagAdapter:
+    def _acquire_rag_adapter(
+        self, index_path: str
+    ) -> AbstractAsyncContextManager[BaseRagAdapter]:
         """
-        Get or create a RAG adapter instance with LRU caching.
+        Get or create a RAG adapter instance with LRU caching, with its index initiated
+        (files downloaded for InMem, no-op for Qdrant).
 
         Args:
             index_path: Path to the RAG index
 
         Returns:
-            BaseRagAdapter: Cached or newly created RAG adapter instance
+            Async context manager yielding the cached or newly created RAG adapter instance
         """
-        return await self._rag_adapter_cache.get_or_create_adapter(
+        return self._rag_adapter_cache.acquire_adapter(
             index_path=index_path,
             completion_llm=self.completion_llm,
             embedding_llm=self.embedding_llm,
         )
 
+    async def _acquire_rag_adapters(
+        self, stack: AsyncExitStack, index_paths: Iterable[str]
+    ) -> Dict[str, BaseRagAdapter]:
+        """
+        Acquire the RAG adapters of all index paths concurrently, released when the stack is closed.
+
+        Args:
+            stack: Exit stack holding the acquired adapters
+            index_paths: Paths to the RAG indexes
+
+        Returns:
+            Dict mapping each index path to its RAG adapter
+        """
+        index_paths = list(dict.fromkeys(index_paths))
+        # Wait for all acquisitions, so that every acquired adapter is on the stack
+        # before an error is raised
+        results = await asyncio.gather(
+            *(
+                stack.enter_async_context(self._acquire_rag_adapter(index_path))
+                for index_path in index_paths
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return dict(zip(index_paths, results))
+
     async def generate_question_bank_by_parts(
         self, request: QuestionBankPartsGenerationRequest
     ) -> QuestionBankResponse:
-        """Generate question bank by parts using parallel processing with delays and RAG."""
+        """Generate question bank by parts using RAG, generating the slots concurrently under an adaptive limit."""
         try:
-            # Build generation slots
-            slots = self._build_generation_slots(request)
-            if not slots:
-                raise ValueError(
-                    "No generation slots could be built from template/distribution."
-                )
-
             # Prepare existing questions for reference (but no uniqueness checking)
             existing_flat = self._flatten_existing_questions(request.existing_questions)
 
-            # Process in parallel batches of 3 with 2-second delays
-            all_generated = []
-            batch_size = 3
-
-            # Process slots in batches of 3
-            for i in range(0, len(slots), batch_size):
-                batch_slots = slots[i : i + batch_size]
-
-                # Create tasks for parallel execution with delays
-                tasks = []
-                for j, slot in enumerate(batch_slots):
-                    # Get or create cached RAG adapter instance
-                    rag_adapter = await self._get_or_create_rag_adapter(
-                        slot["index_path"]
-                    )
-                    # Initiate the index (download files for InMem, no-op for Qdrant)
-                    await rag_adapter.initiate_index()
+            # Fill the `reuse_ratio` share of the questions from the question item store
+            stored_questions, stored_positions = await self._get_stored_questions(
+                request, existing_flat
+            )
 
-                    # Generate unit-specific system prompt for this slot
-                    system_prompt = self._format_system_prompt(
-                        request, existing_flat, slot
-                    )
+            # Build generation slots for the remaining questions
+            slots = self._build_generation_slots(request, stored_positions)
+            if not slots and not stored_questions:
+                raise ValueError(
+                    "No generation slots could be built from template/distribution."
+                )
 
-                    # Create task with delay
-                    task = self._generate_questions_batch_async(
-                        system_prompt, slot, rag_adapter, j * 2
-                    )  # 2-second delay between each
-                    tasks.append(task)
+            # Generate unit-specific system prompt for each slot, avoiding the reused questions too
+            avoided_questions = existing_flat + [
+                get_question_text(stored["item"]) for stored in stored_questions
+            ]
+            system_prompts = [
+                self._format_system_prompt(request, avoided_questions, slot)
+                for slot in slots
+            ]
 
-                # Wait for all tasks in the current batch to complete
-                batch_results = await asyncio.gather(*tasks)
+            all_generated = list(stored_questions)
+            async with AsyncExitStack() as stack:
+                # Prepare the RAG adapters of all units up front, kept in the cache until done
+                rag_adapters = await self._acquire_rag_adapters(
+                    stack, (slot["index_path"] for slot in slots)
+                )
 
-                # Add all generated questions from this batch
-                for raw_items in batch_results:
-                    if raw_items:
-                        all_generated.extend(raw_items)
+                # Dispatch all slots, the concurrency limiter decides how many run at once
+                tasks = [
+                    asyncio.ensure_future(
+                        self._generate_questions_batch_async(
+                            system_prompt, slot, rag_adapters[slot["index_path"]]
+                        )
+                    )
+                    for system_prompt, slot in zip(system_prompts, slots)
+                ]
+                try:
+                    # Add the generated questions of each slot as soon as it completes
+                    for next_completed in asyncio.as_completed(tasks):
+                        raw_items = await next_completed
+                        if raw_items:
+                            all_generated.extend(raw_items)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+
+            logger.info(
+                f"Generated {len(slots)} question slots, concurrency limiter: "
+                f"{self._concurrency_limiter.get_stats()}"
+            )
 
             # Organize all generated questions into the final response structure
+            new_question_items = []
             response_questions = self._organize_questions_into_response(
-                request, all_generated
+                request, all_generated, new_question_items
             )
 
+            # Store the new questions for later requests
+            try:
+                await self._question_item_store.add_items(new_question_items)
+            except Exception as e:
+                logger.error(f"Error storing generated questions: {e}")
+
             return QuestionBankResponse(
                 metadata=QuestionBankMetadata(
                     user_id=request.user_id,
@@ -499,8 +698,9 @@ class QuestionPaperService:
             raise
 
     async def cleanup(self) -> None:
-        """Clear the RAG adapter cache and associated resources."""
+        """Clear the RAG adapter cache and associated resources, and close the question item store."""
         await self._rag_adapter_cache.cleanup()
+        await self._question_item_store.close()
 
     async def get_question_distribution(
         self,
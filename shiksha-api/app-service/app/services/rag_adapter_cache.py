@@ -1,12 +1,25 @@
 import logging
 import asyncio
 from collections import OrderedDict
-from typing import Optional
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+from app.config import settings
 from app.services.rag_adapters import BaseRagAdapter, RagAdapterFactory
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _CacheEntry:
+    """A cached RAG adapter with its preparation task and the number of requests using it."""
+
+    adapter: BaseRagAdapter
+    ready: Optional[asyncio.Future] = None
+    ref_count: int = 0
+    size_in_bytes: int = 0
+
+
 class RagAdapterCache:
     """
     A centralized LRU cache manager for RAG adapter instances.
@@ -14,73 +27,166 @@ class RagAdapterCache:
     This class provides caching functionality to reuse RAG adapter instances
     across multiple requests, reducing initialization overhead and improving
     performance.
+
+    Adapters are created and prepared (initialized and their index initiated, e.g.
+    downloaded) once per index path, concurrent requests for the same index path wait
+    for the same preparation. Adapters are reference counted while in use, see
+    acquire_adapter(), and only adapters that are not in use are evicted, least recently
+    used first, once the cached indexes exceed `max_cache_size_in_bytes`.
     """
 
-    def __init__(self, max_cache_size: int = 32):
+    def __init__(
+        self,
+        max_cache_size_in_bytes: int = 2 * 1024**3,
+        max_cache_size: int = 256,
+    ):
         """
         Initialize the RAG adapter cache.
 
         Args:
-            max_cache_size: Maximum number of adapters to cache (default: 32)
+            max_cache_size_in_bytes: Maximum total size of the cached indexes (default: 2 GiB)
+            max_cache_size: Maximum number of adapters to cache, which bounds the adapters of
+                            remote indexes that take no local space (default: 256)
         """
-        self._rag_adapter_cache: OrderedDict[str, BaseRagAdapter] = OrderedDict()
+        self._rag_adapter_cache: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._max_cache_size_in_bytes = max_cache_size_in_bytes
         self._cache_size = max_cache_size
-
-    async def get_or_create_adapter(
+        # Cleanups of evicted adapters, awaited before the same index path is prepared again
+        self._cleanup_tasks: Dict[str, asyncio.Task] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @asynccontextmanager
+    async def acquire_adapter(
         self,
         index_path: str,
         completion_llm,
         embedding_llm,
-    ) -> BaseRagAdapter:
+    ) -> AsyncIterator[BaseRagAdapter]:
         """
-        Get or create a RAG adapter instance with LRU caching.
+        Get or create a ready RAG adapter instance, which is not evicted until released.
+
+        Usage:
+            async with cache.acquire_adapter(index_path, completion_llm, embedding_llm) as adapter:
+                await adapter.chat_with_index(...)
 
         Args:
             index_path: Path to the RAG index
             completion_llm: Completion language model instance
             embedding_llm: Embedding language model instance
 
-        Returns:
-            BaseRagAdapter: Cached or newly created RAG adapter instance
+        Yields:
+            BaseRagAdapter: Cached or newly created RAG adapter instance with its index initiated
         """
+        entry = await self._acquire_entry(index_path, completion_llm, embedding_llm)
+        try:
+            yield entry.adapter
+        finally:
+            entry.ref_count -= 1
+            self._evict_if_needed()
+
+    async def _acquire_entry(
+        self,
+        index_path: str,
+        completion_llm,
+        embedding_llm,
+    ) -> _CacheEntry:
+        """Get or create the cache entry of the index path and wait until its adapter is ready."""
         # Generate cache key using the index path
         cache_key = index_path
 
-        # Check if adapter instance exists in cache
-        if cache_key in self._rag_adapter_cache:
+        entry = self._rag_adapter_cache.get(cache_key)
+        if entry is not None:
             # Move to end (most recently used)
-            adapter = self._rag_adapter_cache.pop(cache_key)
-            self._rag_adapter_cache[cache_key] = adapter
+            self._rag_adapter_cache.move_to_end(cache_key)
+            self._hits += 1
             logger.debug(f"Retrieved RAG adapter from cache for: {index_path}")
-            return adapter
+        else:
+            # Create new adapter instance, prepared once for all concurrent requests
+            entry = _CacheEntry(
+                adapter=RagAdapterFactory.create_adapter(
+                    index_path=index_path,
+                    completion_llm=completion_llm,
+                    embedding_llm=embedding_llm,
+                )
+            )
+            entry.ready = asyncio.ensure_future(self._prepare_adapter(cache_key, entry))
+            self._rag_adapter_cache[cache_key] = entry
+            self._misses += 1
+            logger.debug(f"Created new RAG adapter and cached for: {index_path}")
 
-        # Create new adapter instance
-        adapter = RagAdapterFactory.create_adapter(
-            index_path=index_path,
-            completion_llm=completion_llm,
-            embedding_llm=embedding_llm,
-        )
+        entry.ref_count += 1
+        try:
+            # Shielded, so that a cancelled request doesn't cancel the shared preparation
+            await asyncio.shield(entry.ready)
+        except BaseException:
+            entry.ref_count -= 1
+            raise
+        return entry
+
+    async def _prepare_adapter(self, cache_key: str, entry: _CacheEntry) -> None:
+        """
+        Initialize the adapter and initiate its index (download files for InMem, no-op for Qdrant).
 
-        # Initialize the adapter
-        await adapter.initialize()
+        A failed adapter is removed from the cache and cleaned up, so the next request retries.
+        """
+        try:
+            # Wait until the files of a previously evicted adapter are removed
+            pending_cleanup = self._cleanup_tasks.get(cache_key)
+            if pending_cleanup is not None:
+                await pending_cleanup
+
+            await entry.adapter.initialize()
+            await entry.adapter.initiate_index()
+            entry.size_in_bytes = entry.adapter.get_size_in_bytes()
+        except Exception:
+            if self._rag_adapter_cache.get(cache_key) is entry:
+                del self._rag_adapter_cache[cache_key]
+            await self._clear_adapter_resources(entry.adapter)
+            raise
+
+        self._evict_if_needed()
+
+    def _get_cache_size_in_bytes(self) -> int:
+        return sum(entry.size_in_bytes for entry in self._rag_adapter_cache.values())
+
+    def _is_over_budget(self) -> bool:
+        return (
+            len(self._rag_adapter_cache) > self._cache_size
+            or self._get_cache_size_in_bytes() > self._max_cache_size_in_bytes
+        )
 
-        # Add to cache and handle LRU eviction
-        self._rag_adapter_cache[cache_key] = adapter
+    def _evict_if_needed(self) -> None:
+        """Evict the least recently used adapters that are ready and not in use until the cache fits its budget."""
+        for cache_key, entry in list(self._rag_adapter_cache.items()):
+            if not self._is_over_budget():
+                return
+            if entry.ref_count > 0 or not entry.ready.done():
+                continue
+
+            del self._rag_adapter_cache[cache_key]
+            self._evictions += 1
+            self._schedule_cleanup(cache_key, entry.adapter)
+            logger.debug(
+                f"Evicted RAG adapter from cache and cleared resources: {cache_key}"
+            )
 
-        # Remove least recently used item if cache is full
-        if len(self._rag_adapter_cache) > self._cache_size:
-            oldest_key = next(iter(self._rag_adapter_cache))
-            evicted_adapter = self._rag_adapter_cache.pop(oldest_key)
+        if self._is_over_budget():
+            logger.warning(
+                "RAG adapter cache exceeds its budget, all remaining adapters are in use"
+            )
 
-            # Clean up resources for the evicted adapter
-            await self._clear_adapter_resources(evicted_adapter)
+    def _schedule_cleanup(self, cache_key: str, adapter: BaseRagAdapter) -> None:
+        """Clean up the evicted adapter in the background."""
+        task = asyncio.ensure_future(self._clear_adapter_resources(adapter))
+        self._cleanup_tasks[cache_key] = task
 
-            logger.debug(
-                f"Evicted RAG adapter from cache and cleared resources: {oldest_key}"
-            )
+        def _forget_cleanup(_):
+            if self._cleanup_tasks.get(cache_key) is task:
+                del self._cleanup_tasks[cache_key]
 
-        logger.debug(f"Created new RAG adapter and cached for: {index_path}")
-        return adapter
+        task.add_done_callback(_forget_cleanup)
 
     async def _clear_adapter_resources(self, adapter: BaseRagAdapter) -> None:
         """
@@ -98,9 +204,9 @@ class RagAdapterCache:
         """Clear the RAG adapter cache and associated resources."""
         # Clean up resources for all cached adapters
         cleanup_tasks = [
-            self._clear_adapter_resources(adapter)
-            for adapter in self._rag_adapter_cache.values()
-        ]
+            self._clear_adapter_resources(entry.adapter)
+            for entry in self._rag_adapter_cache.values()
+        ] + list(self._cleanup_tasks.values())
 
         if cleanup_tasks:
             await asyncio.gather(*cleanup_tasks, return_exceptions=True)
@@ -113,14 +219,27 @@ class RagAdapterCache:
         Get information about the current cache state.
 
         Returns:
-            dict: Dictionary containing cache size and keys
+            dict: Dictionary containing cache size and keys, the adapters in use and the
+                  hit, miss and eviction counts
         """
         return {
             "cache_size": len(self._rag_adapter_cache),
             "max_cache_size": self._cache_size,
+            "cache_size_in_bytes": self._get_cache_size_in_bytes(),
+            "max_cache_size_in_bytes": self._max_cache_size_in_bytes,
             "cached_keys": list(self._rag_adapter_cache.keys()),
+            "in_use_keys": [
+                cache_key
+                for cache_key, entry in self._rag_adapter_cache.items()
+                if entry.ref_count > 0
+            ],
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
         }
 
 
 # Global cache instance that can be shared across services
-RAG_ADAPTER_CACHE = RagAdapterCache()
+RAG_ADAPTER_CACHE = RagAdapterCache(
+    max_cache_size_in_bytes=settings.rag_adapter_cache_max_size_in_bytes
+)
@@ -9,7 +9,7 @@ import os
 import logging
 import tempfile
 from abc import ABC, abstractmethod
-from typing import List, Optional, Union
+from typing import AsyncGenerator, List, Optional, Union
 from app.config import settings
 from app.utils.blob_store import BlobStore
 from rag_wrapper import InMemRagOps, QdrantRagOps
@@ -66,6 +66,15 @@ class BaseRagAdapter(ABC):
         """Clean up any resources used by the adapter."""
         pass
 
+    def get_size_in_bytes(self) -> int:
+        """
+        Get the local size of the index, used to budget the adapter cache.
+
+        Returns:
+            int: Size of the index files kept locally, 0 for remote indexes
+        """
+        return 0
+
     @property
     def rag_ops(self) -> Union[InMemRagOps, QdrantRagOps]:
         """Get the RAG operations instance."""
@@ -90,6 +99,24 @@ class BaseRagAdapter(ABC):
             curr_message, chat_history, metadata_filter=self.metadata_filter
         )
 
+    async def astream_chat_with_index(
+        self, curr_message: str, chat_history: List[ChatMessage]
+    ) -> AsyncGenerator[str, None]:
+        """
+        Chat with the RAG index, yielding the response tokens as they are generated.
+
+        Args:
+            curr_message: Current user message
+            chat_history: List of previous chat messages
+
+        Yields:
+            str: Response text deltas from the RAG system
+        """
+        async for token in self.rag_ops.astream_chat_with_index(
+            curr_message, chat_history, metadata_filter=self.metadata_filter
+        ):
+            yield token
+
     async def index_exists(self) -> bool:
         """Check if the index exists."""
         return await self.rag_ops.index_exists()
@@ -116,7 +143,8 @@ class InMemRagOpsAdapter(BaseRagAdapter):
         self.index_path = index_path
         self._blob_store = BlobStore()
         self.persist_dir = os.path.join(
-            tempfile.gettempdir(), index_path.replace("/", "_")
+            settings.index_cache_dir or tempfile.gettempdir(),
+            index_path.replace("/", "_"),
         )
 
     async def initialize(self) -> InMemRagOps:
@@ -137,28 +165,47 @@ class InMemRagOpsAdapter(BaseRagAdapter):
     async def initiate_index(self) -> None:
         """
         Initiate the index by downloading files from blob storage if needed.
+
+        Index files downloaded before, e.g. before a restart, are kept if their blobs
+        didn't change, so an up-to-date index only costs a blob list call.
         """
-        index_exists = await self.index_exists()
-        if not index_exists:
-            logger.info(f"Downloading RAG index from blob storage: {self.index_path}")
+        logger.info(f"Syncing RAG index from blob storage: {self.index_path}")
 
-            downloaded_file_paths = await self._blob_store.download_blobs_to_folder(
-                prefix=self.index_path, target_folder=self.persist_dir
-            )
+        downloaded_file_paths = await self._blob_store.download_blobs_to_folder(
+            prefix=self.index_path, target_folder=self.persist_dir
+        )
 
-            if not downloaded_file_paths:
-                raise RuntimeError(
-                    f"No files downloaded for index path: {self.index_path}"
-                )
+        if not downloaded_file_paths:
+            raise RuntimeError(f"No files downloaded for index path: {self.index_path}")
 
-            logger.info(f"Downloaded {len(downloaded_file_paths)} index files")
-            file_paths_str = "\n".join(downloaded_file_paths)
-            logger.info(f"Downloaded RAG index files: {file_paths_str}")
-        else:
-            logger.debug(f"Index already exists at: {self.persist_dir}")
+        file_paths_str = "\n".join(downloaded_file_paths)
+        logger.info(f"RAG index files up to date: {file_paths_str}")
+
+    def get_size_in_bytes(self) -> int:
+        """
+        Get the size of the downloaded index files, which the index also takes in memory roughly.
+
+        Returns:
+            int: Total size of the files in the persist directory
+        """
+        size_in_bytes = 0
+        for dir_path, _, file_names in os.walk(self.persist_dir):
+            for file_name in file_names:
+                size_in_bytes += os.path.getsize(os.path.join(dir_path, file_name))
+        return size_in_bytes
 
     async def cleanup(self) -> None:
-        """Clean up downloaded index files."""
+        """
+        Drop the in-memory index and clean up the downloaded index files.
+
+        The files are kept when INDEX_CACHE_DIR is set, so that the next use of the index
+        only checks its blobs instead of downloading it again.
+        """
+        self._rag_ops = None
+        if settings.index_cache_dir:
+            logger.info(f"Keeping cached index files at: {self.persist_dir}")
+            return
+
         if os.path.exists(self.persist_dir):
             import shutil
 
@@ -223,10 +270,11 @@ class QdrantRagOpsAdapter(BaseRagAdapter):
         pass
 
     async def cleanup(self) -> None:
-        """Clean up Qdrant resources if needed."""
-        # QdrantRagOps typically doesn't require local file cleanup
+        """Close the Qdrant clients of the RAG operations instance."""
+        # QdrantRagOps doesn't require local file cleanup
         # as it works with remote Qdrant instances
-        pass
+        if self._rag_ops is not None:
+            await self._rag_ops.aclose()
 
 
 class RagAdapterFactory:
@@ -0,0 +1,358 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple, TypeVar
+from pydantic import BaseModel
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Response header reporting whether a response was served from the cache
+CACHE_STATUS_HEADER = "X-Cache"
+CACHE_HIT = "HIT"
+CACHE_MISS = "MISS"
+# The cache backend failed, the response was computed without the cache
+CACHE_BYPASS = "BYPASS"
+
+
+def get_request_cache_key(
+    namespace: str, request: BaseModel, exclude: Optional[Set[str]] = None
+) -> str:
+    """
+    Get the cache key of a validated request model from a hash of its canonical JSON.
+
+    Args:
+        namespace: Prefix separating the keys of different endpoints
+        request: The validated request model
+        exclude: Fields that don't affect the response, e.g. the user id
+
+    Returns:
+        str: The cache key
+    """
+    content = json.dumps(
+        request.model_dump(mode="json", exclude=exclude),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return f"{namespace}:{hashlib.sha256(content.encode('utf-8')).hexdigest()}"
+
+
+class BaseResponseCacheBackend(ABC):
+    """Storage of the serialized responses of a ResponseCache."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Get the unexpired value of the key, None if there is none."""
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        """Set the value of the key, expiring after `ttl_seconds`."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all values."""
+
+    async def close(self) -> None:
+        """Release the resources of the backend."""
+
+
+class InMemoryResponseCacheBackend(BaseResponseCacheBackend):
+    """Keeps the responses in process memory, evicting the least recently used beyond `max_entries`."""
+
+    def __init__(self, max_entries: int = 1024):
+        self._entries: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+        self._max_entries = max_entries
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        # Move to end (most recently used)
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        self._entries[key] = (time.time() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class DiskResponseCacheBackend(BaseResponseCacheBackend):
+    """
+    Keeps the responses in a SQLite file, so that they survive restarts, evicting the least
+    recently used beyond `max_entries`.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 1024):
+        self._db_path = db_path
+        self._max_entries = max_entries
+        self._connection: Optional[sqlite3.Connection] = None
+        # Serializes the database operations, which run in worker threads
+        self._lock = asyncio.Lock()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self._db_path, check_same_thread=False)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    async def _run(self, fn, *args):
+        async with self._lock:
+            return await asyncio.to_thread(fn, *args)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._run(self._get, key)
+
+    def _get(self, key: str) -> Optional[str]:
+        connection = self._get_connection()
+        now = time.time()
+        with connection:
+            row = connection.execute(
+                "SELECT value FROM responses WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+        return row[0] if row is not None else None
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        await self._run(self._set, key, value, ttl_seconds)
+
+    def _set(self, key: str, value: str, ttl_seconds: int) -> None:
+        connection = self._get_connection()
+        now = time.time()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl_seconds, now),
+            )
+            connection.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            connection.execute(
+                """
+                DELETE FROM responses WHERE key NOT IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC LIMIT ?
+                )
+                """,
+                (self._max_entries,),
+            )
+
+    async def clear(self) -> None:
+        await self._run(self._clear)
+
+    def _clear(self) -> None:
+        connection = self._get_connection()
+        with connection:
+            connection.execute("DELETE FROM responses")
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class RedisResponseCacheBackend(BaseResponseCacheBackend):
+    """
+    Keeps the responses in Redis, shared by all instances of the app service.
+
+    Values expire after their TTL. The size of the cache is bounded by the Redis server,
+    configure `maxmemory` with the `allkeys-lru` or `volatile-lru` policy.
+    Requires the `redis` package.
+    """
+
+    def __init__(self, redis_url: str, key_prefix: str = "response-cache:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ImportError(
+                "The redis response cache backend requires the `redis` package, install it "
+                "with `pip install redis`"
+            ) from e
+
+        self._client = redis.from_url(redis_url, decode_responses=True)
+        self._key_prefix = key_prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._client.get(self._key_prefix + key)
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        await self._client.set(self._key_prefix + key, value, ex=ttl_seconds)
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter(match=f"{self._key_prefix}*"):
+            await self._client.delete(key)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class ResponseCache:
+    """
+    Caches the responses of deterministic endpoints, keyed on their request, see
+    get_request_cache_key().
+
+    Concurrent misses of the same key compute the response once. Backend failures are
+    logged and the response is computed without the cache, so that the cache never fails
+    a request.
+    """
+
+    def __init__(self, backend: BaseResponseCacheBackend, ttl_seconds: int = 86400):
+        """
+        Initialize the response cache.
+
+        Args:
+            backend: Storage of the serialized responses
+            ttl_seconds: Time after which cached responses expire (default: 1 day)
+        """
+        self._backend = backend
+        self._ttl_seconds = ttl_seconds
+        # Responses being computed, awaited by concurrent requests of the same key
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+        serialize: Callable[[T], Any],
+        deserialize: Callable[[Any], T],
+        should_cache: Optional[Callable[[T], bool]] = None,
+    ) -> Tuple[T, str]:
+        """
+        Get the cached response of the key, or compute and cache it.
+
+        Args:
+            key: Cache key of the request
+            compute: Function computing the response
+            serialize: Function converting the response to JSON serializable data
+            deserialize: Function converting the JSON serializable data back to the response
+            should_cache: Optional predicate on the response, e.g. that it's valid, deciding
+                          whether it's cached
+
+        Returns:
+            The response and its cache status, CACHE_HIT, CACHE_MISS or CACHE_BYPASS
+        """
+        try:
+            cached = await self._backend.get(key)
+        except Exception as e:
+            self._errors += 1
+            logger.error(f"Failed to get cached response, computing it: {e}")
+            return await compute(), CACHE_BYPASS
+
+        if cached is not None:
+            self._hits += 1
+            return deserialize(json.loads(cached)), CACHE_HIT
+
+        self._misses += 1
+        pending = self._pending.get(key)
+        if pending is not None:
+            # Shielded, so that a cancelled request doesn't cancel the shared computation
+            return deserialize(await asyncio.shield(pending)), CACHE_MISS
+
+        task = asyncio.ensure_future(
+            self._compute_and_cache(key, compute, serialize, should_cache)
+        )
+        self._pending[key] = task
+        task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return deserialize(await asyncio.shield(task)), CACHE_MISS
+
+    async def _compute_and_cache(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+        serialize: Callable[[T], Any],
+        should_cache: Optional[Callable[[T], bool]],
+    ) -> Any:
+        response = await compute()
+        data = serialize(response)
+        if should_cache is None or should_cache(response):
+            try:
+                await self._backend.set(key, json.dumps(data), self._ttl_seconds)
+            except Exception as e:
+                self._errors += 1
+                logger.error(f"Failed to cache response: {e}")
+        return data
+
+    async def clear(self) -> None:
+        """Remove all cached responses."""
+        await self._backend.clear()
+
+    async def close(self) -> None:
+        """Release the resources of the backend."""
+        await self._backend.close()
+
+    def get_cache_info(self) -> dict:
+        """
+        Get information about the cache usage since startup.
+
+        Returns:
+            dict: Dictionary containing the backend, TTL, hit, miss and error counts and the hit rate
+        """
+        lookups = self._hits + self._misses
+        return {
+            "backend": type(self._backend).__name__,
+            "ttl_seconds": self._ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "errors": self._errors,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+        }
+
+
+def create_response_cache_backend() -> BaseResponseCacheBackend:
+    """Create the response cache backend configured in the settings."""
+    backend = settings.response_cache_backend.lower()
+    if backend == "memory":
+        return InMemoryResponseCacheBackend(
+            max_entries=settings.response_cache_max_entries
+        )
+    if backend == "disk":
+        if not settings.response_cache_path:
+            raise ValueError("RESPONSE_CACHE_PATH is required for the disk backend")
+        return DiskResponseCacheBackend(
+            db_path=settings.response_cache_path,
+            max_entries=settings.response_cache_max_entries,
+        )
+    if backend == "redis":
+        if not settings.response_cache_redis_url:
+            raise ValueError(
+                "RESPONSE_CACHE_REDIS_URL is required for the redis backend"
+            )
+        return RedisResponseCacheBackend(redis_url=settings.response_cache_redis_url)
+    raise ValueError(f"Unsupported response cache backend: {backend}")
+
+
+# Global cache instance that can be shared across routers
+RESPONSE_CACHE = ResponseCache(
+    backend=create_response_cache_backend(),
+    ttl_seconds=settings.response_cache_ttl_seconds,
+)
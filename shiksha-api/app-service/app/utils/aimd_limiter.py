@@ -0,0 +1,212 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Deque, TypeVar
+
+import httpx
+import openai
+from rag_wrapper.utils.retry import get_status_code
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Rate limit and overloaded responses of the LLM endpoints
+OVERLOAD_STATUS_CODES = {429, 503}
+
+OVERLOAD_ERROR_TYPES = (
+    asyncio.TimeoutError,
+    TimeoutError,
+    openai.APITimeoutError,
+    httpx.TimeoutException,
+)
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """
+    Check if an error signals that the LLM endpoint is overloaded, i.e. a rate limit,
+    service unavailable or timeout error.
+
+    Errors raised from another error, e.g. a retry error raised from a rate limit error, are
+    also overload errors when the error they were raised from is.
+    """
+    if isinstance(error, OVERLOAD_ERROR_TYPES):
+        return True
+    if get_status_code(error) in OVERLOAD_STATUS_CODES:
+        return True
+    return error.__cause__ is not None and is_overload_error(error.__cause__)
+
+
+class AIMDConcurrencyLimiter:
+    """
+    Concurrency limiter that adapts its limit to the capacity of the LLM endpoint with
+    additive-increase, multiplicative-decrease (AIMD).
+
+    Every successful call grows the limit by `increase_step / limit`, i.e. by `increase_step`
+    once a full window of calls succeeded. An overload error (429, 503 or timeout) multiplies
+    the limit by `decrease_factor`, at most once per window: overload errors of calls started
+    before the last decrease don't decrease the limit again. Calls that failed with an overload
+    error are retried with exponential backoff, up to `max_retries` times.
+
+    Usage:
+        limiter = AIMDConcurrencyLimiter(initial_limit=4, max_limit=16)
+        result = await limiter.run(lambda: llm.acomplete(prompt))
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        increase_step: float = 1.0,
+        decrease_factor: float = 0.5,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit: Number of concurrent calls allowed at first
+            min_limit: Lower bound of the limit
+            max_limit: Upper bound of the limit
+            increase_step: Limit increase per window of successful calls
+            decrease_factor: Factor the limit is multiplied with on overload errors
+            max_retries: Maximum number of retries of a call failing with an overload error
+            backoff_seconds: Delay before the first retry, doubled with every retry
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                "Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit"
+            )
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._increase_step = increase_step
+        self._decrease_factor = decrease_factor
+        self._max_retries = max_retries
+        self._backoff_seconds = backoff_seconds
+
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Incremented on every decrease, so that overload errors of calls started
+        # before the decrease don't decrease the limit again
+        self._window = 0
+
+        self._successes = 0
+        self._overloads = 0
+        self._retries = 0
+        self._peak_in_flight = 0
+
+    @property
+    def limit(self) -> int:
+        """The current number of concurrent calls allowed."""
+        return int(self._limit)
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run the call once a slot is free, retrying it on overload errors.
+
+        Args:
+            call: Function creating the awaitable to run, called once per attempt
+
+        Returns:
+            The result of the call
+
+        Raises:
+            The error of the call if it isn't an overload error, or the overload error of
+            the last attempt once all retries failed.
+        """
+        for attempt in range(self._max_retries + 1):
+            await self._acquire()
+            window = self._window
+            try:
+                result = await call()
+            except Exception as e:
+                if not is_overload_error(e):
+                    raise
+                self._on_overload(window)
+                if attempt == self._max_retries:
+                    raise
+                error = e
+            else:
+                self._on_success()
+                return result
+            finally:
+                self._release()
+
+            self._retries += 1
+            delay = self._backoff_seconds * 2**attempt
+            logger.warning(
+                f"LLM endpoint overloaded ({error}), retrying in {delay} seconds "
+                f"with a concurrency limit of {self.limit}"
+            )
+            await asyncio.sleep(delay)
+
+    async def _acquire(self) -> None:
+        """Wait until the number of calls in flight is below the limit, first come first served."""
+        if not self._waiters and self._in_flight < self.limit:
+            self._start_call()
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Hand the slot over to the next waiter if it was granted before the cancellation
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+
+    def _start_call(self) -> None:
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            # Waiters cancelled while waiting are skipped
+            if not waiter.done():
+                self._start_call()
+                waiter.set_result(None)
+
+    def _on_success(self) -> None:
+        self._successes += 1
+        self._limit = min(
+            self._max_limit, self._limit + self._increase_step / self._limit
+        )
+        self._wake_waiters()
+
+    def _on_overload(self, window: int) -> None:
+        self._overloads += 1
+        if window != self._window:
+            return
+        self._window += 1
+        self._limit = max(self._min_limit, self._limit * self._decrease_factor)
+        logger.info(f"Decreased concurrency limit to {self.limit}")
+
+    def get_stats(self) -> dict:
+        """
+        Get information about the current limiter state.
+
+        Returns:
+            dict: Dictionary containing the current limit, the calls in flight and waiting,
+                  and the success, overload and retry counts
+        """
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "waiting": sum(1 for waiter in self._waiters if not waiter.done()),
+            "successes": self._successes,
+            "overloads": self._overloads,
+            "retries": self._retries,
+        }
@@ -1,13 +1,24 @@
+import asyncio
+import json
+import logging
 import os
-from typing import List, Optional
+import uuid
+from typing import Any, Dict, List, Optional
 
-from azure.core.exceptions import AzureError
+from azure.core import MatchConditions
+from azure.core.exceptions import AzureError, ResourceModifiedError
 from azure.identity.aio import DefaultAzureCredential
 from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
 import aiofiles
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Records the ETag and last-modified time of the blobs downloaded into a folder. Its name
+# doesn't end with ".json", so it isn't mistaken for an index file.
+MANIFEST_FILE_NAME = ".blob_manifest"
+
 
 class BlobStore:
     """
@@ -38,18 +49,29 @@ class BlobStore:
             )
 
     async def download_blobs_to_folder(
-        self, prefix: str, target_folder: str = "blob_downloads"
+        self,
+        prefix: str,
+        target_folder: str = "blob_downloads",
+        max_concurrency: int = 8,
     ) -> List[str]:
         """
         Async download all blobs whose names start with `prefix`
         into a local subfolder under /tmp (or wherever you like).
 
+        The folder doubles as a persistent cache: a manifest records the ETag and
+        last-modified time of every downloaded blob, so blobs that didn't change since they
+        were downloaded cost only the list call, and files of deleted blobs are removed.
+        Changed blobs are downloaded concurrently, streamed to a temporary file in chunks
+        and renamed into place once complete, so an interrupted download never leaves a
+        partial file behind.
+
         Args:
           prefix: in the form "container/prefix_path"
           target_folder: local directory root for downloads
+          max_concurrency: maximum number of blobs downloaded at the same time
 
         Returns:
-          List of local file paths written.
+          List of local file paths of all blobs under the prefix, downloaded or up to date.
 
         Raises:
           ValueError, RuntimeError
@@ -59,29 +81,116 @@ class BlobStore:
 
         container_name, blob_prefix = prefix.split("/", 1)
         container_client = self._async_svc.get_container_client(container_name)
-        downloaded_files: List[str] = []
+        os.makedirs(target_folder, exist_ok=True)
+        cached_blobs = self._read_manifest(target_folder)
+        semaphore = asyncio.Semaphore(max_concurrency)
 
         try:
             # list_blobs is async iterable
+            blobs: Dict[str, Dict[str, Any]] = {}
             async for blob_props in container_client.list_blobs(
                 name_starts_with=blob_prefix
             ):
-                blob_name = blob_props.name
-                blob_client = container_client.get_blob_client(blob_name)
-                stream = await blob_client.download_blob()
-                data = await stream.readall()
-
-                file_name = blob_name.split("/")[-1]
-                local_path = os.path.join(target_folder, file_name)
-                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                file_name = blob_props.name.split("/")[-1]
+                blobs[file_name] = self._get_manifest_entry(blob_props.name, blob_props)
+
+            stale_file_names = [
+                file_name
+                for file_name, entry in blobs.items()
+                if cached_blobs.get(file_name) != entry
+                or not os.path.exists(os.path.join(target_folder, file_name))
+            ]
+
+            async def _download(file_name: str) -> None:
+                async with semaphore:
+                    blobs[file_name] = await self._download_blob_to_file(
+                        container_client,
+                        blobs[file_name],
+                        os.path.join(target_folder, file_name),
+                    )
+
+            await asyncio.gather(
+                *(_download(file_name) for file_name in stale_file_names)
+            )
 
-                # write without blocking the event loop
-                async with aiofiles.open(local_path, "wb") as f:
-                    await f.write(data)
+        except AzureError as e:
+            raise RuntimeError(f"Failed to download blobs asynchronously: {e}")
 
-                downloaded_files.append(local_path)
+        # Remove the files of blobs that no longer exist
+        for file_name in set(cached_blobs) - set(blobs):
+            local_path = os.path.join(target_folder, file_name)
+            if os.path.exists(local_path):
+                os.remove(local_path)
+
+        self._write_manifest(target_folder, blobs)
+        logger.info(
+            f"Downloaded {len(stale_file_names)} blobs of '{prefix}', "
+            f"{len(blobs) - len(stale_file_names)} were up to date"
+        )
+        return [os.path.join(target_folder, file_name) for file_name in blobs]
+
+    async def _download_blob_to_file(
+        self, container_client, entry: Dict[str, Any], local_path: str
+    ) -> Dict[str, Any]:
+        """
+        Stream a blob to a temporary file in chunks and atomically rename it to `local_path`.
 
-            return downloaded_files
+        The listed version of the blob is downloaded, so that the file matches its manifest
+        entry. If the blob changed since it was listed, its current version is downloaded.
 
-        except AzureError as e:
-            raise RuntimeError(f"Failed to download blobs asynchronously: {e}")
+        Returns:
+          Manifest entry with the ETag and last-modified time of the downloaded blob version.
+        """
+        temp_path = f"{local_path}.{uuid.uuid4().hex}.partial"
+        try:
+            blob_client = container_client.get_blob_client(entry["blob_name"])
+            try:
+                downloader = await blob_client.download_blob(
+                    etag=f'"{entry["etag"]}"',
+                    match_condition=MatchConditions.IfNotModified,
+                )
+            except ResourceModifiedError:
+                logger.info(f"Blob {entry['blob_name']} changed since it was listed")
+                downloader = await blob_client.download_blob()
+                entry = self._get_manifest_entry(
+                    entry["blob_name"], downloader.properties
+                )
+
+            # write without blocking the event loop
+            async with aiofiles.open(temp_path, "wb") as f:
+                async for chunk in downloader.chunks():
+                    await f.write(chunk)
+
+            os.replace(temp_path, local_path)
+            return entry
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @staticmethod
+    def _get_manifest_entry(blob_name: str, blob_props) -> Dict[str, Any]:
+        last_modified = blob_props.last_modified
+        return {
+            "blob_name": blob_name,
+            # Listed blobs have unquoted ETags, downloaded ones quoted ETags
+            "etag": blob_props.etag.strip('"') if blob_props.etag else None,
+            "last_modified": last_modified.isoformat() if last_modified else None,
+        }
+
+    @staticmethod
+    def _read_manifest(target_folder: str) -> Dict[str, Dict[str, Any]]:
+        """Read the blobs recorded as downloaded into the folder, by local file name."""
+        manifest_path = os.path.join(target_folder, MANIFEST_FILE_NAME)
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_manifest(target_folder: str, blobs: Dict[str, Dict[str, Any]]) -> None:
+        manifest_path = os.path.join(target_folder, MANIFEST_FILE_NAME)
+        temp_path = f"{manifest_path}.{uuid.uuid4().hex}.partial"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(blobs, f, indent=2)
+        os.replace(temp_path, manifest_path)
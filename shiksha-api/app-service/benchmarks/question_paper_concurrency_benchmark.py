@@ -0,0 +1,152 @@
+"""
+Question slot dispatch benchmark against a fake rate-limited LLM endpoint.
+
+Generates the question slots of one question paper with the previous strategy (fixed batches of 3 slots,
+started 0, 2 and 4 seconds apart) and with the `AIMDConcurrencyLimiter` used by `QuestionPaperService`, against
+a fake LLM that takes `--latency` seconds per call and answers 429 to calls beyond its `--rpm` limit, evaluated
+over 10 second windows like Azure OpenAI deployments. Reports the wall time, the 429 responses, the failed slots
+and the peak concurrency of each strategy. Time is scaled by `--time-scale`, so the benchmark runs in a few
+seconds; reported times are unscaled.
+
+Usage (from shiksha-api/app-service):
+    PYTHONPATH=.:app/rag-wrapper/src python benchmarks/question_paper_concurrency_benchmark.py
+    PYTHONPATH=.:app/rag-wrapper/src python benchmarks/question_paper_concurrency_benchmark.py --slots 60 --rpm 60
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+
+from app.utils.aimd_limiter import AIMDConcurrencyLimiter
+
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+
+class FakeLLM:
+    """Answers after a fixed latency, or with a 429 when more than `rpm / 6` calls started in the last 10 seconds."""
+
+    def __init__(self, latency: float, rpm: float, time_scale: float, seed: int):
+        self.latency = latency * time_scale
+        self.rate_limit = rpm / 6
+        self.window = 10 * time_scale
+        self.rng = random.Random(seed)
+        self.call_times = deque()
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def generate(self) -> list:
+        now = time.perf_counter()
+        while self.call_times and self.call_times[0] <= now - self.window:
+            self.call_times.popleft()
+        if len(self.call_times) >= self.rate_limit:
+            self.rate_limited += 1
+            await asyncio.sleep(self.latency * 0.01)
+            raise FakeRateLimitError("429 Too Many Requests")
+        self.call_times.append(now)
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            # Up to 25% latency jitter, like responses of varying length
+            await asyncio.sleep(self.latency * (1 + self.rng.random() / 4))
+        finally:
+            self.in_flight -= 1
+        return [{"item": "question"}]
+
+
+async def generate_slot_or_fail(generate) -> list:
+    try:
+        return await generate()
+    except Exception:
+        return []
+
+
+async def run_fixed_batches(llm: FakeLLM, args) -> int:
+    """The previous strategy: batches of 3 slots, started 0, 2 and 4 seconds apart."""
+
+    async def delayed_slot(delay_seconds):
+        await asyncio.sleep(delay_seconds * args.time_scale)
+        return await generate_slot_or_fail(llm.generate)
+
+    generated = 0
+    for i in range(0, args.slots, 3):
+        batch = range(i, min(i + 3, args.slots))
+        results = await asyncio.gather(
+            *(delayed_slot(j * 2) for j in range(len(batch)))
+        )
+        generated += sum(1 for result in results if result)
+    return generated
+
+
+async def run_aimd(llm: FakeLLM, args) -> int:
+    """The current strategy: all slots dispatched at once through the AIMD limiter, collected as they complete."""
+    limiter = AIMDConcurrencyLimiter(
+        initial_limit=args.initial_concurrency,
+        max_limit=args.max_concurrency,
+        backoff_seconds=args.time_scale,
+    )
+    tasks = [
+        asyncio.ensure_future(generate_slot_or_fail(lambda: limiter.run(llm.generate)))
+        for _ in range(args.slots)
+    ]
+    generated = 0
+    for next_completed in asyncio.as_completed(tasks):
+        if await next_completed:
+            generated += 1
+    return generated
+
+
+async def main(args):
+    strategies = {"fixed batches of 3": run_fixed_batches, "AIMD limiter": run_aimd}
+    header = f"{'strategy':<20} {'wall time s':>12} {'429s':>6} {'failed slots':>13} {'peak concurrency':>17}"
+    print(header)
+    print("-" * len(header))
+    for name, run in strategies.items():
+        llm = FakeLLM(args.latency, args.rpm, args.time_scale, args.seed)
+        start = time.perf_counter()
+        generated = await run(llm, args)
+        wall_time = (time.perf_counter() - start) / args.time_scale
+        print(
+            f"{name:<20} {wall_time:>12.1f} {llm.rate_limited:>6} {args.slots - generated:>13} {llm.peak_in_flight:>17}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--slots", type=int, default=30, help="Question slots of the question paper"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=4, help="Seconds the fake LLM takes per call"
+    )
+    parser.add_argument(
+        "--rpm", type=float, default=120, help="Calls per minute the fake LLM accepts"
+    )
+    parser.add_argument(
+        "--initial-concurrency",
+        type=int,
+        default=4,
+        help="Initial limit of the AIMD limiter",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=16,
+        help="Maximum limit of the AIMD limiter",
+    )
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.05,
+        help="Factor applied to all simulated durations",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    # Retry warnings of the limiter would drown the results
+    logging.getLogger("app.utils.aimd_limiter").setLevel(logging.ERROR)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,7 @@
+import os
+
+# Services create their Azure OpenAI clients at import time, which requires these settings
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "test-key")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com/")
+os.environ.setdefault("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o")
+os.environ.setdefault("AZURE_OPENAI_EMBED_MODEL", "text-embedding-ada-002")
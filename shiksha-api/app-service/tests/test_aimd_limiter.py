@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+
+from app.utils.aimd_limiter import AIMDConcurrencyLimiter
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def create_limiter(**kwargs) -> AIMDConcurrencyLimiter:
+    kwargs.setdefault("backoff_seconds", 0)
+    return AIMDConcurrencyLimiter(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_limit_is_enforced():
+    limiter = create_limiter(initial_limit=2, max_limit=2)
+    in_flight = 0
+    peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "ok"
+
+    results = await asyncio.gather(*(limiter.run(call) for _ in range(10)))
+    assert results == ["ok"] * 10
+    assert peak == 2
+    assert limiter.get_stats()["peak_in_flight"] == 2
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_by_one_per_window_of_successes():
+    limiter = create_limiter(initial_limit=2, max_limit=16)
+
+    async def call():
+        return "ok"
+
+    # A window is as many successful calls as the current limit
+    for _ in range(2):
+        await limiter.run(call)
+    assert limiter.limit == 2  # 2 + 1/2 + 1/2.5 = 2.9
+    await limiter.run(call)
+    assert limiter.limit == 3
+
+    capped = create_limiter(initial_limit=2, max_limit=2)
+    for _ in range(10):
+        await capped.run(call)
+    assert capped.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_limit_is_halved_at_most_once_per_window():
+    limiter = create_limiter(initial_limit=8, max_limit=8, max_retries=0)
+    started = asyncio.Event()
+    num_started = 0
+
+    async def call():
+        nonlocal num_started
+        num_started += 1
+        if num_started == 4:
+            started.set()
+        await started.wait()
+        raise StatusError(429)
+
+    # 4 calls in flight in the same window all fail with an overload error
+    results = await asyncio.gather(
+        *(limiter.run(call) for _ in range(4)), return_exceptions=True
+    )
+    assert all(isinstance(result, StatusError) for result in results)
+    assert limiter.limit == 4
+    assert limiter.get_stats()["overloads"] == 4
+
+    # A call started after the decrease belongs to a new window
+    with pytest.raises(StatusError):
+        await limiter.run(call)
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error", [StatusError(429), StatusError(503), asyncio.TimeoutError()]
+)
+async def test_overload_errors_are_retried(error):
+    limiter = create_limiter(max_retries=3)
+    attempts = 0
+
+    async def flaky_call():
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise error
+        return "ok"
+
+    assert await limiter.run(flaky_call) == "ok"
+    assert attempts == 3
+    assert limiter.get_stats()["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries():
+    limiter = create_limiter(max_retries=2)
+    attempts = 0
+
+    async def overloaded_call():
+        nonlocal attempts
+        attempts += 1
+        raise StatusError(503)
+
+    with pytest.raises(StatusError):
+        await limiter.run(overloaded_call)
+    assert attempts == 3
+    assert limiter.get_stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_other_errors_are_raised_without_retry():
+    limiter = create_limiter(initial_limit=4)
+    attempts = 0
+
+    async def failing_call():
+        nonlocal attempts
+        attempts += 1
+        raise StatusError(400)
+
+    with pytest.raises(StatusError):
+        await limiter.run(failing_call)
+    assert attempts == 1
+    stats = limiter.get_stats()
+    assert (stats["retries"], stats["overloads"], stats["in_flight"]) == (0, 0, 0)
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_hands_its_granted_slot_on():
+    limiter = create_limiter(initial_limit=1, max_limit=1)
+    release_first = asyncio.Event()
+
+    async def blocking_call():
+        await release_first.wait()
+        return "first"
+
+    async def call():
+        return "third"
+
+    first = asyncio.create_task(limiter.run(blocking_call))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(limiter.run(call))
+    third = asyncio.create_task(limiter.run(call))
+    await asyncio.sleep(0)
+    assert limiter.get_stats()["waiting"] == 2
+
+    # The slot is granted to the second call, which is cancelled before it resumes
+    release_first.set()
+    await asyncio.sleep(0)
+    assert first.done() and limiter.get_stats()["in_flight"] == 1
+    second.cancel()
+
+    assert await first == "first"
+    assert await asyncio.wait_for(third, 1) == "third"
+    with pytest.raises(asyncio.CancelledError):
+        await second
+    assert limiter.get_stats()["in_flight"] == 0
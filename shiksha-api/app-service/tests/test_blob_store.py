@@ -0,0 +1,128 @@
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceModifiedError
+
+from app.utils.blob_store import BlobStore
+
+LAST_MODIFIED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeDownloader:
+    def __init__(self, data: bytes, etag: str):
+        self._data = data
+        # Downloads report quoted ETags
+        self.properties = SimpleNamespace(etag=f'"{etag}"', last_modified=LAST_MODIFIED)
+
+    async def chunks(self):
+        yield self._data
+
+
+class FakeContainerClient:
+    """Blobs by name, as (data, ETag) pairs. Listings report unquoted ETags."""
+
+    def __init__(self, blobs: dict):
+        self.blobs = blobs
+        self.downloads = []
+
+    async def list_blobs(self, name_starts_with: str):
+        for name, (_, etag) in self.blobs.items():
+            if name.startswith(name_starts_with):
+                yield SimpleNamespace(name=name, etag=etag, last_modified=LAST_MODIFIED)
+
+    def get_blob_client(self, blob_name: str):
+        container = self
+
+        class FakeBlobClient:
+            async def download_blob(self, etag=None, match_condition=None):
+                data, current_etag = container.blobs[blob_name]
+                if (
+                    match_condition == MatchConditions.IfNotModified
+                    and etag != f'"{current_etag}"'
+                ):
+                    raise ResourceModifiedError("The condition specified was not met")
+                container.downloads.append(blob_name)
+                return FakeDownloader(data, current_etag)
+
+        return FakeBlobClient()
+
+
+def create_blob_store(container: FakeContainerClient) -> BlobStore:
+    blob_store = BlobStore.__new__(BlobStore)
+    blob_store._async_svc = SimpleNamespace(get_container_client=lambda _: container)
+    return blob_store
+
+
+@pytest.mark.asyncio
+async def test_unchanged_blobs_are_not_downloaded_again(tmp_path):
+    container = FakeContainerClient(
+        {"index/a.json": (b"a", "0x1"), "index/b.json": (b"b", "0x2")}
+    )
+    blob_store = create_blob_store(container)
+
+    paths = await blob_store.download_blobs_to_folder("container/index/", tmp_path)
+    assert sorted(container.downloads) == ["index/a.json", "index/b.json"]
+    assert sorted(os.path.basename(path) for path in paths) == ["a.json", "b.json"]
+
+    container.downloads.clear()
+    await blob_store.download_blobs_to_folder("container/index/", tmp_path)
+    assert container.downloads == []
+
+
+@pytest.mark.asyncio
+async def test_changed_blobs_are_downloaded_again(tmp_path):
+    container = FakeContainerClient(
+        {"index/a.json": (b"a", "0x1"), "index/b.json": (b"b", "0x2")}
+    )
+    blob_store = create_blob_store(container)
+    await blob_store.download_blobs_to_folder("container/index/", tmp_path)
+
+    container.blobs["index/a.json"] = (b"a2", "0x3")
+    container.downloads.clear()
+    await blob_store.download_blobs_to_folder("container/index/", tmp_path)
+    assert container.downloads == ["index/a.json"]
+    assert (tmp_path / "a.json").read_bytes() == b"a2"
+
+    # A missing file is downloaded again
+    os.remove(tmp_path / "b.json")
+    container.downloads.clear()
+    await blob_store.download_blobs_to_folder("container/index/", tmp_path)
+    assert container.downloads == ["index/b.json"]
+
+
+@pytest.mark.asyncio
+async def test_blob_changed_after_listing_records_downloaded_version(tmp_path):
+    container = FakeContainerClient({"index/a.json": (b"a", "0x1")})
+    blob_store = create_blob_store(container)
+    list_blobs = container.list_blobs
+
+    async def list_then_change(name_starts_with: str):
+        async for blob in list_blobs(name_starts_with):
+            yield blob
+        container.blobs["index/a.json"] = (b"a2", "0x2")
+
+    container.list_blobs = list_then_change
+    await blob_store.download_blobs_to_folder("container/index/", tmp_path)
+    assert (tmp_path / "a.json").read_bytes() == b"a2"
+
+    container.list_blobs = list_blobs
+    container.downloads.clear()
+    await blob_store.download_blobs_to_folder("container/index/", tmp_path)
+    assert container.downloads == []
+
+
+@pytest.mark.asyncio
+async def test_files_of_deleted_blobs_are_removed(tmp_path):
+    container = FakeContainerClient(
+        {"index/a.json": (b"a", "0x1"), "index/b.json": (b"b", "0x2")}
+    )
+    blob_store = create_blob_store(container)
+    await blob_store.download_blobs_to_folder("container/index/", tmp_path)
+
+    del container.blobs["index/b.json"]
+    paths = await blob_store.download_blobs_to_folder("container/index/", tmp_path)
+    assert [os.path.basename(path) for path in paths] == ["a.json"]
+    assert not (tmp_path / "b.json").exists()
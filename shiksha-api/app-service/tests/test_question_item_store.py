@@ -0,0 +1,241 @@
+import pytest
+
+from app.models.question_paper import (
+    Chapter,
+    MatchingListQuestion,
+    QuestionBankPartsGenerationRequest,
+    QuestionDistribution,
+    QuestionType,
+    QuestionTypeResponse,
+    Template,
+)
+from app.services import question_item_store
+from app.services.question_item_store import QuestionItemKey, QuestionItemStore
+from app.services.question_paper_service import QuestionPaperService
+
+LEARNING_OUTCOMES = ["Explains photosynthesis"]
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(question_item_store.time, "time", clock.time)
+    return clock
+
+
+def create_key(question_type=QuestionType.FILL_BLANKS, index_path="index-a"):
+    return QuestionItemKey.create(
+        index_path=index_path,
+        question_type=question_type.value,
+        objective="Understanding",
+        marks_per_question=1,
+        learning_outcomes=LEARNING_OUTCOMES,
+    )
+
+
+def question(text: str) -> dict:
+    return {"question": text}
+
+
+async def get_all_texts(store: QuestionItemStore, key: QuestionItemKey, **kwargs):
+    items = await store.get_items(key, 1000, **kwargs)
+    return sorted(item.get("question") or item["value1"] for item in items)
+
+
+@pytest.mark.asyncio
+async def test_only_the_newest_items_of_a_key_are_kept(clock):
+    store = QuestionItemStore(max_items_per_key=3)
+    key = create_key()
+    other_key = create_key(index_path="index-b")
+    for i in range(5):
+        clock.now += 1
+        await store.add_items(
+            [(key, question(f"q{i}")), (other_key, question(f"o{i}"))]
+        )
+
+    assert await get_all_texts(store, key) == ["q2", "q3", "q4"]
+    assert await get_all_texts(store, other_key) == ["o2", "o3", "o4"]
+
+    # Storing a question again refreshes it, so it is kept
+    clock.now += 1
+    await store.add_items([(key, question("q2"))])
+    clock.now += 1
+    await store.add_items([(key, question("q5"))])
+    assert await get_all_texts(store, key) == ["q2", "q4", "q5"]
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_items_older_than_the_max_age_are_not_returned(clock):
+    store = QuestionItemStore(max_age_seconds=100)
+    key = create_key()
+    await store.add_items([(key, question("old"))])
+    clock.now += 60
+    await store.add_items([(key, question("new"))])
+    clock.now += 50
+
+    assert await get_all_texts(store, key) == ["new"]
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_existing_questions_are_excluded(clock):
+    store = QuestionItemStore()
+    key = create_key()
+    match_key = create_key(QuestionType.MATCH_LIST)
+    await store.add_items(
+        [
+            (key, question("What is chlorophyll?")),
+            (key, question("What is a stoma?")),
+            (match_key, {"value1": "Leaf", "value2": "Photosynthesis"}),
+            (match_key, {"value1": "Root", "value2": "Absorption"}),
+        ]
+    )
+
+    # Compared case-insensitively, matching questions by their "value1 :: value2" text
+    exclude_texts = {" what is CHLOROPHYLL? ", "leaf :: photosynthesis"}
+    assert await get_all_texts(store, key, exclude_texts=exclude_texts) == [
+        "What is a stoma?"
+    ]
+    assert await get_all_texts(store, match_key, exclude_texts=exclude_texts) == [
+        "Root"
+    ]
+    await store.close()
+
+
+def create_request(
+    reuse_ratio: float,
+    num_questions: int,
+    question_type=QuestionType.FILL_BLANKS,
+    **kwargs,
+):
+    return QuestionBankPartsGenerationRequest(
+        user_id="teacher",
+        board="CBSE",
+        medium="english",
+        grade=7,
+        subject="Science",
+        chapters=[
+            Chapter(
+                title="Nutrition in Plants",
+                index_path="index-a",
+                learning_outcomes=LEARNING_OUTCOMES,
+            ),
+            Chapter(
+                title="Nutrition in Animals",
+                index_path="index-b",
+                learning_outcomes=["Describes digestion"],
+            ),
+        ],
+        total_marks=num_questions,
+        template=[
+            Template(
+                type=question_type,
+                number_of_questions=num_questions,
+                marks_per_question=1,
+                question_distribution=[
+                    QuestionDistribution(
+                        unit_name="Nutrition in Plants", objective="Understanding"
+                    )
+                    for _ in range(num_questions)
+                ],
+            )
+        ],
+        reuse_ratio=reuse_ratio,
+        **kwargs,
+    )
+
+
+def create_service(store: QuestionItemStore) -> QuestionPaperService:
+    service = QuestionPaperService.__new__(QuestionPaperService)
+    service._question_item_store = store
+    return service
+
+
+@pytest.mark.asyncio
+async def test_reuse_ratio_spreads_stored_questions_over_the_template(clock):
+    store = QuestionItemStore()
+    await store.add_items([(create_key(), question(f"q{i}")) for i in range(10)])
+    service = create_service(store)
+
+    stored, positions = await service._get_stored_questions(create_request(0.5, 4), [])
+    assert positions == {(0, 1), (0, 3)}
+    assert len({item["item"]["question"] for item in stored}) == 2
+    assert all(item["reused"] for item in stored)
+
+    _, positions = await service._get_stored_questions(create_request(0.0, 4), [])
+    assert positions == set()
+    _, positions = await service._get_stored_questions(create_request(1.0, 4), [])
+    assert positions == {(0, 0), (0, 1), (0, 2), (0, 3)}
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_existing_questions_are_not_reused(clock):
+    store = QuestionItemStore()
+    match_key = create_key(QuestionType.MATCH_LIST)
+    await store.add_items(
+        [
+            (match_key, {"value1": "Leaf", "value2": "Photosynthesis"}),
+            (match_key, {"value1": "Root", "value2": "Absorption"}),
+        ]
+    )
+    service = create_service(store)
+    request = create_request(
+        1.0,
+        2,
+        QuestionType.MATCH_LIST,
+        existing_questions=[
+            QuestionTypeResponse(
+                type=QuestionType.MATCH_LIST,
+                number_of_questions=1,
+                marks_per_question=1,
+                questions=[
+                    MatchingListQuestion(value1="Leaf", value2="Photosynthesis")
+                ],
+            )
+        ],
+    )
+
+    stored, positions = await service._get_stored_questions(
+        request, service._flatten_existing_questions(request.existing_questions)
+    )
+    assert [item["item"] for item in stored] == [
+        {"value1": "Root", "value2": "Absorption"}
+    ]
+    assert len(positions) == 1
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_reused_questions_are_not_stored_again(clock):
+    store = QuestionItemStore()
+    await store.add_items([(create_key(), question("reused"))])
+    service = create_service(store)
+    request = create_request(0.5, 2)
+
+    stored, positions = await service._get_stored_questions(request, [])
+    assert positions == {(0, 1)}
+    generated = {
+        "unit_name": "Nutrition in Plants",
+        "type": QuestionType.FILL_BLANKS.value,
+        "objective": "Understanding",
+        "marks_per_question": 1,
+        "item": question("generated"),
+    }
+
+    new_question_items = []
+    response = service._organize_questions_into_response(
+        request, [generated] + stored, new_question_items
+    )
+    assert [q.question for q in response[0].questions] == ["generated", "reused"]
+    assert new_question_items == [(create_key(), {"question": "generated"})]
+    await store.close()
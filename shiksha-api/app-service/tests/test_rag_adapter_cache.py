@@ -0,0 +1,171 @@
+import asyncio
+
+import pytest
+
+from app.services import rag_adapter_cache
+from app.services.rag_adapter_cache import RagAdapterCache
+
+
+class FakeAdapter:
+    """Records its lifecycle in `events`. Preparation and cleanup block until their event is set."""
+
+    def __init__(self, index_path: str, size_in_bytes: int, events: list):
+        self.index_path = index_path
+        self.size_in_bytes = size_in_bytes
+        self.events = events
+        self.fail = False
+        self.prepare_released = asyncio.Event()
+        self.prepare_released.set()
+        self.cleanup_released = asyncio.Event()
+        self.cleanup_released.set()
+
+    async def initialize(self):
+        self.events.append(("initialize", self.index_path))
+
+    async def initiate_index(self):
+        await self.prepare_released.wait()
+        if self.fail:
+            raise RuntimeError("download failed")
+        self.events.append(("initiate_index", self.index_path))
+
+    def get_size_in_bytes(self) -> int:
+        return self.size_in_bytes
+
+    async def cleanup(self):
+        self.events.append(("cleanup_start", self.index_path))
+        await self.cleanup_released.wait()
+        self.events.append(("cleanup", self.index_path))
+
+
+class FakeAdapterFactory:
+    def __init__(self):
+        self.adapters = []
+        self.events = []
+        self.size_in_bytes = 100
+        self.fail = False
+        self.block_prepare = False
+
+    def create_adapter(self, index_path, completion_llm, embedding_llm):
+        adapter = FakeAdapter(index_path, self.size_in_bytes, self.events)
+        adapter.fail = self.fail
+        if self.block_prepare:
+            adapter.prepare_released.clear()
+        self.adapters.append(adapter)
+        return adapter
+
+
+@pytest.fixture
+def factory(monkeypatch):
+    factory = FakeAdapterFactory()
+    monkeypatch.setattr(
+        rag_adapter_cache.RagAdapterFactory, "create_adapter", factory.create_adapter
+    )
+    return factory
+
+
+async def use_adapter(cache: RagAdapterCache, index_path: str):
+    async with cache.acquire_adapter(index_path, None, None) as adapter:
+        return adapter
+
+
+@pytest.mark.asyncio
+async def test_concurrent_acquires_share_one_preparation(factory):
+    factory.block_prepare = True
+    cache = RagAdapterCache()
+    tasks = [asyncio.create_task(use_adapter(cache, "index-a")) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert len(factory.adapters) == 1
+
+    factory.adapters[0].prepare_released.set()
+    results = await asyncio.gather(*tasks)
+    assert all(adapter is factory.adapters[0] for adapter in results)
+    assert factory.events.count(("initiate_index", "index-a")) == 1
+    info = cache.get_cache_info()
+    assert (info["hits"], info["misses"], info["in_use_keys"]) == (4, 1, [])
+
+
+@pytest.mark.asyncio
+async def test_adapter_in_use_is_not_evicted(factory):
+    cache = RagAdapterCache(max_cache_size=1)
+    async with cache.acquire_adapter("index-a", None, None) as adapter_a:
+        await use_adapter(cache, "index-b")
+        await asyncio.sleep(0)
+        # index-a is least recently used, but in use, so index-b is evicted instead
+        assert cache.get_cache_info()["cached_keys"] == ["index-a"]
+        assert ("cleanup_start", "index-a") not in factory.events
+        assert ("cleanup", "index-b") in factory.events
+        assert adapter_a is factory.adapters[0]
+
+    # Released and over budget no more, it stays cached
+    assert cache.get_cache_info()["cached_keys"] == ["index-a"]
+    assert ("cleanup_start", "index-a") not in factory.events
+
+
+@pytest.mark.asyncio
+async def test_in_use_adapters_may_exceed_the_budget(factory):
+    cache = RagAdapterCache(max_cache_size=1)
+    async with cache.acquire_adapter("index-a", None, None):
+        async with cache.acquire_adapter("index-b", None, None):
+            assert cache.get_cache_info()["cache_size"] == 2
+        await asyncio.sleep(0)
+        assert cache.get_cache_info()["cached_keys"] == ["index-a"]
+    assert ("cleanup_start", "index-a") not in factory.events
+
+
+@pytest.mark.asyncio
+async def test_failed_preparation_is_dropped_and_retried(factory):
+    factory.fail = True
+    cache = RagAdapterCache()
+    with pytest.raises(RuntimeError):
+        await use_adapter(cache, "index-a")
+    assert cache.get_cache_info()["cached_keys"] == []
+    assert ("cleanup", "index-a") in factory.events
+
+    factory.fail = False
+    adapter = await use_adapter(cache, "index-a")
+    assert adapter is factory.adapters[1]
+    assert cache.get_cache_info()["cached_keys"] == ["index-a"]
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_adapters_are_evicted_over_the_byte_budget(factory):
+    cache = RagAdapterCache(max_cache_size_in_bytes=250)
+    await use_adapter(cache, "index-a")
+    await use_adapter(cache, "index-b")
+    # index-a becomes the most recently used
+    await use_adapter(cache, "index-a")
+    await use_adapter(cache, "index-c")
+    await asyncio.sleep(0)
+
+    info = cache.get_cache_info()
+    assert info["cached_keys"] == ["index-a", "index-c"]
+    assert info["cache_size_in_bytes"] == 200
+    assert info["evictions"] == 1
+    assert ("cleanup", "index-b") in factory.events
+
+
+@pytest.mark.asyncio
+async def test_rebuild_waits_for_the_pending_cleanup(factory):
+    cache = RagAdapterCache(max_cache_size=1)
+    await use_adapter(cache, "index-a")
+    factory.adapters[0].cleanup_released.clear()
+    # Evicts index-a, whose cleanup blocks
+    await use_adapter(cache, "index-b")
+    await asyncio.sleep(0)
+    assert ("cleanup_start", "index-a") in factory.events
+
+    rebuild = asyncio.create_task(use_adapter(cache, "index-a"))
+    await asyncio.sleep(0.01)
+    assert not rebuild.done()
+    assert factory.events.count(("initialize", "index-a")) == 1
+
+    factory.adapters[0].cleanup_released.set()
+    adapter = await rebuild
+    assert adapter is factory.adapters[2]
+    # The new index is only initialized once the old files are removed
+    initialized_at = [
+        i
+        for i, event in enumerate(factory.events)
+        if event == ("initialize", "index-a")
+    ]
+    assert factory.events.index(("cleanup", "index-a")) < initialized_at[1]
@@ -0,0 +1,306 @@
+import asyncio
+
+import pytest
+
+from app.models.question_paper import (
+    Chapter,
+    MarksDistribution,
+    ObjectiveDistribution,
+    QBQuestionDistributionGenerationRequest,
+    QuestionDistribution,
+    QuestionType,
+    Template,
+)
+from app.services import response_cache
+from app.services.response_cache import (
+    CACHE_BYPASS,
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_STATUS_HEADER,
+    BaseResponseCacheBackend,
+    DiskResponseCacheBackend,
+    InMemoryResponseCacheBackend,
+    ResponseCache,
+    get_request_cache_key,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture(params=["memory", "disk"])
+def create_backend(request, tmp_path):
+    backends = []
+
+    def create(max_entries: int = 1024) -> BaseResponseCacheBackend:
+        if request.param == "memory":
+            backend = InMemoryResponseCacheBackend(max_entries=max_entries)
+        else:
+            backend = DiskResponseCacheBackend(
+                str(tmp_path / f"cache-{len(backends)}.db"), max_entries=max_entries
+            )
+        backends.append(backend)
+        return backend
+
+    yield create
+    for backend in backends:
+        asyncio.run(backend.close())
+
+
+class FailingBackend(BaseResponseCacheBackend):
+    async def get(self, key):
+        raise ConnectionError("backend is down")
+
+    async def set(self, key, value, ttl_seconds):
+        raise ConnectionError("backend is down")
+
+    async def clear(self):
+        pass
+
+
+class CountingCompute:
+    """Returns the next value of a counter, blocking until `released` is set."""
+
+    def __init__(self):
+        self.calls = 0
+        self.released = asyncio.Event()
+        self.released.set()
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        value = self.calls
+        await self.released.wait()
+        return value
+
+
+async def get_or_compute(cache: ResponseCache, key: str, compute, **kwargs):
+    return await cache.get_or_compute(
+        key, compute, serialize=lambda v: v, deserialize=lambda v: v, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_values_expire_after_their_ttl(clock, create_backend):
+    backend = create_backend()
+    await backend.set("key", "value", ttl_seconds=10)
+    clock.now += 9
+    assert await backend.get("key") == "value"
+    clock.now += 1
+    assert await backend.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_values_are_evicted(clock, create_backend):
+    backend = create_backend(max_entries=2)
+    await backend.set("a", "1", ttl_seconds=60)
+    clock.now += 1
+    await backend.set("b", "2", ttl_seconds=60)
+    clock.now += 1
+    # "a" becomes the most recently used
+    assert await backend.get("a") == "1"
+    clock.now += 1
+    await backend.set("c", "3", ttl_seconds=60)
+
+    assert await backend.get("a") == "1"
+    assert await backend.get("b") is None
+    assert await backend.get("c") == "3"
+
+
+@pytest.mark.asyncio
+async def test_cached_responses_are_hits_until_they_expire(clock):
+    cache = ResponseCache(InMemoryResponseCacheBackend(), ttl_seconds=10)
+    compute = CountingCompute()
+
+    assert await get_or_compute(cache, "key", compute) == (1, CACHE_MISS)
+    assert await get_or_compute(cache, "key", compute) == (1, CACHE_HIT)
+    clock.now += 10
+    assert await get_or_compute(cache, "key", compute) == (2, CACHE_MISS)
+    info = cache.get_cache_info()
+    assert (info["hits"], info["misses"], info["errors"]) == (1, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_the_response_once():
+    cache = ResponseCache(InMemoryResponseCacheBackend())
+    compute = CountingCompute()
+    compute.released.clear()
+
+    tasks = [
+        asyncio.create_task(get_or_compute(cache, "key", compute)) for _ in range(5)
+    ]
+    await asyncio.sleep(0.01)
+    assert compute.calls == 1
+
+    compute.released.set()
+    assert await asyncio.gather(*tasks) == [(1, CACHE_MISS)] * 5
+    assert await get_or_compute(cache, "key", compute) == (1, CACHE_HIT)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_miss_does_not_cancel_the_shared_computation():
+    cache = ResponseCache(InMemoryResponseCacheBackend())
+    compute = CountingCompute()
+    compute.released.clear()
+
+    first = asyncio.create_task(get_or_compute(cache, "key", compute))
+    second = asyncio.create_task(get_or_compute(cache, "key", compute))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    compute.released.set()
+    assert await second == (1, CACHE_MISS)
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert await get_or_compute(cache, "key", compute) == (1, CACHE_HIT)
+
+
+@pytest.mark.asyncio
+async def test_responses_rejected_by_should_cache_are_not_stored():
+    cache = ResponseCache(InMemoryResponseCacheBackend())
+    compute = CountingCompute()
+
+    def is_even(value: int) -> bool:
+        return value % 2 == 0
+
+    assert await get_or_compute(cache, "key", compute, should_cache=is_even) == (
+        1,
+        CACHE_MISS,
+    )
+    assert await get_or_compute(cache, "key", compute, should_cache=is_even) == (
+        2,
+        CACHE_MISS,
+    )
+    assert await get_or_compute(cache, "key", compute, should_cache=is_even) == (
+        2,
+        CACHE_HIT,
+    )
+
+
+@pytest.mark.asyncio
+async def test_backend_failures_bypass_the_cache():
+    cache = ResponseCache(FailingBackend())
+    compute = CountingCompute()
+
+    assert await get_or_compute(cache, "key", compute) == (1, CACHE_BYPASS)
+    assert await get_or_compute(cache, "key", compute) == (2, CACHE_BYPASS)
+    assert cache.get_cache_info()["errors"] == 2
+
+
+def create_distribution_request(
+    user_id: str = "teacher",
+) -> QBQuestionDistributionGenerationRequest:
+    return QBQuestionDistributionGenerationRequest(
+        user_id=user_id,
+        board="CBSE",
+        medium="english",
+        grade=7,
+        subject="Science",
+        chapters=[
+            Chapter(
+                title="Nutrition in Plants",
+                index_path="index-a",
+                learning_outcomes=["Explains photosynthesis"],
+            )
+        ],
+        total_marks=2,
+        marks_distribution=[
+            MarksDistribution(
+                unit_name="Nutrition in Plants", percentage_distribution=100, marks=2
+            )
+        ],
+        objective_distribution=[
+            ObjectiveDistribution(
+                objective="Understanding", percentage_distribution=100
+            )
+        ],
+        template=[
+            Template(
+                type=QuestionType.FILL_BLANKS,
+                number_of_questions=2,
+                marks_per_question=1,
+            )
+        ],
+    )
+
+
+def test_user_id_is_excluded_from_the_request_cache_key():
+    request = create_distribution_request("teacher-a")
+    key = get_request_cache_key("distribution", request, exclude={"user_id"})
+
+    assert key.startswith("distribution:")
+    assert key == get_request_cache_key(
+        "distribution", create_distribution_request("teacher-b"), exclude={"user_id"}
+    )
+    assert key != get_request_cache_key("distribution", request)
+    assert key != get_request_cache_key("template", request, exclude={"user_id"})
+
+    other_request = create_distribution_request("teacher-a")
+    other_request.grade = 8
+    assert key != get_request_cache_key(
+        "distribution", other_request, exclude={"user_id"}
+    )
+
+
+def test_question_distribution_route_reports_the_cache_status(monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.routers import question_paper
+
+    calls = 0
+
+    async def get_question_distribution(request):
+        nonlocal calls
+        calls += 1
+        return [
+            Template(
+                type=QuestionType.FILL_BLANKS,
+                number_of_questions=2,
+                marks_per_question=1,
+                question_distribution=[
+                    QuestionDistribution(
+                        unit_name="Nutrition in Plants", objective="Understanding"
+                    )
+                    for _ in range(2)
+                ],
+            )
+        ]
+
+    monkeypatch.setattr(
+        question_paper,
+        "RESPONSE_CACHE",
+        ResponseCache(InMemoryResponseCacheBackend()),
+    )
+    monkeypatch.setattr(
+        question_paper.QUESTION_PAPER_SERVICE_INSTANCE,
+        "get_question_distribution",
+        get_question_distribution,
+    )
+    app = FastAPI()
+    app.include_router(question_paper.router)
+    client = TestClient(app)
+
+    statuses = []
+    for user_id in ["teacher-a", "teacher-b"]:
+        response = client.post(
+            "/question-paper/questiondistribution",
+            json=create_distribution_request(user_id).model_dump(mode="json"),
+        )
+        assert response.status_code == 200
+        statuses.append(response.headers[CACHE_STATUS_HEADER])
+
+    assert statuses == [CACHE_MISS, CACHE_HIT]
+    assert calls == 1
@@ -9,7 +9,7 @@ import tempfile
 from core.logger import LoggerFactory
 import shutil
 
-from rag_wrapper import InMemRagOps, InMemGraphRagOps
+from rag_wrapper import InMemRagOps, InMemGraphRagOps, SQLiteEmbeddingCacheStore
 from core.blob_store import BlobStore
 from core.config import Config
 from core.models.workflow_models import RAGInput
@@ -63,8 +63,12 @@ class BaseAzureBlobRAGAgent(abc.ABC):
         # Initialize blob store for downloading index files
         self._blob_store = BlobStore()
 
-        # Set up local index path in temp directory
-        self._local_index_path = os.path.join(tempfile.gettempdir(), index_path)
+        # Set up local index path in the index cache or temp directory
+        self._local_index_path = os.path.join(
+            Config.INDEX_CACHE_DIR or tempfile.gettempdir(), index_path
+        )
+        # Whether the local index files were checked against blob storage
+        self._index_synced = False
 
         # Initialize RAG operations using the class provided by the subclass
         rag_ops_class = self.get_rag_ops_class()
@@ -72,6 +76,11 @@ class BaseAzureBlobRAGAgent(abc.ABC):
             persist_dir=self._local_index_path,
             completion_llm=self._llm,
             emb_llm=self._embed_llm,
+            embedding_cache_store=(
+                SQLiteEmbeddingCacheStore(Config.EMBEDDING_CACHE_PATH)
+                if Config.EMBEDDING_CACHE_PATH
+                else None
+            ),
         )
 
     @abc.abstractmethod
@@ -92,8 +101,13 @@ class BaseAzureBlobRAGAgent(abc.ABC):
         Clears resources associated with the current index path by deleting the downloaded folder.
 
         This method ensures proper cleanup of temporary files and prevents disk space issues
-        from accumulated downloaded indexes.
+        from accumulated downloaded indexes. The folder is kept when Config.INDEX_CACHE_DIR is
+        set, so that the next lesson plan of the chapter doesn't download the index again.
         """
+        if Config.INDEX_CACHE_DIR:
+            self.logger.info(f"Keeping cached index files at {self._local_index_path}")
+            return
+
         if os.path.exists(self._local_index_path):
             try:
                 shutil.rmtree(self._local_index_path)
@@ -109,7 +123,7 @@ class BaseAzureBlobRAGAgent(abc.ABC):
         """
         Generates content using Retrieval-Augmented Generation (RAG).
 
-        Downloads the required RAG index if not present locally, performs retrieval and synthesis
+        Downloads the required RAG index if not present locally or changed in blob storage, performs retrieval and synthesis
         using the provided queries, and returns the generated content as a string or JSON object.
 
         Args:
@@ -123,15 +137,12 @@ class BaseAzureBlobRAGAgent(abc.ABC):
             Exception: For other unexpected errors during generation.
         """
         try:
-            # Check if the RAG index exists locally
-            index_exists = await self._rag_ops.index_exists()
-
-            if not index_exists:
-                self.logger.info(
-                    f"Downloading new RAG index at {self._local_index_path}..."
-                )
+            # Sync the local RAG index with blob storage once per agent, files whose
+            # blobs didn't change since they were downloaded are kept
+            if not self._index_synced:
+                self.logger.info(f"Syncing RAG index at {self._local_index_path}...")
 
-                # Download index files from blob storage
+                # Download new or changed index files from blob storage
                 downloaded_file_paths = await self._blob_store.download_blobs_to_folder(
                     prefix=rag_input.index_path, target_folder=self._local_index_path
                 )
@@ -142,7 +153,8 @@ class BaseAzureBlobRAGAgent(abc.ABC):
                     )
 
                 file_paths_str = "\n".join(downloaded_file_paths)
-                self.logger.info(f"Downloaded RAG index files: {file_paths_str}")
+                self.logger.info(f"RAG index files up to date: {file_paths_str}")
+                self._index_synced = True
 
             # Initialize the index if needed (for property graph operations)
             if hasattr(self._rag_ops, "initiate_index"):
@@ -8,6 +8,7 @@ from core.blob_store import BlobStore
 from core.config import Config
 from core.models.workflow_models import RAGInput
 from core.logger import LoggerFactory
+from rag_wrapper.embedding_cache import SQLiteEmbeddingCacheStore
 from rag_wrapper.rag_ops.qdrant_rag_ops import QdrantRagOps
 
 
@@ -35,6 +36,12 @@ class QdrantRAGAgent:
             api_key=Config.QDRANT_API_KEY,
             emb_llm=self._embed_llm,
             completion_llm=self._llm,
+            response_mode=Config.RAG_RESPONSE_MODE,
+            embedding_cache_store=(
+                SQLiteEmbeddingCacheStore(Config.EMBEDDING_CACHE_PATH)
+                if Config.EMBEDDING_CACHE_PATH
+                else None
+            ),
         )
         self.logger = LoggerFactory.get_agent_logger("QdrantRAGAgent")
 
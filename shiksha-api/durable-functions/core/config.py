@@ -20,3 +20,11 @@ class Config:
     WEBHOOK_URL = os.environ.get("WEBHOOK_URL", None)
     QDRANT_URL = os.environ.get("QDRANT_URL", "http://localhost:6333")
     QDRANT_API_KEY = os.environ.get("QDRANT_API_KEY", None)
+    # Optional path of a SQLite file that caches embeddings across RAG agents
+    EMBEDDING_CACHE_PATH = os.environ.get("EMBEDDING_CACHE_PATH", None)
+    # Response mode of the Qdrant RAG agent, "packed" answers with one LLM call per query
+    RAG_RESPONSE_MODE = os.environ.get("RAG_RESPONSE_MODE", "tree_summarize")
+    # Optional directory that keeps the downloaded RAG index files across lesson plans and
+    # restarts, they are only re-downloaded when their blobs change. Without it, indexes are
+    # downloaded to the temp directory and deleted after every lesson plan.
+    INDEX_CACHE_DIR = os.environ.get("INDEX_CACHE_DIR", None)
@@ -4,10 +4,17 @@ RAG Wrapper - A simple RAG wrapper for easy-to-use APIs to create, update or que
 This package provides implementations for different vector stores and RAG operations:
 - InMemRagOps: In-memory vector store implementation
 - AzureAISearchRagOps: Azure AI Search vector store implementation
+- CachedEmbedding: Content-addressed embedding cache with an optional SQLite backend
+- NumpyVectorStore: Memory-mapped NumPy vector store for InMemRagOps
+- TokenBudgetSynthesizer: Single-call response synthesis over deduplicated, token-budgeted context
 """
 
 from .base.base_vector_index_rag_ops import BaseVectorIndexRagOps
 from .base.base_graph_index_rag_ops import BaseGraphIndexRagOps
+from .base.base_embedding_cache_store import BaseEmbeddingCacheStore
+from .embedding_cache import CachedEmbedding, SQLiteEmbeddingCacheStore
+from .vector_stores import NumpyVectorStore
+from .response_synthesizers import PACKED_RESPONSE_MODE, TokenBudgetSynthesizer
 from .rag_ops.in_mem_rag_ops import InMemRagOps
 from .rag_ops.azure_ai_search_rag_ops import AzureAISearchRagOps
 from .rag_ops.in_mem_graph_rag_ops import InMemGraphRagOps
@@ -20,5 +27,11 @@ __all__ = [
     "InMemRagOps",
     "AzureAISearchRagOps",
     "InMemGraphRagOps",
-    "QdrantRagOps"
+    "QdrantRagOps",
+    "BaseEmbeddingCacheStore",
+    "CachedEmbedding",
+    "SQLiteEmbeddingCacheStore",
+    "NumpyVectorStore",
+    "PACKED_RESPONSE_MODE",
+    "TokenBudgetSynthesizer",
 ]
@@ -1,13 +1,12 @@
 import logging
-import uuid
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict, Optional, Union
+from typing import Any, AsyncGenerator, List, Dict, Optional, Union
 
 from tenacity import (
-    retry,
+    AsyncRetrying,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
+    retry_if_exception,
     retry_if_result,
 )
 from llama_index.core.chat_engine.types import ChatMode
@@ -15,6 +14,7 @@ from llama_index.core import (
     StorageContext,
     Document,
     PropertyGraphIndex,
+    QueryBundle,
     get_response_synthesizer,
     Settings,
 )
@@ -23,6 +23,11 @@ from llama_index.core.schema import TransformComponent
 from llama_index.core.vector_stores import MetadataFilters, ExactMatchFilter
 
 from llama_index.core.callbacks import CallbackManager, TokenCountingHandler
+
+from .base_embedding_cache_store import BaseEmbeddingCacheStore
+from ..embedding_cache.cached_embedding import CachedEmbedding
+from ..utils.doc_ids import get_text_chunk_doc_id
+from ..utils.retry import is_invalid_response, is_retryable_error
 import traceback
 from llama_index.core.response_synthesizers import (
     ResponseMode,
@@ -68,6 +73,7 @@ class BaseGraphIndexRagOps(ABC):
         path_depth: int = 1,
         include_text: bool = True,
         embed_kg_nodes: bool = True,
+        embedding_cache_store: Optional[BaseEmbeddingCacheStore] = None,
     ):
         """Initialize with embedding and completion language models and configuration parameters.
 
@@ -80,7 +86,10 @@ class BaseGraphIndexRagOps(ABC):
             path_depth: Depth of relations to follow after node retrieval (default: 1)
             include_text: Whether to include source chunk text with retrieved paths (default: True)
             embed_kg_nodes: Whether to embed knowledge graph nodes (default: True)
+            embedding_cache_store: Optional persistent embedding cache, wraps emb_llm in a CachedEmbedding when set
         """
+        if emb_llm is not None and embedding_cache_store is not None:
+            emb_llm = CachedEmbedding(emb_llm, cache_store=embedding_cache_store)
         self.emb_llm = emb_llm
         self.completion_llm = completion_llm
         self.similarity_top_k = similarity_top_k
@@ -91,6 +100,8 @@ class BaseGraphIndexRagOps(ABC):
         self.logger = logging.getLogger(__name__)
         self.token_counter = TokenCountingHandler()
         self._callback_manager = CallbackManager([self.token_counter])
+        # Retries per query stage ("retrieve", "synthesize"), see get_retry_stats()
+        self.stage_retry_counts: Dict[str, int] = {}
 
         self._add_token_counter_to_llm(
             self.completion_llm
@@ -163,25 +174,34 @@ class BaseGraphIndexRagOps(ABC):
     def _create_documents_from_text_chunks(
         self, text_chunks: List[str], metadata: dict = None
     ) -> tuple[List[Document], List[str]]:
-        """Create Document objects from text chunks with optional metadata."""
+        """Create Document objects from text chunks with optional metadata.
+
+        Document ids are derived from the chunk text and metadata, so repeated chunks
+        are only indexed once. Returns one document per distinct chunk, and the document
+        id of every non-empty chunk in order, repeated chunks sharing the same id.
+        """
         if not text_chunks:
             raise ValueError("text_chunks cannot be empty")
 
         documents = []
         doc_ids = []
+        seen_doc_ids = set()
 
         for text in text_chunks:
             if not text.strip():  # Skip empty or whitespace-only chunks
                 continue
 
-            doc_id = f"doc_id_{uuid.uuid4()}"
+            doc_id = get_text_chunk_doc_id(text, metadata)
+            doc_ids.append(doc_id)
+            if doc_id in seen_doc_ids:  # Index repeated chunks once
+                continue
+            seen_doc_ids.add(doc_id)
             doc_chunk = Document(text=text, id_=doc_id)
 
             if metadata:
                 doc_chunk.metadata = metadata.copy()
 
             documents.append(doc_chunk)
-            doc_ids.append(doc_id)
 
         if not documents:
             raise ValueError("No valid text chunks provided after filtering")
@@ -195,20 +215,78 @@ class BaseGraphIndexRagOps(ABC):
             f"Next attempt in {retry_state.next_action.sleep} seconds."
         )
 
-    def _retry_on_empty_string_or_timeout_response(self, result) -> bool:
-        """Check if response indicates failure requiring retry."""
-        if hasattr(result, "response"):
-            response_text = str(result.response)
-        else:
-            response_text = str(result)
-
-        # Check for empty responses or known error patterns
-        return (
-            response_text == ""
-            or response_text == "504.0 GatewayTimeout"
-            or "timeout" in response_text.lower()
-            or len(response_text.strip()) == 0
+    async def _run_stage_with_retries(
+        self, stage: str, stage_fn, retry_on_result=None
+    ) -> Any:
+        """Run one stage of a query, retrying it on transient errors and, optionally, on invalid results.
+
+        Args:
+            stage: Name of the stage, counted in stage_retry_counts
+            stage_fn: Async function running the stage
+            retry_on_result: Optional predicate on the result that triggers a retry
+        """
+        retry_condition = retry_if_exception(is_retryable_error)
+        if retry_on_result is not None:
+            retry_condition = retry_condition | retry_if_result(retry_on_result)
+
+        def before_sleep(retry_state):
+            self.stage_retry_counts[stage] = self.stage_retry_counts.get(stage, 0) + 1
+            self._log_retry_attempt(retry_state)
+
+        return await AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=wait_exponential(multiplier=1, min=1, max=10),
+            retry=retry_condition,
+            before_sleep=before_sleep,
+        )(stage_fn)
+
+    def _get_sub_retrievers(
+        self,
+        sub_retrievers: Optional[List[Any]] = None,
+        metadata_filter: Optional[Dict[str, str]] = None,
+    ) -> List[Any]:
+        """Get the given sub-retrievers, or create default ones with the correct LLM."""
+        if sub_retrievers:
+            return sub_retrievers
+        return self._create_default_sub_retrievers(metadata_filter)
+
+    def _create_query_engine(
+        self,
+        sub_retrievers: Optional[List[Any]] = None,
+        metadata_filter: Optional[Dict[str, str]] = None,
+        streaming: bool = False,
+    ):
+        """Create a query engine with token tracking and sub-retrievers."""
+        return self.rag_index.as_query_engine(
+            llm=self.completion_llm,
+            response_synthesizer=get_response_synthesizer(
+                llm=self.completion_llm,
+                response_mode=self._get_response_mode(),
+                callback_manager=self._callback_manager,
+                streaming=streaming,
+            ),
+            include_text=self.include_text,
+            similarity_top_k=self.similarity_top_k,
+            sub_retrievers=self._get_sub_retrievers(sub_retrievers, metadata_filter),
+        )
+
+    def _create_chat_engine(
+        self,
+        sub_retrievers: Optional[List[Any]] = None,
+        metadata_filter: Optional[Dict[str, str]] = None,
+    ):
+        """Create a context chat engine with token tracking and sub-retrievers."""
+        chat_engine = self.rag_index.as_chat_engine(
+            chat_mode=ChatMode.CONTEXT,
+            llm=self.completion_llm,
+            embed_model=self.emb_llm,
+            include_text=self.include_text,
+            similarity_top_k=self.similarity_top_k,
+            sub_retrievers=self._get_sub_retrievers(sub_retrievers, metadata_filter),
         )
+        if hasattr(chat_engine, "callback_manager"):
+            chat_engine.callback_manager = self._callback_manager
+        return chat_engine
 
     async def _query_with_retries(
         self,
@@ -216,54 +294,29 @@ class BaseGraphIndexRagOps(ABC):
         sub_retrievers: Optional[List[Any]] = None,
         metadata_filter: Optional[Dict[str, str]] = None,
     ):
-        """Internal method with retry logic for robust querying."""
+        """Internal method with retry logic for robust querying.
 
-        @retry(
-            stop=stop_after_attempt(3),
-            wait=wait_exponential(multiplier=1, min=1, max=10),
-            retry=(
-                retry_if_exception_type(Exception)
-                | retry_if_result(
-                    lambda result: self._retry_on_empty_string_or_timeout_response(
-                        result
-                    )
-                )
-            ),
-            before_sleep=self._log_retry_attempt,
+        Retrieval and synthesis are separate stages and only the failed stage is retried,
+        so e.g. an LLM timeout reuses the retrieved nodes instead of retrieving again.
+        """
+        query_engine = self._create_query_engine(sub_retrievers, metadata_filter)
+        qb = QueryBundle(query_str=text_str)
+
+        async def _retrieve():
+            return await query_engine.aretrieve(qb)
+
+        nodes = await self._run_stage_with_retries("retrieve", _retrieve)
+
+        async def _synthesize():
+            return await query_engine.asynthesize(qb, nodes)
+
+        return await self._run_stage_with_retries(
+            "synthesize", _synthesize, retry_on_result=is_invalid_response
         )
-        async def _aquery_with_retries():
-            """Internal retry wrapper."""
-            try:
-                # Create query engine with token tracking and sub-retrievers
-                query_engine_kwargs = {
-                    "llm": self.completion_llm,
-                    "response_synthesizer": get_response_synthesizer(
-                        llm=self.completion_llm,
-                        response_mode=self._get_response_mode(),
-                        callback_manager=self._callback_manager,
-                    ),
-                    "include_text": self.include_text,
-                    "similarity_top_k": self.similarity_top_k,
-                }
-
-                # Add sub_retrievers if provided, otherwise create default ones with correct LLM
-                if sub_retrievers:
-                    query_engine_kwargs["sub_retrievers"] = sub_retrievers
-                else:
-                    query_engine_kwargs["sub_retrievers"] = (
-                        self._create_default_sub_retrievers(metadata_filter)
-                    )
-
-                query_engine = self.rag_index.as_query_engine(**query_engine_kwargs)
-
-                # Generate response using the query engine
-                response = await query_engine.aquery(text_str)
-                return response
-            except Exception as e:
-                self.logger.error(traceback.format_exc())
-                raise e
-
-        return await _aquery_with_retries()
+
+    def get_retry_stats(self) -> Dict[str, int]:
+        """Get the number of retries per query stage."""
+        return dict(self.stage_retry_counts)
 
     async def query_index(
         self,
@@ -300,7 +353,7 @@ class BaseGraphIndexRagOps(ABC):
             )
 
             # Validate response quality
-            if self._retry_on_empty_string_or_timeout_response(answer):
+            if is_invalid_response(answer):
                 raise ValueError(f"LLM RESPONSE IS NOT VALID: {answer}")
 
             return answer
@@ -339,25 +392,7 @@ class BaseGraphIndexRagOps(ABC):
 
         try:
             # Create chat engine with context awareness
-            chat_engine_kwargs = {
-                "chat_mode": ChatMode.CONTEXT,
-                "llm": self.completion_llm,
-                "embed_model": self.emb_llm,
-                "include_text": self.include_text,
-                "similarity_top_k": self.similarity_top_k,
-            }
-
-            # Add sub_retrievers if provided, otherwise create default ones with correct LLM
-            if sub_retrievers:
-                chat_engine_kwargs["sub_retrievers"] = sub_retrievers
-            else:
-                chat_engine_kwargs["sub_retrievers"] = (
-                    self._create_default_sub_retrievers(metadata_filter)
-                )
-
-            chat_engine = self.rag_index.as_chat_engine(**chat_engine_kwargs)
-            if hasattr(chat_engine, "callback_manager"):
-                chat_engine.callback_manager = self._callback_manager
+            chat_engine = self._create_chat_engine(sub_retrievers, metadata_filter)
 
             # Generate response with chat history context
             response = await chat_engine.achat(curr_message, chat_history)
@@ -372,6 +407,85 @@ class BaseGraphIndexRagOps(ABC):
             self.logger.error(traceback.format_exc())
             raise
 
+    async def astream_query_index(
+        self,
+        text_str: str,
+        sub_retrievers: Optional[List[Any]] = None,
+        metadata_filter: Optional[Dict[str, str]] = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Query the property graph index like query_index(), yielding the response tokens as they are generated.
+
+        Retrieval and the start of the synthesis are retried like in query_index(),
+        a stream that fails midway is not.
+
+        Args:
+            text_str: Main query for response generation
+            sub_retrievers: Optional list of sub-retrievers to use
+            metadata_filter: Optional metadata filters for the default sub-retrievers
+
+        Yields:
+            Response text deltas
+        """
+        if not self.rag_index:
+            exists = await self.index_exists()
+            if exists:
+                await self.initiate_index()
+            else:
+                raise ValueError(
+                    "No index exists. Create an index first using create_index()."
+                )
+
+        query_engine = self._create_query_engine(
+            sub_retrievers, metadata_filter, streaming=True
+        )
+        qb = QueryBundle(query_str=text_str)
+
+        async def _retrieve():
+            return await query_engine.aretrieve(qb)
+
+        nodes = await self._run_stage_with_retries("retrieve", _retrieve)
+
+        async def _synthesize():
+            return await query_engine.asynthesize(qb, nodes)
+
+        response = await self._run_stage_with_retries("synthesize", _synthesize)
+        async for token in response.async_response_gen():
+            yield token
+
+    async def astream_chat_with_index(
+        self,
+        curr_message: str,
+        chat_history: List[ChatMessage],
+        sub_retrievers: Optional[List[Any]] = None,
+        metadata_filter: Optional[Dict[str, str]] = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Chat with the index like chat_with_index(), yielding the response tokens as they are generated.
+
+        Args:
+            curr_message: Current user message
+            chat_history: Previous messages for context
+            sub_retrievers: Optional list of sub-retrievers to use
+            metadata_filter: Optional metadata filters for the default sub-retrievers
+
+        Yields:
+            Response text deltas
+        """
+        if not self.rag_index:
+            exists = await self.index_exists()
+            if exists:
+                await self.initiate_index()
+            else:
+                raise ValueError(
+                    "No index exists. Create an index first using create_index()."
+                )
+
+        chat_engine = self._create_chat_engine(sub_retrievers, metadata_filter)
+        response = await chat_engine.astream_chat(curr_message, chat_history)
+        async for token in response.async_response_gen():
+            yield token
+
     async def create_index(
         self,
         text_chunks: List[str],
@@ -391,7 +505,8 @@ class BaseGraphIndexRagOps(ABC):
             kg_extractors: Optional list of knowledge graph extractors to use
 
         Returns:
-            List of document IDs for the indexed chunks
+            List of document IDs of the non-empty chunks, in order. Repeated chunks are
+            indexed once and share the same ID.
         """
         try:
             if not self.property_graph_store:
@@ -0,0 +1,73 @@
+import logging
+import sqlite3
+import threading
+from array import array
+from typing import Dict, List
+
+from ..base.base_embedding_cache_store import BaseEmbeddingCacheStore
+
+
+class SQLiteEmbeddingCacheStore(BaseEmbeddingCacheStore):
+    """
+    On-disk embedding cache backed by a single SQLite file.
+
+    Embeddings are stored as float32 blobs, which is the precision embedding APIs
+    return them in. The connection is shared between threads and guarded by a lock,
+    so the store can be used from `asyncio.to_thread`.
+    """
+
+    # SQLite limits the number of bound parameters per statement
+    MAX_KEYS_PER_QUERY = 500
+
+    def __init__(self, db_path: str):
+        """
+        Open or create the cache database.
+
+        Args:
+            db_path: Path to the SQLite file, created if it does not exist
+        """
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, embedding BLOB NOT NULL)"
+            )
+            self._connection.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Look up the embeddings of the given keys."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), self.MAX_KEYS_PER_QUERY):
+                batch = keys[start : start + self.MAX_KEYS_PER_QUERY]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT key, embedding FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+        return found
+
+    def put_many(self, embeddings: Dict[str, List[float]]) -> None:
+        """Store the given embeddings in a single transaction."""
+        if not embeddings:
+            return
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, embedding) VALUES (?, ?)",
+                [
+                    (key, array("f", embedding).tobytes())
+                    for key, embedding in embeddings.items()
+                ],
+            )
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -5,26 +5,44 @@ from llama_index.core import StorageContext
 from llama_index.core.indices import load_index_from_storage
 from llama_index.core.llms import LLM
 from rag_wrapper.base.base_vector_index_rag_ops import BaseVectorIndexRagOps
+from rag_wrapper.vector_stores.numpy_vector_store import NumpyVectorStore
 
 
 class InMemRagOps(BaseVectorIndexRagOps):
-    """In-memory RAG operations using LlamaIndex."""
+    """In-memory RAG operations using LlamaIndex.
+
+    With `use_numpy_vector_store`, new indexes keep their embeddings in a NumpyVectorStore
+    instead of llama-index's JSON SimpleVectorStore, which loads and queries much faster for
+    large indexes. Indexes persisted with either store are loaded with the matching one.
+    """
 
     _ERROR = ValueError(
         "Index Object is not defined. The `persist_dir` passed to the constructor doesn't contain the index files."
     )
 
-    def __init__(self, persist_dir: str, emb_llm: LLM, completion_llm: LLM, **kwargs):
+    def __init__(
+        self,
+        persist_dir: str,
+        emb_llm: LLM,
+        completion_llm: LLM,
+        use_numpy_vector_store: bool = False,
+        numpy_vector_dtype: str = "float32",
+        **kwargs,
+    ):
         """Initialize in-memory RAG operations with models and index path.
 
         Args:
             persist_dir: Path to store/load the index
             emb_llm: Embedding language model
             completion_llm: Completion language model
+            use_numpy_vector_store: Create new indexes with a NumpyVectorStore (default: False)
+            numpy_vector_dtype: Precision of the NumpyVectorStore embeddings, "float32" or "float16" (default: "float32")
             **kwargs: Additional arguments passed to BaseRagOps (similarity_top_k, response_mode)
         """
         super().__init__(completion_llm=completion_llm, emb_llm=emb_llm, **kwargs)
         self.persist_dir = persist_dir
+        self.use_numpy_vector_store = use_numpy_vector_store
+        self.numpy_vector_dtype = numpy_vector_dtype
 
     async def persist_index(self):
         """Persist the index to disk."""
@@ -38,8 +56,11 @@ class InMemRagOps(BaseVectorIndexRagOps):
         try:
             if await self.index_exists():
                 self.logger.info(f"Loading existing index from {self.persist_dir}")
+                vector_store = None
+                if NumpyVectorStore.exists_in_persist_dir(self.persist_dir):
+                    vector_store = NumpyVectorStore.from_persist_dir(self.persist_dir)
                 self.storage_context = StorageContext.from_defaults(
-                    persist_dir=self.persist_dir
+                    persist_dir=self.persist_dir, vector_store=vector_store
                 )
                 self.rag_index = load_index_from_storage(
                     storage_context=self.storage_context,
@@ -51,6 +72,10 @@ class InMemRagOps(BaseVectorIndexRagOps):
                 self.logger.info(
                     f"No existing index found at {self.persist_dir}. Use create_index() to create a new index."
                 )
+                if self.use_numpy_vector_store:
+                    self.storage_context = StorageContext.from_defaults(
+                        vector_store=NumpyVectorStore(dtype=self.numpy_vector_dtype)
+                    )
 
         except Exception as e:
             self.logger.error(f"Failed to initialize index: {e}")
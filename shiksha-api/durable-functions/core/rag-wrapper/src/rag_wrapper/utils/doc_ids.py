@@ -0,0 +1,18 @@
+import hashlib
+import json
+import uuid
+from typing import Optional
+
+
+def get_text_chunk_doc_id(text: str, metadata: Optional[dict] = None) -> str:
+    """
+    Get the document id of a text chunk from a hash of its text and metadata.
+
+    The same chunk always gets the same id, so re-indexing unchanged content can be detected
+    and skipped. The id keeps the `doc_id_<uuid>` format of randomly generated ids.
+    """
+    content = json.dumps(
+        {"text": text, "metadata": metadata or {}}, sort_keys=True, default=str
+    )
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return f"doc_id_{uuid.UUID(hex=digest[:32])}"
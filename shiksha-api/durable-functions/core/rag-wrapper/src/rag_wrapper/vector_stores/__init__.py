@@ -0,0 +1,3 @@
+from .numpy_vector_store import NumpyVectorStore
+
+__all__ = ["NumpyVectorStore"]
@@ -0,0 +1,85 @@
+"""
+Token-Budgeted Context Packing Tests
+
+Uses mock models and an in-memory index, no external services are required.
+"""
+
+from unittest.mock import patch
+
+from llama_index.core import MockEmbedding
+from llama_index.core.llms import MockLLM
+from llama_index.core.schema import (
+    NodeRelationship,
+    NodeWithScore,
+    RelatedNodeInfo,
+    TextNode,
+)
+from rag_wrapper.rag_ops.in_mem_rag_ops import InMemRagOps
+from rag_wrapper.response_synthesizers import TokenBudgetSynthesizer
+
+PHOTOSYNTHESIS = (
+    "Plants make their own food by photosynthesis using sunlight water and carbon dioxide "
+    "and they release oxygen into the air as a by product of the process"
+)
+
+
+def create_node(node_id, text, doc_id, score):
+    return NodeWithScore(
+        node=TextNode(
+            id_=node_id,
+            text=text,
+            relationships={NodeRelationship.SOURCE: RelatedNodeInfo(node_id=doc_id)},
+        ),
+        score=score,
+    )
+
+
+def test_pack_nodes_drops_duplicates_and_respects_budget():
+    synthesizer = TokenBudgetSynthesizer(
+        llm=MockLLM(), context_token_budget=45, tokenizer=str.split
+    )
+    nodes = [
+        create_node(
+            "overlap", PHOTOSYNTHESIS.split(" by photosynthesis")[1], "doc-1", 0.8
+        ),
+        create_node("best", PHOTOSYNTHESIS, "doc-1", 0.9),
+        create_node("copy", PHOTOSYNTHESIS + " too", "doc-2", 0.7),
+        create_node(
+            "roots", "Roots absorb water and minerals from the soil", "doc-3", 0.6
+        ),
+        create_node("long", "Leaves " * 30, "doc-4", 0.5),
+        create_node("stem", "The stem carries water to the leaves", "doc-5", 0.4),
+    ]
+
+    packed_nodes, stats = synthesizer.pack_nodes(nodes)
+
+    assert [n.node.node_id for n in packed_nodes] == ["best", "roots", "stem"]
+    assert stats["num_duplicate_chunks"] == 2
+    assert stats["num_over_budget_chunks"] == 1
+    assert stats["context_tokens"] == 27 + 8 + 7
+    assert stats["context_tokens_saved"] == stats["retrieved_context_tokens"] - 42
+
+
+async def test_packed_response_mode_makes_one_llm_call(tmp_path):
+    rag_ops = InMemRagOps(
+        persist_dir=str(tmp_path / "index"),
+        emb_llm=MockEmbedding(embed_dim=8),
+        completion_llm=MockLLM(max_tokens=8),
+        response_mode="packed",
+        context_token_budget=200,
+    )
+    # Identical chunks are indexed once, so the duplicates differ in their last word
+    await rag_ops.create_index(
+        [f"{PHOTOSYNTHESIS} {i}" for i in range(5)]
+        + [f"Fact {i} about roots." for i in range(5)]
+    )
+
+    with patch.object(
+        MockLLM, "acomplete", autospec=True, side_effect=MockLLM.acomplete
+    ) as acomplete:
+        response = await rag_ops.query_index("How do plants make food?")
+
+    assert acomplete.await_count == 1
+    assert response.metadata["num_duplicate_chunks"] == 4
+    assert response.metadata["context_tokens_saved"] > 0
+    assert len(response.source_nodes) == 6
@@ -0,0 +1,82 @@
+"""
+Qdrant Existence Check Cache Tests
+
+Uses mock models and a mock Qdrant client, no external services are required.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from llama_index.core import MockEmbedding
+from llama_index.core.llms import MockLLM
+from rag_wrapper.rag_ops.qdrant_rag_ops import QdrantRagOps
+
+
+def create_rag_ops(scroll_points, cache_ttl_in_seconds=60):
+    async_client = MagicMock()
+    async_client.get_collections = AsyncMock(
+        return_value=SimpleNamespace(collections=[SimpleNamespace(name="books")])
+    )
+    async_client.scroll = AsyncMock(return_value=(scroll_points, None))
+    rag_ops = QdrantRagOps(
+        collection_name="books",
+        emb_llm=MockEmbedding(embed_dim=8),
+        completion_llm=MockLLM(),
+        cache_ttl_in_seconds=cache_ttl_in_seconds,
+    )
+    rag_ops._create_async_client = MagicMock(return_value=async_client)
+    return rag_ops, async_client
+
+
+async def test_validated_filters_and_collection_are_cached():
+    rag_ops, async_client = create_rag_ops(["point"])
+
+    for _ in range(3):
+        assert await rag_ops.index_exists()
+        await rag_ops._prequery_filter_guard({"chapter_id": "1", "subject": "science"})
+    await rag_ops._prequery_filter_guard({"subject": "science", "chapter_id": "1"})
+
+    async_client.get_collections.assert_awaited_once()
+    async_client.scroll.assert_awaited_once()
+    assert rag_ops.get_cache_stats() == {"round_trips_saved": 5, "cached_filters": 1}
+
+
+async def test_unmatched_filters_are_not_cached():
+    rag_ops, async_client = create_rag_ops([])
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await rag_ops._prequery_filter_guard({"chapter_id": "1"})
+
+    assert async_client.scroll.await_count == 2
+    assert rag_ops.get_cache_stats()["round_trips_saved"] == 0
+
+
+async def test_cache_expires_and_is_invalidated():
+    rag_ops, async_client = create_rag_ops(["point"], cache_ttl_in_seconds=0)
+    await rag_ops._prequery_filter_guard({"chapter_id": "1"})
+    await rag_ops._prequery_filter_guard({"chapter_id": "1"})
+    assert async_client.scroll.await_count == 2
+
+    rag_ops.cache_ttl_in_seconds = 60
+    await rag_ops._prequery_filter_guard({"chapter_id": "1"})
+    rag_ops.rag_index = MagicMock()
+    rag_ops.vector_store = MagicMock(adelete_nodes=AsyncMock())
+    await rag_ops.delete_documents(["doc-1"])
+    await rag_ops._prequery_filter_guard({"chapter_id": "1"})
+
+    assert async_client.scroll.await_count == 4
+
+
+async def test_expired_filters_are_pruned():
+    rag_ops, _ = create_rag_ops(["point"], cache_ttl_in_seconds=0)
+    for chapter_id in range(5):
+        await rag_ops._prequery_filter_guard({"chapter_id": str(chapter_id)})
+    assert rag_ops.get_cache_stats()["cached_filters"] == 1
+
+    rag_ops.cache_ttl_in_seconds = 60
+    for chapter_id in range(5):
+        await rag_ops._prequery_filter_guard({"chapter_id": str(chapter_id)})
+    assert rag_ops.get_cache_stats()["cached_filters"] == 5
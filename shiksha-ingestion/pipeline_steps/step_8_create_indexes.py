@@ -104,13 +104,18 @@ class CreateIndexStep(BasePipelineStep):
                     MarkdownNodeParser(),
                     SentenceSplitter(chunk_size=1024, chunk_overlap=100)
                 ]
-                await rag_ops.create_index(
+                # Only embeds the changed pages when the chapter is re-ingested
+                result = await rag_ops.upsert_text_chunks(
                     text_chunks=pages,
                     metadata={
                         "chapter_id": chapter_id
                     },
                     transformations=transformations
                 )
+                logger.info(
+                    f"Indexed chapter {chapter_id}: {len(result['inserted'])} pages inserted, "
+                    f"{len(result['deleted'])} deleted, {len(result['unchanged'])} unchanged"
+                )
 
             asyncio.run(run_create_index())
             